@@ -0,0 +1,163 @@
+"""
+
+    Benchmark: Border Detection Signal Processing
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Compares the time taken (per image) by ``border_detection()`` when its 1D signal processing
+    (``_rounder()``, ``_deltas()``, ``_anomaly_removal()`` and ``_zero_var_axis_elements_remove()``)
+    is implemented with loops over lists (the approach used previously) and with NumPy.
+
+    The images are synthetic: smooth noise surrounded by borders of a random width and shade, with
+    (in half of the images) a lower bar containing 'text'. Note: the generators in ``data/synthesized_data``
+    require a private collection of base images, so the images are generated here instead.
+
+    The results of both implementations are checked for (exact) equality.
+
+    Usage:
+
+        $ python benchmarks/border_detection_signal.py --n_images 2000
+
+"""
+import os
+import sys
+import argparse
+from time import time
+from contextlib import contextmanager
+
+import numpy as np
+from scipy.ndimage import gaussian_filter
+
+sys.path.insert(0, os.path.abspath("."))
+
+from biovida.images.models import border_detection as bd
+
+
+# ----------------------------------------------------------------------------------------------------------
+# Reference (Loop) Implementation
+# ----------------------------------------------------------------------------------------------------------
+
+
+def rounder_loop(l, by=3):
+    t = int if by == 0 else float
+    return list([round(t(x), by) for x in l])
+
+
+def deltas_loop(iterable):
+    return np.array([abs(j-i) for i, j in zip(iterable, iterable[1:])])
+
+
+def subsection_loop(iterable, exclude, start, end):
+    return iterable[start:exclude] + iterable[exclude+1:end]
+
+
+def anomaly_removal_loop(numeric_array, window=2):
+    if window <= 1 or window > len(numeric_array):
+        raise ValueError("`window` must be greater than 1 and less than the length of `numeric_array`.")
+    if window > 2:
+        window += 1
+    smoothed = list()
+    for i in range(len(numeric_array)):
+        if i < window:
+            if len(set(numeric_array[i+1:i+window+1])) == 1:
+                smoothed.append(numeric_array[i+1])
+            else:
+                smoothed.append(numeric_array[i])
+        if i >= window:
+            if len(set(subsection_loop(numeric_array, i, i-window+1, i+window))) == 1:
+                smoothed.append(numeric_array[i-1])
+            else:
+                smoothed.append(numeric_array[i])
+    return smoothed
+
+
+def array_cleaner_loop(arr, round_by=5, anomaly_window=2):
+    rounded_arr = rounder_loop(arr, round_by)
+    return np.array(anomaly_removal_loop(rounded_arr, anomaly_window))
+
+
+def zero_var_axis_elements_remove_loop(image, axis, rounding=3):
+    zero_var_items = np.where(np.round(np.std(image, axis=axis), rounding) == 0)
+    if axis == 0:
+        image[:, zero_var_items] = [0]
+    elif axis == 1:
+        image[zero_var_items] = [0]
+    return image
+
+
+@contextmanager
+def loop_implementation():
+    """Temporarily replace the NumPy implementation in ``border_detection`` with the reference implementation."""
+    replacements = {'_rounder': rounder_loop, '_deltas': deltas_loop, '_anomaly_removal': anomaly_removal_loop,
+                    '_array_cleaner': array_cleaner_loop,
+                    '_zero_var_axis_elements_remove': zero_var_axis_elements_remove_loop}
+    originals = {k: getattr(bd, k) for k in replacements}
+    for k, v in replacements.items():
+        setattr(bd, k, v)
+    try:
+        yield
+    finally:
+        for k, v in originals.items():
+            setattr(bd, k, v)
+
+
+# ----------------------------------------------------------------------------------------------------------
+# Synthetic Images
+# ----------------------------------------------------------------------------------------------------------
+
+
+def synthetic_bordered_image(random_state):
+    """Smooth noise with borders and, possibly, a lower bar. Scaled to [0, 1] in steps of 1/255."""
+    h, w = random_state.randint(150, 600, size=2)
+    image = gaussian_filter(random_state.rand(h, w), sigma=random_state.uniform(1, 6))
+    image = (image - image.min()) / (image.max() - image.min())
+
+    top, bottom = random_state.randint(0, h // 6, size=2)
+    left, right = random_state.randint(0, w // 6, size=2)
+    bordered = np.full((top + h + bottom, left + w + right), random_state.choice([0.0, 1.0, random_state.rand()]))
+    bordered[top:top + h, left:left + w] = image
+
+    if random_state.rand() < 0.5:
+        bar = np.ones((random_state.randint(15, 50), bordered.shape[1]))
+        for _ in range(random_state.randint(3, 30)):  # 'text'
+            y, x = random_state.randint(2, bar.shape[0] - 8), random_state.randint(0, bar.shape[1] - 10)
+            bar[y:y + random_state.randint(4, 8), x:x + random_state.randint(3, 10)] = 0
+        bordered = np.vstack((bordered, bar))
+
+    return np.round(bordered * 255) / 255.0
+
+
+def per_image_ms(images):
+    start, rslts = time(), list()
+    for image in images:
+        rslts.append(bd.border_detection(image, report_signal_strength=True, rescale_input_ndarray=False))
+    return (time() - start) / len(images) * 1000, rslts
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--n_images', type=int, default=2000)
+    args = parser.parse_args()
+
+    random_state = np.random.RandomState(100)
+    images = [synthetic_bordered_image(random_state) for _ in range(args.n_images)]
+
+    with loop_implementation():
+        loop_ms, loop_rslts = per_image_ms(images)
+    numpy_ms, numpy_rslts = per_image_ms(images)
+
+    for image, a, b in zip(images, loop_rslts, numpy_rslts):
+        assert a == b, (a, b)
+        signal = np.mean(image, axis=0)
+        with loop_implementation():
+            expected = bd._array_cleaner(signal)
+        actual = bd._array_cleaner(signal)
+        assert expected.dtype == actual.dtype and np.array_equal(expected, actual)
+
+    print("Images: {0:,}; all results identical.\n".format(len(images)))
+    print("{0:<30} {1:>10}".format('', 'ms/image'))
+    print("{0:<30} {1:>10.2f}".format('border_detection() (loops)', loop_ms))
+    print("{0:<30} {1:>10.2f}".format('border_detection() (NumPy)', numpy_ms))
+
+
+if __name__ == '__main__':
+    main()
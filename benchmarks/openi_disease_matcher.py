@@ -0,0 +1,124 @@
+"""
+
+    Benchmark: Disease Matching in Open-i Text (Linear Scan vs. Aho-Corasick)
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Compares the rows per second achieved by ``_disease_guess()`` when the names of diseases are
+    found by checking each name against each source in turn (the approach ``_disease_guess()`` used
+    previously) and when they are found with a single pass of an ``AhoCorasick`` automaton.
+
+    Usage:
+
+        $ python benchmarks/openi_disease_matcher.py --n_rows 500 --n_diseases 10000
+
+    Note: synthetic disease names are used s.t. the benchmark does not require the Disease Ontology.
+
+"""
+import os
+import sys
+import random
+import argparse
+from time import time
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.abspath("."))
+
+from biovida.support_tools.support_tools import cln
+from biovida.support_tools._aho_corasick import AhoCorasick
+from biovida.images._interface_support.openi._openi_text_feature_extraction import _disease_guess
+
+
+PREFIXES = ('acute', 'chronic', 'congenital', 'primary', 'secondary', 'familial', 'juvenile', 'benign',
+            'malignant', 'hereditary', 'idiopathic', 'autoimmune', 'infectious', 'recurrent')
+ORGANS = ('heart', 'lung', 'liver', 'kidney', 'brain', 'spine', 'bone', 'skin', 'pancreas', 'thyroid', 'colon',
+          'breast', 'prostate', 'bladder', 'retina', 'muscle', 'blood', 'lymph node', 'spleen', 'stomach')
+SUFFIXES = ('disease', 'cancer', 'carcinoma', 'syndrome', 'cyst', 'fibrosis', 'infection', 'neoplasm',
+            'inflammation', 'lesion', 'hypertrophy', 'atrophy', 'dysplasia', 'sarcoma', 'stenosis')
+
+
+def synthetic_diseases(n_diseases, seed=100):
+    """Generate ``n_diseases`` (lower case) names of the form 'prefix organ suffix'."""
+    names = set(["{0} {1}".format(o, s) for o in ORGANS for s in SUFFIXES] + list(SUFFIXES))
+    for p in PREFIXES:
+        for o in ORGANS:
+            for s in SUFFIXES:
+                names.add("{0} {1} {2}".format(p, o, s))
+    random.seed(seed)
+    while len(names) < n_diseases:
+        names.add("{0} {1} type {2}".format(random.choice(ORGANS), random.choice(SUFFIXES), random.randint(1, 10 ** 6)))
+    return sorted(names)[:n_diseases]
+
+
+def synthetic_row(list_of_diseases):
+    """The text sources passed to ``_disease_guess()`` for a single row."""
+    def sentence():
+        return "The {0} year old patient presented with {1}, with no evidence of {2}.".format(
+            random.randint(5, 90), random.choice(list_of_diseases), random.choice(list_of_diseases))
+    return {'problems': "; ".join(random.sample(list_of_diseases, 2)),
+            'title': "A case of {0}".format(random.choice(list_of_diseases)),
+            'background': " ".join(sentence() for _ in range(3)),
+            'abstract': "<p><b>Findings: </b>{0}</p>".format(" ".join(sentence() for _ in range(8))),
+            'image_caption': "Axial CT demonstrating {0}.".format(random.choice(list_of_diseases)),
+            'image_mention': None}
+
+
+def disease_guess_scan(problems, title, background, abstract, image_caption, image_mention, list_of_diseases):
+    """``_disease_guess()`` as it was implemented prior to the introduction of ``AhoCorasick``."""
+    generic = ('syndrome', 'disease')
+
+    if isinstance(problems, str) and cln(problems).lower() in ('normal', 'none'):
+        return 'normal'
+
+    possible_diseases = list()
+    for source in (image_caption, image_mention, problems, title, background, abstract):
+        if isinstance(source, str) and len(source):
+            source_clean = cln(BeautifulSoup(source, 'lxml').text.lower())
+            for d in list_of_diseases:
+                if d in source_clean:
+                    possible_diseases.append([source_clean.find(d), d])
+
+    no_substrings = list()
+    for i in possible_diseases:
+        if not any(i[-1] in j[-1] for j in possible_diseases if j[-1] != i[-1]):
+            no_substrings.append(i)
+    to_return = list(set([i[1] for i in no_substrings if i[1] not in generic]))
+
+    if len(to_return):
+        return "; ".join(sorted(to_return))
+    elif isinstance(problems, str):
+        filtered_problems = [p for p in problems.split(";") if p in list_of_diseases]
+        return "; ".join(sorted(filtered_problems)) if len(filtered_problems) else None
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--n_rows', type=int, default=500)
+    parser.add_argument('--n_diseases', type=int, default=10000)
+    args = parser.parse_args()
+
+    list_of_diseases = synthetic_diseases(args.n_diseases)
+    rows = [synthetic_row(list_of_diseases) for _ in range(args.n_rows)]
+
+    start = time()
+    disease_matcher = AhoCorasick(list_of_diseases)
+    build_time = time() - start
+
+    start = time()
+    for row in rows:
+        disease_guess_scan(list_of_diseases=list_of_diseases, **row)
+    scan_rate = len(rows) / (time() - start)
+
+    start = time()
+    for row in rows:
+        _disease_guess(disease_matcher=disease_matcher, **row)
+    automaton_rate = len(rows) / (time() - start)
+
+    print("Diseases: {0:,}, rows: {1:,}".format(len(list_of_diseases), len(rows)))
+    print("Automaton build time: {0:.2f} s".format(build_time))
+    print("Linear scan:  {0:>10.1f} rows/s".format(scan_rate))
+    print("Aho-Corasick: {0:>10.1f} rows/s ({1:.1f}x)".format(automaton_rate, automaton_rate / scan_rate))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""
+
+    Profile: Time Spent by each Open-i Text Feature Extractor
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Runs ``feature_extract()`` over synthetic records and reports the time spent in each of the
+    extractors it calls (including the normalization of text shared by the extractors). Also
+    compares the cost of stripping HTML by parsing each source with ``BeautifulSoup`` (as
+    ``_disease_guess()`` did previously) against ``_NormalizedText``.
+
+    Usage:
+
+        $ python benchmarks/openi_feature_extraction_profile.py --n_rows 1000
+
+"""
+import os
+import sys
+import argparse
+import pandas as pd
+from time import time
+from functools import wraps
+from bs4 import BeautifulSoup
+from collections import defaultdict, OrderedDict
+
+sys.path.insert(0, os.path.abspath("."))
+
+from biovida.support_tools.support_tools import cln
+from biovida.support_tools._aho_corasick import AhoCorasick
+from biovida.images._interface_support.openi import _openi_text_feature_extraction as fe
+from biovida.images._interface_support.openi.openi_text_processing import _openi_raw_prepare
+
+from openi_disease_matcher import synthetic_diseases
+from openi_records_streaming_memory import synthetic_record
+
+
+EXTRACTORS = ('_normalize', '_abstract_parser', '_disease_guess', '_patient_age_guess', '_patient_sex_guess',
+              '_illness_duration_guess', '_imaging_modality_guess', '_image_plane_guess',
+              '_problematic_image_features', '_ethnicity_guess')
+
+
+def instrument(timings):
+    """Replace each function in ``EXTRACTORS`` with a version which records the time spent in ``timings``."""
+    def timed(name, func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                timings[name] += time() - start
+        return wrapper
+
+    for name in EXTRACTORS:
+        setattr(fe, name, timed(name, getattr(fe, name)))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--n_rows', type=int, default=1000)
+    parser.add_argument('--n_diseases', type=int, default=10000)
+    args = parser.parse_args()
+
+    records = [synthetic_record(i) for i in range(args.n_rows)]
+    for record in records[::2]:
+        # Without a 'diagnosis' section, ``feature_extract()`` falls back to ``_disease_guess()``.
+        record['abstract'] = record['abstract'].replace("Diagnosis", "Summary")
+    data_frame = _openi_raw_prepare(pd.DataFrame(records), clinical_cases_only=False)
+    rows = [row for _, row in data_frame.iterrows()]
+    disease_matcher = AhoCorasick(synthetic_diseases(args.n_diseases))
+
+    timings = defaultdict(float)
+    instrument(timings)
+
+    start = time()
+    for row in rows:
+        fe.feature_extract(row, disease_matcher=disease_matcher, image_caption_unique=True)
+    total = time() - start
+
+    print("Rows: {0:,}; total: {1:.2f} s ({2:.1f} rows/s)\n".format(len(rows), total, len(rows) / total))
+    print("{0:<30} {1:>10} {2:>10}".format('extractor', 'ms/row', '% total'))
+    for name, seconds in sorted(timings.items(), key=lambda x: -x[1]):
+        print("{0:<30} {1:>10.3f} {2:>10.1f}".format(name, seconds / len(rows) * 1000, seconds / total * 100))
+
+    # HTML stripping: DOM (previously used in `_disease_guess()`) vs. `_NormalizedText`.
+    sources = [row[c] for row in rows for c in ('abstract', 'image_caption', 'title', 'problems')
+               if isinstance(row[c], str)]
+    comparison = OrderedDict()
+    start = time()
+    for s in sources:
+        cln(BeautifulSoup(s, 'lxml').text.lower())
+    comparison['BeautifulSoup'] = time() - start
+    start = time()
+    for s in sources:
+        fe._NormalizedText(s)
+    comparison['_NormalizedText'] = time() - start
+
+    print("\nHTML stripping ({0:,} sources):".format(len(sources)))
+    for name, seconds in comparison.items():
+        print("{0:<30} {1:>10.3f} ms/source".format(name, seconds / len(sources) * 1000))
+
+
+if __name__ == '__main__':
+    main()
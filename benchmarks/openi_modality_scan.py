@@ -0,0 +1,135 @@
+"""
+
+    Benchmark: Scanning Open-i Image Captions for Imaging Modalities and Planes
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Compares the time taken (per caption) by ``_im_scan()`` and ``_image_plane_guess()``
+    when the terms in ``_openi_imaging_modality_information`` are searched for with nested
+    ``any(term in source ...)`` loops (the approach used previously) and with a compiled
+    term bank (``_term_bank()``). For reference, a single alternation regex (with a lookahead,
+    s.t. overlapping terms are found) is also timed.
+
+    The results of the nested loops and the term bank are checked for equality.
+
+    Usage:
+
+        $ python benchmarks/openi_modality_scan.py --n_captions 10000
+
+"""
+import os
+import re
+import sys
+import random
+import argparse
+from time import time
+from collections import defaultdict
+
+sys.path.insert(0, os.path.abspath("."))
+
+from biovida.support_tools.support_tools import cln
+from biovida.images._interface_support.openi import _openi_text_feature_extraction as fe
+from biovida.images._interface_support.openi._openi_imaging_modality_information import (
+    terms_dict, modality_subtypes, modality_specific_subtypes)
+
+
+WORDS = ('the', 'patient', 'image', 'demonstrates', 'a', 'lesion', 'in', 'left', 'right', 'lobe', 'with',
+         'surrounding', 'edema', 'arrow', 'shows', 'mass', 'view', 'of', 'enhancing', 'nodule', 'no', 'evidence')
+MODALITY_PHRASES = ('ct ', 'mri ', ' mr ', 'computed tomography', 't1-weighted', ' t2 ', 'flair', 'chest',
+                    'brain', 'x-ray', 'ultrasound', 'post gad', ' gad ', 'non-contrast', 'contrast-enhanced',
+                    'pet-ct', 'angiography', 'photograph', ' stir ', 'axial', 'coronal', 'sagittal', 'transverse')
+
+
+def synthetic_caption():
+    """A caption of random words, with up to four phrases which refer to modalities or planes."""
+    words = [random.choice(WORDS) for _ in range(random.randint(5, 80))]
+    for _ in range(random.randint(0, 4)):
+        words.insert(random.randint(0, len(words)), random.choice(MODALITY_PHRASES))
+    return " ".join(words)
+
+
+def im_scan_nested(source):
+    """``_im_scan()`` as it was implemented prior to the introduction of ``_term_bank()``."""
+    matches = defaultdict(set)
+    for k, v in list(terms_dict.items()):
+        if any(i in source for i in v[0]):
+            matches[k].add(None)
+            if k in modality_subtypes:
+                for v2 in modality_subtypes[k]:
+                    if any(j in source for j in v2):
+                        matches[k].add(cln(v2[0]))
+
+    for k, v in list(modality_specific_subtypes.items()):
+        for i in v:
+            if any(j in source for j in i):
+                matches[k].add(cln(i[0]))
+
+    if len(list(matches.keys())) != 1:
+        return None
+    else:
+        return {k: list([_f for _f in v if _f]) for k, v in list(matches.items())}
+
+
+def image_plane_guess_nested(image_caption):
+    """``_image_plane_guess()`` as it was implemented prior to the introduction of ``_term_bank()``."""
+    if image_caption is None:
+        return None
+    plane_terms = [['axial', 'transverse'], ['coronal'], ['sagittal']]
+    planes = [p[0] for p in plane_terms if any(i in image_caption.lower for i in p)]
+    return planes[0] if len(planes) == 1 else None
+
+
+def alternation_scanner():
+    """Find all of the terms in the modality term bank with a single regex."""
+    hits = dict(fe._IM_TERM_BANK)
+    terms = sorted(hits, key=lambda t: (-len(t), t))
+    regex = re.compile("(?=({0}))".format("|".join(map(re.escape, terms))))
+    # A match only reports the longest term at each position, so include the hits for terms it starts with.
+    closure = {t: set().union(*[hits[p] for p in terms if t.startswith(p)]) for t in terms}
+
+    def scan(source):
+        found = set()
+        for match in regex.finditer(source):
+            found |= closure[match.group(1)]
+        return found
+    return scan
+
+
+def per_caption_us(func, items):
+    start = time()
+    for i in items:
+        func(i)
+    return (time() - start) / len(items) * 10 ** 6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--n_captions', type=int, default=10000)
+    args = parser.parse_args()
+
+    random.seed(100)
+    captions = [fe._normalize(synthetic_caption()) for _ in range(args.n_captions)]
+    sources = [c.lower for c in captions]
+
+    def as_comparable(rslt):
+        return rslt if rslt is None else {k: sorted(v) for k, v in rslt.items()}
+
+    for c, s in zip(captions, sources):
+        assert as_comparable(im_scan_nested(s)) == as_comparable(fe._im_scan(s)), s
+        assert image_plane_guess_nested(c) == fe._image_plane_guess(c), s
+
+    alternation_scan = alternation_scanner()
+    print("Captions: {0:,}; unique modality terms: {1}\n".format(len(captions), len(fe._IM_TERM_BANK)))
+    print("{0:<40} {1:>12}".format('', 'us/caption'))
+    print("{0:<40} {1:>12.1f}".format('_im_scan() (nested loops)', per_caption_us(im_scan_nested, sources)))
+    print("{0:<40} {1:>12.1f}".format('_im_scan() (term bank)', per_caption_us(fe._im_scan, sources)))
+    print("{0:<40} {1:>12.1f}".format('term bank scan only', per_caption_us(
+        lambda s: fe._term_bank_scan(fe._IM_TERM_BANK, s), sources)))
+    print("{0:<40} {1:>12.1f}".format('alternation regex scan only', per_caption_us(alternation_scan, sources)))
+    print("{0:<40} {1:>12.1f}".format('_image_plane_guess() (nested loops)',
+                                      per_caption_us(image_plane_guess_nested, captions)))
+    print("{0:<40} {1:>12.1f}".format('_image_plane_guess() (term bank)',
+                                      per_caption_us(fe._image_plane_guess, captions)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,147 @@
+"""
+
+    Benchmark: Peak Memory of Processing Open-i Records All at Once vs. in Chunks
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    ``_OpeniRecords().records_pull()`` is run end to end -- i.e., the threaded harvest, the
+    checkpoint file, processing and the final ``records_db`` -- with ``openi_block_harvest()``
+    replaced by a function which returns synthetic raw records (s.t. no requests are sent to Open-i).
+    Each mode is run in a fresh python process and the growth of its peak resident set size (RSS) is reported.
+
+    - 'batch': ``records_pull(chunk_size=None)``, i.e., all harvested records are held in memory
+      and processed at once by ``openi_raw_extract_and_clean()``.
+
+    - 'streaming': ``records_pull(chunk_size=...)``, i.e., harvested records are only written to the
+      checkpoint file and ``_records_stream_process()`` processes them in chunks, appending them to a
+      ``DataFrameShardStore``, before concatenating the processed records into the final ``records_db``.
+
+    Usage:
+
+        $ python benchmarks/openi_records_streaming_memory.py --n_records 5000 20000 --chunk_size 1000
+
+    Note: a short, fixed list of diseases is used s.t. the benchmark does not require the Disease Ontology.
+    For the same reason, ``openi_text_processing._disease_matcher()`` is replaced in the benchmark's processes.
+
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import resource
+import tempfile
+import subprocess
+
+sys.path.insert(0, os.path.abspath("."))
+
+
+DISEASES = ['spondylolysis', 'pneumonia', 'lung cancer', 'fracture', 'meningioma', 'glioblastoma', 'tuberculosis']
+
+ABSTRACT = ("<p><b>Diagnosis: </b>Spondylolysis and Spondylolithesis</p><p><b>History: </b>{0} year old male "
+            "with history of chronic back pain.</p><p><b>Findings: </b>Lateral radiograph of the spine demonstrates "
+            "a grade II lithesis of L4 on L5. Spondylysis of the L4 pars interarticularis is visible.</p>"
+            "<p><b>Ddx: </b>Degenerative spondylolisthesis; pars fracture.</p><p><b>Dxhow: </b>Imaging</p>") * 3
+
+
+def synthetic_record(i):
+    """A raw Open-i record. Every 4 consecutive records share a 'uid'."""
+    uid = "MPX{0}".format(i // 4)
+    return {'MeSH_major': None, 'MeSH_minor': None, 'Problems': None,
+            'abstract': ABSTRACT.format(20 + i % 60), 'affiliate': 'Uniformed Services University',
+            'articleType': 'encounter', 'authors': 'Smith ABS', 'ccLicense': 'byncnd',
+            'detailedQueryURL': 'https://openi.nlm.nih.gov/retrieve.php?img={0}_{1}'.format(uid, i),
+            'docSource': 'MPX', 'fulltext_html_url': 'https://medpix.nlm.nih.gov/bycase?id={0}'.format(i),
+            'getArticleFigures': 'https://openi.nlm.nih.gov/retrieve.php?uid={0}&req=5'.format(uid),
+            'image_caption': "Axial CT image {0} of the spine demonstrates a grade II lithesis of L4 on L5 "
+                             "(arrows).".format(i % 4),
+            'image_id': "{0}_synpic{1}".format(uid, 20000 + i), 'image_mention': None,
+            'image_modalityMajor': 'c',
+            'imgGrid150': 'https://openi.nlm.nih.gov/imgs/150/{0}.png'.format(i),
+            'imgLarge': 'https://openi.nlm.nih.gov/imgs/512/{0}.png'.format(i),
+            'imgThumb': 'https://openi.nlm.nih.gov/imgs/100/{0}.png'.format(i),
+            'imgThumbLarge': 'https://openi.nlm.nih.gov/imgs/137/{0}.png'.format(i),
+            'journal_abbr': 'MedPix', 'journal_date': '14/06/2006', 'journal_title': 'MedPix Images',
+            'licenseType': 'open-access', 'licenseURL': 'faq.php#medpix', 'medpixArticleId': str(i),
+            'medpixFigureId': str(i), 'medpixImageURL': 'https://medpix.nlm.nih.gov/case?id={0}'.format(i),
+            'pmcid': str(i // 4), 'similarInCollection': None, 'similarInResults': None,
+            'title': 'Spondylolysis and Spondylolithesis', 'uid': uid}
+
+
+def synthetic_block_harvest(url, bound, to_harvest, latency=0.0):
+    """Stand-in for ``_OpeniRecords().openi_block_harvest()``, e.g., ``bound="&m=1&n=30"``."""
+    m, n = [int(i.split("=")[1]) for i in bound.split("&")[1:]]
+    if latency:
+        time.sleep(latency)
+    return [synthetic_record(i) for i in range(m - 1, n)]
+
+
+def peak_rss_mb():
+    """Peak RSS of the current process (MB). Note: ``ru_maxrss`` is in bytes on macOS and kilobytes on Linux."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024.0 ** 2 if sys.platform == 'darwin' else peak / 1024.0
+
+
+def run_mode(mode, temp_directory_path, n_records, chunk_size, max_workers, latency):
+    """Run ``records_pull()`` end to end and print the growth in peak RSS (MB) as JSON."""
+    from biovida.images.openi_interface import _OpeniRecords
+    from biovida.support_tools._aho_corasick import AhoCorasick
+    from biovida.images._interface_support.openi import openi_text_processing
+
+    openi_text_processing._disease_matcher = lambda list_of_diseases, cache_path, verbose: AhoCorasick(DISEASES)
+
+    oir = _OpeniRecords(root_url='https://openi.nlm.nih.gov', date_format='%d/%m/%Y', verbose=False,
+                        cache_path=None, temp_directory_path=temp_directory_path)
+    oir.openi_block_harvest = lambda url, bound, to_harvest: synthetic_block_harvest(url, bound, to_harvest,
+                                                                                    latency=latency)
+    baseline = peak_rss_mb()
+
+    start = time.time()
+    records_db = oir.records_pull(search_url='benchmark', to_harvest=dict(), total=n_records, query=dict(),
+                                  pull_time='benchmark', clinical_cases_only=False, download_limit=None,
+                                  max_workers=max_workers, rate_limit=None,
+                                  chunk_size=chunk_size if mode == 'streaming' else None)
+
+    print(json.dumps({'mode': mode, 'n_rows': records_db.shape[0], 'seconds': time.time() - start,
+                      'peak_rss_growth_mb': peak_rss_mb() - baseline}))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--n_records', type=int, nargs='+', default=[5000, 20000])
+    parser.add_argument('--chunk_size', type=int, default=1000)
+    parser.add_argument('--max_workers', type=int, default=4)
+    parser.add_argument('--latency', type=float, default=0.0, help="seconds to sleep per (synthetic) request.")
+    parser.add_argument('--mode', default=None, help=argparse.SUPPRESS)
+    parser.add_argument('--temp_directory_path', default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode is not None:
+        run_mode(args.mode, args.temp_directory_path, n_records=args.n_records[0], chunk_size=args.chunk_size,
+                 max_workers=args.max_workers, latency=args.latency)
+        return
+
+    print("{0:>10} {1:>10} {2:>24} {3:>24}".format('records', 'chunk', 'batch peak RSS (MB)', 'streaming peak RSS (MB)'))
+    for n_records in args.n_records:
+        results = dict()
+        for mode in ('batch', 'streaming'):
+            temp_directory_path = tempfile.mkdtemp()
+            try:
+                output = subprocess.check_output([sys.executable, __file__, '--mode', mode,
+                                                  '--temp_directory_path', temp_directory_path,
+                                                  '--n_records', str(n_records),
+                                                  '--chunk_size', str(args.chunk_size),
+                                                  '--max_workers', str(args.max_workers),
+                                                  '--latency', str(args.latency)])
+                results[mode] = json.loads(output.decode('utf-8').strip().split("\n")[-1])
+            finally:
+                shutil.rmtree(temp_directory_path, ignore_errors=True)
+        if results['batch']['n_rows'] != results['streaming']['n_rows']:
+            raise AssertionError("The modes yielded a different number of rows.")
+        print("{0:>10} {1:>10} {2:>24.1f} {3:>24.1f}".format(n_records, args.chunk_size,
+                                                               results['batch']['peak_rss_growth_mb'],
+                                                               results['streaming']['peak_rss_growth_mb']))
+
+
+if __name__ == '__main__':
+    main()
@@ -9,7 +9,6 @@
 import os
 import re
 import pickle
-import requests
 import numpy as np
 import pandas as pd
 from warnings import warn
@@ -19,6 +18,7 @@ from datetime import datetime
 # Biovida support tools
 from biovida.support_tools.support_tools import cln, header, items_null
 from biovida.support_tools._cache_management import package_cache_creator
+from biovida.support_tools.http_session import http_get
 
 
 class DiseaseOntInterface(object):
@@ -281,7 +281,7 @@ class DiseaseOntInterface(object):
             obo_file = kwargs.get('obo_file')
         else:
             # Open the file and discard [Typedef] information at the end of the file.
-            obo_file = requests.get(disease_ontology_db_url, stream=True).text.split("[Typedef]")[0]
+            obo_file = http_get(disease_ontology_db_url).text.split("[Typedef]")[0]
     
         # Parse the file by splitting on [Term].
         parsed_by_term = obo_file.split("[Term]\n")
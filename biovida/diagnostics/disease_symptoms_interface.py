@@ -6,12 +6,14 @@
     ~~~~~~~~~~~~~~~~~~~~~~~~~~
 
 """
+import io
 import os
 import pandas as pd
 
 # General Support Tools
 from biovida.support_tools.support_tools import cln, header
 from biovida.support_tools._cache_management import package_cache_creator
+from biovida.support_tools.http_session import http_get
 
 
 class DiseaseSymptomsInterface(object):
@@ -97,7 +99,7 @@ class DiseaseSymptomsInterface(object):
         :rtype: ``Pandas DataFrame``
         """
         if not os.path.isfile(save_path) or download_override:
-            to_return = pd.read_csv(url, sep="\t", header=0, index_col=0).reset_index(drop=True)
+            to_return = pd.read_csv(io.StringIO(http_get(url).text), sep="\t", header=0, index_col=0).reset_index(drop=True)
             to_return = cleaner_func(to_return)
             to_return.to_pickle(save_path)
         else:
@@ -6,12 +6,13 @@
     ~~~~~~~~~~~~~~~~~~
 
 """
+import io
 import os
-import requests
 import pandas as pd
 
 # Tool to create required caches
 from biovida.support_tools._cache_management import package_cache_creator
+from biovida.support_tools.http_session import http_get
 
 # BioVida Support Tools
 from biovida.support_tools.support_tools import header, camel_to_snake_case, list_to_bulletpoints
@@ -80,7 +81,7 @@ class DisgenetInterface(object):
 
         if not os.path.isfile(save_address):
             readme_url = 'http://www.disgenet.org/ds/DisGeNET/results/readme.txt'
-            r = requests.get(readme_url, stream=True)
+            r = http_get(readme_url)
             with open(save_address, 'wb') as f:
                 f.write(r.content)
             header("The DisGeNET README has been downloaded to:\n\n {0}\n\n"
@@ -200,7 +201,7 @@ class DisgenetInterface(object):
         if download_override or not os.path.isfile(save_address):
             if self._verbose:
                 header("Downloading DisGeNET Database... ", flank=False)
-            data_frame = pd.read_csv(db_url,
+            data_frame = pd.read_csv(io.BytesIO(http_get(db_url).content),
                                      sep='\t',
                                      header=_disgenet_delimited_databases[database]['header'],
                                      compression='gzip')
@@ -8,7 +8,13 @@
 """
 import numpy as np
 from PIL import Image
-from time import sleep
+from queue import Queue, Full
+from threading import Lock, BoundedSemaphore, Event, Thread
+from contextlib import contextmanager
+from collections import OrderedDict
+from six.moves.urllib.parse import urlsplit
+from time import sleep, time
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
 from scipy.misc import imread, imresize
 from skimage.color.colorconv import rgb2gray
 
@@ -25,19 +31,206 @@ class NoResultsFound(Exception):
     pass
 
 
-def sleep_with_noise(amount_of_time, mean=0.0, noise=0.75):
+class RateLimiter(object):
     """
 
-    Sleep the current python instance by `amount_of_time`.
+    Thread-safe token bucket which limits the rate at which requests are sent to a server.
 
-    :param amount_of_time: the amount of time to sleep the instance for.
-    :type amount_of_time: ``int`` or ``float``
-    :param mean: ``mean`` param of ``numpy.random.normal()``. Defaults to 0.0.
-    :type mean: ``float``
-    :param noise: ``scale`` param of ``numpy.random.normal()``. Defaults to 0.75.
-    :type noise: ``float``
+    :param rate: the max. number of requests to permit per second. If ``None``, no limit will be imposed.
+    :type rate: ``int``, ``float`` or ``None``
+    :param burst: the max. number of requests which may be sent in immediate succession. Defaults to `1`.
+    :type burst: ``int``
     """
-    sleep(abs(amount_of_time + np.random.normal(loc=mean, scale=noise)))
+
+    def __init__(self, rate, burst=1):
+        if rate is not None and (isinstance(rate, bool) or not isinstance(rate, (int, float)) or rate <= 0):
+            raise ValueError("`rate` must be a number greater than zero or `None`.")
+        if not isinstance(burst, int) or burst < 1:
+            raise ValueError("`burst` must be an integer greater than or equal to 1.")
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._last_update = time()
+        self._lock = Lock()
+
+    def _refill(self):
+        """
+
+        Add tokens to the bucket in proportion to the time which has elapsed since the last refill.
+
+        """
+        now = time()
+        self._tokens = min(float(self.burst), self._tokens + (now - self._last_update) * self.rate)
+        self._last_update = now
+
+    def wait(self):
+        """
+
+        Block until a token is available and then consume it.
+
+        """
+        if self.rate is None:
+            return None
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return None
+                time_until_token = (1 - self._tokens) / self.rate
+            sleep(time_until_token)
+
+
+class PerHostLimiter(object):
+    """
+
+    Thread-safe cap on the number of requests which may be in flight to any one host at a given time.
+
+    :param limit: the max. number of concurrent requests to permit for each host.
+    :type limit: ``int``
+    """
+
+    def __init__(self, limit):
+        if not isinstance(limit, int) or limit < 1:
+            raise ValueError("`limit` must be an integer greater than or equal to 1.")
+        self.limit = limit
+        self._semaphores = dict()
+        self._lock = Lock()
+
+    def _semaphore(self, host):
+        with self._lock:
+            if host not in self._semaphores:
+                self._semaphores[host] = BoundedSemaphore(self.limit)
+            return self._semaphores[host]
+
+    @contextmanager
+    def hold(self, url):
+        """
+
+        Hold one of the slots for the host of ``url`` for the duration of a ``with`` block.
+
+        :param url: a URL.
+        :type url: ``str``
+        """
+        semaphore = self._semaphore(urlsplit(url).netloc)
+        with semaphore:
+            yield
+
+
+def ordered_thread_map(func, iterable, max_workers, rate_limiter=None, callback=None, desc=None, verbose=True):
+    """
+
+    Map ``func`` over ``iterable`` using a pool of threads.
+
+    :param func: a function which accepts a single element from ``iterable``.
+    :type func: ``callable``
+    :param iterable: the items to map ``func`` over.
+    :type iterable: ``iterable``
+    :param max_workers: the max. number of calls to ``func`` which may be in flight at any one time.
+    :type max_workers: ``int``
+    :param rate_limiter: an instance of ``RateLimiter`` which all calls to ``func`` will share.
+                         If ``None``, no limit will be imposed. Defaults to ``None``.
+    :type rate_limiter: ``RateLimiter`` or ``None``
+    :param callback: a function which will be called as ``callback(position, result)`` as each call to ``func``
+                     completes, where ``position`` is the position of the element in ``iterable``.
+                     Note: ``callback`` is always executed in the calling thread. Defaults to ``None``.
+    :type callback: ``callable`` or ``None``
+    :param desc: description to pass to ``tqdm``.
+    :type desc: ``str`` or ``None``
+    :param verbose: if ``True``, use ``tqdm`` to report progress.
+    :type verbose: ``bool``
+    :return: the yield of ``func`` for each element in ``iterable``, in the order of ``iterable``
+             (irrespective of the order in which the calls complete).
+    :rtype: ``list``
+    """
+    if not isinstance(max_workers, int) or max_workers < 1:
+        raise ValueError("`max_workers` must be an integer greater than or equal to 1.")
+
+    def worker(item):
+        if rate_limiter is not None:
+            rate_limiter.wait()
+        return func(item)
+
+    items = list(iterable)
+    results = [None] * len(items)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        future_positions = {executor.submit(worker, item): position for position, item in enumerate(items)}
+        try:
+            for future in tqdm(as_completed(future_positions), total=len(items), desc=desc, disable=not verbose):
+                position = future_positions[future]
+                results[position] = future.result()
+                if callback is not None:
+                    callback(position, results[position])
+        except BaseException:
+            # Do not start work which will never be used.
+            for future in future_positions:
+                future.cancel()
+            raise
+
+    return results
+
+
+def bounded_thread_imap(func, iterable, max_workers, max_queued=None, rate_limiter=None, discard=None):
+    """
+
+    Map ``func`` over ``iterable`` using a pool of threads, yielding results as they complete.
+
+    No more than ``max_workers + max_queued`` calls are outstanding (i.e., running or completed, but not yet
+    consumed) at any one time. Thus, if the consumer falls behind, no new calls are started until it catches up.
+
+    :param func: a function which accepts a single element from ``iterable``.
+    :type func: ``callable``
+    :param iterable: the items to map ``func`` over.
+    :type iterable: ``iterable``
+    :param max_workers: the max. number of calls to ``func`` which may be in flight at any one time.
+    :type max_workers: ``int``
+    :param max_queued: the number of calls which may be outstanding in addition to ``max_workers``.
+                       If ``None``, ``max_workers`` will be used. Defaults to ``None``.
+    :type max_queued: ``int`` or ``None``
+    :param rate_limiter: an instance of ``RateLimiter`` which all calls to ``func`` will share.
+                         If ``None``, no limit will be imposed. Defaults to ``None``.
+    :type rate_limiter: ``RateLimiter`` or ``None``
+    :param discard: a function which will be called as ``discard(result)`` for each call which completes, but
+                    whose result is never consumed (e.g., because the consumer raised or stopped early), s.t.
+                    resources held by the result (e.g., temporary files) can be released. Calls which are
+                    running when the generator is closed are waited for. Defaults to ``None``.
+    :type discard: ``callable`` or ``None``
+    :return: a generator of tuples of the form ``(position of the element in iterable, result)``,
+             in the order in which the calls complete.
+    :rtype: ``generator``
+    """
+    if not isinstance(max_workers, int) or max_workers < 1:
+        raise ValueError("`max_workers` must be an integer greater than or equal to 1.")
+    max_queued = max_workers if max_queued is None else max_queued
+    if not isinstance(max_queued, int) or max_queued < 1:
+        raise ValueError("`max_queued` must be an integer greater than or equal to 1.")
+
+    def worker(item):
+        if rate_limiter is not None:
+            rate_limiter.wait()
+        return func(item)
+
+    items = list(iterable)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending, next_position = dict(), 0
+        try:
+            while next_position < len(items) or len(pending):
+                while next_position < len(items) and len(pending) < max_workers + max_queued:
+                    pending[executor.submit(worker, items[next_position])] = next_position
+                    next_position += 1
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in sorted(done, key=lambda f: pending[f]):
+                    position = pending.pop(future)
+                    yield position, future.result()
+        finally:
+            # Do not start work which will never be used.
+            for future in pending:
+                future.cancel()
+            if discard is not None:
+                for future in pending:
+                    # Note: ``exception()`` waits for running calls to complete.
+                    if not future.cancelled() and future.exception() is None:
+                        discard(future.result())
 
 
 def try_fuzzywuzzy_import():
@@ -93,6 +286,35 @@ def image_transposer(converted_image, image_size, axes=(2, 0, 1)):
     return np.transpose(imresize(converted_image, image_size), axes).astype('float32')
 
 
+def _load_and_scale_image(image, image_size, axes, grayscale_first):
+    """
+
+    Load an image and scale it for ``ImageClassificationCNN()``. Note: values are not normalized (i.e., /255).
+
+    :param image: a path to an image or the image as a ndarray.
+    :type image: ``str`` or ``ndarray``
+    :param image_size: see ``load_and_scale_images()``.
+    :type image_size: ``tuple``
+    :param axes: see ``load_and_scale_images()``.
+    :type axes: ``tuple``
+    :param grayscale_first: see ``load_and_scale_images()``.
+    :type grayscale_first: ``bool``
+    :return: the resized and transposed image.
+    :rtype: ``ndarray``
+    """
+    if 'ndarray' == type(image).__name__:
+        converted_image = image
+    else:
+        # Load grayscale images by first converting them to RGB (otherwise, `imresize()` will break).
+        if grayscale_first:
+            loaded_image = Image.open(image).convert("LA")
+            loaded_image = loaded_image.convert("RGB")
+        else:
+            loaded_image = Image.open(image).convert("RGB")
+        converted_image = np.asarray(loaded_image)
+    return image_transposer(converted_image, image_size, axes=axes)
+
+
 def load_and_scale_images(list_of_images, image_size, axes=(2, 0, 1), status=True, grayscale_first=False, desc=None):
     """
 
@@ -114,21 +336,293 @@ def load_and_scale_images(list_of_images, image_size, axes=(2, 0, 1), status=Tru
     :rtype: ``ndarray``
     """
     # Source: https://blog.rescale.com/neural-networks-using-keras-on-rescale/
-    def load_func(image):
-        if 'ndarray' == type(image).__name__:
-            converted_image = image
-        else:
-            # Load grayscale images by first converting them to RGB (otherwise, `imresize()` will break).
-            if grayscale_first:
-                loaded_image = Image.open(image).convert("LA")
-                loaded_image = loaded_image.convert("RGB")
+    loaded = [_load_and_scale_image(image_name, image_size, axes=axes, grayscale_first=grayscale_first)
+              for image_name in tqdm(list_of_images, desc=desc, disable=not status)]
+    return np.array(loaded) / 255.0
+
+
+def image_batches(list_of_images, batch_size, prepare):
+    """
+
+    Prepare images in batches.
+
+    :param list_of_images: the images (or, more generally, the items from which images can be prepared).
+    :type list_of_images: ``list``, ``tuple`` or ``ndarray``
+    :param batch_size: the number of images in each batch.
+    :type batch_size: ``int``
+    :param prepare: a function which accepts an item in ``list_of_images`` and returns an image as an ndarray
+                    with values between 0 and 255.
+    :type prepare: ``func``
+    :return: a generator of the images in batches of ``batch_size`` (the last may be smaller), as ``float32``
+             arrays with values between 0 and 1. Images are stacked along the first axis.
+    :rtype: ``generator``
+    """
+    if not isinstance(batch_size, int) or batch_size < 1:
+        raise ValueError("`batch_size` must be a positive integer.")
+    for start in range(0, len(list_of_images), batch_size):
+        batch = np.array([prepare(image) for image in list_of_images[start:start + batch_size]], dtype='float32')
+        batch /= 255.0
+        yield batch
+
+
+def scaled_image_batches(list_of_images, image_size, batch_size, axes=(2, 0, 1), grayscale_first=False):
+    """
+
+    A batched version of ``load_and_scale_images()``, s.t. only ``batch_size`` images are held in memory at once.
+
+    :param list_of_images: a list of paths to images.
+    :type list_of_images: ``list`` or ``tuple``
+    :param image_size: see ``load_and_scale_images()``.
+    :type image_size: ``tuple``
+    :param batch_size: the number of images in each batch.
+    :type batch_size: ``int``
+    :param axes: see ``load_and_scale_images()``.
+    :type axes: ``tuple``
+    :param grayscale_first: see ``load_and_scale_images()``.
+    :type grayscale_first: ``bool``
+    :return: see ``image_batches()``.
+    :rtype: ``generator``
+    """
+    def prepare(image):
+        return _load_and_scale_image(image, image_size, axes=axes, grayscale_first=grayscale_first)
+    return image_batches(list_of_images, batch_size=batch_size, prepare=prepare)
+
+
+def prefetched(iterable, max_prefetch=2):
+    """
+
+    Iterate over ``iterable`` in a background thread, s.t. up to ``max_prefetch`` items
+    are prepared while the consumer is working on the current item (e.g., images are read
+    from disk while predictions are being made for the prior batch).
+
+    Exceptions raised by ``iterable`` are raised in the consumer. If the consumer stops early,
+    the background thread is stopped.
+
+    :param iterable: any iterable.
+    :type iterable: ``iterable``
+    :param max_prefetch: the maximum number of items to prepare ahead of the consumer.
+    :type max_prefetch: ``int``
+    :return: a generator which yields the items in ``iterable`` (in order).
+    :rtype: ``generator``
+    """
+    items, stop = Queue(maxsize=max(max_prefetch, 1)), Event()
+
+    def put(item):
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return True
+            except Full:
+                pass
+        return False
+
+    def producer():
+        try:
+            for item in iterable:
+                if not put((True, item)):
+                    return None
+            put((False, None))
+        except BaseException as e:
+            put((False, e))
+
+    thread = Thread(target=producer)
+    thread.daemon = True
+    thread.start()
+    try:
+        while True:
+            is_item, value = items.get()
+            if is_item:
+                yield value
+            elif value is None:
+                break
             else:
-                loaded_image = Image.open(image).convert("RGB")
-            converted_image = np.asarray(loaded_image)
-        return image_transposer(converted_image, image_size, axes=axes)
+                raise value
+    finally:
+        stop.set()
+        thread.join()
 
-    loaded = [load_func(image_name) for image_name in tqdm(list_of_images, desc=desc, disable=not status)]
-    return np.array(loaded) / 255.0
+
+def _pil_nbytes(image):
+    """Approximate number of bytes used by a PIL image."""
+    bytes_per_band = 4 if image.mode in ('F', 'I') else 1
+    return image.size[0] * image.size[1] * len(image.getbands()) * bytes_per_band
+
+
+def _crop_key(lower_crop, upper_crop, vborder):
+    """
+
+    Standardize cropping parameters, s.t. they can be used as (part of) a dictionary key.
+
+    :return: a tuple of the form ``(lower_crop, upper_crop, vborder)``, with null values replaced by ``None``.
+    :rtype: ``tuple``
+    """
+    def null(x):
+        return x is None or (isinstance(x, float) and np.isnan(x))
+
+    return (None if null(lower_crop) else int(lower_crop),
+            None if null(upper_crop) else int(upper_crop),
+            None if null(vborder) else (int(vborder[0]), int(vborder[1])))
+
+
+class DecodedImage(object):
+    """
+
+    An image which is read from disk (and decoded) once. Views of the image (e.g., grayscale, cropped,
+    rescaled) are derived from the decoded image when first requested and retained for reuse.
+
+    :param path: the path to the image.
+    :type path: ``str``
+    :param on_growth: a function which will be called as ``on_growth(decoded_image, nbytes)`` when the
+                      decoded image (or a new view) adds ``nbytes`` to the memory used. Defaults to ``None``.
+    :type on_growth: ``callable`` or ``None``
+    """
+
+    def __init__(self, path, on_growth=None):
+        self.path = path
+        self._on_growth = on_growth
+        self._image = None
+        self._views = dict()
+        self.nbytes = 0
+
+    def _grow(self, nbytes):
+        self.nbytes += nbytes
+        if self._on_growth is not None:
+            self._on_growth(self, nbytes)
+
+    def _view(self, key, func):
+        if key not in self._views:
+            view = func()
+            self._views[key] = view
+            self._grow(view.nbytes if isinstance(view, np.ndarray) else _pil_nbytes(view))
+        return self._views[key]
+
+    @property
+    def image(self):
+        """The image, as decoded by ``PIL``."""
+        if self._image is None:
+            image = Image.open(self.path)
+            image.load()
+            self._image = image
+            self._grow(_pil_nbytes(image))
+        return self._image
+
+    def rgb(self):
+        """
+
+        :return: the image converted to RGB.
+        :rtype: ``PIL Image``
+        """
+        return self._view('rgb', lambda: self.image.convert('RGB'))
+
+    def grayscale(self):
+        """
+
+        :return: the image as a 2D float ndarray (as yielded by ``scipy.misc.imread(path, flatten=True)``).
+        :rtype: ``ndarray``
+        """
+        def flatten():
+            image = self.image
+            if image.mode == 'P':
+                image = image.convert('RGBA' if 'transparency' in image.info else 'RGB')
+            return np.array(image.convert('F'))
+        return self._view('grayscale', flatten)
+
+    def cropped(self, lower_crop, upper_crop, vborder, convert_to_rgb=True):
+        """
+
+        :param lower_crop: the lower horizontal crop location (``None`` or ``NaN`` for no cropping).
+        :type lower_crop: ``int`` or ``float``
+        :param upper_crop: the upper horizontal crop location (``None`` or ``NaN`` for no cropping).
+        :type upper_crop: ``int`` or ``float``
+        :param vborder: the vertical crop locations (``None`` or ``NaN`` for no cropping).
+        :type vborder: ``tuple``, ``list`` or ``float``
+        :param convert_to_rgb: if ``True``, convert the cropped image to RGB. Defaults to ``True``.
+        :type convert_to_rgb: ``bool``
+        :return: the cropped image.
+        :rtype: ``PIL Image``
+        """
+        lower_crop, upper_crop, vborder = crop_key = _crop_key(lower_crop, upper_crop, vborder)
+
+        def crop():
+            cropped_image = self.image
+            if lower_crop is not None:
+                w, h = cropped_image.size
+                cropped_image = cropped_image.crop((0, 0, w, lower_crop))
+            if upper_crop is not None:
+                w, h = cropped_image.size
+                cropped_image = cropped_image.crop((0, upper_crop, w, h))
+            if vborder is not None:
+                w, h = cropped_image.size
+                cropped_image = cropped_image.crop((vborder[0], 0, vborder[1], h))
+            return cropped_image.convert('RGB') if convert_to_rgb else cropped_image
+        return self._view(('cropped', crop_key, convert_to_rgb), crop)
+
+    def scaled(self, image_size, lower_crop=None, upper_crop=None, vborder=None, axes=(2, 0, 1)):
+        """
+
+        :param image_size: see ``image_transposer()``.
+        :type image_size: ``tuple``
+        :param lower_crop: see ``cropped()``.
+        :param upper_crop: see ``cropped()``.
+        :param vborder: see ``cropped()``.
+        :param axes: see ``image_transposer()``.
+        :type axes: ``tuple``
+        :return: the (cropped) RGB image, resized to ``image_size`` and transposed about ``axes``
+                 (as yielded by ``load_and_scale_images()``, prior to division by 255).
+        :rtype: ``ndarray``
+        """
+        crop_key = _crop_key(lower_crop, upper_crop, vborder)
+        return self._view(('scaled', crop_key, tuple(image_size), tuple(axes)),
+                          lambda: image_transposer(np.asarray(self.cropped(*crop_key, convert_to_rgb=True)),
+                                                   image_size, axes=axes))
+
+
+class ImageLoader(object):
+    """
+
+    A least-recently-used (LRU) cache of ``DecodedImage`` instances, s.t. an image shared by several
+    analyses is only read from disk once while the memory used by decoded images remains bounded.
+
+    :param max_bytes: the approximate maximum number of bytes to use for decoded images (and their views).
+                      The most recently requested image is always retained. Defaults to 500 MB.
+    :type max_bytes: ``int``
+
+    :Example:
+
+    >>> loader = ImageLoader()
+    >>> loader['/path/to/image.png'].grayscale()
+    """
+
+    def __init__(self, max_bytes=500 * 1024 ** 2):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._images = OrderedDict()
+
+    def __len__(self):
+        return len(self._images)
+
+    def __contains__(self, path):
+        return path in self._images
+
+    def _on_growth(self, decoded_image, nbytes):
+        # Note: images which have already been evicted may continue to be used (and grow) elsewhere.
+        if self._images.get(decoded_image.path) is decoded_image:
+            self.nbytes += nbytes
+            while len(self._images) > 1 and self.nbytes > self.max_bytes:
+                _, evicted = self._images.popitem(last=False)
+                self.nbytes -= evicted.nbytes
+
+    def __getitem__(self, path):
+        if path in self._images:
+            self._images.move_to_end(path)
+        else:
+            self._images[path] = DecodedImage(path, on_growth=self._on_growth)
+        return self._images[path]
+
+    def clear(self):
+        """Remove all images from the cache."""
+        self._images.clear()
+        self.nbytes = 0
 
 
 def show_plt(image):
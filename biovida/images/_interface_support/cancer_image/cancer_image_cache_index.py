@@ -0,0 +1,190 @@
+# coding: utf-8
+
+"""
+
+    Index of the Cancer Image Archive Images Cache
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+"""
+import os
+import pickle
+from collections import defaultdict
+
+from biovida.support_tools.support_tools import atomic_pickle_dump
+
+
+def png_series_abbrev(file_name):
+    """
+
+    Extract the 'series_abbrev' from the name of a PNG in the cache, which are of the form:
+    ``'[instance]_[pull_position]__[series_abbrev]__default.png'``.
+
+    :param file_name: the name of a file.
+    :type file_name: ``str``
+    :return: the 'series_abbrev' or ``None`` if ``file_name`` is not of the form above.
+    :rtype: ``str`` or ``None``
+    """
+    if not file_name.endswith('__default.png'):
+        return None
+    parts = file_name[:-len('__default.png')].split('__', 1)
+    return parts[1] if len(parts) == 2 else None
+
+
+def dicom_series_abbrev(file_name):
+    """
+
+    Extract the 'series_abbrev' from the name of a DICOM in the cache, which are of the form:
+    ``'[instance]_[original_name]__[series_abbrev].dcm'``.
+
+    :param file_name: the name of a file.
+    :type file_name: ``str``
+    :return: the 'series_abbrev' or ``None`` if ``file_name`` is not of the form above.
+    :rtype: ``str`` or ``None``
+    """
+    if file_name.startswith('__'):  # e.g., temporary directories.
+        return None
+    parts = file_name.rsplit('__', 1)
+    return os.path.splitext(parts[1])[0] if len(parts) == 2 else None
+
+
+class SeriesCacheIndex(object):
+    """
+
+    A persistent index of the files in the Cancer Image Archive images cache, keyed by
+    the series each file belongs to (i.e., its 'series_abbrev'), s.t. the files for a series
+    can be found without listing the contents of the cache's directories.
+
+    The index must be told when files are added (``add()``) or removed (``remove()``). Changes
+    made by other means (e.g., the user deleting files) are detected when a directory is first used
+    by comparing its modification time with its modification time when the index was last saved.
+    If they differ, the index for that directory is rebuilt from its contents. Thereafter, the
+    modification time is not checked (the index's own changes to the directory would alter it).
+
+    :param save_path: the path to save the index to.
+    :type save_path: ``str``
+    :param directories: a dictionary of the form ``{name: (path to a directory, function which extracts
+                        the 'series_abbrev' from the name of a file in the directory)}``.
+    :type directories: ``dict``
+    """
+
+    def __init__(self, save_path, directories):
+        self._save_path = save_path
+        self._directories = directories
+        self._mtimes, self._files = self._load()
+        self._verified = set()
+        self._changed = False
+
+    def _load(self):
+        """
+
+        :return: the modification times and files saved, if they exist. Otherwise empty dictionaries.
+        :rtype: ``tuple``
+        """
+        if os.path.isfile(self._save_path):
+            try:
+                with open(self._save_path, "rb") as f:
+                    saved = pickle.load(f)
+                return saved['mtimes'], saved['files']
+            except (EOFError, KeyError, pickle.UnpicklingError):
+                pass  # rebuild.
+        return dict(), dict()
+
+    def _mtime(self, name):
+        return os.stat(self._directories[name][0]).st_mtime_ns
+
+    def _series_files(self, name):
+        """
+
+        :param name: the name of a directory (i.e., a key in ``directories``).
+        :type name: ``str``
+        :return: a dictionary of the form ``{series_abbrev: set of file names}`` for the directory,
+                 which is rebuilt if the directory was changed (before it was first used) without
+                 the index being informed.
+        :rtype: ``dict``
+        """
+        if name in self._verified:
+            return self._files[name]
+        self._verified.add(name)
+
+        if name not in self._files or self._mtimes.get(name) != self._mtime(name):
+            directory, series_abbrev_func = self._directories[name]
+            series_files = defaultdict(set)
+            for file_name in os.listdir(directory):
+                series_abbrev = series_abbrev_func(file_name)
+                if series_abbrev is not None:
+                    series_files[series_abbrev].add(file_name)
+            self._files[name], self._mtimes[name] = dict(series_files), self._mtime(name)
+            self._changed = True
+        return self._files[name]
+
+    def lookup(self, name, series_abbrev):
+        """
+
+        :param name: the name of a directory (i.e., a key in ``directories``).
+        :type name: ``str``
+        :param series_abbrev: as evolved inside ``_CancerImageArchiveImages()._pull_images_engine()``.
+        :type series_abbrev: ``str``
+        :return: the (sorted) paths of the files in the directory for ``series_abbrev``.
+        :rtype: ``tuple``
+        """
+        directory = self._directories[name][0]
+        return tuple(sorted(os.path.join(directory, f) for f in self._series_files(name).get(series_abbrev, ())))
+
+    def add(self, name, paths):
+        """
+
+        Add files to the index.
+
+        :param name: the name of the directory (i.e., a key in ``directories``) which contains ``paths``.
+        :type name: ``str``
+        :param paths: paths to files.
+        :type paths: ``iterable``
+        """
+        series_files, series_abbrev_func = self._series_files(name), self._directories[name][1]
+        for path in paths:
+            file_name = os.path.basename(path)
+            series_abbrev = series_abbrev_func(file_name)
+            if series_abbrev is not None:
+                series_files.setdefault(series_abbrev, set()).add(file_name)
+                self._changed = True
+
+    def remove(self, paths):
+        """
+
+        Remove files from the index, e.g., because they have been deleted.
+
+        :param paths: paths to files.
+        :type paths: ``iterable``
+        """
+        paths = [os.path.abspath(p) for p in paths]
+        for name, (directory, series_abbrev_func) in self._directories.items():
+            directory, series_files = os.path.abspath(directory), self._series_files(name)
+            for path in paths:
+                if os.path.dirname(path) != directory:
+                    continue
+                file_name = os.path.basename(path)
+                series_abbrev = series_abbrev_func(file_name)
+                if file_name in series_files.get(series_abbrev, ()):
+                    series_files[series_abbrev].discard(file_name)
+                    if not len(series_files[series_abbrev]):
+                        del series_files[series_abbrev]
+                    self._changed = True
+
+    def save(self):
+        """
+
+        Save the index (if it has changed since it was loaded).
+
+        Note: the index is assumed to be current. That is, all changes to the directories since
+        the index was loaded must have been recorded with ``add()`` and ``remove()``.
+
+        """
+        for name in self._files:
+            if self._mtimes.get(name) != self._mtime(name):
+                self._mtimes[name] = self._mtime(name)
+                self._changed = True
+        if not self._changed:
+            return None
+
+        atomic_pickle_dump({'mtimes': self._mtimes, 'files': self._files}, self._save_path)
+        self._changed = False
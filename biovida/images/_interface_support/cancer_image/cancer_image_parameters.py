@@ -8,7 +8,6 @@
 """
 import os
 import re
-import requests
 import pandas as pd
 from itertools import chain
 
@@ -21,6 +20,7 @@ from biovida.support_tools.support_tools import (cln,
 
 # Cache Management
 from biovida.support_tools._cache_management import package_cache_creator
+from biovida.support_tools.http_session import http_get
 
 
 class CancerImageArchiveParams(object):
@@ -129,7 +129,7 @@ class CancerImageArchiveParams(object):
         :return: the TCIA API Reference Table with unrefined column.
         :rtype: ``Pandas DataFrame``
         """
-        html = requests.get(api_ref_loc).text
+        html = http_get(api_ref_loc).text
     
         # Extract all tables from the page
         all_tables = pd.read_html(str(html), header=0)
@@ -249,7 +249,7 @@ class CancerImageArchiveParams(object):
         if not os.path.isfile(save_path) or download_override:
             if self._verbose:
                 header("Downloading DICOM Modality Table... ", flank=False)
-            html = requests.get(modality_loc).text
+            html = http_get(modality_loc).text
             modality_df = pd.read_html(str(html), header=0)[0]
             modality_df.columns = modality_df.columns.str.lower()
             modality_df['long'] = modality_df['long'].replace(self._dicom_long_rename())
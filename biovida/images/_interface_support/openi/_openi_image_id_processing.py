@@ -182,7 +182,40 @@ def _image_id_short(journal_title, image_id):
     return output_clean(fig_no)
 
 
-def _image_id_short_enforce_unique(data_frame):
+def image_id_short_summary_update(summary, data_frame):
+    """
+
+    Update ``summary`` with the 'image_id_short' values for the rows in ``data_frame``.
+
+    Along with ``image_id_short_invalid_dict()``, this allows the information
+    required by ``_image_id_short_enforce_unique()`` to be accumulated over
+    chunks of records.
+
+    :param summary: a dictionary of the form ``{'uid': [number of rows, set of 'image_id_short' values], ...}``.
+    :type summary: ``dict``
+    :param data_frame: a dataframe with 'uid', 'journal_title' and 'image_id' columns.
+    :type data_frame: ``Pandas DataFrame``
+    """
+    for uid, journal_title, image_id in zip(data_frame['uid'], data_frame['journal_title'], data_frame['image_id']):
+        if not isinstance(uid, str):
+            continue
+        uid_summary = summary.setdefault(uid, [0, set()])
+        uid_summary[0] += 1
+        uid_summary[1].add(_image_id_short(journal_title, image_id))
+
+
+def image_id_short_invalid_dict(summary):
+    """
+
+    :param summary: as evolved by ``image_id_short_summary_update()``.
+    :type summary: ``dict``
+    :return: a dictionary of the form ``{'uid': not unique or unique (boolean), ...}``.
+    :rtype: ``dict``
+    """
+    return {uid: None in values or len(values) != n for uid, (n, values) in summary.items()}
+
+
+def _image_id_short_enforce_unique(data_frame, invalid_si_id_dict=None, counter=None):
     """
 
     If the 'image_id_short' column is not unique
@@ -191,6 +224,10 @@ def _image_id_short_enforce_unique(data_frame):
 
     :param data_frame: as evolved inside ``image_id_short_gen()``
     :type data_frame: ``Pandas DataFrame``
+    :param invalid_si_id_dict: see ``image_id_short_gen()``.
+    :type invalid_si_id_dict: ``dict`` or ``None``
+    :param counter: see ``image_id_short_gen()``.
+    :type counter: ``defaultdict`` or ``None``
     :return: see description
     :rtype: ``Pandas DataFrame``
 
@@ -218,9 +255,10 @@ def _image_id_short_enforce_unique(data_frame):
         return not len(set(image_id_short)) == len(image_id_short)
 
     # Dict of the form: {'uid': not unique or unique (boolean), ...}
-    invalid_si_id_dict = data_frame.groupby('uid').apply(not_unique_image_id_short).to_dict()
+    if invalid_si_id_dict is None:
+        invalid_si_id_dict = data_frame.groupby('uid').apply(not_unique_image_id_short).to_dict()
 
-    d = defaultdict(int)
+    d = defaultdict(int) if counter is None else counter
     # Iterate over only those rows where 'image_id_short' is not unique and correct accordingly.
     for index, row in data_frame.iterrows():
         if invalid_si_id_dict.get(row['uid']):
@@ -233,7 +271,7 @@ def _image_id_short_enforce_unique(data_frame):
     return data_frame
 
 
-def image_id_short_gen(data_frame):
+def image_id_short_gen(data_frame, invalid_si_id_dict=None, counter=None):
     """
 
     Simplify 'image_id' by 'boiling it down'
@@ -243,10 +281,18 @@ def image_id_short_gen(data_frame):
 
     :param data_frame: an Openi ``records_db`` or ``cache_records_db``.
     :type data_frame: ``Pandas DataFrame``
+    :param invalid_si_id_dict: a dictionary of the form ``{'uid': not unique or unique (boolean), ...}``
+                               (see ``image_id_short_invalid_dict()``). If ``None``, it will be computed
+                               from ``data_frame``. Defaults to ``None``.
+    :type invalid_si_id_dict: ``dict`` or ``None``
+    :param counter: the number of rows seen thus far for each 'uid'. Passing the same ``defaultdict(int)``
+                    when processing consecutive chunks of records yields the same result as processing
+                    all of the records at once. If ``None``, counting starts at zero. Defaults to ``None``.
+    :type counter: ``defaultdict`` or ``None``
     :return: ``data_frame`` with a ``image_id_short`` column.
     :rtype: ``Pandas DataFrame``
     """
     data_frame['image_id_short'] = data_frame.apply(
         lambda x: _image_id_short(x['journal_title'], x['image_id']), axis=1)
 
-    return _image_id_short_enforce_unique(data_frame)
+    return _image_id_short_enforce_unique(data_frame, invalid_si_id_dict=invalid_si_id_dict, counter=counter)
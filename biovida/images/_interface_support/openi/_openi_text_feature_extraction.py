@@ -33,6 +33,63 @@ from biovida.images._interface_support.openi._openi_imaging_modality_information
 CLINICAL_ARTICLE_TYPES = ('encounter', 'case_report', 'radiology_report')
 
 
+# ----------------------------------------------------------------------------------------------------------
+# Normalized Text
+# ----------------------------------------------------------------------------------------------------------
+
+
+# An HTML tag (or comment). Note: '<' must be followed by a letter, '/' or '!'  s.t., e.g., 'p < 0.05' is retained.
+_html_tag_regex = re.compile(r'<[A-Za-z/!][^>]*>')
+
+
+def _strip_html(text):
+    """
+
+    Remove HTML tags from ``text`` and unescape HTML entities (e.g., '&amp;').
+
+    Note: tags are replaced with a space, rather than parsed (as with ``BeautifulSoup``).
+    This is far faster and suffices for the short HTML fragments returned by Open-i.
+
+    :param text: any string.
+    :type text: ``str``
+    :return: see description.
+    :rtype: ``str``
+    """
+    if '<' in text:
+        text = re.sub(_html_tag_regex, " ", text)
+    return unescape(text) if '&' in text else text
+
+
+class _NormalizedText(object):
+    """
+
+    A source of text (e.g., an abstract) which is normalized once and then shared by the feature extractors.
+
+    :param text: any string.
+    :type text: ``str``
+
+    :ivar raw: ``text``, unaltered.
+    :ivar clean: ``text`` with HTML removed and white space collapsed.
+    :ivar lower: ``clean`` in lower case.
+    """
+    __slots__ = ('raw', 'clean', 'lower')
+
+    def __init__(self, text):
+        self.raw = text
+        self.clean = cln(_strip_html(text))
+        self.lower = self.clean.lower()
+
+
+def _normalize(text):
+    """
+
+    :param text: any object.
+    :return: ``_NormalizedText(text)`` if ``text`` is a string, otherwise ``None``.
+    :rtype: ``_NormalizedText`` or ``None``
+    """
+    return _NormalizedText(text) if isinstance(text, str) else None
+
+
 # ----------------------------------------------------------------------------------------------------------
 # Abstract Processing
 # ----------------------------------------------------------------------------------------------------------
@@ -151,19 +208,19 @@ def _patient_sex_guess(background, abstract, image_caption, image_mention):
     Tool to extract the sex of the patient (female or male).
 
     :param background: the background of the patient/study.
-    :type background: ``str``
+    :type background: ``_NormalizedText`` or ``None``
     :param abstract: a text abstract.
-    :type abstract: ``str``
+    :type abstract: ``_NormalizedText`` or ``None``
     :param image_caption: an element from the 'image_caption' column.
-    :type image_caption: ``str``
+    :type image_caption: ``_NormalizedText`` or ``None``
     :param image_mention: an element from the 'image_mention' column.
-    :type image_mention: ``str``
+    :type image_mention: ``_NormalizedText`` or ``None``
     :return: the sex of the patent.
     :rtype: ``str`` or ``None``
     """
     for source in (background, abstract, image_caption, image_mention):
-        if isinstance(source, str):
-            extract = _patient_sex_extract(source.lower())
+        if source is not None:
+            extract = _patient_sex_extract(source.lower)
             if isinstance(extract, str):
                 return extract
     else:
@@ -276,20 +333,20 @@ def _patient_age_guess(background, abstract, image_caption, image_mention):
     Guess the age of the patient.
 
     :param background: the background of the patient/study.
-    :type background: ``str``
+    :type background: ``_NormalizedText`` or ``None``
     :param abstract: a text abstract.
-    :type abstract: ``str``
+    :type abstract: ``_NormalizedText`` or ``None``
     :param image_caption: an element from the 'image_caption' column.
-    :type image_caption: ``str``
+    :type image_caption: ``_NormalizedText`` or ``None``
     :param image_mention: an element from the 'image_mention' column.
-    :type image_mention: ``str``
+    :type image_mention: ``_NormalizedText`` or ``None``
     :return: patient age.
     :rtype: ``float`` or ``None``
     """
     # Loop through the inputs, search all of them for age matches
     for source in (background, abstract, image_caption, image_mention):
-        if isinstance(source, str):
-            matches = _age_marker_match(source)
+        if source is not None:
+            matches = _age_marker_match(source.lower)
             if isinstance(matches, list) and len(matches):
                 return _age_refine(matches)
     else:
@@ -307,15 +364,12 @@ def _ethnicity_guess_engine(image_summary_info):
     Engine to power ``_ethnicity_guess()``.
 
     :param image_summary_info: some summary text of the image, e.g., 'history', 'abstract', 'image_caption' or 'image_mention'.
-    :type image_summary_info: ``str``
+    :type image_summary_info: ``_NormalizedText``
     :return: tuple of the form ('ethnicity', 'sex'), ('ethnicity', None) or (None, None).
     :type: ``tuple``
     """
     e_matches, s_matches = set(), set()
 
-    # Clean the input
-    image_summary_info_cln = cln(image_summary_info)
-
     def eth(ethnicity):
         return ["{0} {1}".format(ethnicity, s) for s in ['adult', 'male', 'female']]
 
@@ -333,7 +387,7 @@ def _ethnicity_guess_engine(image_summary_info):
 
     for k, v in list(long_form_ethnicities.items()):
         for j in v:
-            if j in image_summary_info_cln.lower():
+            if j in image_summary_info.lower:
                 if not ('caucasian' in e_matches and j == 'asian'):  # 'asian' is a substring in 'caucasian'.
                     e_matches.add(k)
 
@@ -342,7 +396,7 @@ def _ethnicity_guess_engine(image_summary_info):
                               (' WM ', 'caucasian', 'male'), (' WF ', 'caucasian', 'female')]
 
     for (abbrev, eth, sex) in short_form_ethnicities:
-        if abbrev in image_summary_info_cln:
+        if abbrev in image_summary_info.clean:
             e_matches.add(eth)
             s_matches.add(sex)
 
@@ -358,19 +412,19 @@ def _ethnicity_guess(background, abstract, image_caption, image_mention):
     Guess the ethnicity of the patient.
 
     :param background: the background of the patient/study.
-    :type background: ``str``
+    :type background: ``_NormalizedText`` or ``None``
     :param abstract: a text abstract.
-    :type abstract: ``str``
+    :type abstract: ``_NormalizedText`` or ``None``
     :param image_caption: an element from the 'image_caption' column.
-    :type image_caption: ``str``
+    :type image_caption: ``_NormalizedText`` or ``None``
     :param image_mention: an element from the 'image_mention' column.
-    :type image_mention: ``str``
+    :type image_mention: ``_NormalizedText`` or ``None``
     :return: tuple of the form ('ethnicity', 'sex'), ('ethnicity', None) or (None, None).
     :rtype: ``tuple``
     """
     matches = list()
     for source in (background, abstract, image_caption, image_mention):
-        if isinstance(source, str):
+        if source is not None:
             matches.append(_ethnicity_guess_engine(source))
 
     # 1. Prefer both pieces of information
@@ -391,38 +445,13 @@ def _ethnicity_guess(background, abstract, image_caption, image_mention):
 # ----------------------------------------------------------------------------------------------------------
 
 
-def _remove_substrings(list_of_terms):
-    """
-
-    Remove list elements that are substrings of other list elements.
-
-    :param list_of_terms: any list of strings and their starting position in the source string.
-    :type list_of_terms: ``iterable``
-    :return: see description.
-    :type: ``list_of_terms`` with any substrings of other terms removed.
-
-    :Example:
-
-    # Source string: "The patient presented with congenital heart disease...".
-    >>> remove_substrings(list_of_terms=[[38, 'heart disease'], [27, 'congenital heart disease'], [44, 'disease']])
-    ...
-    [27, 'congenital heart disease']
-
+def _disease_guess(problems, title, background, abstract, image_caption, image_mention, disease_matcher):
     """
-    if len(list_of_terms) <= 1:
-        return list_of_terms
-    else:
-        rslt = list()
-        for i in list_of_terms:
-            if not any(i[-1] in j[-1] for j in list_of_terms if j[-1] != i[-1]):
-                rslt.append(i)
-        return rslt
-
 
-def _disease_guess(problems, title, background, abstract, image_caption, image_mention, list_of_diseases):
-    """
+    Search `problems`, `title`, `abstract`, `image_caption` and `image_mention` for diseases in `disease_matcher`.
 
-    Search `problems`, `title`, `abstract`, `image_caption` and `image_mention` for diseases in `list_of_diseases`
+    Each source is scanned once. Diseases which are only mentioned as part of a longer disease
+    name in the same source (e.g., 'heart disease' in '...congenital heart disease...') are dropped.
 
     Near future: count the number of times the disease is mentioned in all sources and use that to guide decision...
 
@@ -439,52 +468,55 @@ def _disease_guess(problems, title, background, abstract, image_caption, image_m
           (https://arxiv.org/abs/1505.00670).
         - https://irp.nih.gov/blog/post/2016/11/challenges-to-training-artificial-intelligence-with-medical-imaging-data
 
-    :param problems:
-    :param title:
-    :param background:
-    :param abstract:
-    :param image_caption:
-    :param image_mention:
-    :param list_of_diseases: see ``feature_extract``.
-    :type list_of_diseases: ``list``
+    :param problems: an element from the 'problems' column.
+    :type problems: ``_NormalizedText`` or ``None``
+    :param title: an element from the 'title' column.
+    :type title: ``_NormalizedText`` or ``None``
+    :param background: the background of the patient/study.
+    :type background: ``_NormalizedText`` or ``None``
+    :param abstract: a text abstract.
+    :type abstract: ``_NormalizedText`` or ``None``
+    :param image_caption: an element from the 'image_caption' column.
+    :type image_caption: ``_NormalizedText`` or ``None``
+    :param image_mention: an element from the 'image_mention' column.
+    :type image_mention: ``_NormalizedText`` or ``None``
+    :param disease_matcher: see ``feature_extract``.
+    :type disease_matcher: ``biovida.support_tools._aho_corasick.AhoCorasick``
     :return:
     :rtype: ``str`` or ``None``
 
     :Example:
 
+    >>> from biovida.support_tools._aho_corasick import AhoCorasick
     >>> from biovida.diagnostics.disease_ont_interface import DiseaseOntInterface
-    >>> list_of_diseases = DiseaseOntInterface().pull()['name'].tolist()
+    >>> disease_matcher = AhoCorasick(DiseaseOntInterface().pull()['name'].tolist())
 
-    >>> abstract = '...a patient with pancreatitis, not Macrolipasemia' 
+    >>> abstract = _NormalizedText('...a patient with pancreatitis, not Macrolipasemia')
     >>> _disease_guess(problems=None, title=None, background=None,
     ...                abstract=abstract, image_caption=None, image_mention=None,
-    ...                list_of_diseases=list_of_diseases)
+    ...                disease_matcher=disease_matcher)
     ...
     'pancreatitis'
 
     """
-    # ToDO: this function is very computationally expensive and rather ineffective. Replace.
+    # ToDO: this function is rather ineffective (e.g., negation is ignored). Replace.
     generic = ('syndrome', 'disease')
 
-    if isinstance(problems, str) and cln(problems).lower() in ('normal', 'none'):
+    if problems is not None and problems.lower in ('normal', 'none'):
         return 'normal'
 
-    possible_diseases = list()
+    possible_diseases = set()
     for source in (image_caption, image_mention, problems, title, background, abstract):
-        if isinstance(source, str) and len(source):
-            source_clean = cln(BeautifulSoup(source, 'lxml').text.lower())
-            for d in list_of_diseases:
-                if d in source_clean:
-                    possible_diseases.append([source_clean.find(d), d])
+        if source is not None and len(source.lower):
+            possible_diseases.update(m[-1] for m in disease_matcher.find_all(source.lower, overlapping=False))
 
-    no_substrings = _remove_substrings(possible_diseases)
-    to_return = list(set([i[1] for i in no_substrings if i[1] not in generic]))
+    to_return = [d for d in possible_diseases if d not in generic]
 
     if len(to_return):
         return "; ".join(sorted(to_return))
     # Try to fall back to `problems`.
-    elif not len(to_return) and isinstance(problems, str):
-        filtered_problems = [p for p in problems.split(";") if p in list_of_diseases]
+    elif not len(to_return) and problems is not None:
+        filtered_problems = [p for p in problems.raw.split(";") if p in disease_matcher]
         if len(filtered_problems):
             return "; ".join(sorted(filtered_problems))
         else:
@@ -538,19 +570,19 @@ def _illness_duration_guess(background, abstract, image_caption, image_mention):
     Guess the duration of an illness. Unit: years.
 
     :param background: the background of the patient/study.
-    :type background: ``str``
+    :type background: ``_NormalizedText`` or ``None``
     :param abstract: a text abstract.
-    :type abstract: ``str``
+    :type abstract: ``_NormalizedText`` or ``None``
     :param image_caption: an element from the 'image_caption' column.
-    :type image_caption: ``str``
+    :type image_caption: ``_NormalizedText`` or ``None``
     :param image_mention: an element from the 'image_mention' column.
-    :type image_mention: ``str``
+    :type image_mention: ``_NormalizedText`` or ``None``
     :return:
     :rtype: ``float`` or ``None``
     """
     for source in (background, abstract, image_caption, image_mention):
-        if isinstance(source, str):
-            duration_guess = _illness_duration_guess_engine(source.lower())
+        if source is not None:
+            duration_guess = _illness_duration_guess_engine(source.lower)
             if isinstance(duration_guess, float):
                 return duration_guess
     else:
@@ -562,6 +594,64 @@ def _illness_duration_guess(background, abstract, image_caption, image_mention):
 # ----------------------------------------------------------------------------------------------------------
 
 
+def _term_bank(tables):
+    """
+
+    Compile term tables into a 'bank' which can be used to find all of the
+    terms in a string with a single pass over the (unique) terms.
+
+    :param tables: an iterable of tuples of the form ``(hit, terms)``, where ``hit`` is recorded if any
+                   of the strings in ``terms`` are found.
+    :type tables: ``iterable``
+    :return: a tuple of tuples of the form ``(term, hits)``, where ``hits`` is a tuple of all
+             the hits recorded when ``term`` is found.
+    :rtype: ``tuple``
+    """
+    bank = defaultdict(set)
+    for hit, terms in tables:
+        for term in terms:
+            bank[term].add(hit)
+    return tuple((term, tuple(hits)) for term, hits in sorted(bank.items()))
+
+
+def _term_bank_scan(bank, source):
+    """
+
+    :param bank: as yielded by ``_term_bank()``.
+    :type bank: ``tuple``
+    :param source: any string.
+    :type source: ``str``
+    :return: the hits for all of the terms in ``bank`` which are present in ``source``.
+    :rtype: ``set``
+    """
+    found = set()
+    for term, hits in bank:
+        if term in source:
+            found.update(hits)
+    return found
+
+
+def _im_term_tables():
+    """
+
+    :return: the modality information in ``_openi_imaging_modality_information``, in the form
+             required by ``_term_bank()``. Hits are of the form ``(kind, modality, subtype)``.
+    :rtype: ``generator``
+    """
+    for k, v in terms_dict.items():
+        yield ('modality', k, None), v[0]
+    for k, v in modality_subtypes.items():
+        for v2 in v:
+            yield ('subtype', k, cln(v2[0])), v2
+    for k, v in modality_specific_subtypes.items():
+        for i in v:
+            yield ('specific_subtype', k, cln(i[0])), i
+
+
+# Compiled once, on import. Note: terms shared by several tables are only searched for once.
+_IM_TERM_BANK = _term_bank(_im_term_tables())
+
+
 def _im_scan(source):
     """
 
@@ -570,24 +660,20 @@ def _im_scan(source):
     :param source:
     :return:
     """
+    found = _term_bank_scan(_IM_TERM_BANK, source)
+
     # 1. Look for modality matches
+    modalities_found = set(k for kind, k, subtype in found if kind == 'modality')
     matches = defaultdict(set)
-    for k, v in list(terms_dict.items()):
-        if any(i in source for i in v[0]):
-            # Add that the `k` modality was found (e.g., 'mri').
-            matches[k].add(None)
-            # Scan `source` for subtypes (taking the opportunity to
-            # look for those that may not be modality specific).
-            if k in modality_subtypes:
-                for v2 in modality_subtypes[k]:
-                    if any(j in source for j in v2):
-                        matches[k].add(cln(v2[0]))
-
-    # 2. Look for subtype matches which can be used to infer the modality itself.
-    for k, v in list(modality_specific_subtypes.items()):
-        for i in v:
-            if any(j in source for j in i):
-                matches[k].add(cln(i[0]))
+    for k in modalities_found:
+        # Add that the `k` modality was found (e.g., 'mri').
+        matches[k].add(None)
+
+    # 2. Add subtypes for the modalities found (including those that may not be modality specific),
+    #    as well as subtype matches which can be used to infer the modality itself.
+    for kind, k, subtype in found:
+        if (kind == 'subtype' and k in modalities_found) or kind == 'specific_subtype':
+            matches[k].add(subtype)
 
     if len(list(matches.keys())) != 1:
         return None
@@ -633,18 +719,18 @@ def _imaging_modality_guess(abstract, image_caption, image_mention):
     Preference: ``image_caption`` > ``image_mention`` > ``abstract``.
 
     :param abstract: a text abstract.
-    :type abstract: ``str``
+    :type abstract: ``_NormalizedText`` or ``None``
     :param image_caption: an element from the 'image_caption' column.
-    :type image_caption: ``str``
+    :type image_caption: ``_NormalizedText`` or ``None``
     :param image_mention: an element from the 'image_mention' column.
-    :type image_mention: ``str``
+    :type image_mention: ``_NormalizedText`` or ``None``
     :return: imaging modality.
     :rtype: ``str`` or ``None``
     """
     # Try to return by scanning `image_caption`, `image_mention` and `abstract`
     for source in (image_caption, image_mention, abstract):
-        if isinstance(source, str):
-            scan_rslt = _im_scan(source=cln(source).lower())
+        if source is not None:
+            scan_rslt = _im_scan(source=source.lower)
             if isinstance(scan_rslt, dict) and len(list(scan_rslt.keys())) == 1:
                 return _im_formatter(scan_rslt)
     else:
@@ -656,23 +742,24 @@ def _imaging_modality_guess(abstract, image_caption, image_mention):
 # ----------------------------------------------------------------------------------------------------------
 
 
+_PLANE_TERM_BANK = _term_bank([('axial', ['axial', 'transverse']), ('coronal', ['coronal']), ('sagittal', ['sagittal'])])
+
+
 def _image_plane_guess(image_caption):
     """
 
     Guess whether the plane of the image is 'axial', 'coronal' or 'sagittal'.
 
     :param image_caption: an element from the 'image_caption' column.
-    :type image_caption: ``str``
+    :type image_caption: ``_NormalizedText`` or ``None``
     :return: see description.
     :rtype: ``str`` or ``None``
     """
-    if not isinstance(image_caption, str):
+    if image_caption is None:
         return None
 
-    image_caption_clean = cln(image_caption).lower()
-    plane_terms = [['axial', 'transverse'], ['coronal'], ['sagittal']]
-    planes = [p[0] for p in plane_terms if any(i in image_caption_clean for i in p)]
-    return planes[0] if len(planes) == 1 else None
+    planes = _term_bank_scan(_PLANE_TERM_BANK, image_caption.lower)
+    return planes.pop() if len(planes) == 1 else None
 
 
 # ----------------------------------------------------------------------------------------------------------
@@ -920,7 +1007,7 @@ def _background_extract(d):
     return background
 
 
-def feature_extract(x, list_of_diseases, image_caption_unique):
+def feature_extract(x, disease_matcher, image_caption_unique):
     """
 
     Tool to extract text features from patient summaries.
@@ -928,7 +1015,7 @@ def feature_extract(x, list_of_diseases, image_caption_unique):
     See the description of ``OpeniInterface().pull()`` for additional information.
 
     :param x: series passed though Pandas' ``DataFrame().apply()`` method, e.g.,
-              ``df.apply(lambda x: feature_extract(x, list_of_diseases), axis=1)``.
+              ``df.apply(lambda x: feature_extract(x, disease_matcher, True), axis=1)``.
 
               .. note::
 
@@ -936,8 +1023,9 @@ def feature_extract(x, list_of_diseases, image_caption_unique):
                    and 'journal_title' columns.
 
     :type x: ``Pandas Series``
-    :param list_of_diseases: a list of diseases (e.g., via ``DiseaseOntInterface().pull()['name'].tolist()``)
-    :type list_of_diseases: ``list``
+    :param disease_matcher: an automaton which matches the names of diseases
+                            (e.g., ``AhoCorasick(DiseaseOntInterface().pull()['name'].tolist())``).
+    :type disease_matcher: ``biovida.support_tools._aho_corasick.AhoCorasick``
     :param image_caption_unique: whether or not the caption is unique with respect to the 'uid'.
     :type image_caption_unique: ``bool``
     :return: dictionary with the keys listed in the description.
@@ -951,29 +1039,34 @@ def feature_extract(x, list_of_diseases, image_caption_unique):
     d = {'parsed_abstract': _abstract_parser(abstract)}
     background = _background_extract(d)
 
+    # Normalize each source of text once, for use by all of the extractors below.
+    n_background, n_abstract, n_image_caption, n_image_mention = map(
+        _normalize, (background, abstract, image_caption, image_mention))
+
     # Extract diagnosis -- will typically only work for MedPix images
     d['diagnosis'] = d['parsed_abstract'].get('diagnosis', None) if isinstance(d['parsed_abstract'], dict) else None
 
     # Fall back
     if d['diagnosis'] is None:
-        d['diagnosis'] = _disease_guess(problems=problems, title=title, background=background,
+        d['diagnosis'] = _disease_guess(problems=_normalize(problems), title=_normalize(title),
+                                        background=n_background,
                                         # Block use of 'abstract' when the article is not clinical.
-                                        abstract=abstract if article_type in CLINICAL_ARTICLE_TYPES else None,
-                                        image_caption=image_caption if image_caption_unique else None,
-                                        image_mention=image_mention,
-                                        list_of_diseases=list_of_diseases)
+                                        abstract=n_abstract if article_type in CLINICAL_ARTICLE_TYPES else None,
+                                        image_caption=n_image_caption if image_caption_unique else None,
+                                        image_mention=n_image_mention,
+                                        disease_matcher=disease_matcher)
 
     if isinstance(d['diagnosis'], str):
         d['diagnosis'] = d['diagnosis'].lower()
 
     pairs = [('age', _patient_age_guess), ('sex', _patient_sex_guess), ('illness_duration_years', _illness_duration_guess)]
     for (k, func) in pairs:
-        d[k] = func(background, abstract, image_caption, image_mention)
+        d[k] = func(n_background, n_abstract, n_image_caption, n_image_mention)
 
-    d['imaging_modality_from_text'] = _imaging_modality_guess(abstract, image_caption, image_mention)
-    d['image_plane'] = _image_plane_guess(image_caption)
+    d['imaging_modality_from_text'] = _imaging_modality_guess(n_abstract, n_image_caption, n_image_mention)
+    d['image_plane'] = _image_plane_guess(n_image_caption)
     d['image_problems_from_text'] = _problematic_image_features(image_caption, image_caption_unique)
-    d['ethnicity'], eth_sex = _ethnicity_guess(background, abstract, image_caption, image_mention)
+    d['ethnicity'], eth_sex = _ethnicity_guess(n_background, n_abstract, n_image_caption, n_image_mention)
 
     if d['sex'] is None and eth_sex is not None:
         d['sex'] = eth_sex
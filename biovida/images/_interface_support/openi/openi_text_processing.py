@@ -9,7 +9,9 @@
 import numpy as np
 import pandas as pd
 from bs4 import BeautifulSoup
-from collections import Counter
+from contextlib import contextmanager
+from multiprocessing import Pool, cpu_count
+from collections import Counter, defaultdict
 
 # General Support tools
 from biovida.support_tools.support_tools import cln, unescape, remove_html_bullet_points
@@ -25,13 +27,19 @@ from biovida.images._interface_support.openi.openi_parameters import (openi_imag
                                                                       openi_article_type_params,
                                                                       openi_image_type_modality_full)
 
-from biovida.images._interface_support.openi._openi_image_id_processing import image_id_short_gen
+from biovida.images._interface_support.openi._openi_image_id_processing import (image_id_short_gen,
+                                                                                 image_id_short_summary_update,
+                                                                                 image_id_short_invalid_dict)
 from biovida.images._interface_support.openi._openi_text_feature_extraction import (CLINICAL_ARTICLE_TYPES,
                                                                                     feature_extract)
 
 # Other BioVida APIs
 from biovida.diagnostics.disease_ont_interface import DiseaseOntInterface
 
+# Cache Management
+from biovida.support_tools._aho_corasick import AhoCorasick, cached_aho_corasick
+from biovida.support_tools._cache_management import package_cache_creator
+
 
 # ----------------------------------------------------------------------------------------------------------
 # Abstract Cleaning
@@ -142,7 +150,11 @@ def _df_add_missing_columns(data_frame):
 # ----------------------------------------------------------------------------------------------------------
 
 
-def _apply_clinical_case_only(data_frame):
+_NO_CLINICAL_CASES_MESSAGE = ("\nNo results remained after the `clinical_cases_only=True` restriction was applied.\n"
+                              "Consider setting `pull()`'s `clinical_cases_only` parameter to `False`.")
+
+
+def _apply_clinical_case_only(data_frame, raise_if_empty=True):
     """
 
     Remove records (dataframe rows) which are not of clinical encounters.
@@ -152,6 +164,8 @@ def _apply_clinical_case_only(data_frame):
 
     :param data_frame: the ``data_frame`` as evolved in ``openi_raw_extract_and_clean()``.
     :type data_frame: ``Pandas DataFrame``
+    :param raise_if_empty: if ``True``, raise ``NoResultsFound`` if no rows remain. Defaults to ``True``.
+    :type raise_if_empty: ``bool``
     :return: see description.
     :rtype: ``Pandas DataFrame``
     """
@@ -163,9 +177,8 @@ def _apply_clinical_case_only(data_frame):
 
     data_frame = data_frame[data_frame['article_type'].map(test)].reset_index(drop=True)
 
-    if data_frame.shape[0] == 0:
-        raise NoResultsFound("\nNo results remained after the `clinical_cases_only=True` restriction was applied.\n"
-                             "Consider setting `pull()`'s `clinical_cases_only` parameter to `False`.")
+    if data_frame.shape[0] == 0 and raise_if_empty:
+        raise NoResultsFound(_NO_CLINICAL_CASES_MESSAGE)
     return data_frame
 
 
@@ -245,7 +258,7 @@ def _data_frame_fill_nan(data_frame):
     return data_frame.fillna(np.NaN)
 
 
-def _data_frame_clean(data_frame, verbose):
+def _data_frame_clean(data_frame, verbose, invalid_si_id_dict=None, image_id_short_counter=None):
     """
 
     Clean the text information.
@@ -254,6 +267,10 @@ def _data_frame_clean(data_frame, verbose):
     :type data_frame: ``Pandas DataFrame``
     :param verbose: if ``True`` print additional details.
     :type verbose: ``bool``
+    :param invalid_si_id_dict: see ``image_id_short_gen()``.
+    :type invalid_si_id_dict: ``dict`` or ``None``
+    :param image_id_short_counter: see ``image_id_short_gen()``.
+    :type image_id_short_counter: ``defaultdict`` or ``None``
     :return: cleaned ``data_frame``.
     :rtype:  ``Pandas DataFrame``
     """
@@ -273,7 +290,9 @@ def _data_frame_clean(data_frame, verbose):
         lambda x: openi_image_type_params.get(cln(x).lower(), x), na_action='ignore')
 
     # Label the number of instance of repeating 'uid's.
-    data_frame = image_id_short_gen(data_frame)
+    data_frame = image_id_short_gen(data_frame,
+                                    invalid_si_id_dict=invalid_si_id_dict,
+                                    counter=image_id_short_counter)
 
     # Replace missing Values with with NaN and Return
     return _data_frame_fill_nan(data_frame)
@@ -316,11 +335,229 @@ def _unique_image_caption_dict_gen(data_frame, verbose):
 
 
 # ----------------------------------------------------------------------------------------------------------
-# Outward Facing Tool
+# Outward Facing Tools
+# ----------------------------------------------------------------------------------------------------------
+
+
+def _openi_raw_prepare(data_frame, clinical_cases_only, raise_if_empty=True):
+    """
+
+    Perform the (row-wise) preparation of raw Open-i records which precedes feature extraction.
+
+    :param data_frame: raw records, as harvested by ``biovida.images.openi_interface._OpeniRecords()``.
+    :type data_frame: ``Pandas DataFrame``
+    :param clinical_cases_only: see ``openi_raw_extract_and_clean()``.
+    :type clinical_cases_only: ``bool``
+    :param raise_if_empty: see ``_apply_clinical_case_only()``.
+    :type raise_if_empty: ``bool``
+    :return: ``data_frame`` with snake case columns, cleaned 'article_type' and 'problems' columns
+             and hashable values.
+    :rtype: ``Pandas DataFrame``
+    """
+    data_frame.columns = list([camel_to_snake_case(x).replace("me_sh", "mesh") for x in data_frame.columns])
+    data_frame = _df_add_missing_columns(data_frame)
+
+    data_frame['article_type'] = data_frame['article_type'].map(article_type_lookup, na_action='ignore')
+    data_frame['problems'] = data_frame['problems'].map(problems_cleaner, na_action='ignore')
+
+    if clinical_cases_only:
+        data_frame = _apply_clinical_case_only(data_frame, raise_if_empty=raise_if_empty)
+
+    # Ensure the dataframe can be hashed (i.e., ensure pandas.DataFrame.drop_duplicates does not fail).
+    return _df_make_hashable(data_frame)
+
+
+# ----------------------------------------------------------------------------------------------------------
+# Parallel Feature Extraction
 # ----------------------------------------------------------------------------------------------------------
 
 
-def openi_raw_extract_and_clean(data_frame, clinical_cases_only, verbose, cache_path):
+# The columns required by ``feature_extract()``.
+_FEATURE_EXTRACT_COLUMNS = ('abstract', 'problems', 'title', 'image_caption', 'image_mention', 'article_type')
+
+# The number of records sent to a worker process at once.
+_FEATURE_EXTRACT_PARTITION_SIZE = 250
+
+# The disease matcher for the current worker process (see ``_feature_extract_worker_init()``).
+_worker_disease_matcher = None
+
+
+def _feature_extract_worker_init(disease_matcher):
+    """
+
+    Initialize a worker process in the pool yielded by ``_feature_extract_pool()``.
+
+    :param disease_matcher: an automaton which matches the names of diseases.
+    :type disease_matcher: ``biovida.support_tools._aho_corasick.AhoCorasick``
+    """
+    global _worker_disease_matcher
+    _worker_disease_matcher = disease_matcher
+
+
+def _feature_extract_partition(partition):
+    """
+
+    Run ``feature_extract()`` against a partition of records inside a worker process.
+
+    :param partition: a list of tuples of the form ``(record, image_caption_unique)``, where ``record``
+                      is a dictionary with the keys in ``_FEATURE_EXTRACT_COLUMNS``.
+    :type partition: ``list``
+    :return: a list of the dictionaries returned by ``feature_extract()``.
+    :rtype: ``list``
+    """
+    return [feature_extract(record, disease_matcher=_worker_disease_matcher, image_caption_unique=unique)
+            for record, unique in partition]
+
+
+@contextmanager
+def _feature_extract_pool(n_jobs, disease_matcher):
+    """
+
+    Create a pool of processes in which to run ``feature_extract()``.
+
+    ``disease_matcher`` is sent to each process once, when the process is started.
+    The processes are stopped when the context exits.
+
+    :param n_jobs: the number of processes to use. If `-1`, one process will be used per CPU.
+                   If `1`, no pool will be created.
+    :type n_jobs: ``int``
+    :param disease_matcher: an automaton which matches the names of diseases.
+    :type disease_matcher: ``biovida.support_tools._aho_corasick.AhoCorasick``
+    :return: a pool of processes or, if ``n_jobs`` is `1`, ``None``.
+    :rtype: ``multiprocessing.Pool`` or ``None``
+    """
+    if not isinstance(n_jobs, int) or n_jobs == 0 or n_jobs < -1:
+        raise ValueError("`n_jobs` must be -1 or an integer greater than or equal to 1.")
+    processes = cpu_count() if n_jobs == -1 else n_jobs
+    if processes == 1:
+        yield None
+        return
+
+    pool = Pool(processes=processes, initializer=_feature_extract_worker_init, initargs=(disease_matcher,))
+    try:
+        yield pool
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def _feature_extract_all(data_frame, disease_matcher, caption_unique, verbose, pool=None):
+    """
+
+    Run ``feature_extract()`` against every row in ``data_frame``.
+
+    :param data_frame: see ``_feature_extract_and_clean()``.
+    :type data_frame: ``Pandas DataFrame``
+    :param disease_matcher: see ``_feature_extract_and_clean()``.
+    :type disease_matcher: ``biovida.support_tools._aho_corasick.AhoCorasick``
+    :param caption_unique: see ``_feature_extract_and_clean()``.
+    :type caption_unique: ``func``
+    :param verbose: if ``True`` print additional details.
+    :type verbose: ``bool``
+    :param pool: as yielded by ``_feature_extract_pool()``. If ``None``, rows will be processed in
+                 the current process. Defaults to ``None``.
+    :type pool: ``multiprocessing.Pool`` or ``None``
+    :return: a list of the dictionaries returned by ``feature_extract()``, in the same order as ``data_frame``.
+    :rtype: ``list``
+    """
+    records = [dict(zip(_FEATURE_EXTRACT_COLUMNS, values))
+               for values in zip(*[data_frame[c] for c in _FEATURE_EXTRACT_COLUMNS])]
+    # Computed here s.t. the data required to determine uniqueness need not be sent to the workers.
+    uniques = [caption_unique(uid, image_caption)
+               for uid, image_caption in zip(data_frame['uid'], data_frame['image_caption'])]
+    work = list(zip(records, uniques))
+
+    if pool is None:
+        return [feature_extract(record, disease_matcher=disease_matcher, image_caption_unique=unique)
+                for record, unique in tqdm(work, desc='Processing Records', disable=not verbose)]
+
+    # Records are sent to the workers in partitions s.t. progress can be reported and the load balanced.
+    partitions = [work[i:i + _FEATURE_EXTRACT_PARTITION_SIZE]
+                  for i in range(0, len(work), _FEATURE_EXTRACT_PARTITION_SIZE)]
+
+    extract = list()
+    with tqdm(desc='Processing Records', total=len(work), disable=not verbose) as pbar:
+        # `imap()` yields the results in the order of `partitions`.
+        for partition_extract in pool.imap(_feature_extract_partition, partitions):
+            extract += partition_extract
+            pbar.update(len(partition_extract))
+    return extract
+
+
+def _feature_extract_and_clean(data_frame, disease_matcher, caption_unique, verbose,
+                               invalid_si_id_dict=None, image_id_short_counter=None, pool=None):
+    """
+
+    Run ``feature_extract()`` against every row in ``data_frame``, join the result
+    and clean the text information.
+
+    :param data_frame: as yielded by ``_openi_raw_prepare()``.
+    :type data_frame: ``Pandas DataFrame``
+    :param disease_matcher: an automaton which matches the names of diseases.
+    :type disease_matcher: ``biovida.support_tools._aho_corasick.AhoCorasick``
+    :param caption_unique: a function which accepts a 'uid' and an image caption and returns
+                           ``True`` if the caption is unique amongst the images for the 'uid'.
+    :type caption_unique: ``func``
+    :param verbose: if ``True`` print additional details.
+    :type verbose: ``bool``
+    :param invalid_si_id_dict: see ``image_id_short_gen()``.
+    :type invalid_si_id_dict: ``dict`` or ``None``
+    :param image_id_short_counter: see ``image_id_short_gen()``.
+    :type image_id_short_counter: ``defaultdict`` or ``None``
+    :param pool: see ``_feature_extract_all()``.
+    :type pool: ``multiprocessing.Pool`` or ``None``
+    :return: see description.
+    :rtype: ``Pandas DataFrame``
+    """
+    # Run Feature Extracting Tool and Join with `data_frame`.
+    extract = _feature_extract_all(data_frame,
+                                   disease_matcher=disease_matcher,
+                                   caption_unique=caption_unique,
+                                   verbose=verbose,
+                                   pool=pool)
+    extract_df = pd.DataFrame(extract, index=data_frame.index)
+
+    if not any(c in data_frame.columns for c in extract_df.columns):
+        data_frame = data_frame.join(extract_df, how='left')
+    else:
+        for c in extract_df.columns:
+            data_frame[c] = extract_df[c]
+
+    return _data_frame_clean(data_frame,
+                             verbose=verbose,
+                             invalid_si_id_dict=invalid_si_id_dict,
+                             image_id_short_counter=image_id_short_counter)
+
+
+def _disease_matcher(list_of_diseases, cache_path, verbose):
+    """
+
+    Build an automaton which matches the names of diseases.
+
+    :param list_of_diseases: a list of disease names or ``None``.
+    :type list_of_diseases: ``list`` or ``None``
+    :param cache_path: see ``openi_raw_extract_and_clean()``.
+    :type cache_path: ``str``
+    :param verbose: if ``True`` print additional details.
+    :type verbose: ``bool``
+    :return: an automaton for ``list_of_diseases`` or, if ``None``, for the names of all diseases in the
+             Disease Ontology. The latter is cached to the 'images_cache/openi/aux' directory.
+    :rtype: ``biovida.support_tools._aho_corasick.AhoCorasick``
+    """
+    if list_of_diseases is not None:
+        return AhoCorasick(list_of_diseases)
+
+    list_of_diseases = DiseaseOntInterface(cache_path=cache_path, verbose=verbose).pull()['name'].tolist()
+    _, created_image_dirs = package_cache_creator(sub_dir='images',
+                                                  cache_path=cache_path,
+                                                  to_create=['openi'],
+                                                  nest=[('openi', 'aux')],
+                                                  verbose=verbose)
+    return cached_aho_corasick(list_of_diseases, save_directory=created_image_dirs['aux'], name='disease_matcher')
+
+
+def openi_raw_extract_and_clean(data_frame, clinical_cases_only, verbose, cache_path, list_of_diseases=None,
+                                n_jobs=1):
     """
 
     Extract features from, and clean text of, ``data_frame``.
@@ -336,37 +573,114 @@ def openi_raw_extract_and_clean(data_frame, clinical_cases_only, verbose, cache_
     :param cache_path: path to the location of the BioVida cache. If a cache does not exist in this location,
                        one will created. Default to ``None``, which will generate a cache in the home folder.
     :type cache_path: ``str``
+    :param list_of_diseases: a list of disease names to search for in the text. If ``None``, the names of all
+                             diseases in the Disease Ontology will be used. Defaults to ``None``.
+    :type list_of_diseases: ``list`` or ``None``
+    :param n_jobs: the number of processes to use when extracting features. If `-1`, one process will be
+                   used per CPU. The result does not depend on ``n_jobs``. Defaults to `1`.
+    :type n_jobs: ``int``
     :return: see description.
     :rtype:  ``Pandas DataFrame``
     """
-    data_frame.columns = list([camel_to_snake_case(x).replace("me_sh", "mesh") for x in data_frame.columns])
-    data_frame = _df_add_missing_columns(data_frame)
+    data_frame = _openi_raw_prepare(data_frame, clinical_cases_only=clinical_cases_only)
 
-    data_frame['article_type'] = data_frame['article_type'].map(article_type_lookup, na_action='ignore')
-    data_frame['problems'] = data_frame['problems'].map(problems_cleaner, na_action='ignore')
+    disease_matcher = _disease_matcher(list_of_diseases, cache_path=cache_path, verbose=verbose)
+    unique_image_caption_dict = _unique_image_caption_dict_gen(data_frame=data_frame, verbose=verbose)
 
-    if clinical_cases_only:
-        data_frame = _apply_clinical_case_only(data_frame)
+    def caption_unique(uid, image_caption):
+        return unique_image_caption_dict.get(uid, {}).get(image_caption, False)
 
-    # Ensure the dataframe can be hashed (i.e., ensure pandas.DataFrame.drop_duplicates does not fail).
-    data_frame = _df_make_hashable(data_frame)
+    with _feature_extract_pool(n_jobs, disease_matcher=disease_matcher) as pool:
+        return _feature_extract_and_clean(data_frame,
+                                          disease_matcher=disease_matcher,
+                                          caption_unique=caption_unique,
+                                          verbose=verbose,
+                                          pool=pool)
 
-    list_of_diseases = DiseaseOntInterface(cache_path=cache_path, verbose=verbose).pull()['name'].tolist()
-    unique_image_caption_dict = _unique_image_caption_dict_gen(data_frame=data_frame, verbose=verbose)
 
-    def feature_extract_wrapper(row):
-        caption_unique_bool = unique_image_caption_dict.get(row['uid'], {}).get(row['image_caption'], False)
-        return feature_extract(row, list_of_diseases=list_of_diseases, image_caption_unique=caption_unique_bool)
+def _caption_counts_update(caption_counts, data_frame):
+    """
 
-    # Run Feature Extracting Tool and Join with `data_frame`.
-    extract = [feature_extract_wrapper(row) for _, row in tqdm(data_frame.iterrows(), desc='Processing Records',
-                                                               total=len(data_frame), disable=not verbose)]
-    extract_df = pd.DataFrame(extract)
+    Count the occurrences of each image caption for each 'uid' in ``data_frame``.
+
+    Captions are counted by their hash to keep ``caption_counts`` small. This mirrors
+    ``_unique_image_caption_dict_gen()``, but can be accumulated over chunks of records.
+
+    :param caption_counts: a dictionary of the form ``{'uid': Counter({hash(caption): count, ...}), ...}``.
+    :type caption_counts: ``defaultdict``
+    :param data_frame: as yielded by ``_openi_raw_prepare()``.
+    :type data_frame: ``Pandas DataFrame``
+    """
+    for uid, image_caption in zip(data_frame['uid'], data_frame['image_caption']):
+        if isinstance(uid, str) and isinstance(image_caption, str) and len(cln(image_caption)):
+            caption_counts[uid][hash(image_caption)] += 1
 
-    if not any(c in data_frame.columns for c in extract_df.columns):
-        data_frame = data_frame.join(extract_df, how='left')
-    else:
-        for c in extract_df.columns:
-            data_frame[c] = extract_df[c]
 
-    return _data_frame_clean(data_frame, verbose=verbose)
+def openi_raw_extract_and_clean_streaming(chunks, clinical_cases_only, verbose, cache_path, store,
+                                          list_of_diseases=None, n_jobs=1):
+    """
+
+    Equivalent to ``openi_raw_extract_and_clean()``, save that records are processed
+    one chunk at a time and appended to ``store``, rather than returned.
+
+    Two passes are made over ``chunks``. The first computes the (small) per-'uid' summaries
+    needed to determine if image captions and 'image_id_short' values are unique for a given 'uid'.
+    The second extracts features from, and cleans, each chunk. Thus, memory use is bounded by the size
+    of the chunks (plus the per-'uid' summaries), not by the total number of records.
+
+    :param chunks: a function which, when called, returns an iterable of dataframes of raw records (in order).
+    :type chunks: ``func``
+    :param clinical_cases_only: see ``openi_raw_extract_and_clean()``.
+    :type clinical_cases_only: ``bool``
+    :param verbose: if ``True`` print additional details.
+    :type verbose: ``bool``
+    :param cache_path: see ``openi_raw_extract_and_clean()``.
+    :type cache_path: ``str``
+    :param store: the store to append the processed chunks to.
+    :type store: ``biovida.images._interface_support.shared.DataFrameShardStore``
+    :param list_of_diseases: see ``openi_raw_extract_and_clean()``.
+    :type list_of_diseases: ``list`` or ``None``
+    :param n_jobs: see ``openi_raw_extract_and_clean()``.
+    :type n_jobs: ``int``
+    :return: the number of records appended to ``store``.
+    :rtype: ``int``
+    """
+    caption_counts = defaultdict(Counter)
+    image_id_short_summary = dict()
+
+    n_records = 0
+    for data_frame in chunks():
+        data_frame = _openi_raw_prepare(data_frame, clinical_cases_only=clinical_cases_only, raise_if_empty=False)
+        _caption_counts_update(caption_counts, data_frame=data_frame)
+        image_id_short_summary_update(image_id_short_summary, data_frame=data_frame)
+        n_records += data_frame.shape[0]
+
+    if n_records == 0:
+        raise NoResultsFound(_NO_CLINICAL_CASES_MESSAGE)
+
+    disease_matcher = _disease_matcher(list_of_diseases, cache_path=cache_path, verbose=verbose)
+    invalid_si_id_dict = image_id_short_invalid_dict(image_id_short_summary)
+    image_id_short_counter = defaultdict(int)
+
+    def caption_unique(uid, image_caption):
+        if not isinstance(uid, str) or not isinstance(image_caption, str) or uid not in caption_counts:
+            return False
+        return caption_counts[uid].get(hash(image_caption)) == 1
+
+    with _feature_extract_pool(n_jobs, disease_matcher=disease_matcher) as pool:
+        with tqdm(desc='Processing Records', total=n_records, disable=not verbose) as pbar:
+            for data_frame in chunks():
+                data_frame = _openi_raw_prepare(data_frame, clinical_cases_only=clinical_cases_only,
+                                                raise_if_empty=False)
+                if data_frame.shape[0] == 0:
+                    continue
+                store.append(_feature_extract_and_clean(data_frame,
+                                                        disease_matcher=disease_matcher,
+                                                        caption_unique=caption_unique,
+                                                        verbose=False,
+                                                        invalid_si_id_dict=invalid_si_id_dict,
+                                                        image_id_short_counter=image_id_short_counter,
+                                                        pool=pool))
+                pbar.update(data_frame.shape[0])
+
+    return n_records
@@ -7,6 +7,7 @@
 
 """
 import os
+import shutil
 import pandas as pd
 
 
@@ -23,3 +24,68 @@ def save_records_db(data_frame, path):
         raise IsADirectoryError("'{0}' is a directory.".format(path))
     save_path = "{0}.p".format(path) if not path.endswith(".p") else path
     data_frame.to_pickle(save_path)
+
+
+class DataFrameShardStore(object):
+    """
+
+    An on-disk store of dataframes, to which rows are appended in chunks ('shards').
+
+    Each shard is pickled to its own file, so appending never requires the rows
+    already in the store to be loaded into memory.
+
+    :param path: a directory in which to save the shards. If it already exists, its contents will be deleted.
+    :type path: ``str``
+    """
+
+    def __init__(self, path):
+        self.path = path
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path)
+        self._shard_paths = list()
+        self.n_rows = 0
+
+    def append(self, data_frame):
+        """
+
+        Append ``data_frame`` to the store.
+
+        :param data_frame: a dataframe.
+        :type data_frame: ``Pandas DataFrame``
+        """
+        shard_path = os.path.join(self.path, "shard_{0}.p".format(str(len(self._shard_paths)).zfill(6)))
+        data_frame.to_pickle(shard_path)
+        self._shard_paths.append(shard_path)
+        self.n_rows += data_frame.shape[0]
+
+    def __len__(self):
+        return len(self._shard_paths)
+
+    def iter_shards(self):
+        """
+
+        :return: the shards in the order they were appended.
+        :rtype: ``generator``
+        """
+        for shard_path in self._shard_paths:
+            yield pd.read_pickle(shard_path)
+
+    def to_data_frame(self):
+        """
+
+        :return: all shards in the store, concatenated into a single dataframe.
+        :rtype: ``Pandas DataFrame``
+        """
+        if not len(self._shard_paths):
+            return pd.DataFrame()
+        return pd.concat(list(self.iter_shards()), ignore_index=True)
+
+    def destroy(self):
+        """
+
+        Delete the store from disk.
+
+        """
+        shutil.rmtree(self.path, ignore_errors=True)
+        self._shard_paths = list()
+        self.n_rows = 0
@@ -0,0 +1,215 @@
+# coding: utf-8
+
+"""
+
+    Persistent Stores of Results Computed for Images
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+"""
+import os
+import pickle
+import hashlib
+from glob import glob
+
+from biovida.support_tools.support_tools import atomic_pickle_dump
+
+
+# The name of the directory (in the 'aux' directory of the BioVida images cache) for stores of results.
+RESULTS_DIRECTORY = 'image_processing_results'
+
+
+def file_digest(path, chunk_size=2 ** 20):
+    """
+
+    :param path: the path to a file.
+    :type path: ``str``
+    :param chunk_size: the number of bytes to read at once. Defaults to 1 MiB.
+    :type chunk_size: ``int``
+    :return: the SHA-1 digest of the file's contents.
+    :rtype: ``str``
+    """
+    sha1 = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            sha1.update(chunk)
+    return sha1.hexdigest()
+
+
+class ResultsStore(object):
+    """
+
+    A persistent store of results computed for images, e.g., the predictions of a model.
+
+    Results are keyed on the *contents* of each image (i.e., its SHA-1 digest) rather than its path,
+    along with any parameters which the result depends on (e.g., how the image was cropped). To avoid
+    rereading images, digests are memoized against the path, size and modification time of each image.
+
+    The store is saved to ``'{name}_{fingerprint}.p'`` in ``save_directory`` (see ``save()``). When saved,
+    stores with the same ``name``, but a different ``fingerprint``, are deleted.
+
+    :param save_directory: the directory in which to save the store.
+    :type save_directory: ``str``
+    :param name: a name for the store, e.g., 'visual_image_problems'.
+    :type name: ``str``
+    :param fingerprint: identifies everything else the results depend on, e.g., a digest of a model's weights.
+    :type fingerprint: ``str``
+    """
+
+    def __init__(self, save_directory, name, fingerprint):
+        self._setup(save_path=os.path.join(save_directory, "{0}_{1}.p".format(name, fingerprint[:16])),
+                    stale_pattern=os.path.join(save_directory, "{0}_*.p".format(name)))
+
+    def _setup(self, save_path, stale_pattern):
+        """
+
+        :param save_path: the path to save the store to.
+        :type save_path: ``str``
+        :param stale_pattern: a glob pattern matching stale stores to delete when saving. If ``None``,
+                              no stores are deleted.
+        :type stale_pattern: ``str`` or ``None``
+        """
+        self._save_path = save_path
+        self._stale_pattern = stale_pattern
+        self.results, self._digests = self._load()
+        self._changed = False
+        self.hits, self.misses = 0, 0
+
+    @classmethod
+    def from_save_path(cls, save_path):
+        """
+
+        Load a saved store without knowing its name or fingerprint.
+
+        :param save_path: the path the store was saved to.
+        :type save_path: ``str``
+        :return: the store.
+        :rtype: ``ResultsStore``
+        """
+        store = cls.__new__(cls)
+        store._setup(save_path=save_path, stale_pattern=None)
+        return store
+
+    def _load(self):
+        """
+
+        :return: the results and digests saved for ``fingerprint``, if they exist. Otherwise empty dictionaries.
+        :rtype: ``tuple``
+        """
+        if os.path.isfile(self._save_path):
+            try:
+                with open(self._save_path, "rb") as f:
+                    saved = pickle.load(f)
+                return saved['results'], saved['digests']
+            except (EOFError, KeyError, pickle.UnpicklingError):
+                pass  # start afresh.
+        return dict(), dict()
+
+    def __len__(self):
+        return len(self.results)
+
+    def __contains__(self, key):
+        return key in self.results
+
+    def __setitem__(self, key, value):
+        self.results[key] = value
+        self._changed = True
+
+    def digest(self, path):
+        """
+
+        :param path: the path to an image.
+        :type path: ``str``
+        :return: the SHA-1 digest of the image.
+        :rtype: ``str``
+        """
+        stat, path = os.stat(path), os.path.abspath(path)
+        memo = self._digests.get(path)
+        if memo is not None and memo[:2] == (stat.st_mtime, stat.st_size):
+            return memo[2]
+        digest = file_digest(path)
+        self._digests[path] = (stat.st_mtime, stat.st_size, digest)
+        self._changed = True
+        return digest
+
+    def key(self, path, *params):
+        """
+
+        :param path: the path to an image.
+        :type path: ``str``
+        :param params: any (hashable) parameters the result for the image depends on.
+        :return: a key of the form ``(digest of the image, params...)``.
+        :rtype: ``tuple``
+        """
+        return (self.digest(path),) + tuple(params)
+
+    def get(self, key):
+        """
+
+        :param key: a key, as returned by ``key()``.
+        :type key: ``tuple``
+        :return: the result stored for ``key``, if one exists. Otherwise ``None``.
+        """
+        if key in self.results:
+            self.hits += 1
+            return self.results[key]
+        self.misses += 1
+        return None
+
+    def forget(self, paths):
+        """
+
+        Remove images from the store, e.g., because they have been deleted.
+        Note: results are retained if another image in the store has the same contents.
+
+        :param paths: paths to images.
+        :type paths: ``iterable``
+        """
+        forgotten = set()
+        for path in paths:
+            memo = self._digests.pop(os.path.abspath(path), None)
+            if memo is not None:
+                forgotten.add(memo[2])
+                self._changed = True
+        forgotten -= set(memo[2] for memo in self._digests.values())
+        if len(forgotten):
+            self.results = {k: v for k, v in self.results.items() if k[0] not in forgotten}
+
+    @property
+    def info(self):
+        """
+
+        :return: the number of hits and misses (since the store was loaded) and the number of results in the store.
+        :rtype: ``dict``
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self.results)}
+
+    def save(self):
+        """
+
+        Save the store to ``save_directory`` (if it has changed since it was loaded).
+
+        """
+        if not self._changed:
+            return None
+
+        atomic_pickle_dump({'results': self.results, 'digests': self._digests},
+                           save_path=self._save_path,
+                           stale_pattern=self._stale_pattern)
+        self._changed = False
+
+
+def forget_images(save_directory, paths):
+    """
+
+    Remove images from all of the stores saved in ``save_directory`` (see ``ResultsStore().forget()``).
+
+    :param save_directory: a directory in which stores have been saved.
+    :type save_directory: ``str``
+    :param paths: paths to images.
+    :type paths: ``iterable``
+    """
+    paths = list(paths)
+    for save_path in glob(os.path.join(save_directory, "*.p")):
+        store = ResultsStore.from_save_path(save_path)
+        store.forget(paths)
+        store.save()
@@ -19,6 +19,8 @@ from biovida.diagnostics.disease_symptoms_interface import DiseaseSymptomsInterf
 
 # Support Tools
 from biovida.support_tools.support_tools import tqdm, is_int, items_null
+from biovida.support_tools._cache_management import package_cache_creator
+from biovida.support_tools._fuzzy_matching import FuzzyMatcher
 
 # Image Tools
 from biovida.images._image_tools import try_fuzzywuzzy_import
@@ -27,6 +29,35 @@ from biovida.images._image_tools import try_fuzzywuzzy_import
 from biovida.images._interface_support.openi.openi_support_tools import possible_openi_image_processing_cols
 
 
+# ----------------------------------------------------------------------------------------------------------
+# Fuzzy Matching
+# ----------------------------------------------------------------------------------------------------------
+
+
+def _fuzzy_matcher(choices, cache_path, name, verbose):
+    """
+
+    Create a ``FuzzyMatcher`` for ``choices`` whose memo of matches is stored in the BioVida cache.
+
+    :param choices: the strings to match against, e.g., the names of diseases in the Disease Ontology.
+    :type choices: ``iterable``
+    :param cache_path: location of the BioVida cache. If ``None``, the cache in the home folder will be used.
+    :type cache_path: ``str`` or ``None``
+    :param name: a name for the memo, e.g., 'disease_ontology_names'.
+    :type name: ``str``
+    :param verbose: If ``True``, print notice when creating cache directories.
+    :type verbose: ``bool``
+    :return: a ``FuzzyMatcher`` for ``choices``.
+    :rtype: ``FuzzyMatcher``
+    """
+    process = try_fuzzywuzzy_import()
+    _, created_image_dirs = package_cache_creator(sub_dir='images',
+                                                  to_create=['unification'],
+                                                  cache_path=cache_path,
+                                                  verbose=verbose)
+    return FuzzyMatcher(choices, process=process, save_directory=created_image_dirs['unification'], name=name)
+
+
 # ----------------------------------------------------------------------------------------------------------
 # Interface Integration
 # ----------------------------------------------------------------------------------------------------------
@@ -304,6 +335,7 @@ class _DiseaseOntologyIntegration(object):
 
     def __init__(self, cache_path=None, verbose=True):
         self.verbose = verbose
+        self._cache_path = cache_path
         # Load the database
         ontology_df = DiseaseOntInterface(cache_path=cache_path, verbose=verbose).pull()
 
@@ -318,6 +350,25 @@ class _DiseaseOntologyIntegration(object):
         self.ont_name_dict_keys = tuple(self.ont_name_dict.keys())
         self.ont_disease_synonym_dict_keys = tuple(self.ont_disease_synonym_dict.keys())
 
+        # Fuzzy matchers for the keys of the two dictionaries (created only when needed).
+        self._name_fuzzy_matcher = None
+        self._disease_synonym_fuzzy_matcher = None
+
+    def _fuzzy_matchers(self):
+        """
+
+        :return: fuzzy matchers for ``ont_name_dict_keys`` and ``ont_disease_synonym_dict_keys``.
+        :rtype: ``tuple``
+        """
+        if self._name_fuzzy_matcher is None:
+            self._name_fuzzy_matcher = _fuzzy_matcher(self.ont_name_dict_keys, cache_path=self._cache_path,
+                                                      name='disease_ontology_names', verbose=self.verbose)
+            self._disease_synonym_fuzzy_matcher = _fuzzy_matcher(self.ont_disease_synonym_dict_keys,
+                                                                 cache_path=self._cache_path,
+                                                                 name='disease_ontology_synonyms',
+                                                                 verbose=self.verbose)
+        return self._name_fuzzy_matcher, self._disease_synonym_fuzzy_matcher
+
     def _disease_synonym_match(self, disease_synonym):
         """
 
@@ -382,26 +433,24 @@ class _DiseaseOntologyIntegration(object):
         :return: disease information dictionary.
         :rtype: ``dict``
         """
-        # ToDo: add memorizing of fuzzy matches
         # Try matching the string raw (i.e., 'as is').
         raw_rslt = self._find_disease_info_raw(disease)
         if isinstance(raw_rslt, dict):
             return raw_rslt
 
-        if is_int(fuzzy_threshold):
-            process = try_fuzzywuzzy_import()
-
-        # Eject if fuzzy matching is disabled
-        if not is_int(fuzzy_threshold):
+        # Eject if fuzzy matching is disabled (or `disease` is not a string)
+        if not is_int(fuzzy_threshold) or not isinstance(disease, str):
             return self.empty_nest_dict
 
+        name_fuzzy_matcher, disease_synonym_fuzzy_matcher = self._fuzzy_matchers()
+
         # Try using `ont_name_dict`
-        name_fuzzy_match, threshold = process.extractOne(disease, self.ont_name_dict_keys)
+        name_fuzzy_match, threshold = name_fuzzy_matcher.extract_one(disease)
         if threshold >= fuzzy_threshold:
             return self.ont_name_dict[name_fuzzy_match]
 
         # Try using `ont_disease_synonym_dict`
-        disease_synonym_fuzzy_match, threshold = process.extractOne(disease, self.ont_disease_synonym_dict_keys)
+        disease_synonym_fuzzy_match, threshold = disease_synonym_fuzzy_matcher.extract_one(disease)
         if threshold >= fuzzy_threshold:
             return self._disease_synonym_match(disease_synonym_fuzzy_match)
         else:
@@ -427,6 +476,11 @@ class _DiseaseOntologyIntegration(object):
         disease_ontology_data = [self._find_disease_info(i, fuzzy_threshold)
                                  for i in tqdm(data_frame['disease'], desc='Disease Data', disable=not self.verbose)]
 
+        # Save the fuzzy matches s.t. they can be reused.
+        if self._name_fuzzy_matcher is not None:
+            for matcher in self._fuzzy_matchers():
+                matcher.save()
+
         # Convert `disease_ontology_data` to a dataframe
         disease_ontology_addition = pd.DataFrame(disease_ontology_data)
 
@@ -442,7 +496,7 @@ class _DiseaseOntologyIntegration(object):
 # ----------------------------------------------------------------------------------------------------------
 
 
-def _disease_synonym_match_battery(disease, disease_synonyms, resource_dict, fuzzy_threshold):
+def _disease_synonym_match_battery(disease, disease_synonyms, resource_dict, fuzzy_threshold, fuzzy_matcher=None):
     """
 
     Try to match ``disease`` and ``disease_synonyms`` in ``resource_dict``
@@ -456,16 +510,12 @@ def _disease_synonym_match_battery(disease, disease_synonyms, resource_dict, fuz
     :type resource_dict: ``dict``
     :param fuzzy_threshold: an integer on ``(0, 100]``.
     :type fuzzy_threshold: ``int``, `bool`, ``None``
+    :param fuzzy_matcher: a fuzzy matcher for the keys of ``resource_dict``. If ``None`` and ``fuzzy_threshold``
+                          is an integer, one will be created (without persisting its matches). Defaults to ``None``.
+    :type fuzzy_matcher: ``FuzzyMatcher`` or ``None``
     :return: the nested dictionary for a given key.
     :rtype: ``dict`` or ``None``
     """
-    # Extract the keys
-    lookup_dict_keys = tuple(resource_dict.keys())
-
-    # Import process
-    if is_int(fuzzy_threshold):
-        process = try_fuzzywuzzy_import()
-
     # Try disease 'as is'
     if disease in resource_dict:
         return resource_dict[disease]
@@ -480,24 +530,29 @@ def _disease_synonym_match_battery(disease, disease_synonyms, resource_dict, fuz
     if not is_int(fuzzy_threshold):
         return np.NaN
 
+    if fuzzy_matcher is None:
+        fuzzy_matcher = FuzzyMatcher(resource_dict.keys(), process=try_fuzzywuzzy_import())
+
     # Try Fuzzy matching on `disease`
-    disease_fuzzy_match, threshold = process.extractOne(disease, lookup_dict_keys)
-    if threshold >= fuzzy_threshold:
-        return resource_dict[disease_fuzzy_match]
+    if isinstance(disease, str):
+        disease_fuzzy_match, threshold = fuzzy_matcher.extract_one(disease)
+        if threshold >= fuzzy_threshold:
+            return resource_dict[disease_fuzzy_match]
 
     # Try Fuzzy matching on `disease_synonyms`
     if not isinstance(disease_synonyms, tuple):
         return np.NaN
     else:
         for s in disease_synonyms:
-            disease_synonym_fuzzy_match, threshold = process.extractOne(s, lookup_dict_keys)
+            disease_synonym_fuzzy_match, threshold = fuzzy_matcher.extract_one(s)
             if threshold >= fuzzy_threshold:
                 return resource_dict[disease_synonym_fuzzy_match]
         else:
             return np.NaN  # capitulate
 
 
-def _resource_integration(data_frame, resource_dict, fuzzy_threshold, new_column_name, verbose, desc):
+def _resource_integration(data_frame, resource_dict, fuzzy_threshold, new_column_name, verbose, desc,
+                          cache_path=None):
     """
 
     Integrates information in ``resource_dict`` into ``data_frame`` as new column (``new_column_name``).
@@ -514,6 +569,8 @@ def _resource_integration(data_frame, resource_dict, fuzzy_threshold, new_column
     :type verbose: ``bool``
     :param desc: description to pass to ``tqdm``.
     :type desc: ``str`` or ``None``
+    :param cache_path: location of the BioVida cache, in which fuzzy matches are saved. Defaults to ``None``.
+    :type cache_path: ``str`` or ``None``
     :return: ``data_frame`` with information extracted from ``resource_dict``
     :rtype: ``Pandas DataFrame``
     """
@@ -528,15 +585,27 @@ def _resource_integration(data_frame, resource_dict, fuzzy_threshold, new_column
     elif 'disease_synonym' not in data_frame.columns:
         raise AttributeError(missing_column_error_message.format('disease_synonym'))
 
+    # Create a single fuzzy matcher for `resource_dict` (rather than one per row).
+    if is_int(fuzzy_threshold):
+        fuzzy_matcher = _fuzzy_matcher(resource_dict.keys(), cache_path=cache_path,
+                                       name=new_column_name, verbose=verbose)
+    else:
+        fuzzy_matcher = None
+
     # Map gene-disease information onto the dataframe
     matches = list()
     for _, row in tqdm(data_frame.iterrows(), total=len(data_frame), desc=desc, disable=not verbose):
         match = _disease_synonym_match_battery(disease=row['disease'],
                                                disease_synonyms=row['disease_synonym'],
                                                resource_dict=resource_dict,
-                                               fuzzy_threshold=fuzzy_threshold)
+                                               fuzzy_threshold=fuzzy_threshold,
+                                               fuzzy_matcher=fuzzy_matcher)
         matches.append(match)
 
+    # Save the fuzzy matches s.t. they can be reused.
+    if fuzzy_matcher is not None:
+        fuzzy_matcher.save()
+
     # Add the `rslt` series to `data_frame`
     data_frame[new_column_name] = matches
 
@@ -578,6 +647,7 @@ class _DiseaseSymptomsIntegration(object):
 
     def __init__(self, cache_path=None, verbose=True):
         self.verbose = verbose
+        self._cache_path = cache_path
         # Load the Disease Symptoms database
         dis_symp_db = DiseaseSymptomsInterface(cache_path=cache_path, verbose=verbose).pull()
 
@@ -627,7 +697,8 @@ class _DiseaseSymptomsIntegration(object):
                                                    fuzzy_threshold=fuzzy_threshold,
                                                    new_column_name='known_associated_symptoms',
                                                    verbose=self.verbose,
-                                                   desc='Symptoms')
+                                                   desc='Symptoms',
+                                                   cache_path=self._cache_path)
 
         # Find 'known_associated_symptoms' which individual patients presented with by scanning the abstract
         updated_data_frame['mentioned_symptoms'] = self._mentioned_symptoms(updated_data_frame)
@@ -674,6 +745,7 @@ class _DisgenetIntegration(object):
 
     def __init__(self, cache_path=None, verbose=True):
         self.verbose = verbose
+        self._cache_path = cache_path
         # Load the database
         disgenet_df = DisgenetInterface(cache_path=cache_path, verbose=verbose).pull('all')
 
@@ -697,7 +769,8 @@ class _DisgenetIntegration(object):
                                      fuzzy_threshold=fuzzy_threshold,
                                      new_column_name='known_associated_genes',
                                      verbose=self.verbose,
-                                     desc='Genomic')
+                                     desc='Genomic',
+                                     cache_path=self._cache_path)
 
 
 # ----------------------------------------------------------------------------------------------------------
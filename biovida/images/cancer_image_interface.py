@@ -8,23 +8,33 @@
 """
 import io
 import os
+import re
 import pickle
 import shutil
+import socket
 import zipfile
-import requests
+import tempfile
 import numpy as np
 import pandas as pd
 from PIL import Image
-from time import sleep
+from time import sleep, time
+from threading import Lock
 from copy import deepcopy
 from warnings import warn
 from datetime import datetime
 from math import log10, floor
+from contextlib import contextmanager
+from multiprocessing import Pool, cpu_count
+from requests.exceptions import RequestException
 
 from biovida import __version_numeric__
 
 # General Image Support Tools
-from biovida.images._image_tools import NoResultsFound
+from biovida.images._image_tools import (NoResultsFound,
+                                         RateLimiter,
+                                         PerHostLimiter,
+                                         ordered_thread_map,
+                                         bounded_thread_imap)
 
 # Database Management
 from biovida.images.image_cache_mgmt import (_records_db_merge,
@@ -42,6 +52,7 @@ from biovida.support_tools.support_tools import (cln,
                                                  camel_to_snake_case,
                                                  data_frame_col_drop,
                                                  list_to_bulletpoints,
+                                                 atomic_pickle_dump,
                                                  IN_NOTEBOOK)
 
 # Import Printing Tools
@@ -49,12 +60,16 @@ from biovida.support_tools.printing import pandas_pprint
 
 # Cache Management
 from biovida.support_tools._cache_management import package_cache_creator
+from biovida.support_tools.http_session import http_get, http_download
 
 # Interface Support tools
 from biovida.images._interface_support.shared import save_records_db
 from biovida.images._interface_support.dicom_data_to_dict import dicom_to_dict
 from biovida.images._interface_support.cancer_image.cancer_image_parameters import CancerImageArchiveParams
 from biovida.images._interface_support.cancer_image.cancer_image_support_tools import nonessential_cancer_image_columns
+from biovida.images._interface_support.cancer_image.cancer_image_cache_index import (SeriesCacheIndex,
+                                                                                     png_series_abbrev,
+                                                                                     dicom_series_abbrev)
 
 
 # ----------------------------------------------------------------------------------------------------------
@@ -98,7 +113,7 @@ class _CancerImageArchiveOverview(object):
         :rtype: ``Pandas DataFrame``
         """
         # Extract the main summary table from the home page
-        summary_df = pd.read_html(str(requests.get(self._tcia_homepage).text), header=0)[0]
+        summary_df = pd.read_html(str(http_get(self._tcia_homepage).text), header=0)[0]
 
         # Convert column names from camelCase to snake_cake
         summary_df.columns = list(map(camel_to_snake_case, summary_df.columns))
@@ -215,9 +230,12 @@ class _CancerImageArchiveRecords(object):
     :type tcia_overview_df: ``Pandas DataFrames``
     :param root_url: the root URL for the Cancer Imaging Archive's API.
     :type root_url: ``str``
+    :param cache_directory: a directory in which to cache the records of each collection (see ``records_pull()``).
+                            If ``None``, records will not be cached. Defaults to ``None``.
+    :type cache_directory: ``str`` or ``None``
     """
 
-    def __init__(self, api_key, dicom_modality_abbrevs, tcia_overview_df, root_url):
+    def __init__(self, api_key, dicom_modality_abbrevs, tcia_overview_df, root_url, cache_directory=None):
         self.ROOT_URL = root_url
         self.records_df = None
         self.dicom_modality_abbrevs = dicom_modality_abbrevs
@@ -225,20 +243,26 @@ class _CancerImageArchiveRecords(object):
         self.API_KEY = api_key
         self._url_sep = '+'
 
-    def _study_extract(self, study):
+        self._cache_directory = cache_directory
+        if cache_directory is not None and not os.path.isdir(cache_directory):
+            os.makedirs(cache_directory)
+
+    def _study_extract(self, study, url_sep='+'):
         """
 
         Download all patients in a given study.
 
         :param study: a Cancer Imaging Archive collection (study)
         :type study: ``str``
+        :param url_sep: the replacement for spaces in ``study``. Defaults to '+'.
+        :type url_sep: ``str``
         :return: the yield of passing the ``getPatientStudy`` parameter to the Cancer Imaging Archive API for a given
                  collection (study).
         :rtype: ``Pandas DataFrame``
         """
         url = '{0}/query/getPatientStudy?Collection={1}&format=csv&api_key={2}'.format(
-            self.ROOT_URL, cln(study).replace(' ', self._url_sep), self.API_KEY)
-        data_frame = pd.DataFrame.from_csv(url).reset_index()
+            self.ROOT_URL, cln(study).replace(' ', url_sep), self.API_KEY)
+        data_frame = pd.DataFrame.from_csv(io.StringIO(http_get(url).text)).reset_index()
 
         # Convert column names from camelCase to snake_cake
         data_frame.columns = list(map(camel_to_snake_case, data_frame.columns))
@@ -260,9 +284,8 @@ class _CancerImageArchiveRecords(object):
         """
         study_df = self._study_extract(study)
         if study_df.shape[0] == 0:
-            self._url_sep = '-'
-            study_df = self._study_extract(study)
-            self._url_sep = '+'  # reset
+            # Note: `url_sep` is passed (rather than changing `self._url_sep`) s.t. collections can be pulled at once.
+            study_df = self._study_extract(study, url_sep='-')
             if study_df.shape[0] == 0:
                 raise IndexError("The '{0}' collection/study data has no length.\n"
                                  "This is likely the result of a problem with the "
@@ -321,31 +344,53 @@ class _CancerImageArchiveRecords(object):
 
         return patient_dict
 
-    def _patient_image_summary(self, patient, study, patient_dict):
+    def _patient_series(self, patient, study):
         """
 
-        Harvests the Cancer Image Archive's Text Record of all baseline images for a given patient
-        in a given study.
+        Harvests the Cancer Image Archive's Text Record of all series for a given patient in a given study.
 
         :param patient: the patient_id (will be used to form the request to the TCIA server).
         :type patient: ``str``
         :param study: a Cancer Imaging Archive collection (study).
         :type study: ``str``
-        :param patient_dict: a value in ``study_dict`` (which is a dictionary itself).
-        :type patient_dict: ``dict``
         :return: the yield of the TCIA ``getSeries`` param for a given patient in a given collection (study).
-                 Their sex, age, the session number (e.g., baseline = 1, baseline + 1 month = 2, etc.) and the
-                 'study_date' (i.e., the date the study was conducted).
         :rtype: ``Pandas DataFrame``
         """
         # Select an individual Patient
         url = '{0}/query/getSeries?Collection={1}&PatientID={2}&format=csv&api_key={3}'.format(
             self.ROOT_URL, cln(study).replace(' ', self._url_sep), patient, self.API_KEY)
-        patient_df = pd.DataFrame.from_csv(url).reset_index()
+        patient_df = pd.DataFrame.from_csv(io.StringIO(http_get(url).text)).reset_index()
 
         # Convert column names from camelCase to snake_cake
         patient_df.columns = list(map(camel_to_snake_case, patient_df.columns))
 
+        return patient_df
+
+    def _patient_image_summary(self, patient, study, patient_dict, patient_series=None):
+        """
+
+        Harvests the Cancer Image Archive's Text Record of all baseline images for a given patient
+        in a given study.
+
+        :param patient: the patient_id (will be used to form the request to the TCIA server).
+        :type patient: ``str``
+        :param study: a Cancer Imaging Archive collection (study).
+        :type study: ``str``
+        :param patient_dict: a value in ``study_dict`` (which is a dictionary itself).
+        :type patient_dict: ``dict``
+        :param patient_series: the yield of ``_patient_series()`` for ``patient``. If ``None``, it will be
+                               requested from the TCIA server. Defaults to ``None``.
+        :type patient_series: ``Pandas DataFrame`` or ``None``
+        :return: the yield of the TCIA ``getSeries`` param for a given patient in a given collection (study).
+                 Their sex, age, the session number (e.g., baseline = 1, baseline + 1 month = 2, etc.) and the
+                 'study_date' (i.e., the date the study was conducted).
+        :rtype: ``Pandas DataFrame``
+        """
+        if patient_series is None:
+            patient_df = self._patient_series(patient, study=study)
+        else:
+            patient_df = patient_series.copy(deep=True)
+
         # Add sex, age, session, study_date and patient id
         patient_info = patient_df['study_instance_uid'].map(
             lambda x: {k: patient_dict[x][k] for k in ('sex', 'age', 'session', 'study_date')})
@@ -437,11 +482,57 @@ class _CancerImageArchiveRecords(object):
 
         return condition_name.lower() if isinstance(condition_name, str) else condition_name
 
-    def records_pull(self, study, search_dict, pull_time, patient_limit, verbose):
+    def _series_cache_path(self, study):
+        """
+
+        :param study: a Cancer Imaging Archive collection (study).
+        :type study: ``str``
+        :return: the path to the file in which the series records for ``study`` are cached.
+        :rtype: ``str``
+        """
+        return os.path.join(self._cache_directory, "{0}.p".format(re.sub(r'[^\w\-]', '_', cln(study))))
+
+    def _load_series_cache(self, study):
+        """
+
+        :param study: a Cancer Imaging Archive collection (study).
+        :type study: ``str``
+        :return: a dictionary of the form ``{patient_id: (study_instance_uids, yield of _patient_series()), ...}``
+                 for the patients in ``study`` whose records have been cached.
+        :rtype: ``dict``
+        """
+        if self._cache_directory is None or not os.path.isfile(self._series_cache_path(study)):
+            return dict()
+        try:
+            with open(self._series_cache_path(study), "rb") as f:
+                saved = pickle.load(f)
+        except (EOFError, pickle.UnpicklingError):
+            return dict()
+        return saved['patients'] if saved.get('collection') == study else dict()
+
+    def _save_series_cache(self, study, series_cache):
+        """
+
+        :param study: a Cancer Imaging Archive collection (study).
+        :type study: ``str``
+        :param series_cache: see ``_load_series_cache()``.
+        :type series_cache: ``dict``
+        """
+        if self._cache_directory is None:
+            return None
+        atomic_pickle_dump({'collection': study, 'patients': series_cache}, self._series_cache_path(study))
+
+    def records_pull(self, study, search_dict, pull_time, patient_limit, verbose, max_workers=1,
+                     rate_limiter=None, host_limiter=None):
         """
 
         Extract record of all images for all patients in a given study.
 
+        The series records for each patient are requested by a pool of ``max_workers`` threads and (if
+        ``cache_directory`` is not ``None``) cached on disk. The cached records for a patient are reused
+        provided the patient's studies (as given by the Cancer Imaging Archive's ``getPatientStudy`` parameter,
+        which is requested anew each time) have not changed.
+
         :param study: a Cancer Imaging Archive collection (study).
         :type study: ``str``
         :param search_dict: a dictionary which contains the search information provided by the user
@@ -455,10 +546,29 @@ class _CancerImageArchiveRecords(object):
         :type patient_limit: ``int`` or ``None``
         :param verbose: if ``True`` print additional information. Defaults to ``False``.
         :type verbose: ``bool``
+        :param max_workers: the max. number of patients whose records can be requested at any one time.
+                            Defaults to `1`.
+        :type max_workers: ``int``
+        :param rate_limiter: an instance of ``RateLimiter`` which all requests will share. Defaults to ``None``.
+        :type rate_limiter: ``RateLimiter`` or ``None``
+        :param host_limiter: an instance of ``PerHostLimiter`` which all requests will share. Defaults to ``None``.
+        :type host_limiter: ``PerHostLimiter`` or ``None``
         :return: a dataframe of all baseline images
         :rtype: ``Pandas DataFrame``
         """
-        study_dict = self._summarize_study_by_patient(study)
+        def limited(func, *args, **kwargs):
+            """Send a request subject to `host_limiter` and `rate_limiter` (waiting for a token once a slot is held)."""
+            def send():
+                if rate_limiter is not None:
+                    rate_limiter.wait()
+                return func(*args, **kwargs)
+
+            if host_limiter is None:
+                return send()
+            with host_limiter.hold(self.ROOT_URL):
+                return send()
+
+        study_dict = limited(self._summarize_study_by_patient, study)
 
         # Check for invalid `patient_limit` values:
         if not isinstance(patient_limit, int) and patient_limit is not None:
@@ -470,10 +580,31 @@ class _CancerImageArchiveRecords(object):
         s_patients = sorted(study_dict.keys())
         patients_to_obtain = s_patients[:patient_limit] if isinstance(patient_limit, int) else s_patients
 
+        # Request the records of patients which are not in the cache (or whose studies have changed).
+        series_cache = self._load_series_cache(study)
+        patients_to_request = [p for p in patients_to_obtain
+                               if p not in series_cache or series_cache[p][0] != frozenset(study_dict[p])]
+
+        def cache_patient_series(position, patient_series):
+            patient = patients_to_request[position]
+            series_cache[patient] = (frozenset(study_dict[patient]), patient_series)
+
+        try:
+            ordered_thread_map(func=lambda patient: limited(self._patient_series, patient, study=study),
+                               iterable=patients_to_request,
+                               max_workers=max_workers,
+                               callback=cache_patient_series,
+                               desc="'{0}' Records".format(study),
+                               verbose=verbose)
+        finally:
+            # Save the records obtained, even if a request failed, s.t. they are not requested again.
+            if len(patients_to_request):
+                self._save_series_cache(study, series_cache=series_cache)
+
         # Evolve a dataframe ('frame') for the baseline images of all patients
-        frames = list()
-        for patient in tqdm(patients_to_obtain, desc="'{0}' Records".format(study), disable=not verbose):
-            frames.append(self._patient_image_summary(patient, study=study, patient_dict=study_dict[patient]))
+        frames = [self._patient_image_summary(patient, study=study, patient_dict=study_dict[patient],
+                                              patient_series=series_cache[patient][1])
+                  for patient in patients_to_obtain]
 
         # Concatenate baselines frame for each patient
         patient_study_df = pd.concat(frames, ignore_index=True)
@@ -496,6 +627,228 @@ class _CancerImageArchiveRecords(object):
 # ----------------------------------------------------------------------------------------------------------
 
 
+def _extract_instance_number(f):
+    """
+
+    Extract the instance number from a DICOM file.
+
+    :param f: a DICOM file
+    :param f: ``pydicom object``
+    :return: instance number
+    :rtype: ``str``
+    """
+    try:
+        instance_number = f.InstanceNumber
+    except:
+        return 'NA'
+
+    cleaned_instance_number = cln(str(instance_number))
+    if len(cleaned_instance_number) and cleaned_instance_number.isdigit():
+        return cleaned_instance_number
+    else:
+        return 'NA'
+
+
+def _dicom_to_standard_image(f, pull_position, series_uid, conversion, new_file_name, save_location):
+    """
+
+    This function handles the act of saving dicom images as in a more common file format (e.g., .png).
+    An image (``f``) can be either 2 or 3 Dimensional.
+
+    Notes:
+
+    - 3D images will be saved as individual frames
+
+    - if pydicom cannot render the DICOM as a pixel array, this function will its halt image extraction efforts.
+
+    :param f: a (py)dicom image.
+    :type f: ``pydicom object``
+    :param pull_position: the position of the file in the list of files pulled from the database.
+    :type pull_position: ``int``
+    :param series_uid: the 'series_instance_uid' needed to use TCIA's ``getImage`` parameter
+    :type series_uid: ``str``
+    :param conversion: the color scale conversion to use, e.g., 'LA' or 'RGB'.
+    :type conversion: ``str``
+    :param new_file_name: see ``_read_dicom``'s ``save_name`` parameter.
+    :type new_file_name: ``str``
+    :param save_location: the directory to save the images to.
+    :type save_location: ``str``
+    :return: tuple of the form: ``(a list of paths to saved images, boolean denoting success)``
+    :rtype: ``tuple``
+    """
+    # Note: f.PatientsWeight will extract weight from the dicom.
+
+    # Define a list to populate with a record of all images saved
+    all_save_paths = list()
+
+    # Extract a pixel array from the dicom file.
+    try:
+        pixel_arr = f.pixel_array
+    except (UnboundLocalError, TypeError):
+        return [], False
+
+    def save_path(instance):
+        """Define the path to save the image to."""
+        head = "{0}_{1}".format(instance, pull_position)
+        file_name = "{0}__{1}__default.{2}".format(
+            head, os.path.basename(new_file_name), "png")
+        return os.path.join(save_location, file_name)
+
+    if pixel_arr.ndim == 2:
+        # Define save name by combining the images instance in the set.
+        path = save_path(_extract_instance_number(f))
+        Image.fromarray(pixel_arr).convert(conversion).save(path)
+        all_save_paths.append(path)
+    # If ``f`` is a 3D image (e.g., segmentation dicom files), save each layer as a separate file/image.
+    elif pixel_arr.ndim == 3:
+        for instance, layer in enumerate(list(range(pixel_arr.shape[0])), start=1):
+            path = save_path(instance)
+            Image.fromarray(pixel_arr[layer:layer + 1][0]).convert(conversion).save(path)
+            all_save_paths.append(path)
+    else:
+        warn("\nProblem converting an image for\nthe following series_instance_uid:\n\n{0}\n\nCannot "
+             "stabilize {1} dimensional arrays.\nImages must be 2D or 3D.".format(series_uid, pixel_arr.ndim))
+        return [], False
+
+    return all_save_paths, True
+
+
+def _read_dicom(path_to_dicom_file, pull_position, series_uid, save_name, save_location, convert, color=False):
+    """
+
+    Read a dicom file (once) and extract everything needed from it: its instance number, its metadata
+    and, if ``convert`` is ``True``, its pixel data (which is saved in a more common file format).
+    Note: this function is defined at the top level s.t. it can be run in a ``multiprocessing.Pool``.
+
+    :param path_to_dicom_file: path to a dicom image
+    :type path_to_dicom_file: ``str``
+    :param pull_position: the position of the image in the raw zip data provided by the Cancer Imaging Archive API.
+    :type pull_position: ``int``
+    :param series_uid: the 'series_instance_uid' needed to use TCIA's ``getImage`` parameter
+    :type series_uid: ``str``
+    :param save_name: name of the new file (do *NOT* include a file extension).
+                      If ``None``, name from ``path_to_dicom_file`` will be conserved.
+    :type save_name: ``str``
+    :param save_location: the directory to save the images to.
+    :type save_location: ``str``
+    :param convert: if ``True``, save the image in ``save_location`` (see ``_dicom_to_standard_image()``).
+                    If ``False``, the pixel data is not read.
+    :type convert: ``bool``
+    :param color: If ``True``, convert the image to RGB before saving. If ``False``, save as a grayscale image.
+                  Defaults to ``False``
+    :type color: ``bool``
+    :return: tuple of the form: ``(instance number, metadata, a list of paths to saved images, boolean denoting
+             success)``. If ``convert`` is ``False``, the last two elements will be ``[]`` and ``None``.
+    :rtype: ``tuple``
+    """
+    # Load the DICOM file into RAM
+    f = dicom.read_file(path_to_dicom_file, stop_before_pixels=not convert)
+    instance_number, metadata = _extract_instance_number(f), dicom_to_dict(dicom_file=f)
+    if not convert:
+        return instance_number, metadata, [], None
+
+    # Conversion (needed so the resultant image is not pure black)
+    conversion = 'RGB' if color else 'LA'  # note: 'LA' = grayscale.
+
+    if isinstance(save_name, str):
+        new_file_name = save_name
+    else:
+        # Remove the file extension and then extract the base name from the path.
+        new_file_name = os.path.basename(os.path.splitext(path_to_dicom_file)[0])
+
+    # Convert the image into a PIL object and save to disk.
+    all_save_paths, success = _dicom_to_standard_image(f=f, pull_position=pull_position, series_uid=series_uid,
+                                                       conversion=conversion, new_file_name=new_file_name,
+                                                       save_location=save_location)
+    return instance_number, metadata, all_save_paths, success
+
+
+@contextmanager
+def _dicom_conversion_pool(n_jobs):
+    """
+
+    Create a pool of processes in which to run ``_read_dicom()``.
+    The processes are stopped when the context exits.
+
+    :param n_jobs: the number of processes to use. If `-1`, one process will be used per CPU.
+                   If `1`, no pool will be created.
+    :type n_jobs: ``int``
+    :return: a pool of processes or, if ``n_jobs`` is `1`, ``None``.
+    :rtype: ``multiprocessing.Pool`` or ``None``
+    """
+    if isinstance(n_jobs, bool) or not isinstance(n_jobs, int) or n_jobs == 0 or n_jobs < -1:
+        raise ValueError("`n_jobs` must be -1 or an integer greater than or equal to 1.")
+    processes = cpu_count() if n_jobs == -1 else n_jobs
+    if processes == 1:
+        yield None
+        return
+
+    pool = Pool(processes=processes)
+    try:
+        yield pool
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+# Temporary directories for DICOMs are named '__temp_dicom__[pid]@[host]__...', identifying the process
+# which created them. Those older than this (in seconds) are deemed latent regardless of their owner.
+_TEMP_DICOM_PREFIX = '__temp_dicom__'
+_LATENT_TEMP_DICOM_AGE = 24 * 60 * 60
+
+
+def _temp_dicom_dir_prefix():
+    """
+
+    :return: the prefix for temporary DICOM directories created by the current process.
+    :rtype: ``str``
+    """
+    return "{0}{1}@{2}__".format(_TEMP_DICOM_PREFIX, os.getpid(), socket.gethostname())
+
+
+def _process_running(pid):
+    """
+
+    :param pid: a process id (on the current host).
+    :type pid: ``int``
+    :return: whether or not a process with id ``pid`` is running. ``None`` if this cannot be determined.
+    :rtype: ``bool`` or ``None``
+    """
+    if os.name == 'nt':
+        return None  # `os.kill()` would signal (or terminate) the process.
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # the process exists, but belongs to another user.
+    return True
+
+
+def _latent_temp_dicom_dir(path):
+    """
+
+    Determine whether a temporary DICOM directory has been left behind by an interrupted pull.
+    That is, whether the process which created it is no longer running or, if this cannot
+    be determined (e.g., it is on another host), it is older than ``_LATENT_TEMP_DICOM_AGE``.
+
+    :param path: the path to a temporary DICOM directory.
+    :type path: ``str``
+    :rtype: ``bool``
+    """
+    try:
+        age = time() - os.stat(path).st_mtime
+    except FileNotFoundError:
+        return False  # e.g., removed by its owner.
+    if age > _LATENT_TEMP_DICOM_AGE:
+        return True
+
+    owner = re.match(r"{0}(\d+)@(.+?)__".format(_TEMP_DICOM_PREFIX), os.path.basename(path))
+    if owner is None or owner.group(2) != socket.gethostname():
+        return False
+    return _process_running(int(owner.group(1))) is False
+
+
 class _CancerImageArchiveImages(object):
     """
 
@@ -533,9 +886,23 @@ class _CancerImageArchiveImages(object):
         self.records_db_images = None
         self.real_time_update_db = None
 
+        # Statistics for the most recent call to ``pull_images()`` (see ``_report_throughput()``).
+        self.throughput = None
+
         # Define the path to the temporary directory
         self.temp_directory_path = os.path.join(self._created_image_dirs['databases'], "__temp__")
 
+        # Define the path to the directory where the metadata of the DICOMs in each series is saved.
+        self.dicom_data_directory = os.path.join(self._created_image_dirs['databases'], "dicom_data")
+        if not os.path.isdir(self.dicom_data_directory):
+            os.makedirs(self.dicom_data_directory)
+
+        # Index of the files in the 'raw' and 'dicoms' directories (see ``_cache_check()``).
+        self.cache_index = SeriesCacheIndex(
+            save_path=os.path.join(self._created_image_dirs['databases'], "tcia_cache_index.p"),
+            directories={'raw': (self._created_image_dirs['raw'], png_series_abbrev),
+                         'dicoms': (self._created_image_dirs['dicoms'], dicom_series_abbrev)})
+
     def _instantiate_real_time_update_db(self, db_index):
         """
 
@@ -550,117 +917,44 @@ class _CancerImageArchiveImages(object):
         self.real_time_update_db = pd.DataFrame(
             columns=real_time_update_columns, index=db_index).replace({np.NaN: None})
 
-    def _download_zip(self, series_uid, temporary_folder):
+    def _download_zip(self, series_uid, temporary_folder, progress=None):
         """
 
         Downloads the zipped from from the Cancer Imaging Archive for a given 'SeriesInstanceUID' (``series_uid``).
 
+        The archive is streamed to disk (see ``biovida.support_tools.http_session.http_download()``) and its members
+        are then extracted one at a time, s.t. neither is held in memory in its entirety.
+
         :param series_uid: the 'series_instance_uid' needed to use TCIA's ``getImage`` parameter
         :type series_uid: ``str``
         :param temporary_folder: path to the temporary folder where the images will be (temporary) cached.
         :type temporary_folder: ``str``
+        :param progress: a function which will be called as ``progress(bytes_received, total_bytes)``
+                         as the archive is downloaded. Defaults to ``None``.
+        :type progress: ``callable`` or ``None``
         :return: list of paths to the new files.
         :rtype: ``list``
         """
-        # See: http://stackoverflow.com/a/14260592/4898004
         url = '{0}/query/getImage?SeriesInstanceUID={1}&format=csv&api_key={2}'.format(
             self.ROOT_URL, series_uid, self.API_KEY)
-        r = requests.get(url)
-        z = zipfile.ZipFile(io.BytesIO(r.content))
-        z.extractall(temporary_folder)
-
-        def file_path_full(f):
-            """Construct the full path for a given file in ``z``."""
-            base_name = cln(os.path.basename(f.filename))
-            return os.path.join(temporary_folder, base_name) if len(base_name) else None
-
-        # Generate the list of paths to the dicoms
-        return list([_f for _f in map(file_path_full, z.filelist) if _f])
-
-    @staticmethod
-    def _extract_instance_number(f):
-        """
-        
-        Extract the instance number from a DICOM file.
-        
-        :param f: a DICOM file
-        :param f: ``pydicom object``
-        :return: instance number
-        :rtype: ``str``
-        """
-        try:
-            instance_number = f.InstanceNumber
-        except:
-            return 'NA'
-
-        cleaned_instance_number = cln(str(instance_number))
-        if len(cleaned_instance_number) and cleaned_instance_number.isdigit():
-            return cleaned_instance_number
-        else:
-            return 'NA'
-
-    def _dicom_to_standard_image(self, f, pull_position, series_uid, conversion, new_file_name):
-        """
-
-        This method handles the act of saving dicom images as in a more common file format (e.g., .png).
-        An image (``f``) can be either 2 or 3 Dimensional.
-
-        Notes:
-
-        - 3D images will be saved as individual frames
-
-        - if pydicom cannot render the DICOM as a pixel array, this method will its halt image extraction efforts.
-
-        :param f: a (py)dicom image.
-        :type f: ``pydicom object``
-        :param pull_position: the position of the file in the list of files pulled from the database.
-        :type pull_position: ``int``
-        :param series_uid: the 'series_instance_uid' needed to use TCIA's ``getImage`` parameter
-        :type series_uid: ``str``
-        :param conversion: the color scale conversion to use, e.g., 'LA' or 'RGB'.
-        :type conversion: ``str``
-        :param new_file_name: see ``_convert_and_save_dicom``'s ``save_name`` parameter.
-        :type new_file_name: ``str``
-        :return: tuple of the form: ``(a list of paths to saved images, boolean denoting success)``
-        :rtype: ``tuple``
-        """
-        # Note: f.PatientsWeight will extract weight from the dicom.
-
-        # Define a list to populate with a record of all images saved
-        all_save_paths = list()
-
-        # Extract a pixel array from the dicom file.
-        try:
-            pixel_arr = f.pixel_array
-        except (UnboundLocalError, TypeError):
-            return [], False
-
-        save_location = self._created_image_dirs['raw']
-
-        def save_path(instance):
-            """Define the path to save the image to."""
-            head = "{0}_{1}".format(instance, pull_position)
-            file_name = "{0}__{1}__default.{2}".format(
-                head, os.path.basename(new_file_name), "png")
-            return os.path.join(save_location, file_name)
-
-        if pixel_arr.ndim == 2:
-            # Define save name by combining the images instance in the set.
-            path = save_path(self._extract_instance_number(f))
-            Image.fromarray(pixel_arr).convert(conversion).save(path)
-            all_save_paths.append(path)
-        # If ``f`` is a 3D image (e.g., segmentation dicom files), save each layer as a separate file/image.
-        elif pixel_arr.ndim == 3:
-            for instance, layer in enumerate(list(range(pixel_arr.shape[0])), start=1):
-                path = save_path(instance)
-                Image.fromarray(pixel_arr[layer:layer + 1][0]).convert(conversion).save(path)
-                all_save_paths.append(path)
-        else:
-            warn("\nProblem converting an image for\nthe following series_instance_uid:\n\n{0}\n\nCannot "
-                 "stabilize {1} dimensional arrays.\nImages must be 2D or 3D.".format(series_uid, pixel_arr.ndim))
-            return [], False
-
-        return all_save_paths, True
+        zip_path = os.path.join(temporary_folder, '__series__.zip')
+        http_download(url, file_path=zip_path, progress=progress)
+
+        dicom_files = list()
+        with zipfile.ZipFile(zip_path) as z:
+            for member in z.infolist():
+                # Members are extracted to the top level of `temporary_folder` (this also
+                # ensures they cannot be written outside of it). Directories are skipped.
+                base_name = cln(os.path.basename(member.filename))
+                if not len(base_name):
+                    continue
+                path = os.path.join(temporary_folder, base_name)
+                with z.open(member) as source, open(path, 'wb') as target:
+                    shutil.copyfileobj(source, target, 2 ** 20)
+                dicom_files.append(path)
+        os.remove(zip_path)
+
+        return dicom_files
 
     def _update_and_set_list(self, index, column, new, return_replacement_len=False):
         """
@@ -693,48 +987,19 @@ class _CancerImageArchiveImages(object):
 
         return len(replacement) if return_replacement_len and isinstance(replacement, (list, tuple)) else None
 
-    def _convert_and_save_dicom(self,
-                                path_to_dicom_file,
-                                index,
-                                pull_position,
-                                series_uid,
-                                save_name,
-                                color=False):
+    def _record_conversion(self, index, all_save_paths, success):
         """
 
-        Save a dicom image as a more common file format.
+        Record the conversion performed by ``_read_dicom()`` in ``self.real_time_update_db``.
 
-        :param path_to_dicom_file: path to a dicom image
-        :type path_to_dicom_file: ``str``
-        :param pull_position: the position of the image in the raw zip data provided by the Cancer Imaging Archive API.
-        :type pull_position: ``int``
-        :param series_uid: the 'series_instance_uid' needed to use TCIA's ``getImage`` parameter
-        :type series_uid: ``str``
-        :param index: the row index currently being processed inside of the main loop in ``_pull_images_engine()``.
+        :param index: the row index currently being processed inside of ``_pull_images_engine()``.
         :type index: ``int``
-        :param save_name: name of the new file (do *NOT* include a file extension).
-                          If ``None``, name from ``path_to_dicom_file`` will be conserved.
-        :type save_name: ``str``
-        :param color: If ``True``, convert the image to RGB before saving. If ``False``, save as a grayscale image.
-                      Defaults to ``False``
-        :type color: ``bool``
+        :param all_save_paths: paths to the images saved by ``_read_dicom()``.
+        :type all_save_paths: ``list``
+        :param success: whether or not the dicom file could be converted.
+        :type success: ``bool``
         """
-        # Load the DICOM file into RAM
-        f = dicom.read_file(path_to_dicom_file)
-
-        # Conversion (needed so the resultant image is not pure black)
-        conversion = 'RGB' if color else 'LA'  # note: 'LA' = grayscale.
-
-        if isinstance(save_name, str):
-            new_file_name = save_name
-        else:
-            # Remove the file extension and then extract the base name from the path.
-            new_file_name = os.path.basename(os.path.splitext(path_to_dicom_file)[0])
-
-        # Convert the image into a PIL object and save to disk.
-        all_save_paths, success = self._dicom_to_standard_image(f=f, pull_position=pull_position,
-                                                                series_uid=series_uid, conversion=conversion,
-                                                                new_file_name=new_file_name)
+        self.cache_index.add('raw', all_save_paths)
 
         # Update Record
         cfp_len = self._update_and_set_list(index, 'cached_images_path', all_save_paths, return_replacement_len=True)
@@ -744,7 +1009,7 @@ class _CancerImageArchiveImages(object):
         if self.real_time_update_db.get_value(index, 'error_free_conversion') != False:  # Block False being replaced.
             self.real_time_update_db.set_value(index, 'error_free_conversion', success)
 
-    def _move_dicoms(self, dicom_files, series_abbrev, index):
+    def _move_dicoms(self, dicom_files, instance_numbers, series_abbrev, index):
         """
 
         Move the dicom source files to ``self._created_image_dirs['dicoms']``.
@@ -752,18 +1017,20 @@ class _CancerImageArchiveImages(object):
 
         :param dicom_files: the yield of ``_download_zip()``
         :type dicom_files: ``list``
+        :param instance_numbers: the instance number of each file in ``dicom_files`` (see ``_read_dicom()``).
+        :type instance_numbers: ``list``
         :param series_abbrev: as evolved inside ``_pull_images_engine()``.
         :type series_abbrev: ``str``
         :param index: the row index currently being processed inside of the main loop in ``_pull_images_engine()``.
         :type index: ``int``
+        :return: the new location of each file in ``dicom_files``.
+        :rtype: ``list``
         """
         new_dicom_paths = list()
-        for file in dicom_files:
+        for file, instance_number in zip(dicom_files, instance_numbers):
             # Define a name for the new file by extracting the dicom file name and combining with `series_abbrev`.
-            instance_number = self._extract_instance_number(f=dicom.read_file(file))
             file_parsed = list(os.path.splitext(os.path.basename(file)))
             new_dicom_file_name = "{0}_{1}__{2}{3}".format(
-                # ToDo: this is redundant. The file is read twice: once to move and once if converting to PNG.
                 instance_number, file_parsed[0], series_abbrev, file_parsed[1])
 
             new_location = os.path.join(self._created_image_dirs['dicoms'], new_dicom_file_name)
@@ -772,6 +1039,7 @@ class _CancerImageArchiveImages(object):
             if os.path.isfile(new_location):
                 os.remove(new_location)
             shutil.move(file, new_location)
+        self.cache_index.add('dicoms', new_dicom_paths)
 
         def sort_func(i):
             """Sort `new_dicom_paths` by instance_number."""
@@ -783,6 +1051,66 @@ class _CancerImageArchiveImages(object):
 
         sorted_paths = tuple(sorted(new_dicom_paths, key=sort_func))
         self.real_time_update_db.set_value(index, 'cached_dicom_images_path', sorted_paths)
+        return new_dicom_paths
+
+    def _dicom_data_path(self, series_uid):
+        """
+
+        :param series_uid: a 'series_instance_uid'.
+        :type series_uid: ``str``
+        :return: the path to the file in which the metadata of the DICOMs in the series is saved.
+        :rtype: ``str``
+        """
+        return os.path.join(self.dicom_data_directory, "{0}.p".format(series_uid))
+
+    def _save_dicom_data(self, series_uid, dicom_files, metadata, new_dicom_paths=None):
+        """
+
+        Save the metadata extracted (by ``_read_dicom()``) from each DICOM in a series.
+
+        The metadata is saved against the name of each file in the archive provided by the Cancer Imaging Archive.
+        If the DICOMs were saved to the cache, their (new) paths are saved as well. If the DICOMs were saved by an
+        earlier pull, but not the current one, the paths recorded at that time are conserved
+        (provided the files still exist).
+
+        :param series_uid: the 'series_instance_uid' of the series.
+        :type series_uid: ``str``
+        :param dicom_files: the yield of ``_download_zip()``
+        :type dicom_files: ``list``
+        :param metadata: the metadata of each file in ``dicom_files``.
+        :type metadata: ``list``
+        :param new_dicom_paths: the yield of ``_move_dicoms()``, if it was called. Defaults to ``None``.
+        :type new_dicom_paths: ``list`` or ``None``
+        """
+        previous = self.load_dicom_data(series_uid) or dict()
+        dicom_data = dict()
+        for e, (file, file_metadata) in enumerate(zip(dicom_files, metadata)):
+            name = os.path.basename(file)
+            if new_dicom_paths is not None:
+                path = new_dicom_paths[e]
+            else:
+                path = previous.get(name, {}).get('path')
+                path = path if isinstance(path, str) and os.path.isfile(path) else None
+            dicom_data[name] = {'path': path, 'metadata': file_metadata}
+
+        atomic_pickle_dump(dicom_data, self._dicom_data_path(series_uid))
+
+    def load_dicom_data(self, series_uid):
+        """
+
+        Load the metadata saved (by ``_save_dicom_data()``) for the DICOMs in a series.
+
+        :param series_uid: a 'series_instance_uid'.
+        :type series_uid: ``str``
+        :return: a dictionary of the form ``{file name: {'path': path or None, 'metadata': {...}}, ...}``
+                 or ``None`` if no metadata has been saved for ``series_uid``.
+        :rtype: ``dict`` or ``None``
+        """
+        save_path = self._dicom_data_path(series_uid)
+        if not os.path.isfile(save_path):
+            return None
+        with open(save_path, "rb") as f:
+            return pickle.load(f)
 
     def _cache_check(self, series_abbrev, n_images_min, save_png, save_dicom):
         """
@@ -811,15 +1139,11 @@ class _CancerImageArchiveImages(object):
 
         :rtype: ``tuple``
         """
-        # Check that `self._created_image_dirs['raw']` has files which contain the string `series_abbrev`.
-        converted_loc_summary = tuple(sorted([os.path.join(self._created_image_dirs['raw'], f)
-                                              for f in os.listdir(self._created_image_dirs['raw'])
-                                              if series_abbrev in f]))
+        # Look up the files for `series_abbrev` in `self._created_image_dirs['raw']`.
+        converted_loc_summary = self.cache_index.lookup('raw', series_abbrev)
 
-        # Check that `self._created_image_dirs['dicoms'])` has files which contain the string `series_abbrev`.
-        dicoms_sl_summary = tuple(sorted([os.path.join(self._created_image_dirs['dicoms'], f)
-                                          for f in os.listdir(self._created_image_dirs['dicoms'])
-                                          if series_abbrev in f]))
+        # Look up the files for `series_abbrev` in `self._created_image_dirs['dicoms']`.
+        dicoms_sl_summary = self.cache_index.lookup('dicoms', series_abbrev)
 
         if save_png:
             converted_loc_summary_complete = len(converted_loc_summary) >= n_images_min
@@ -840,20 +1164,28 @@ class _CancerImageArchiveImages(object):
     def _create_temp_dicom_dir(self):
         """
 
-        Create a temporary directory for DICOM files immediately following download from
-        The Cancer Imaging Archive.
+        Create a temporary directory for the DICOM files of a single series immediately following download
+        from The Cancer Imaging Archive. Each series has its own directory, s.t. several can be
+        downloaded (and converted) at once.
 
         :return: the full path to the newly created temporary directory.
         :rtype: ``str``
         """
-        temp_folder = os.path.join(self._created_image_dirs['dicoms'], '__temp_dicom__')
+        return tempfile.mkdtemp(prefix=_temp_dicom_dir_prefix(), dir=self._created_image_dirs['dicoms'])
 
-        if os.path.isdir(temp_folder):
-            # To prevent duplicate images being created,
-            # destroy this directory if it already exists.
-            shutil.rmtree(temp_folder, ignore_errors=True)
-        os.makedirs(temp_folder)
-        return temp_folder
+    def _remove_latent_temp_dicom_dirs(self):
+        """
+
+        Remove temporary directories left behind by an interrupted pull (see ``_latent_temp_dicom_dir()``).
+        This prevents duplicate images from being created. Directories in use by other pulls
+        (including those in other processes) are left as they are.
+
+        """
+        dicoms_dir = self._created_image_dirs['dicoms']
+        for d in os.listdir(dicoms_dir):
+            path = os.path.join(dicoms_dir, d)
+            if d.startswith(_TEMP_DICOM_PREFIX) and os.path.isdir(path) and _latent_temp_dicom_dir(path):
+                shutil.rmtree(path, ignore_errors=True)
 
     @staticmethod
     def _valid_modality(allowed_modalities, modality, modality_full):
@@ -887,20 +1219,110 @@ class _CancerImageArchiveImages(object):
         else:
             return False
 
-    def _pull_images_engine(self, save_dicom, allowed_modalities, save_png):
+    def _report_throughput(self, n_series, n_bytes, duration):
+        """
+
+        Record (and, if ``verbose`` is ``True``, print) the throughput of the most recent image harvest.
+
+        :param n_series: the number of series which were downloaded.
+        :type n_series: ``int``
+        :param n_bytes: the number of bytes which were downloaded.
+        :type n_bytes: ``int``
+        :param duration: the time the harvest took (seconds).
+        :type duration: ``float``
+        """
+        duration = max(duration, 1e-6)
+        self.throughput = {'series_downloaded': n_series,
+                           'megabytes_downloaded': n_bytes / 1e6,
+                           'seconds': duration,
+                           'megabytes_per_second': n_bytes / 1e6 / duration}
+        if self.verbose and n_series:
+            print("\nDownloaded {0} series ({1:.2f} MB) in {2:.1f} seconds: {3:.2f} MB/s.".format(
+                n_series, self.throughput['megabytes_downloaded'], duration, self.throughput['megabytes_per_second']))
+
+    def _download_series(self, series_uid, progress=None):
+        """
+
+        Download the DICOM files for a series into their own temporary directory.
+        Note: this method is run by the threads of ``_pull_images_engine()``.
+
+        :param series_uid: the 'series_instance_uid' needed to use TCIA's ``getImage`` parameter
+        :type series_uid: ``str``
+        :param progress: see ``_download_zip()``.
+        :type progress: ``callable`` or ``None``
+        :return: a tuple of the form ``(temporary directory, list of paths to the DICOM files)``.
+        :rtype: ``tuple``
+        """
+        temporary_folder = self._create_temp_dicom_dir()
+        try:
+            return temporary_folder, self._download_zip(series_uid, temporary_folder=temporary_folder,
+                                                        progress=progress)
+        except:
+            shutil.rmtree(temporary_folder, ignore_errors=True)
+            raise
+
+    def _process_series(self, pool, index, dicom_files, series_uid, series_abbrev, save_png, save_dicom):
+        """
+
+        Read each of the DICOM files for a series (once) to convert them to PNGs (if ``save_png`` is ``True``),
+        move them into the cache (if ``save_dicom`` is ``True``) and save their metadata.
+
+        :param pool: the yield of ``_dicom_conversion_pool()``.
+        :type pool: ``multiprocessing.Pool`` or ``None``
+        :param index: the row index currently being processed inside of ``_pull_images_engine()``.
+        :type index: ``int``
+        :param dicom_files: the DICOM files for the series.
+        :type dicom_files: ``list``
+        :param series_uid: the 'series_instance_uid' needed to use TCIA's ``getImage`` parameter
+        :type series_uid: ``str``
+        :param series_abbrev: as evolved inside ``_pull_images_engine()``.
+        :type series_abbrev: ``str``
+        :param save_png: see: ``pull_images()``.
+        :type save_png: ``bool``
+        :param save_dicom: see: ``pull_images()``.
+        :type save_dicom: ``bool``
+        """
+        items = [(f, e, series_uid, series_abbrev, self._created_image_dirs['raw'], save_png)
+                 for e, f in enumerate(dicom_files, start=1)]
+        # `starmap()` yields the results in the order of `items`.
+        reads = pool.starmap(_read_dicom, items) if pool is not None else [_read_dicom(*i) for i in items]
+        if save_png:
+            for _, _, all_save_paths, success in reads:
+                self._record_conversion(index, all_save_paths=all_save_paths, success=success)
+
+        new_dicom_paths = None
+        if save_dicom:
+            new_dicom_paths = self._move_dicoms(dicom_files=dicom_files, instance_numbers=[r[0] for r in reads],
+                                                series_abbrev=series_abbrev, index=index)
+        self._save_dicom_data(series_uid, dicom_files=dicom_files, metadata=[r[1] for r in reads],
+                              new_dicom_paths=new_dicom_paths)
+
+    def _pull_images_engine(self, save_dicom, allowed_modalities, save_png, max_workers=2, n_jobs=1,
+                            download_progress=None):
         """
 
         Tool to coordinate the above machinery for pulling and downloading images (or locating them in the cache).
 
+        Series are downloaded by a pool of ``max_workers`` threads. As each download completes, the series is
+        converted (by a pool of ``n_jobs`` processes) and moved into the cache while the threads continue
+        downloading. If conversion falls behind, the threads pause s.t. no more than ``max_workers``
+        downloaded series are waiting to be converted.
+
         :param save_dicom: see: ``pull_images()``.
         :type save_dicom: ``bool``
         :param save_png: see: ``pull_images()``
         :param save_png: ``bool``
         :param allowed_modalities: see: ``pull_images()``
         :type allowed_modalities: ``list``, ``tuple`` or ``None``
-        """
-        for index, row in tqdm(self.records_db_images.iterrows(), total=len(self.records_db_images),
-                               desc='Obtaining Images', disable=not self.verbose):
+        :param max_workers: see ``pull_images()``'s ``images_max_workers`` parameter. Defaults to `2`.
+        :type max_workers: ``int``
+        :param n_jobs: see ``pull_images()``. Defaults to `1`.
+        :type n_jobs: ``int``
+        :param download_progress: see ``CancerImageInterface().pull()``. Defaults to ``None``.
+        :type download_progress: ``callable`` or ``None``
+        """
+        to_download = list()
+        for index, row in self.records_db_images.iterrows():
             # Check if the image should be harvested (or loaded from the cache).
             valid_image_modality = self._valid_modality(allowed_modalities, row['modality'], row['modality_full'])
 
@@ -917,21 +1339,7 @@ class _CancerImageArchiveImages(object):
                                                                         save_dicom=save_dicom)
 
             if valid_image_modality and not cache_complete:
-                temporary_folder = self._create_temp_dicom_dir()
-
-                # Download the images into a temporary folder.
-                dicom_files = self._download_zip(row['series_instance_uid'], temporary_folder=temporary_folder)
-
-                if save_png:
-                    for e, f in enumerate(dicom_files, start=1):
-                        self._convert_and_save_dicom(path_to_dicom_file=f, index=index, pull_position=e,
-                                                     series_uid=row['series_instance_uid'],
-                                                     save_name=series_abbrev)
-
-                if save_dicom:
-                    self._move_dicoms(dicom_files=dicom_files, series_abbrev=series_abbrev, index=index)
-
-                shutil.rmtree(temporary_folder, ignore_errors=True)
+                to_download.append((index, row['series_instance_uid'], series_abbrev))
             else:
                 self._update_and_set_list(index, 'cached_dicom_images_path', dsl_summary)
                 self._update_and_set_list(index, 'cached_images_path', sl_summary)
@@ -940,7 +1348,41 @@ class _CancerImageArchiveImages(object):
                 converted_image_count = len(sl_summary) if isinstance(sl_summary, (list, tuple)) else None
                 self.real_time_update_db.set_value(index, 'image_count_converted_cache', converted_image_count)
 
-    def pull_images(self, records_db, session_limit, save_png, save_dicom, allowed_modalities):
+        # Bytes received for each series (updated by the downloading threads).
+        bytes_received, lock = dict(), Lock()
+
+        def download(job):
+            def progress(received, total_bytes):
+                with lock:
+                    bytes_received[job[1]] = received
+                if download_progress is not None:
+                    download_progress(job[1], received, total_bytes)
+            return self._download_series(job[1], progress=progress)
+
+        self._remove_latent_temp_dicom_dirs()
+        start_time = time()
+        # If processing is interrupted, series which have been downloaded but not processed are removed.
+        downloads = bounded_thread_imap(func=download, iterable=to_download, max_workers=max_workers,
+                                        discard=lambda d: shutil.rmtree(d[0], ignore_errors=True))
+        try:
+            with _dicom_conversion_pool(n_jobs) as pool:
+                for position, (temporary_folder, dicom_files) in tqdm(downloads, total=len(to_download),
+                                                                      desc='Obtaining Images',
+                                                                      disable=not self.verbose):
+                    index, series_uid, series_abbrev = to_download[position]
+                    try:
+                        self._process_series(pool, index=index, dicom_files=dicom_files, series_uid=series_uid,
+                                             series_abbrev=series_abbrev, save_png=save_png, save_dicom=save_dicom)
+                    finally:
+                        shutil.rmtree(temporary_folder, ignore_errors=True)
+        finally:
+            downloads.close()
+        self.cache_index.save()
+
+        self._report_throughput(len(to_download), n_bytes=sum(bytes_received.values()), duration=time() - start_time)
+
+    def pull_images(self, records_db, session_limit, save_png, save_dicom, allowed_modalities,
+                    images_max_workers=2, n_jobs=1, download_progress=None):
         """
 
         Pull Images from the Cancer Imaging Archive.
@@ -959,6 +1401,12 @@ class _CancerImageArchiveImages(object):
                                    Note: 'MRI', 'PET', 'CT' and 'X-Ray' can also be used.
                                    This parameter is not case sensitive.
         :type allowed_modalities: ``list``, ``tuple`` or ``None``
+        :param images_max_workers: see ``CancerImageInterface().pull()``. Defaults to `2`.
+        :type images_max_workers: ``int``
+        :param n_jobs: see ``CancerImageInterface().pull()``. Defaults to `1`.
+        :type n_jobs: ``int``
+        :param download_progress: see ``CancerImageInterface().pull()``. Defaults to ``None``.
+        :type download_progress: ``callable`` or ``None``
         :return: a dataframe with information about the images cached by this method.
         :rtype: ``Pandas DataFrame``
         """
@@ -972,7 +1420,9 @@ class _CancerImageArchiveImages(object):
             os.makedirs(self.temp_directory_path)
 
         settings_path = os.path.join(self.temp_directory_path, "image_pull_settings.p")
-        pickle.dump({k: v for k, v in list(locals().items()) if k not in ('self', 'settings_path')},
+        # Note: `download_progress` is not saved as functions cannot, in general, be pickled.
+        pickle.dump({k: v for k, v in list(locals().items())
+                     if k not in ('self', 'settings_path', 'download_progress')},
                     open(settings_path, "wb"))
 
         if isinstance(session_limit, int):
@@ -987,7 +1437,8 @@ class _CancerImageArchiveImages(object):
         self._instantiate_real_time_update_db(db_index=self.records_db_images.index)
 
         self._pull_images_engine(save_dicom=save_dicom, allowed_modalities=allowed_modalities,
-                                 save_png=save_png)
+                                 save_png=save_png, max_workers=images_max_workers, n_jobs=n_jobs,
+                                 download_progress=download_progress)
         self.real_time_update_db = self.real_time_update_db.replace({None: np.NaN})
 
         return _record_update_dbs_joiner(records_db=self.records_db_images, update_db=self.real_time_update_db)
@@ -1150,17 +1601,19 @@ class CancerImageInterface(object):
 
         self._tcia_overview_df = self._Overview._obtain_tcia_overview()
 
-        self._Records = _CancerImageArchiveRecords(api_key=api_key,
-                                                   dicom_modality_abbrevs=self.dicom_modality_abbrevs,
-                                                   tcia_overview_df=deepcopy(self._tcia_overview_df),
-                                                   root_url=root_url)
-
         self._Images = _CancerImageArchiveImages(api_key=api_key,
                                                  dicom_modality_abbrevs=self.dicom_modality_abbrevs,
                                                  root_url=root_url,
                                                  cache_path=cache_path,
                                                  verbose=verbose)
 
+        self._Records = _CancerImageArchiveRecords(api_key=api_key,
+                                                   dicom_modality_abbrevs=self.dicom_modality_abbrevs,
+                                                   tcia_overview_df=deepcopy(self._tcia_overview_df),
+                                                   root_url=root_url,
+                                                   cache_directory=os.path.join(
+                                                       self._Images._created_image_dirs['databases'], 'records'))
+
         self._ROOT_PATH = self._Overview._created_image_dirs['ROOT_PATH']
 
         # Search attributes
@@ -1362,43 +1815,63 @@ class CancerImageInterface(object):
         if not pretty_print or IN_NOTEBOOK:
             return self.current_query
 
-    def _pull_records(self, patient_limit, collections_limit):
+    def _pull_records(self, patient_limit, collections_limit, max_workers=4, rate_limit=5):
         """
 
         Pull Records from the TCIA API.
 
+        Collections are pulled at once (by a pool of ``max_workers`` threads). A collection which cannot be
+        pulled is recorded as such (see ``pull_success``) and does not prevent the others from being pulled.
+
         :param patient_limit: limit on the number of patients to extract.
                              Patient IDs are sorted prior to this limit being imposed.
                              If ``None``, no patient_limit will be imposed. Defaults to `3`.
         :type patient_limit: ``int`` or ``None``
         :param collections_limit: limit the number of collections to download. If ``None``, no limit will be applied.
         :type collections_limit: ``int`` or ``None``
+        :param max_workers: see ``pull()``'s ``records_max_workers`` parameter. Defaults to `4`.
+        :type max_workers: ``int``
+        :param rate_limit: see ``pull()``'s ``records_rate_limit`` parameter. Defaults to `5`.
+        :type rate_limit: ``int``, ``float`` or ``None``
         :return: a list of dataframes
         :rtype: ``list``
         """
-        pull_success = list()
         if isinstance(collections_limit, int):
-            all_collections = self.current_query['collection'][:collections_limit]
+            all_collections = list(self.current_query['collection'][:collections_limit])
         else:
-            all_collections = self.current_query['collection']
+            all_collections = list(self.current_query['collection'])
+
+        # Note: the `host_limiter` caps the number of requests in flight across all collections at `max_workers`.
+        rate_limiter, host_limiter = RateLimiter(rate=rate_limit), PerHostLimiter(limit=max_workers)
+        concurrent_collections = max_workers > 1 and len(all_collections) > 1
 
-        # Loop through and download all of the studies
-        record_frames = list()
-        for collection in all_collections:
+        def collection_pull(collection):
             try:
-                record_frames.append(self._Records.records_pull(study=collection,
-                                                                search_dict=self.search_dict,
-                                                                pull_time=self._pull_time,
-                                                                patient_limit=patient_limit,
-                                                                verbose=self._verbose))
-                pull_success.append((True, collection))
-            except IndexError as e:
-                warn("\nIndexError Encountered: {0}".format(e))
-                pull_success.append((False, collection))
+                return self._Records.records_pull(study=collection,
+                                                  search_dict=self.search_dict,
+                                                  pull_time=self._pull_time,
+                                                  patient_limit=patient_limit,
+                                                  verbose=self._verbose and not concurrent_collections,
+                                                  max_workers=max_workers,
+                                                  rate_limiter=rate_limiter,
+                                                  host_limiter=host_limiter)
+            except (IndexError, KeyError, ValueError, RequestException) as e:
+                warn("\n{0} Encountered for '{1}': {2}".format(type(e).__name__, collection, e))
+                return None
+
+        # Download all of the studies
+        results = ordered_thread_map(func=collection_pull,
+                                     iterable=all_collections,
+                                     max_workers=max_workers,
+                                     desc='Collections',
+                                     verbose=self._verbose and concurrent_collections)
+
+        record_frames = [r for r in results if r is not None]
+        pull_success = [(r is not None, collection) for r, collection in zip(results, all_collections)]
 
         return record_frames, pull_success
 
-    def _records_db_gen(self, patient_limit, collections_limit):
+    def _records_db_gen(self, patient_limit, collections_limit, max_workers=4, rate_limit=5):
         """
         
         Generate ``records_db`` by refining the output of ``_pull_records()``.
@@ -1407,10 +1880,16 @@ class CancerImageInterface(object):
         :type patient_limit: ``int`` or ``None``
         :param collections_limit: see ``pull()``.
         :type collections_limit: ``int`` or ``None``
+        :param max_workers: see ``pull()``'s ``records_max_workers`` parameter. Defaults to `4`.
+        :type max_workers: ``int``
+        :param rate_limit: see ``pull()``'s ``records_rate_limit`` parameter. Defaults to `5`.
+        :type rate_limit: ``int``, ``float`` or ``None``
         :return: 
         """
         record_frames, self.pull_success = self._pull_records(patient_limit=patient_limit,
-                                                              collections_limit=collections_limit)
+                                                              collections_limit=collections_limit,
+                                                              max_workers=max_workers,
+                                                              rate_limit=rate_limit)
 
         # Check for failures
         download_failures = [collection for (success, collection) in self.pull_success if success is False]
@@ -1431,7 +1910,10 @@ class CancerImageInterface(object):
         """
 
         Extract data from all dicom files referenced in ``records_db`` or ``cache_records_db``.
-        Note: this requires that ``save_dicom`` is ``True`` when ``pull()`` is called.
+
+        The data is extracted from the DICOMs as they are pulled (see ``pull()``), so the DICOMs do
+        not need to be reread here. Data for series pulled by older versions of BioVida is extracted
+        from the DICOMs in the cache (this requires that ``save_dicom`` was ``True`` when ``pull()`` was called).
 
         :param database: the name of the database to use. Must be one of: 'records_db', 'cache_records_db'.
                          Defaults to 'records_db'.
@@ -1439,11 +1921,12 @@ class CancerImageInterface(object):
         :param make_hashable: If ``True`` convert the data extracted to nested tuples.
                               If ``False`` generate nested dictionaries. Defaults to ``False``
         :type make_hashable: ``bool``
-        :return: a series of the dicom data with dictionaries of the form ``{path: {DICOM Description: value, ...}, ...}``.
+        :return: a series of the dicom data with dictionaries of the form
+                 ``{path: {DICOM Description: value, ...}, ...}``. If the DICOMs were not saved (i.e., ``save_dicom`` was ``False``), the name of each file in the archive
+                 provided by the Cancer Imaging Archive is used in place of its path.
                  If ``make_hashable`` is ``True``, all dictionaries will be converted to ``tuples``.
         :rtype: ``Pandas Series``
         """
-        # ToDo: remove need for ``save_dicom=True`` by calling upstream before the temporary dicom files are destroyed.
         if database == 'records_db':
             database_to_use = self.records_db
         elif database == 'cache_records_db':
@@ -1456,19 +1939,25 @@ class CancerImageInterface(object):
         else:
             db = database_to_use.copy(deep=True)
 
-        def dicom_apply(paths):
+        def dicom_apply(series_uid, paths):
             """Extract dicom data."""
-            if not isinstance(paths, (list, tuple)):
+            dicom_data = self._Images.load_dicom_data(series_uid)
+            if dicom_data is not None:
+                data = {v['path'] or k: v['metadata'] for k, v in dicom_data.items()}
+            elif not isinstance(paths, (list, tuple)):
                 return paths
             elif not len(paths):
                 return paths
             else:
-                if make_hashable:
-                    return tuple({p: tuple(dicom_to_dict(dicom_file=p).items()) for p in paths}.items())
-                else:
-                    return {p: dicom_to_dict(dicom_file=p) for p in paths}
+                data = {p: dicom_to_dict(dicom_file=p) for p in paths}
 
-        return pd.Series([dicom_apply(p) for p in db['cached_dicom_images_path']], index=db.index)
+            if make_hashable:
+                return tuple({k: tuple(v.items()) for k, v in data.items()}.items())
+            else:
+                return data
+
+        return pd.Series([dicom_apply(s, p) for s, p in zip(db['series_instance_uid'], db['cached_dicom_images_path'])],
+                         index=db.index)
 
     def pull(self,
              patient_limit=3,
@@ -1477,7 +1966,12 @@ class CancerImageInterface(object):
              allowed_modalities=None,
              save_dicom=True,
              save_png=False,
-             new_records_pull=True):
+             new_records_pull=True,
+             records_max_workers=4,
+             records_rate_limit=5,
+             images_max_workers=2,
+             n_jobs=1,
+             download_progress=None):
         """
 
         Pull (i.e., download) the current search.
@@ -1532,6 +2026,28 @@ class CancerImageInterface(object):
         :type save_png: ``bool``
         :param new_records_pull: if ``True``, download the data for the current search. If ``False``, use ``INSTANCE.records_db``.
         :type new_records_pull: ``bool``
+        :param records_max_workers: the max. number of requests for records which can be in flight at any one time.
+                                    Collections, and the patients within them, are pulled at once. Records are cached
+                                    for each collection, s.t. only patients which are new (or who have new studies)
+                                    are requested when a collection is pulled again. Defaults to `4`.
+        :type records_max_workers: ``int``
+        :param records_rate_limit: the max. number of requests for records to send to the Cancer Imaging Archive
+                                   per second. This limit is shared by all ``records_max_workers``. If ``None``,
+                                   no limit will be imposed (not recommended). Defaults to `5`.
+        :type records_rate_limit: ``int``, ``float`` or ``None``
+        :param images_max_workers: the max. number of series which can be downloaded at any one time. Series are
+                                   converted to PNGs (if ``save_png`` is ``True``) while others are downloading.
+                                   Defaults to `2`.
+        :type images_max_workers: ``int``
+        :param n_jobs: the number of processes to use to convert DICOMs to PNGs. If `-1`, one process will be
+                       used per CPU. Defaults to `1`.
+        :type n_jobs: ``int``
+        :param download_progress: a function which will be called as
+                                  ``download_progress(series_instance_uid, bytes_received, total_bytes)`` as each
+                                  series is downloaded, where ``total_bytes`` is ``None`` if it is not known.
+                                  Note: this function is called from the threads downloading the series.
+                                  Defaults to ``None``.
+        :type download_progress: ``callable`` or ``None``
         :return: a DataFrame with the record information.
         :rtype: ``Pandas DataFrame``
         """
@@ -1540,7 +2056,9 @@ class CancerImageInterface(object):
                 raise ValueError("`search()` must be called before `pull()`.")
             self._pull_time = datetime.now()
             self.records_db = self._records_db_gen(patient_limit=patient_limit,
-                                                   collections_limit=collections_limit)
+                                                   collections_limit=collections_limit,
+                                                   max_workers=records_max_workers,
+                                                   rate_limit=records_rate_limit)
         elif not isinstance(self.records_db, pd.DataFrame):
             raise TypeError("`records_db` is not a DataFrame.")
 
@@ -1549,7 +2067,10 @@ class CancerImageInterface(object):
                                                        session_limit=session_limit,
                                                        save_png=save_png,
                                                        save_dicom=save_dicom,
-                                                       allowed_modalities=allowed_modalities)
+                                                       allowed_modalities=allowed_modalities,
+                                                       images_max_workers=images_max_workers,
+                                                       n_jobs=n_jobs,
+                                                       download_progress=download_progress)
 
             # Add the new records_db datafame with the existing `cache_records_db`.
             self._tcia_cache_records_db_handler()
@@ -30,6 +30,9 @@ from biovida.support_tools.utilities import (_tvt_dict_gen,
 
 # Import Printing Tools
 from biovida.support_tools import pandas_pprint
+
+# Stores of Results
+from biovida.images._results_store import RESULTS_DIRECTORY, forget_images
 import collections
 
 
@@ -332,10 +335,15 @@ def _robust_delete(to_delete):
     :param to_delete: a file, or multiple files to delete. Note: if ``to_delete`` is not a ``string``,
                      ``list`` or ``tuple``, no action will be taken.
     :type to_delete: ``str``, ``list``  or ``tuple``
+    :return: the paths of the files which were deleted.
+    :rtype: ``list``
     """
+    deleted = list()
+
     def delete_file(td):
         if os.path.isfile(td):
             os.remove(td)
+            deleted.append(td)
 
     if isinstance(to_delete, str):
         delete_file(to_delete)
@@ -343,6 +351,32 @@ def _robust_delete(to_delete):
         for t in to_delete:
             if isinstance(t, str):
                 delete_file(t)
+    return deleted
+
+
+def _forget_deleted_images(instance, deleted_images):
+    """
+
+    Remove deleted images from the stores of results saved in the BioVida cache
+    (see ``biovida.images.image_processing.OpeniImageProcessing()``) and from the index of the
+    Cancer Imaging Archive images cache.
+
+    :param instance: see ``image_delete()``
+    :type instance: ``OpeniInterface``, ``OpeniImageProcessing`` or ``CancerImageInterface``
+    :param deleted_images: the paths of the images which were deleted.
+    :type deleted_images: ``list``
+    """
+    if not len(deleted_images):
+        return None
+    if instance.__class__.__name__ == 'OpeniImageProcessing':
+        instance._forget_images(deleted_images)
+    elif instance.__class__.__name__ == 'OpeniInterface':
+        results_path = os.path.join(instance._created_image_dirs['aux'], RESULTS_DIRECTORY)
+        if os.path.isdir(results_path):
+            forget_images(results_path, deleted_images)
+    elif instance.__class__.__name__ == 'CancerImageInterface':
+        instance._Images.cache_index.remove(deleted_images)
+        instance._Images.cache_index.save()
 
 
 def _double_check_with_user():
@@ -407,7 +441,7 @@ def _pretty_print_image_delete(deleted_rows, verbose):
             print("\nNo Rows Deleted.")
 
 
-def _delete_rule_wrapper_gen(instance, delete_rule, only_recent, image_columns):
+def _delete_rule_wrapper_gen(instance, delete_rule, only_recent, image_columns, deleted_images=None):
     """
     
     Generate ``delete_rule_wrapper()``.
@@ -420,6 +454,8 @@ def _delete_rule_wrapper_gen(instance, delete_rule, only_recent, image_columns):
     :type only_recent: ``bool``
     :param image_columns: as evolved in ``image_delete()``
     :type image_columns: ``tuple``
+    :param deleted_images: a list to which the paths of deleted images are appended. Defaults to ``None``.
+    :type deleted_images: ``list`` or ``None``
     :return: a function which wraps ``delete_rule`` in such a way that a
              boolean is always the output. 
     :rtype: ``func``
@@ -453,7 +489,9 @@ def _delete_rule_wrapper_gen(instance, delete_rule, only_recent, image_columns):
         if blanket_delete or (isinstance(func_delete, bool) and func_delete is True):
             if enact:
                 for c in image_columns:
-                    _robust_delete(row[c])
+                    deleted = _robust_delete(row[c])
+                    if deleted_images is not None:
+                        deleted_images.extend(deleted)
             return False  # drop row from the dataframe
         else:
             return True   # keep row in the dataframe
@@ -524,8 +562,10 @@ def image_delete(instance, delete_rule, only_recent=False, verbose=True):
         print("\nDeleting...")
 
     image_columns = _image_instance_image_columns[instance.__class__.__name__]
+    deleted_images = list()
     delete_rule_wrapper = _delete_rule_wrapper_gen(instance=instance, delete_rule=delete_rule,
-                                                   only_recent=only_recent, image_columns=image_columns)
+                                                   only_recent=only_recent, image_columns=image_columns,
+                                                   deleted_images=deleted_images)
 
     def index_dict_update(data_frame_name, stage, data_frame):
         if stage == 'before':
@@ -570,6 +610,9 @@ def image_delete(instance, delete_rule, only_recent=False, verbose=True):
         else:
             raise TypeError("`cache_record_db` is not a DataFrame.")
 
+    # Results computed for the deleted images are no longer required.
+    _forget_deleted_images(instance, deleted_images=deleted_images)
+
     deleted_rows = {k: sorted(set(v['before']) - set(v['after'])) for k, v in list(index_dict.items())}
     _pretty_print_image_delete(deleted_rows=deleted_rows, verbose=verbose)
 
@@ -7,26 +7,37 @@
 
 """
 import os
+import sys
 import json
-import requests
+import pickle
+import inspect
+import hashlib
 import numpy as np
 import pandas as pd
-from PIL import Image
 from PIL import ImageStat
-from scipy.misc import imread
+from functools import partial
 from collections import defaultdict
+from contextlib import contextmanager
+from multiprocessing import Pool, cpu_count
 from os.path import join as os_join
 from six.moves.urllib.parse import urljoin
 from os.path import basename as os_basename
 
+from biovida import __version__
+from biovida.images import _image_tools
+from biovida.images.models import border_detection as _border_detection_module
+from biovida.images.models import template_matching as _template_matching_module
+
 # General tools
 from biovida.support_tools.support_tools import (tqdm,
                                                  items_null,
                                                  data_frame_col_drop,
                                                  list_to_bulletpoints)
+from biovida.support_tools.http_session import http_get
 
 # Tools form the image subpackage
-from biovida.images._image_tools import load_and_scale_images
+from biovida.images._image_tools import ImageLoader, DecodedImage, image_batches, _crop_key
+from biovida.images._results_store import RESULTS_DIRECTORY, ResultsStore, file_digest, forget_images
 
 # Open-i Support Tools
 from biovida.images._interface_support.openi.openi_support_tools import (nonessential_openi_columns,
@@ -34,7 +45,7 @@ from biovida.images._interface_support.openi.openi_support_tools import (nonesse
 
 # Models
 from biovida.images.models.border_detection import border_detection
-from biovida.images.models.template_matching import robust_match_template
+from biovida.images.models.template_matching import robust_match_template, template_registry
 from biovida.images.models.image_classification import ImageClassificationCNN
 import collections
 
@@ -42,6 +53,208 @@ import collections
 pd.options.mode.chained_assignment = None
 
 
+# ----------------------------------------------------------------------------------------------------------
+# Per-Image Analyses
+# ----------------------------------------------------------------------------------------------------------
+
+
+def _grayscale_image_analysis(decoded_image):
+    """
+
+    Computes whether or not an image is grayscale.
+    See the ``OpeniImageProcessing().grayscale_analysis()`` method for caveats.
+
+    :param decoded_image: an image (or ``None`` if the image is not available).
+    :type decoded_image: ``DecodedImage`` or ``None``
+    :return: ``True`` if grayscale, else ``False``.
+    :rtype: ``bool``
+    """
+    # See: http://stackoverflow.com/q/23660929/4898004
+    if decoded_image is None:
+        return np.NaN
+    stat = ImageStat.Stat(decoded_image.rgb())
+    return np.mean(stat.sum) == stat.sum[0]
+
+
+def _logo_image_analysis(decoded_image, journal, pattern_image, journal_filter, output_params, match_template_params):
+    """
+
+    Search for a logo (typically MedPix's) in an image.
+
+    :param decoded_image: an image (or ``None`` if the image is not available).
+    :type decoded_image: ``DecodedImage`` or ``None``
+    :param journal: the title of the journal the image is from.
+    :type journal: ``str``
+    :param pattern_image: the logo, prepared by ``template_registry``.
+    :type pattern_image: ``_PatternPyramid``
+    :param journal_filter: only images from journals with titles which contain this string
+                           (ignoring case) are searched. If ``None``, all images are searched.
+    :type journal_filter: ``str`` or ``None``
+    :param output_params: see ``OpeniImageProcessing()._logo_analysis_out()``.
+    :type output_params: ``tuple``
+    :param match_template_params: keyword arguments for ``robust_match_template()``.
+    :type match_template_params: ``dict``
+    :return: see ``OpeniImageProcessing()._logo_analysis_out()``.
+    :rtype: ``NaN``, ``dict`` or ``tuple``
+    """
+    if decoded_image is None:
+        return np.NaN
+    elif journal_filter is not None and journal_filter.lower() not in str(journal).lower():
+        return np.NaN
+    analysis_results = robust_match_template(pattern_image=pattern_image,
+                                             base_image=decoded_image.grayscale(),
+                                             **match_template_params)
+    return OpeniImageProcessing._logo_analysis_out(analysis_results, output_params)
+
+
+def _border_image_analysis(decoded_image, border_detection_params):
+    """
+
+    Search for borders and bars in an image.
+
+    :param decoded_image: an image (or ``None`` if the image is not available).
+    :type decoded_image: ``DecodedImage`` or ``None``
+    :param border_detection_params: keyword arguments for ``border_detection()``.
+    :type border_detection_params: ``dict``
+    :return: the yield of ``border_detection()``.
+    :rtype: ``dict``
+    """
+    if decoded_image is None:
+        return {'hbar': np.NaN, 'hborder': np.NaN, 'vborder': np.NaN}
+    return border_detection(decoded_image.grayscale(),
+                            report_signal_strength=False,
+                            rescale_input_ndarray=True,
+                            **border_detection_params)
+
+
+# ----------------------------------------------------------------------------------------------------------
+# Parallel Image Analysis
+# ----------------------------------------------------------------------------------------------------------
+
+
+# The number of images sent to a worker process at once.
+_IMAGE_ANALYSIS_CHUNK_SIZE = 4
+
+# See ``_analyses_fingerprint()``.
+_ANALYSES_FINGERPRINT = None
+
+# The analysis run by the current worker process (see ``_image_analysis_worker_init()``).
+_worker_image_analysis = None
+
+
+def _analyses_fingerprint():
+    """
+
+    Identify the version of the analyses (``grayscale_analysis()``, ``logo_analysis()`` and ``border_analysis()``)
+    which computed the results saved in the BioVida cache.
+
+    The fingerprint is computed from the BioVida version and the source code of the modules which
+    implement the analyses. Thus, results are recomputed whenever the code which generated them changes.
+    Note: the parameters of each analysis form part of the key for each result (see ``_image_analysis_map()``).
+
+    :return: the fingerprint of the analyses.
+    :rtype: ``str``
+    """
+    global _ANALYSES_FINGERPRINT
+    if _ANALYSES_FINGERPRINT is None:
+        sha1 = hashlib.sha1(__version__.encode('utf-8'))
+        for module in (sys.modules[__name__], _image_tools, _border_detection_module, _template_matching_module):
+            try:
+                sha1.update(inspect.getsource(module).encode('utf-8'))
+            except (IOError, OSError, TypeError):
+                # The source is not available (e.g., only bytecode was installed).
+                sha1.update(module.__name__.encode('utf-8'))
+        _ANALYSES_FINGERPRINT = sha1.hexdigest()
+    return _ANALYSES_FINGERPRINT
+
+
+def _image_analysis_worker_init(analysis):
+    """
+
+    Initialize a worker process in the pool yielded by ``_image_analysis_pool()``.
+
+    :param analysis: a function which accepts a ``DecodedImage`` (or ``None``), followed by any additional arguments.
+    :type analysis: ``func``
+    """
+    global _worker_image_analysis
+    _worker_image_analysis = analysis
+
+
+def _image_analysis_worker(item):
+    """
+
+    Run the analysis for the current worker process against a single image.
+    Note: images are read from disk by the worker, s.t. they need not be sent to it.
+
+    :param item: a tuple of the form ``(image_path, additional arguments...)``.
+    :type item: ``tuple``
+    :return: the yield of the analysis.
+    """
+    image_path, args = item[0], item[1:]
+    decoded_image = None if items_null(image_path) else DecodedImage(image_path)
+    return _worker_image_analysis(decoded_image, *args)
+
+
+def _image_analysis_processes(n_jobs):
+    """
+
+    :param n_jobs: the number of processes to use. If `-1`, one process will be used per CPU.
+    :type n_jobs: ``int``
+    :return: the number of processes to use.
+    :rtype: ``int``
+    """
+    if isinstance(n_jobs, bool) or not isinstance(n_jobs, int) or n_jobs == 0 or n_jobs < -1:
+        raise ValueError("`n_jobs` must be -1 or an integer greater than or equal to 1.")
+    return cpu_count() if n_jobs == -1 else n_jobs
+
+
+def _new_image_analysis_pool(processes, analysis):
+    """
+
+    Create a pool of processes in which to run ``analysis``.
+    ``analysis`` is sent to each process once, when the process is started.
+
+    :param processes: the number of processes in the pool.
+    :type processes: ``int``
+    :param analysis: see ``_image_analysis_worker_init()``.
+    :type analysis: ``func``
+    :rtype: ``multiprocessing.Pool``
+    """
+    return Pool(processes=processes, initializer=_image_analysis_worker_init, initargs=(analysis,))
+
+
+def _close_image_analysis_pool(pool):
+    pool.terminate()
+    pool.join()
+
+
+@contextmanager
+def _image_analysis_pool(n_jobs, analysis):
+    """
+
+    Create a pool of processes in which to run ``analysis`` (see ``_new_image_analysis_pool()``).
+    The processes are stopped when the context exits.
+
+    :param n_jobs: the number of processes to use. If `-1`, one process will be used per CPU.
+                   If `1`, no pool will be created.
+    :type n_jobs: ``int``
+    :param analysis: see ``_image_analysis_worker_init()``.
+    :type analysis: ``func``
+    :return: a pool of processes or, if ``n_jobs`` is `1`, ``None``.
+    :rtype: ``multiprocessing.Pool`` or ``None``
+    """
+    processes = _image_analysis_processes(n_jobs)
+    if processes == 1:
+        yield None
+        return
+
+    pool = _new_image_analysis_pool(processes, analysis=analysis)
+    try:
+        yield pool
+    finally:
+        _close_image_analysis_pool(pool)
+
+
 class OpeniImageProcessing(object):
     """
 
@@ -60,6 +273,22 @@ class OpeniImageProcessing(object):
     :type download_override: ``bool``
     :param verbose: if ``True``, print additional details. Defaults to ``False``.
     :type verbose: ``bool``
+    :param max_image_memory: the approximate maximum amount of memory (in megabytes) to use for retaining decoded
+                             images, s.t. they can be shared by analyses (rather than being read from disk by each).
+                             Defaults to 500.
+    :type max_image_memory: ``int`` or ``float``
+    :param n_jobs: the default number of processes to use for ``grayscale_analysis()``, ``logo_analysis()`` and
+                   ``border_analysis()``. If `-1`, one process will be used per CPU. Defaults to `1`.
+    :type n_jobs: ``int``
+    :param cache_predictions: if ``True``, save the predictions made by ``visual_image_problems()`` in the
+                              BioVida cache, s.t. the model only needs to be run against images (or crops thereof)
+                              it has not seen before. See ``prediction_cache_info``. Defaults to ``True``.
+    :type cache_predictions: ``bool``
+    :param cache_analyses: if ``True``, save the results of ``grayscale_analysis()``, ``logo_analysis()`` and
+                           ``border_analysis()`` in the BioVida cache, s.t. each analysis only needs to be run against
+                           images it has not seen before (with the same parameters). See ``analysis_cache_info``.
+                           Defaults to ``True``.
+    :type cache_analyses: ``bool``
 
     :var image_dataframe: this is the dataframe that was passed when instantiating the class and
                           contains a cache of all analyses run as new columns.
@@ -85,7 +314,7 @@ class OpeniImageProcessing(object):
                               "visual_image_problems_model_support.p"]
 
         def download(url, file_path):
-            response = requests.get(url)
+            response = http_get(url)
             with open(file_path, 'wb') as file:
                 file.write(response.content)
 
@@ -132,8 +361,15 @@ class OpeniImageProcessing(object):
                  db_to_extract='records_db',
                  model_location=None,
                  download_override=False,
-                 verbose=True):
+                 verbose=True,
+                 max_image_memory=500,
+                 n_jobs=1,
+                 cache_predictions=True,
+                 cache_analyses=True):
         self._verbose = verbose
+        self.n_jobs = n_jobs
+        self.cache_predictions = cache_predictions
+        self.cache_analyses = cache_analyses
         self.db_to_extract = db_to_extract
         self._cache_path = getattr(instance, '_cache_path')
         self.known_image_problems = ('arrows', 'asterisks', 'grids')
@@ -172,14 +408,185 @@ class OpeniImageProcessing(object):
         # Load the visual image problems the model can detect
         self.model_classes = list(self._ircnn.data_classes.keys())
 
-        # Container for images represented as `ndarrays`
-        self._ndarrays_images = None
+        # Decoded images (and views thereof, e.g., as 2D ndarrays) shared by the analyses.
+        self._image_loader = ImageLoader(max_bytes=int(max_image_memory * 1024 ** 2))
+
+        # Results saved in the BioVida cache (see ``_prediction_store()`` and ``_analysis_store()``).
+        self._results_path = os_join(instance._created_image_dirs['aux'], RESULTS_DIRECTORY)
+        if not os.path.isdir(self._results_path):
+            os.makedirs(self._results_path)
+        self._predictions = None
+        self._analyses = dict()
+        self._defer_store_saves = False
+
+        # Pools of processes shared by calls to the same analysis (see ``_shared_analysis_pools()``).
+        self._analysis_pools = None
+
+        # Counts of the images considered by ``visual_image_problems()`` (see ``prediction_report``).
+        self._prediction_counts = defaultdict(int)
 
     @property
     def image_dataframe_short(self):
         """Return `image_dataframe` with nonessential columns removed."""
         return data_frame_col_drop(self.image_dataframe, nonessential_openi_columns, 'image_dataframe')
 
+    @property
+    def prediction_cache_info(self):
+        """Return the number of hits and misses for the cache of predictions made by
+        ``visual_image_problems()``, along with the number of predictions in the cache."""
+        if self._predictions is None:
+            return {'hits': 0, 'misses': 0, 'size': 0}
+        return self._predictions.info
+
+    @property
+    def prediction_report(self):
+        """
+
+        Report the number of images considered by ``visual_image_problems()`` (across calls), and of these, how many
+        were not passed through the model (because their modality is unknown to it or their prediction was cached)
+        and how many were. ``'seconds_saved'`` estimates the time (to load, crop, scale and score images) saved
+        by not passing images through the model, based on the most recent throughput it achieved (``None``
+        if the model has not been run).
+
+        :return: a dictionary of the form ``{'images': ..., 'unknown_modality': ..., 'cached': ..., 'predicted': ...,
+                 'seconds_saved': ...}``.
+        :rtype: ``dict``
+        """
+        report = {k: self._prediction_counts[k] for k in ('images', 'unknown_modality', 'cached', 'predicted')}
+        seconds_per_image = self._prediction_counts.get('seconds_per_image')
+        if seconds_per_image is None:
+            report['seconds_saved'] = None
+        else:
+            report['seconds_saved'] = (report['unknown_modality'] + report['cached']) * seconds_per_image
+        return report
+
+    @property
+    def analysis_cache_info(self):
+        """Return the number of hits and misses for the cache of the results of each analysis
+        (e.g., 'border_analysis'), along with the number of results in the cache."""
+        return {k: v.info for k, v in self._analyses.items()}
+
+    def _prediction_store(self):
+        """
+
+        Load the store of predictions made by the model.
+
+        Predictions are keyed on the contents of the image, the crop box and a fingerprint of the model
+        (its weights and the size of its input). Thus, if any of these change, the model is run again.
+
+        :return: the store of predictions.
+        :rtype: ``ResultsStore``
+        """
+        if self._predictions is None:
+            fingerprint = "{0}_{1}".format(file_digest(self._model_path), self._ircnn.image_shape)
+            self._predictions = ResultsStore(save_directory=self._results_path,
+                                             name='visual_image_problems_predictions',
+                                             fingerprint=hashlib.sha1(fingerprint.encode('utf-8')).hexdigest())
+        return self._predictions
+
+    def _analysis_store(self, name):
+        """
+
+        Load the store of results for an analysis.
+
+        :param name: the name of the analysis, e.g., 'border_analysis'.
+        :type name: ``str``
+        :return: the store of results for the analysis.
+        :rtype: ``ResultsStore``
+        """
+        if name not in self._analyses:
+            self._analyses[name] = ResultsStore(save_directory=self._results_path,
+                                                name=name,
+                                                fingerprint=_analyses_fingerprint())
+        return self._analyses[name]
+
+    def _forget_images(self, image_paths):
+        """
+
+        Remove images from the stores of results saved in the BioVida cache,
+        e.g., because they have been deleted (see ``biovida.images.image_delete()``).
+
+        :param image_paths: paths to images.
+        :type image_paths: ``iterable``
+        """
+        image_paths = list(image_paths)
+        for store in self._loaded_stores():
+            store.forget(image_paths)
+            store.save()
+        # Stores which have not been loaded by this instance.
+        forget_images(self._results_path, image_paths)
+
+    def _loaded_stores(self):
+        """
+
+        :return: the stores of results which have been loaded by this instance.
+        :rtype: ``list``
+        """
+        return [s for s in [self._predictions] + list(self._analyses.values()) if s is not None]
+
+    def _save_store(self, store):
+        """
+
+        Save ``store``, unless saving has been deferred (see ``_deferred_store_saves()``).
+
+        :param store: a store of results.
+        :type store: ``ResultsStore``
+        """
+        if not self._defer_store_saves:
+            store.save()
+
+    @contextmanager
+    def _deferred_store_saves(self):
+        """
+
+        Defer saving the stores of results until the end of a ``with`` block, s.t. they are written once
+        (rather than once per call to an analysis, e.g., for each batch in ``_auto_analysis_batched()``).
+        The stores are saved even if the block raises, s.t. the results computed prior are not lost.
+
+        """
+        self._defer_store_saves = True
+        try:
+            yield
+        finally:
+            self._defer_store_saves = False
+            for store in self._loaded_stores():
+                store.save()
+
+    @contextmanager
+    def _shared_analysis_pools(self):
+        """
+
+        Reuse the pool of processes created for an analysis (see ``_image_analysis_run()``) for
+        the remainder of a ``with`` block, e.g., for every batch in ``_auto_analysis_batched()``.
+        Otherwise, a pool is created (and its processes started) each time an analysis is run.
+        The pools are stopped when the block exits.
+
+        """
+        self._analysis_pools = dict()
+        try:
+            yield
+        finally:
+            pools, self._analysis_pools = self._analysis_pools, None
+            for pool in pools.values():
+                _close_image_analysis_pool(pool)
+
+    def _shared_analysis_pool(self, processes, analysis):
+        """
+
+        :param processes: the number of processes in the pool.
+        :type processes: ``int``
+        :param analysis: see ``_image_analysis_worker_init()``.
+        :type analysis: ``func``
+        :return: the pool of processes for ``analysis`` (see ``_shared_analysis_pools()``).
+        :rtype: ``multiprocessing.Pool``
+        """
+        # Analyses are recreated by each call to an analysis method (e.g., as a ``functools.partial``),
+        # so they are identified by their serialized form (which is what is sent to the processes).
+        key = (processes, hashlib.sha1(pickle.dumps(analysis, protocol=pickle.HIGHEST_PROTOCOL)).hexdigest())
+        if key not in self._analysis_pools:
+            self._analysis_pools[key] = _new_image_analysis_pool(processes, analysis=analysis)
+        return self._analysis_pools[key]
+
     def _pil_load(self, image_paths, convert_to_rgb, status):
         """
 
@@ -195,49 +602,92 @@ class OpeniImageProcessing(object):
         :rtype: ``list``
         """
         def conversion(image):
-            return (Image.open(image).convert('RGB'), image) if convert_to_rgb else (Image.open(image), image)
+            decoded_image = self._image_loader[image]
+            return (decoded_image.rgb(), image) if convert_to_rgb else (decoded_image.image, image)
         return [conversion(i) for i in tqdm(image_paths, desc="Loading Images", disable=not status)]
 
-    def _ndarray_extract(self, zip_with_column=None, reload_override=False):
+    def _image_analysis_map(self, analysis, items, n_jobs, desc, status, store_name=None, params=(),
+                            new_analysis=False):
         """
 
-        Loads images as `ndarrays` and flattens them.
-
-        :param zip_with_column: a column from the `image_dataframe` to zip with the images. Defaults to None.
-        :type zip_with_column: ``str``
-        :param reload_override: if True, reload the images from disk. Defaults to False.
-        :type reload_override: ``bool``
-        :return: images as 2D ndarrays.
-        :rtype: ``zip`` or ``list of ndarrays``
+        Run ``analysis`` against each image in ``items``.
+
+        If ``store_name`` is not ``None`` (and ``cache_analyses`` is ``True``), results are saved in the BioVida
+        cache and ``analysis`` is only run against images (with non-null paths) for which no result has been saved
+        with the same ``params`` and additional arguments.
+
+        :param analysis: a function which accepts a ``DecodedImage`` (or ``None``, if the path to the image
+                         is null), followed by any additional arguments. Must be defined at the top level of a
+                         module (or be a ``functools.partial`` thereof) if ``n_jobs`` is not `1`.
+        :type analysis: ``func``
+        :param items: tuples of the form ``(image_path, additional arguments...)``.
+        :type items: ``list``
+        :param n_jobs: the number of processes to use. If ``None``, ``self.n_jobs`` will be used.
+        :type n_jobs: ``int`` or ``None``
+        :param desc: description to pass to ``tqdm``.
+        :type desc: ``str``
+        :param status: display status bar.
+        :type status: ``bool``
+        :param store_name: the name of the store of results for ``analysis`` (see ``_analysis_store()``).
+                           If ``None``, results will not be saved.
+        :type store_name: ``str`` or ``None``
+        :param params: the (hashable) parameters of ``analysis``.
+        :type params: ``tuple``
+        :param new_analysis: if ``True``, ignore the results in the store and run ``analysis`` against every
+                             image (saving the new results). Defaults to ``False``.
+        :type new_analysis: ``bool``
+        :return: the yield of ``analysis`` for each item in ``items`` (in the same order as ``items``).
+        :rtype: ``list``
         """
-        if self._ndarrays_images is None or reload_override:
-            self._ndarrays_images = [imread(i, flatten=True) for i in self.image_dataframe['cached_images_path']]
-
-        if zip_with_column is not None:
-            return list(zip(*[self._ndarrays_images, self.image_dataframe[zip_with_column]]))
-        else:
-            return self._ndarrays_images
+        if store_name is None or not self.cache_analyses:
+            return self._image_analysis_run(analysis, items=items, n_jobs=n_jobs, desc=desc, status=status)
+
+        store = self._analysis_store(store_name)
+        results, keys, to_analyze = [None] * len(items), [None] * len(items), list()
+        for i, item in enumerate(items):
+            if not items_null(item[0]):
+                # Null arguments (e.g., a missing journal title) are NaNs, which do not compare equal.
+                args = tuple(None if items_null(a) else a for a in item[1:])
+                keys[i] = store.key(item[0], params, args)
+                results[i] = None if new_analysis else store.get(keys[i])
+            if results[i] is None:
+                to_analyze.append(i)
+
+        if len(to_analyze):
+            new_results = self._image_analysis_run(analysis, items=[items[i] for i in to_analyze],
+                                                   n_jobs=n_jobs, desc=desc, status=status)
+            for i, result in zip(to_analyze, new_results):
+                results[i] = result
+                if keys[i] is not None:
+                    store[keys[i]] = result
+            self._save_store(store)
+        return results
 
-    @staticmethod
-    def _grayscale_image(image_path):
+    def _image_analysis_run(self, analysis, items, n_jobs, desc, status):
         """
 
-        Computes whether or not an image is grayscale.
-        See the `grayscale_analysis()` method for caveats.
+        Run ``analysis`` against each image in ``items`` (see ``_image_analysis_map()``).
 
-        :param image_path: path to an image.
-        :type image_path:``str``
-        :return: ``True`` if grayscale, else ``False``.
-        :rtype: ``bool``
+        :return: the yield of ``analysis`` for each item in ``items`` (in the same order as ``items``).
+        :rtype: ``list``
         """
-        # See: http://stackoverflow.com/q/23660929/4898004
-        if image_path is None or items_null(image_path):
-            return np.NaN
-        image = Image.open(image_path)  # ToDo: find way to call only once inside this class (similar to _ndarray_extract())
-        stat = ImageStat.Stat(image.convert("RGB"))
-        return np.mean(stat.sum) == stat.sum[0]
-
-    def grayscale_analysis(self, new_analysis=False, status=True):
+        processes = _image_analysis_processes(self.n_jobs if n_jobs is None else n_jobs)
+        if processes == 1:
+            # Images are obtained from `_image_loader`, s.t. they can be shared by the analyses.
+            return [analysis(None if items_null(item[0]) else self._image_loader[item[0]], *item[1:])
+                    for item in tqdm(items, desc=desc, disable=not status)]
+
+        def run(pool):
+            # `imap()` yields the results in the order of `items`.
+            results = pool.imap(_image_analysis_worker, items, chunksize=_IMAGE_ANALYSIS_CHUNK_SIZE)
+            return list(tqdm(results, desc=desc, disable=not status, total=len(items)))
+
+        if self._analysis_pools is not None:
+            return run(self._shared_analysis_pool(processes, analysis=analysis))
+        with _image_analysis_pool(processes, analysis=analysis) as pool:
+            return run(pool)
+
+    def grayscale_analysis(self, new_analysis=False, status=True, n_jobs=None):
         """
 
         Analyze the images to determine whether or not they are grayscale
@@ -249,14 +699,20 @@ class OpeniImageProcessing(object):
                 of red, green and blue. In such an instance this function may errounously conclude that
                 the image is grayscale.
 
-        :param new_analysis: rerun the analysis if it has already been computed. Defaults to ``False``.
+        :param new_analysis: rerun the analysis if it has already been computed, ignoring any results
+                             saved in the BioVida cache. Defaults to ``False``.
         :type new_analysis: ``bool``
         :param status: display status bar. Defaults to ``True``.
         :type status: ``bool``
+        :param n_jobs: the number of processes to use. If ``None``, the ``n_jobs`` value passed when
+                       instantiating the class will be used. Defaults to ``None``.
+        :type n_jobs: ``int`` or ``None``
         """
         if 'grayscale' not in self.image_dataframe.columns or new_analysis:
-            column = self.image_dataframe['cached_images_path']
-            grayscale = [self._grayscale_image(i) for i in tqdm(column, desc='Grayscale Analysis', disable=not status)]
+            items = [(i,) for i in self.image_dataframe['cached_images_path']]
+            grayscale = self._image_analysis_map(_grayscale_image_analysis, items=items, n_jobs=n_jobs,
+                                                 desc='Grayscale Analysis', status=status,
+                                                 store_name='grayscale_analysis', new_analysis=new_analysis)
             self.image_dataframe['grayscale'] = grayscale
 
     @staticmethod
@@ -291,41 +747,6 @@ class OpeniImageProcessing(object):
 
         return bounding_box
 
-    def _logo_processor(self, robust_match_template_wrapper, output_params, status):
-        """
-
-        Performs the actual analysis for ``logo_analysis()``, searching for the
-        MedPix logo in the images.
-
-        :param robust_match_template_wrapper: wrapper generated inside of ``logo_analysis()``
-        :type robust_match_template_wrapper: ``func``
-        :param output_params: tuple of the form:
-
-                        ``(match_quality_threshold, xy_position_threshold[0], xy_position_threshold[1])``
-
-        :type output_params: ``tuple``
-        :param status: display status bar. Defaults to ``True``.
-        :type status: ``bool``
-        :return: a list of dictionaries or tuples specifying all, or part of (i.e., lower left) the bonding box
-                 for the pattern in the base image.
-        :rtype: ``list of dicts`` or ``list of tuples``
-        """
-        results = list()
-
-        # Use images in the dataframe represented as ndarrays, along with
-        # the journal title (to check for their source being medpix).
-        to_analyze = self._ndarray_extract(zip_with_column='journal_title')
-
-        for image, journal in tqdm(to_analyze, desc='Logo Analysis', disable=not status):
-            if 'medpix' not in str(journal).lower():
-                results.append(np.NaN)
-            else:
-                analysis_results = robust_match_template_wrapper(image)
-                current = self._logo_analysis_out(analysis_results, output_params)
-                results.append(current)
-
-        return results
-
     def logo_analysis(self,
                       match_quality_threshold=0.25,
                       xy_position_threshold=(1 / 3.0, 1 / 2.5),
@@ -333,12 +754,18 @@ class OpeniImageProcessing(object):
                       end_search_threshold=0.875,
                       base_image_cropping=(0.15, 0.5),
                       new_analysis=False,
-                      status=True):
+                      status=True,
+                      n_jobs=None,
+                      logo_path=None,
+                      journal_filter='medpix'):
         """
 
         Search for the MedPix Logo. If located, with match quality above match_quality_threshold,
         populate the the 'medpix_logo_bounding_box' of ``image_dataframe`` with its bounding box.
 
+        Note: the logo is prepared for the search once and saved alongside it in the BioVida cache (see
+        ``biovida.images.models.template_matching.template_registry``).
+
         :param match_quality_threshold: the minimum match quality required to accept the match.
                                         See: ``skimage.feature.match_template()`` for more information.
         :type match_quality_threshold: ``float``
@@ -353,10 +780,21 @@ class OpeniImageProcessing(object):
         :type end_search_threshold: ``float``
         :param base_image_cropping: See: ``biovida.images.models.template_matching.robust_match_template()``
         :type base_image_cropping: ``tuple``
-        :param new_analysis: rerun the analysis if it has already been computed.
+        :param new_analysis: rerun the analysis if it has already been computed, ignoring any results
+                             saved in the BioVida cache. Defaults to ``False``.
         :type new_analysis: ``bool``
         :param status: display status bar. Defaults to ``True``.
         :type status: ``bool``
+        :param n_jobs: the number of processes to use. If ``None``, the ``n_jobs`` value passed when
+                       instantiating the class will be used. Defaults to ``None``.
+        :type n_jobs: ``int`` or ``None``
+        :param logo_path: the path to an image of the logo to search for. If ``None``, the MedPix logo will be used.
+                          The bounding box of the logo is stored in the 'medpix_logo_bounding_box' column regardless,
+                          as this column is used when cropping the images. Defaults to ``None``.
+        :type logo_path: ``str`` or ``None``
+        :param journal_filter: only search images from journals with titles which contain this string (ignoring case).
+                               If ``None``, all images will be searched. Defaults to 'medpix'.
+        :type journal_filter: ``str`` or ``None``
         """
         # Note: this method wraps ``biovida.images.models.template_matching.robust_match_template()``.
         if 'medpix_logo_bounding_box' in self.image_dataframe.columns and not new_analysis:
@@ -365,27 +803,40 @@ class OpeniImageProcessing(object):
         # Package Params
         output_params = (match_quality_threshold, xy_position_threshold[0], xy_position_threshold[1])
 
-        # Load the Pattern. ToDo: Allow for non MedPix logos logos.
-        medpix_template_image = imread(self._medpix_path, flatten=True)
-
-        def robust_match_template_wrapper(image):
-            return robust_match_template(pattern_image=medpix_template_image,
-                                         base_image=image,
-                                         base_resizes=base_resizes,
-                                         end_search_threshold=end_search_threshold,
-                                         base_image_cropping=base_image_cropping)
-
-        # Run the algorithm searching for the medpix logo in the base image
-        self.image_dataframe['medpix_logo_bounding_box'] = self._logo_processor(robust_match_template_wrapper,
-                                                                                output_params=output_params,
-                                                                                status=status)
+        # Load the Pattern (prepared once per process).
+        logo_path = self._medpix_path if logo_path is None else logo_path
+        if not os.path.isfile(logo_path):
+            raise FileNotFoundError("'{0}' could not be located.".format(str(logo_path)))
+        logo = template_registry.get(logo_path, save_directory=self.instance._created_image_dirs['aux'])
+
+        match_template_params = {'base_resizes': base_resizes,
+                                 'end_search_threshold': end_search_threshold,
+                                 'base_image_cropping': base_image_cropping}
+        analysis = partial(_logo_image_analysis,
+                           pattern_image=logo,
+                           journal_filter=journal_filter,
+                           output_params=output_params,
+                           match_template_params=match_template_params)
+        params = (file_digest(logo_path), journal_filter, output_params, tuple(sorted(match_template_params.items())))
+
+        # Run the algorithm searching for the logo in the base image. The journal title
+        # is used to check that the image is from the journal of interest (e.g., MedPix).
+        items = list(zip(self.image_dataframe['cached_images_path'], self.image_dataframe['journal_title']))
+        self.image_dataframe['medpix_logo_bounding_box'] = self._image_analysis_map(analysis, items=items,
+                                                                                    n_jobs=n_jobs,
+                                                                                    desc='Logo Analysis',
+                                                                                    status=status,
+                                                                                    store_name='logo_analysis',
+                                                                                    params=params,
+                                                                                    new_analysis=new_analysis)
 
     def border_analysis(self,
                         signal_strength_threshold=0.25,
                         min_border_separation=0.15,
                         lower_bar_search_space=0.9,
                         new_analysis=False,
-                        status=True):
+                        status=True,
+                        n_jobs=None):
         """
 
         Wrapper for ``biovida.images.models.border_detection.border_detection()``.
@@ -396,34 +847,38 @@ class OpeniImageProcessing(object):
         :type min_border_separation: ``float``
         :param lower_bar_search_space: see ``biovida.images.models.border_detection()``.
         :type lower_bar_search_space: ``float``
-        :param new_analysis: rerun the analysis if it has already been computed. Defaults to ``False``.
+        :param new_analysis: rerun the analysis if it has already been computed, ignoring any results
+                             saved in the BioVida cache. Defaults to ``False``.
         :type new_analysis: ``bool``
         :param status: display status bar. Defaults to ``True``.
         :type status: ``bool``
+        :param n_jobs: the number of processes to use. If ``None``, the ``n_jobs`` value passed when
+                       instantiating the class will be used. Defaults to ``None``.
+        :type n_jobs: ``int`` or ``None``
         """
         if all(x in self.image_dataframe.columns for x in ['hbar', 'hborder', 'vborder']) and not new_analysis:
             return None
 
-        def ba_func(image):
-            return border_detection(image,
-                                    signal_strength_threshold=signal_strength_threshold,
-                                    min_border_separation=min_border_separation,
-                                    lower_bar_search_space=lower_bar_search_space,
-                                    report_signal_strength=False,
-                                    rescale_input_ndarray=True)
-
-        to_analyze = self._ndarray_extract()
+        border_detection_params = {'signal_strength_threshold': signal_strength_threshold,
+                                   'min_border_separation': min_border_separation,
+                                   'lower_bar_search_space': lower_bar_search_space}
+        analysis = partial(_border_image_analysis, border_detection_params=border_detection_params)
 
         # Run the analysis
-        border_analysis = [ba_func(i) for i in tqdm(to_analyze, desc='Border Analysis', disable=not status)]
+        items = [(i,) for i in self.image_dataframe['cached_images_path']]
+        border_analysis = self._image_analysis_map(analysis, items=items, n_jobs=n_jobs,
+                                                   desc='Border Analysis', status=status,
+                                                   store_name='border_analysis',
+                                                   params=tuple(sorted(border_detection_params.items())),
+                                                   new_analysis=new_analysis)
 
         # Convert to a dataframe
-        ba_df = pd.DataFrame(border_analysis).fillna(np.NaN)
+        ba_df = pd.DataFrame(border_analysis, index=self.image_dataframe.index).fillna(np.NaN)
 
-        # Update datafame
-        self.image_dataframe['hbar'] = ba_df['hbar']
-        self.image_dataframe['hborder'] = ba_df['hborder']
-        self.image_dataframe['vborder'] = ba_df['vborder']
+        # Update datafame (inferring the dtype of each column from its values, as ``_auto_analysis_batched()``
+        # does, rather than relying on ``fillna()`` to downcast columns which are entirely null).
+        for c in ('hbar', 'hborder', 'vborder'):
+            self.image_dataframe[c] = pd.Series(ba_df[c].tolist(), index=self.image_dataframe.index)
 
     @staticmethod
     def _h_crop_top_decision(x):
@@ -488,8 +943,8 @@ class OpeniImageProcessing(object):
         self.image_dataframe['upper_crop'] = self.image_dataframe.apply(self._h_crop_top_decision, axis=1)
         self.image_dataframe['lower_crop'] = self.image_dataframe.apply(self._h_crop_lower_decision, axis=1)
 
-    @staticmethod
-    def _apply_cropping(cached_images_path,
+    def _apply_cropping(self,
+                        cached_images_path,
                         lower_crop,
                         upper_crop,
                         vborder,
@@ -512,27 +967,10 @@ class OpeniImageProcessing(object):
         :return: the cropped image as either a PIL image or 2D ndarray.
         :rtype: ``PIL`` or ``2D ndarray``
         """
-        # Load the image
-        converted_image = Image.open(cached_images_path)
-
-        # Horizontal Cropping
-        if not items_null(lower_crop):
-            w, h = converted_image.size
-            converted_image = converted_image.crop(0, 0, w, int(lower_crop))
-        if not items_null(upper_crop):
-            w, h = converted_image.size
-            converted_image = converted_image.crop(0, int(upper_crop), w, h)
-
-        # Vertical Cropping
-        if not items_null(vborder):
-            w, h = converted_image.size
-            converted_image = converted_image.crop(int(vborder[0]), 0, int(vborder[1]), h)
-
-        if convert_to_rgb:
-            image_to_save = converted_image.convert("RGB")
-        else:
-            image_to_save = converted_image
-
+        image_to_save = self._image_loader[cached_images_path].cropped(lower_crop=lower_crop,
+                                                                       upper_crop=upper_crop,
+                                                                       vborder=vborder,
+                                                                       convert_to_rgb=convert_to_rgb)
         if return_as_array:
             return np.asarray(image_to_save)
         else:
@@ -572,7 +1010,7 @@ class OpeniImageProcessing(object):
 
         return all_cropped_images
 
-    def visual_image_problems(self, limit_to_known_modalities=True, new_analysis=False, status=True):
+    def visual_image_problems(self, limit_to_known_modalities=True, new_analysis=False, status=True, batch_size=32):
         """
 
         This method is powered by a Convolutional Neural Network which
@@ -583,13 +1021,24 @@ class OpeniImageProcessing(object):
         - arrows in images
         - images arrayed as grids
 
-        :param limit_to_known_modalities: if ``True``, remove model predicts for image modalities
-                                          the model has not explicitly been trained on. Defaults to ``True``.
+        :param limit_to_known_modalities: if ``True``, only pass images of modalities the model has explicitly been
+                                          trained on through the model. The 'visual_image_problems' column will be
+                                          NaN for all other images. See ``prediction_report``. Defaults to ``True``.
+
+                .. note::
+
+                    The 'image_modality_major' column is left as is. (Earlier versions set it to NaN for
+                    images of modalities the model has not been trained on.) Thus, ``auto_decision()``
+                    now applies its 'grayscale' test to these images as well (see ``auto_decision()``).
+
         :type limit_to_known_modalities: ``bool``
-        :param new_analysis: rerun the analysis if it has already been computed. Defaults to ``False``.
+        :param new_analysis: rerun the analysis if it has already been computed, ignoring any predictions
+                             saved in the BioVida cache. Defaults to ``False``.
         :type new_analysis: ``bool``
         :param status: display status bar. Defaults to ``True``.
         :type status: ``bool``
+        :param batch_size: the number of images to prepare and pass through the model at once. Defaults to 32.
+        :type batch_size: ``int``
 
 
         :Examples:
@@ -607,33 +1056,65 @@ class OpeniImageProcessing(object):
         if 'visual_image_problems' in self.image_dataframe.columns and not new_analysis:
             return None
 
-        cropped_images_for_analysis = self._cropper(return_as_array=True, status=status)
+        predictions = [np.NaN] * self.image_dataframe.shape[0]
+        rows = list(zip(*[self.image_dataframe[c] for c in ('cached_images_path', 'lower_crop',
+                                                            'upper_crop', 'vborder')]))
 
-        transformed_images = load_and_scale_images(list_of_images=cropped_images_for_analysis,
-                                                   image_size=self._ircnn.image_shape, status=status,
-                                                   desc='Preparing Images')
+        # Images of modalities the model has not been trained on are not passed to it (or even loaded).
+        if limit_to_known_modalities:
+            known = [i for i, modality in enumerate(self.image_dataframe['image_modality_major'])
+                     if modality in self.trained_open_i_modality_types]
+        else:
+            known = list(range(len(rows)))
+        self._prediction_counts['images'] += len(rows)
+        self._prediction_counts['unknown_modality'] += len(rows) - len(known)
+
+        def transform(row):
+            # Crop, resize and transpose the image (see ``biovida.images._image_tools.load_and_scale_images()``).
+            # Note: this is only called by the thread preparing batches for ``predict_batches()``.
+            return self._image_loader[row[0]].scaled(image_size=self._ircnn.image_shape,
+                                                     lower_crop=row[1], upper_crop=row[2], vborder=row[3])
+
+        # Obtain predictions for images the model has already seen (with the same crop box) from the store.
+        store = self._prediction_store() if self.cache_predictions else None
+        keys, to_predict = dict(), list()
+        for i in known:
+            if store is not None:
+                keys[i] = store.key(rows[i][0], _crop_key(*rows[i][1:]))
+                predictions[i] = None if new_analysis else store.get(keys[i])
+                if predictions[i] is not None:
+                    self._prediction_counts['cached'] += 1
+                    continue
+            to_predict.append(i)
+        self._prediction_counts['predicted'] += len(to_predict)
 
         # Scan Images for Visual Problems with Neural Network
-        self.image_dataframe['visual_image_problems'] = self._ircnn.predict(list_of_images=[transformed_images],
-                                                                            status=status, desc='Scanning for Problems')
-
-        if limit_to_known_modalities:  # ToDo: Temporary. Future: avoid passing through the model in the first place.
-            for index, row in self.image_dataframe.iterrows():
-                if row['image_modality_major'] not in self.trained_open_i_modality_types:
-                    self.image_dataframe.set_value(index, 'image_modality_major', np.NaN)
-
-    def auto_analysis(self, limit_to_known_modalities=True, new_analysis=False, status=True):
+        if len(to_predict):
+            batches = image_batches([rows[i] for i in to_predict], batch_size=batch_size, prepare=transform)
+            new_predictions = self._ircnn.predict_batches(batches, n_images=len(to_predict),
+                                                          status=status, desc='Scanning for Problems')
+            for i, prediction in zip(to_predict, new_predictions):
+                predictions[i] = prediction
+                if store is not None:
+                    store[keys[i]] = prediction
+
+        if store is not None:
+            self._save_store(store)
+
+        self.image_dataframe['visual_image_problems'] = predictions
+        if self._ircnn.throughput is not None:
+            self._prediction_counts['seconds_per_image'] = 1 / self._ircnn.throughput
+
+    def _auto_analysis_battery(self, limit_to_known_modalities, new_analysis, status):
         """
 
-        Automatically use the class methods to analyze the ``image_dataframe`` using default
-        parameter values for class methods.
+        Run all of the analyses on ``image_dataframe`` with default parameter values.
 
-        :param limit_to_known_modalities: if ``True``, remove model predicts for image modalities
-                                          the model has not explicitly been trained on. Defaults to ``True``.
+        :param limit_to_known_modalities: see ``auto_analysis()``.
         :type limit_to_known_modalities: ``bool``
-        :param new_analysis: rerun the analysis if it has already been computed. Defaults to ``False``.
+        :param new_analysis: see ``auto_analysis()``.
         :type new_analysis: ``bool``
-        :param status: display status bar. Defaults to ``True``.
+        :param status: see ``auto_analysis()``.
         :type status: ``bool``
         """
         # Run Analysis Battery with Default Parameter Values
@@ -648,6 +1129,130 @@ class OpeniImageProcessing(object):
         self.visual_image_problems(limit_to_known_modalities=limit_to_known_modalities,
                                    new_analysis=new_analysis, status=status)
 
+    def _auto_analysis_batch(self, batch_index, columns_to_compute, limit_to_known_modalities, new_analysis=False):
+        """
+
+        Run the analyses for the rows in ``image_dataframe`` given by ``batch_index`` and
+        write the results to ``image_dataframe``.
+
+        :param batch_index: index labels of the rows in ``image_dataframe`` to analyze.
+        :type batch_index: ``list``
+        :param columns_to_compute: the columns generated by the analyses which are to be (re)computed
+                                   (and written back to ``image_dataframe``).
+        :type columns_to_compute: ``list``
+        :param limit_to_known_modalities: see ``auto_analysis()``.
+        :type limit_to_known_modalities: ``bool``
+        :param new_analysis: if ``True``, ignore the results saved in the BioVida cache. Defaults to ``False``.
+        :type new_analysis: ``bool``
+        """
+        full_image_dataframe = self.image_dataframe
+
+        # The analysis methods operate on `image_dataframe`, so it is temporarily limited to the batch.
+        # Analyses whose columns are dropped will be computed, the rest will be skipped.
+        self.image_dataframe = full_image_dataframe.loc[batch_index].drop(columns_to_compute, axis=1)
+        try:
+            # Note: as the columns to compute have been dropped, `new_analysis` only
+            # determines whether or not the results saved in the BioVida cache are used.
+            self._auto_analysis_battery(limit_to_known_modalities=limit_to_known_modalities,
+                                        new_analysis=new_analysis, status=False)
+            batch_results = self.image_dataframe
+        finally:
+            self.image_dataframe = full_image_dataframe
+            # Release the pixels for this batch.
+            self._image_loader.clear()
+
+        for c in columns_to_compute:
+            for index, value in zip(batch_results.index, batch_results[c]):
+                self.image_dataframe.set_value(index, c, value)
+
+    def _auto_analysis_batched(self, batch_size, limit_to_known_modalities, new_analysis, status):
+        """
+
+        Run the analyses on ``batch_size`` images at a time, writing the results for each batch
+        to ``image_dataframe`` as it completes.
+
+        :param batch_size: the number of images to analyze at a time.
+        :type batch_size: ``int``
+        :param limit_to_known_modalities: see ``auto_analysis()``.
+        :type limit_to_known_modalities: ``bool``
+        :param new_analysis: see ``auto_analysis()``.
+        :type new_analysis: ``bool``
+        :param status: see ``auto_analysis()``.
+        :type status: ``bool``
+        """
+        # Columns generated by each of the analyses (as checked by the corresponding methods).
+        analyses_columns = (('grayscale',), ('medpix_logo_bounding_box',), ('hbar', 'hborder', 'vborder'),
+                            ('upper_crop', 'lower_crop'), ('visual_image_problems',))
+
+        columns_to_compute = list()
+        for columns in analyses_columns:
+            if new_analysis or not all(c in self.image_dataframe.columns for c in columns):
+                columns_to_compute += list(columns)
+        if not len(columns_to_compute):
+            return None
+
+        for c in columns_to_compute:
+            self.image_dataframe[c] = pd.Series([np.NaN] * self.image_dataframe.shape[0],
+                                                index=self.image_dataframe.index, dtype='object')
+
+        all_index = list(self.image_dataframe.index)
+        batches = [all_index[i:i + batch_size] for i in range(0, len(all_index), batch_size)]
+        completed = False
+        try:
+            # The stores of results are saved once, after the final batch (or on interruption), and
+            # the processes for each analysis (if ``n_jobs`` is not `1`) are started once.
+            with self._deferred_store_saves(), self._shared_analysis_pools():
+                for batch_index in tqdm(batches, desc='Auto Analysis (Batches)', disable=not status):
+                    self._auto_analysis_batch(batch_index,
+                                              columns_to_compute=columns_to_compute,
+                                              limit_to_known_modalities=limit_to_known_modalities,
+                                              new_analysis=new_analysis)
+            completed = True
+        finally:
+            if not completed:
+                # Remove incomplete columns s.t. they are not mistaken for the results of a complete analysis.
+                self.image_dataframe.drop(columns_to_compute, axis=1, inplace=True)
+
+        # Allow pandas to infer the dtype of the new columns (as it would if computed all at once).
+        for c in columns_to_compute:
+            self.image_dataframe[c] = pd.Series(self.image_dataframe[c].tolist(), index=self.image_dataframe.index)
+
+    def auto_analysis(self, limit_to_known_modalities=True, new_analysis=False, status=True, batch_size=None):
+        """
+
+        Automatically use the class methods to analyze the ``image_dataframe`` using default
+        parameter values for class methods.
+
+        :param limit_to_known_modalities: if ``True``, only pass images of modalities the model has explicitly been
+                                          trained on through the model (see ``visual_image_problems()``).
+                                          Defaults to ``True``.
+        :type limit_to_known_modalities: ``bool``
+        :param new_analysis: rerun the analysis if it has already been computed, ignoring any results
+                             saved in the BioVida cache. Defaults to ``False``.
+        :type new_analysis: ``bool``
+        :param status: display status bar. Defaults to ``True``.
+        :type status: ``bool``
+        :param batch_size: if an integer, pass ``batch_size`` images at a time through all of the analyses
+                           (writing the results to ``image_dataframe`` after each batch), s.t. no more than one
+                           batch of images is held in memory. If ``None``, each analysis is run on all
+                           images before the next analysis begins. Defaults to ``None``.
+
+                .. note::
+
+                    If the analysis is interrupted, the columns it was computing are removed from ``image_dataframe``.
+
+        :type batch_size: ``int`` or ``None``
+        """
+        if batch_size is None:
+            self._auto_analysis_battery(limit_to_known_modalities=limit_to_known_modalities,
+                                        new_analysis=new_analysis, status=status)
+        elif isinstance(batch_size, bool) or not isinstance(batch_size, int) or batch_size < 1:
+            raise ValueError("`batch_size` must be a positive integer or `None`.")
+        else:
+            self._auto_analysis_batched(batch_size=batch_size,
+                                        limit_to_known_modalities=limit_to_known_modalities,
+                                        new_analysis=new_analysis, status=status)
+
     @staticmethod
     def _invalid_image_tests(row, problems_to_ignore, valid_floor, image_problem_threshold=None):
         """
@@ -729,6 +1334,15 @@ class OpeniImageProcessing(object):
         :param problems_to_ignore: image problems to ignore. See ``INSTANCE.known_image_problems`` for valid values.
                                    Defaults to ``None``.
         :type problems_to_ignore: ``None``, ``list`` or ``tuple``
+
+        .. note::
+
+            An image is invalid if it is not grayscale, but its 'image_modality_major' is one of the (normally)
+            grayscale modalities, e.g., 'x_ray'. This test applies to all images, including those of modalities
+            the model has not been trained on, as ``visual_image_problems()`` no longer sets
+            'image_modality_major' to NaN for these images. Thus, images which were previously considered
+            valid may now be considered invalid (with 'grayscale' among their 'invalid_image_reasons').
+
         """
         for i in ('grayscale', 'image_problems_from_text', 'visual_image_problems'):
             if i not in self.image_dataframe.columns:
@@ -748,30 +1362,34 @@ class OpeniImageProcessing(object):
         self.image_dataframe['invalid_image_reasons'] = test_results[1].fillna(np.NaN)
 
     def auto(self, valid_floor=0.8, limit_to_known_modalities=True,
-             problems_to_ignore=None, new_analysis=False, status=True):
+             problems_to_ignore=None, new_analysis=False, status=True, batch_size=None):
         """
 
         Automatically carry out all aspects of image preprocessing (recommended).
 
         :param valid_floor: the smallest value needed for a 'valid_image' to be considered valid. Defaults to `0.8`.
         :type valid_floor: ``float``
-        :param limit_to_known_modalities: if ``True``, remove model predicts for image modalities
-                                          the model has not explicitly been trained on. Defaults to ``True``.
+        :param limit_to_known_modalities: if ``True``, only pass images of modalities the model has explicitly been
+                                          trained on through the model (see ``visual_image_problems()``).
+                                          Defaults to ``True``.
         :type limit_to_known_modalities: ``bool``
         :param problems_to_ignore: image problems to ignore. See ``INSTANCE.known_image_problems`` for valid values.
                                    Defaults to ``None``.
         :type problems_to_ignore: ``None``, ``list`` or ``tuple``
-        :param new_analysis: rerun the analysis if it has already been computed. Defaults to ``False``.
+        :param new_analysis: rerun the analysis if it has already been computed, ignoring any results
+                             saved in the BioVida cache. Defaults to ``False``.
         :type new_analysis: ``bool``
         :param status: display status bar. Defaults to ``True``.
         :type status: ``bool``
+        :param batch_size: see ``auto_analysis()``. Defaults to ``None``.
+        :type batch_size: ``int`` or ``None``
         :return: the `image_dataframe`, complete with the results of all possible analyses
                 (using default parameter values).
         :rtype: ``Pandas DataFrame``
         """
         # Run Auto Analysis
         self.auto_analysis(limit_to_known_modalities=limit_to_known_modalities,
-                           new_analysis=new_analysis, status=status)
+                           new_analysis=new_analysis, status=status, batch_size=batch_size)
 
         # Run Auto Decision
         self.auto_decision(problems_to_ignore=problems_to_ignore,
@@ -10,6 +10,7 @@ import numpy as np
 import pandas as pd
 from operator import sub
 from functools import reduce
+from numpy.lib.stride_tricks import as_strided
 
 
 from biovida.images._image_tools import load_image_rescale
@@ -20,15 +21,28 @@ def _rounder(l, by=3):
 
     Rounds all of the elements in an iterable.
 
+    Note: the result is identical to ``[round(float(x), by) for x in l]``. ``numpy.round()`` rounds ``x * 10**by``,
+    which can differ from rounding ``x`` itself when ``x * 10**by`` is (almost exactly) halfway between two
+    integers. The few elements for which this is the case are rounded with ``round()``.
+
     :param l: a list of values
-    :type l: ``list`` or ``tuple``
+    :type l: ``list``, ``tuple`` or ``ndarray``
     :param by:  If 0, the values will be converted to integers.
     :type by: ``int``
     :return: rounded numbers.
-    :rtype: ``list``
+    :rtype: ``ndarray``
     """
-    t = int if by == 0 else float
-    return list([round(t(x), by) for x in l])
+    arr = np.asarray(l, dtype='float64')
+    if by == 0:
+        return np.trunc(arr).astype('int64')
+
+    scalar = 10.0 ** by
+    scaled = arr * scalar
+    rounded = np.round(scaled) / scalar
+    halfway_distance = np.abs(np.abs(scaled - np.floor(scaled)) - 0.5)
+    for i in np.flatnonzero(halfway_distance <= 4 * np.abs(np.spacing(scaled))):
+        rounded[i] = round(float(arr[i]), by)
+    return rounded
 
 
 def _deltas(iterable):
@@ -37,12 +51,11 @@ def _deltas(iterable):
     Compute the _deltas between all adjacent elements in ``iterable``.
 
     :param iterable: an iterable structure
-    :type iterable: ``list`` or ``tuple``
+    :type iterable: ``list``, ``tuple`` or ``ndarray``
     :return: an array with the delta between juxtaposed entries.
     :rtype: ``ndarray``
     """
-    # Source: http://stackoverflow.com/a/2400875/4898004.
-    return np.array([abs(j-i) for i, j in zip(iterable, iterable[1:])])
+    return np.abs(np.diff(np.asarray(iterable)))
 
 
 def _largest_n_values(arr, n):
@@ -60,25 +73,6 @@ def _largest_n_values(arr, n):
     return tuple(sorted(arr.argsort()[-n:]))
 
 
-def _subsection(iterable, exclude, start, end):
-    """
-
-    Selects a subsection of an array, excluding a single subsection
-
-    :param iterable: some iterable data structure, which can be indexed.
-    :type iterable: ``list`` or ``tuple``
-    :param exclude: the index to exclude.
-    :type exclude: ``int``
-    :param start: where to start the slice.
-    :type start: ``int``
-    :param end: where to end the slice
-    :type end: ``int``
-    :return: a list of the desired subsection.
-    :rtype: ``list``
-    """
-    return iterable[start:exclude] + iterable[exclude+1:end]
-
-
 def _anomaly_removal(numeric_array, window=2):
     """
 
@@ -87,10 +81,19 @@ def _anomaly_removal(numeric_array, window=2):
 
     E.g., 0, 0, 0, 0, 99, 0, 0, 0, 0 --> 0, 0, 0, 0, 0, 0, 0, 0, 0.
 
-    :param numeric_array: must be a list or tuple. Numpy array will break this.
-    :param window:
-    :return: a list of smoothed values.
-    :rtype: ``list``
+    Specifically, with ``w = window`` (or ``window + 1`` if ``window > 2``), element ``i`` is replaced
+
+        - by element ``i + 1`` if ``i < w`` and the (up to) ``w`` elements after it are all equal.
+
+        - by element ``i - 1`` if ``i >= w`` and the ``w - 1`` elements before it and
+          the (up to) ``w - 1`` elements after it are all equal.
+
+    :param numeric_array: a 1D sequence of numbers.
+    :type numeric_array: ``list``, ``tuple`` or ``1D ndarray``
+    :param window: the size of the neighbourhood (see above).
+    :type window: ``int``
+    :return: an array of smoothed values.
+    :rtype: ``ndarray``
 
     :Example:
 
@@ -105,49 +108,58 @@ def _anomaly_removal(numeric_array, window=2):
         0.24677 --> 0.24677 .Change Made:  False
         0.24677 --> 0.24677 .Change Made:  False
     """
-    # Note: the logic is somewhat complex here...a mistake is possible.
+    arr = np.asarray(numeric_array)
+    n = len(arr)
 
-    if window <= 1 or window > len(numeric_array):
+    if window <= 1 or window > n:
         raise ValueError("`window` must be greater than 1 and less than the length of `numeric_array`.")
 
     if window > 2:
         window += 1
 
-    smoothed = list()
-    for i in range(len(numeric_array)):
-        # if can't look back
-        if i < window:
-            # If all forward neighbours are the same
-            if len(set(numeric_array[i+1:i+window+1])) == 1:
-                # Smooth using the next element
-                smoothed.append(numeric_array[i+1])
-            else:
-                # if not, leave 'as is'
-                smoothed.append(numeric_array[i])
-        # if can look back
-        if i >= window:
-            if len(set(_subsection(numeric_array, i, i-window+1, i+window))) == 1:
-                # smooth using the prior element (needed to prevent error at the end of the iterable).
-                smoothed.append(numeric_array[i-1])
-            else:
-                smoothed.append(numeric_array[i])
+    # ``changes[k]`` is the number of adjacent elements which differ in ``arr[:k + 1]``. Thus,
+    # ``arr[start:end]`` is homogeneous iff ``changes[end - 1] == changes[start]``.
+    changes = np.append(0, np.cumsum(arr[1:] != arr[:-1]))
+
+    def homogeneous(start, end):
+        return changes[end - 1] == changes[start]
+
+    index = np.arange(n)
+    has_next = index + 1 < n
+    nxt = np.minimum(index + 1, n - 1)
 
+    # Elements which can't look back: smooth using the next element, if all forward neighbours are the same.
+    forward = (index < window) & has_next & homogeneous(nxt, np.minimum(index + window + 1, n))
+
+    # Elements which can look back: smooth using the prior element if all neighbours
+    # (excluding the element itself) are the same.
+    prior = np.maximum(index - 1, 0)
+    backward = (index >= window) & homogeneous(np.maximum(index - window + 1, 0), np.maximum(index, 1))
+    backward &= ~has_next | (homogeneous(nxt, np.minimum(index + window, n)) & (arr[prior] == arr[nxt]))
+
+    smoothed = arr.copy()
+    smoothed[forward] = arr[nxt[forward]]
+    smoothed[backward] = arr[prior[backward]]
     return smoothed
 
 
 def _rolling_avg(iterable, window):
     """
 
-    Computes the rolling average using ``Pandas``.
+    Computes the rolling average.
 
     :param iterable: some iterable data structure, which can be indexed.
-    :type iterable: ``list`` or ``tuple``
+    :type iterable: ``list``, ``tuple`` or ``ndarray``
     :param window: the window for the rolling average.
     :type window: ``int``
     :return: the rolling average of the iterable. Note: center = ``False``.
     :rtype: ``Pandas Series``
     """
-    return pd.Series(iterable).rolling(center=False, window=window).mean().dropna()
+    arr = np.asarray(iterable, dtype='float64')
+    if window > len(arr):
+        return pd.Series([], dtype='float64')
+    windows = as_strided(arr, shape=(len(arr) - window + 1, window), strides=arr.strides * 2)
+    return pd.Series(windows.mean(axis=1), index=range(window - 1, len(arr))).dropna()
 
 
 def _array_cleaner(arr, round_by=5, anomaly_window=2):
@@ -164,8 +176,7 @@ def _array_cleaner(arr, round_by=5, anomaly_window=2):
     :return: an array of the smoothed values.
     :rtype: ``ndarray``
     """
-    rounded_arr = _rounder(arr, round_by)
-    return np.array(_anomaly_removal(rounded_arr, anomaly_window))
+    return _anomaly_removal(_rounder(arr, round_by), anomaly_window)
 
 
 def _largest_n_changes_with_values(iterable, n):
@@ -277,11 +288,11 @@ def _zero_var_axis_elements_remove(image, axis, rounding=3):
     :return: a matrix with rows/columns with standard deviation == 0 replaced with zero vectors.
     :rtype: ``ndarray``
     """
-    zero_var_items = np.where(np.round(np.std(image, axis=axis), rounding) == 0)
+    zero_var_items = np.round(np.std(image, axis=axis), rounding) == 0
     if axis == 0:
-        image[:, zero_var_items] = [0]
+        image[:, zero_var_items] = 0
     elif axis == 1:
-        image[zero_var_items] = [0]
+        image[zero_var_items] = 0
     return image
 
 
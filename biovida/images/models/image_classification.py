@@ -8,10 +8,12 @@
 """
 import os
 import pickle
+import numpy as np
+from time import time
 from warnings import warn
 
 from biovida.support_tools.support_tools import tqdm
-from biovida.images._image_tools import load_and_scale_images
+from biovida.images._image_tools import scaled_image_batches, prefetched
 
 # The model in `/_resources` was trained using Theano.
 # TensorFlow cannot be used to load these weights until
@@ -101,6 +103,9 @@ class ImageClassificationCNN(object):
         self.model = None
         self.data_classes = None
 
+        # Images per second achieved by the most recent call to ``predict()`` or ``predict_batches()``.
+        self.throughput = None
+
     def _train_gen(self):
         """
 
@@ -667,17 +672,63 @@ class ImageClassificationCNN(object):
         predictions = ((data_classes_reversed[e], i) for e, i in enumerate(single_image_prediction))
         return sorted(predictions, key=lambda x: x[1], reverse=True)
 
-    def predict(self, list_of_images, desc=None, status=True):
+    def predict_batches(self, batches, n_images, desc=None, status=True, prefetch=2):
+        """
+
+        Generate predictions for batches of images.
+
+        Batches are drawn from ``batches`` in a background thread, s.t. the next batches
+        can be prepared (e.g., read from disk) while predictions are being made for the current batch.
+        The throughput achieved (in images per second) is saved to ``throughput``.
+
+        :param batches: an iterable of ``ndarrays``, each containing images stacked along the first axis and
+                        preprocessed as required by the model (e.g., the yield of
+                        ``biovida.images._image_tools.scaled_image_batches()``).
+        :type batches: ``iterable``
+        :param n_images: the total number of images in ``batches`` (used for the status bar).
+        :type n_images: ``int``
+        :param desc: description for ``tqdm``.
+        :type desc: ``str`` or ``None``
+        :param status: True for a tqdm status bar; False for no status bar. Defaults to True.
+        :type status: ``bool``
+        :param prefetch: the number of batches to prepare ahead of the model. Defaults to 2.
+        :type prefetch: ``int``
+        :return: a list of lists with tuples of the form (name, probability).
+        :rtype: ``list``
+        """
+        if self.model is None:
+            raise AttributeError("Predictions cannot be made until a model is loaded or trained.")
+
+        predictions, start = list(), time()
+        with tqdm(total=n_images, desc=desc, disable=not status, unit='image') as status_bar:
+            for batch in prefetched(batches, max_prefetch=prefetch):
+                predictions += [self._prediction_labels(i) for i in self.model.predict(batch, batch_size=len(batch))]
+                status_bar.update(len(batch))
+
+        elapsed = time() - start
+        self.throughput = len(predictions) / elapsed if elapsed > 0 else None
+        return predictions
+
+    def predict(self, list_of_images, desc=None, status=True, batch_size=32, prefetch=2):
         """
 
         Generate Predictions for a list of images.
 
-        :param list_of_images: a list of paths (strings) to images or ``ndarrays``.
+        Images are loaded, scaled and normalized in batches of ``batch_size``, s.t. the memory
+        required does not grow with the number of images (see ``predict_batches()``).
+
+        :param list_of_images: a list of paths (strings) to images or ``ndarrays`` (preprocessed as required by
+                               the model). A list containing a single ``ndarray`` of images (stacked along the
+                               first axis) is also accepted.
         :type list_of_images: ``list``
         :param desc: description for ``tqdm``.
         :type desc: ``str`` or ``None``
         :param status: True for a tqdm status bar; False for no status bar. Defaults to True.
         :type status: ``bool``
+        :param batch_size: the number of images to pass through the model at once. Defaults to 32.
+        :type batch_size: ``int``
+        :param prefetch: the number of batches to prepare ahead of the model. Defaults to 2.
+        :type prefetch: ``int``
         :return: a list of lists with tuples of the form (name, probability). Defaults to False.
         :rtype: ``list``
         """
@@ -687,13 +738,17 @@ class ImageClassificationCNN(object):
         is_ndarray = [type(i).__name__ == 'ndarray' for i in list_of_images]
 
         if all(is_ndarray):
-            images = list_of_images
+            if len(list_of_images) == 1 and np.ndim(list_of_images[0]) == 4:
+                images = list_of_images[0]
+            else:
+                images = list_of_images
+            batches = (np.asarray(images[i:i + batch_size], dtype='float32')
+                       for i in range(0, len(images), batch_size))
         elif any(is_ndarray):
             raise ValueError("Only some of the items in `list_of_images` we found to be `ndarrays`.")
         else:
-            images = load_and_scale_images(list_of_images=list_of_images, image_size=self.image_shape,
-                                           status=status, grayscale_first=True,
-                                           desc='Preparing Images')
+            images = list_of_images
+            batches = scaled_image_batches(list_of_images, image_size=self.image_shape,
+                                           batch_size=batch_size, grayscale_first=True)
 
-        # ToDo: tqdm not working properly (see: https://github.com/bstriner/keras-tqdm).
-        return [self._prediction_labels(i) for i in tqdm(self.model.predict(images), desc=desc, disable=not status)]
+        return self.predict_batches(batches, n_images=len(images), desc=desc, status=status, prefetch=prefetch)
@@ -6,11 +6,16 @@
     ~~~~~~~~~~~~~~~~~
 
 """
+import os
+import pickle
+import hashlib
 import numpy as np
 from scipy.misc import imread
 from scipy.misc import imresize
 from skimage.feature import match_template
 
+from biovida.support_tools.support_tools import atomic_pickle_dump
+
 
 # Notes:
 #     See: http://scikit-image.org/docs/dev/api/skimage.feature.html#skimage.feature.match_template.
@@ -152,11 +157,291 @@ def _min_base_rescale(base, pattern, base_resizes, round_to=3):
     return tuple(base_resizes)
 
 
+# ----------------------------------------------------------------------------------------------------------
+# Normalized Cross-Correlation
+# ----------------------------------------------------------------------------------------------------------
+
+
+def _fast_fft_length(n):
+    """
+
+    :param n: a length.
+    :type n: ``int``
+    :return: the smallest integer >= ``n`` whose only prime factors are 2, 3 and 5
+             (lengths for which FFTs are fast).
+    :rtype: ``int``
+    """
+    best, power_of_two = 2 ** int(np.ceil(np.log2(max(n, 1)))), 1
+    while power_of_two < best:
+        power_of_three = power_of_two
+        while power_of_three < best:
+            candidate = power_of_three
+            while candidate < n:
+                candidate *= 5
+            best = min(best, candidate)
+            power_of_three *= 3
+        power_of_two *= 2
+    return best
+
+
+class _PreparedPattern(object):
+    """
+
+    A pattern image with the statistics required by ``_normalized_cross_correlation()`` precomputed,
+    s.t. they are not recomputed for every (scaled) base image the pattern is compared against.
+
+    :param pattern: the pattern image as a 2D array.
+    :type pattern: ``2D ndarray``
+    """
+
+    def __init__(self, pattern):
+        pattern = np.asarray(pattern, dtype='float64')
+        self.shape = pattern.shape
+        self.size = pattern.size
+        self.zero_mean = pattern - pattern.mean()
+        self.sum_of_squares = np.sum(self.zero_mean ** 2)
+        self._spectra = dict()
+
+    def __getstate__(self):
+        # The spectra are specific to the shapes of the images the pattern has been compared
+        # against, so they are not sent to other processes.
+        state = dict(self.__dict__)
+        state['_spectra'] = dict()
+        return state
+
+    def spectrum(self, fft_shape):
+        """
+
+        :param fft_shape: the shape of the FFT.
+        :type fft_shape: ``tuple``
+        :return: the complex conjugate of the (real) FFT of the zero mean pattern, zero padded to ``fft_shape``.
+        :rtype: ``2D ndarray``
+        """
+        if fft_shape not in self._spectra:
+            self._spectra[fft_shape] = np.conj(np.fft.rfft2(self.zero_mean, s=fft_shape))
+        return self._spectra[fft_shape]
+
+
+def _window_sums(image, window_shape):
+    """
+
+    :param image: an image as a 2D array.
+    :type image: ``2D ndarray``
+    :param window_shape: the shape of the window.
+    :type window_shape: ``tuple``
+    :return: the sum of ``image`` inside every position a window of ``window_shape`` can
+             take without leaving the image (computed with an integral image).
+    :rtype: ``2D ndarray``
+    """
+    h, w = window_shape
+    integral = np.zeros((image.shape[0] + 1, image.shape[1] + 1))
+    integral[1:, 1:] = image.cumsum(axis=0).cumsum(axis=1)
+    return integral[h:, w:] - integral[:-h, w:] - integral[h:, :-w] + integral[:-h, :-w]
+
+
+def _normalized_cross_correlation(image, prepared_pattern):
+    """
+
+    Compute the normalized cross-correlation of ``image`` and a pattern.
+    Equivalent to ``skimage.feature.match_template(image, pattern)``, i.e., only positions where
+    the pattern lies entirely inside ``image`` are considered. The cross-correlation is computed
+    with FFTs and the local statistics of ``image`` with integral images.
+
+    :param image: an image as a 2D array.
+    :type image: ``2D ndarray``
+    :param prepared_pattern: the pattern.
+    :type prepared_pattern: ``_PreparedPattern``
+    :return: the correlation coefficient for each position. ``None`` if the pattern is larger than ``image``.
+    :rtype: ``2D ndarray`` or ``None``
+    """
+    image = np.asarray(image, dtype='float64')
+    (h, w), (ph, pw) = image.shape, prepared_pattern.shape
+    if h < ph or w < pw:
+        return None
+
+    # Note: circular wrap-around cannot reach positions where the pattern lies entirely inside the image.
+    fft_shape = (_fast_fft_length(h), _fast_fft_length(w))
+    spectrum = np.fft.rfft2(image, s=fft_shape) * prepared_pattern.spectrum(fft_shape)
+    numerator = np.fft.irfft2(spectrum, s=fft_shape)[:h - ph + 1, :w - pw + 1]
+
+    image_sums = _window_sums(image, (ph, pw))
+    image_sums_of_squares = _window_sums(image ** 2, (ph, pw))
+    image_variance = image_sums_of_squares - image_sums ** 2 / prepared_pattern.size
+    denominator = np.sqrt(np.maximum(image_variance, 0) * prepared_pattern.sum_of_squares)
+
+    response = np.zeros_like(numerator)
+    mask = denominator > np.finfo('float64').eps
+    response[mask] = numerator[mask] / denominator[mask]
+    return response
+
+
+# ----------------------------------------------------------------------------------------------------------
+# Engines
+# ----------------------------------------------------------------------------------------------------------
+
+
+def _match_entry(location, match_quality, scale, pattern_shape, base_h_crop):
+    """
+
+    :param location: the top left corner of the match in the scaled base image. Form: ``(x, y)``.
+    :type location: ``tuple``
+    :param match_quality: the quality of the match.
+    :type match_quality: ``float``
+    :param scale: the amount the (cropped) base image was scaled by.
+    :type scale: ``float``
+    :param pattern_shape: the shape of the pattern image.
+    :type pattern_shape: ``tuple``
+    :param base_h_crop: the number of columns cropped from the left of the base image.
+    :type base_h_crop: ``int``
+    :return: a tuple of the form ``(top left corner, bottom right corner, match quality)``, with
+             the corners expressed in the coordinates of the (uncropped and unscaled) base image.
+    :rtype: ``tuple``
+    """
+    top_left_adj = np.ceil(np.array(location) / float(scale)) + np.array([base_h_crop, 0])
+    bottom_right = top_left_adj + np.floor(np.array(pattern_shape)[::-1] / scale)
+    return list(top_left_adj), list(bottom_right), match_quality
+
+
+def _pyramid_factor(pattern, min_coarse_pattern_size=8, max_factor=4):
+    """
+
+    :param pattern: the pattern image as a 2D array.
+    :type pattern: ``2D ndarray``
+    :param min_coarse_pattern_size: the minimum length of the pattern's smallest axis after downsampling.
+    :type min_coarse_pattern_size: ``int``
+    :param max_factor: the largest downsampling factor to use.
+    :type max_factor: ``int``
+    :return: the factor by which to downsample the images for the coarse search
+             in ``_pyramid_matching_engine()``. If 1, no coarse search is performed.
+    :rtype: ``int``
+    """
+    return int(max(1, min(max_factor, min(pattern.shape) // min_coarse_pattern_size)))
+
+
+class _PatternPyramid(object):
+    """
+
+    A pattern image, prepared for ``_pyramid_matching_engine()``. That is, with its
+    statistics precomputed at full resolution and after it has been downsampled for the coarse search.
+
+    :param pattern: the pattern image as a 2D array.
+    :type pattern: ``2D ndarray``
+    :param coarse_pattern: ``pattern`` downsampled by ``factor``. If ``None``, it will be computed. Defaults to ``None``.
+    :type coarse_pattern: ``2D ndarray`` or ``None``
+    :param factor: the downsampling factor. If ``None``, it will be determined by ``_pyramid_factor()``.
+                   Defaults to ``None``.
+    :type factor: ``int`` or ``None``
+    """
+
+    def __init__(self, pattern, coarse_pattern=None, factor=None):
+        self.pattern = np.asarray(pattern, dtype='float64')
+        self.factor = _pyramid_factor(self.pattern) if factor is None else factor
+        self.full = _PreparedPattern(self.pattern)
+        if self.factor > 1:
+            if coarse_pattern is None:
+                coarse_pattern = imresize(self.pattern, 1.0 / self.factor, interp='lanczos')
+            self.coarse_pattern = np.asarray(coarse_pattern, dtype='float64')
+            self.coarse = _PreparedPattern(self.coarse_pattern)
+        else:
+            self.coarse_pattern, self.coarse = self.pattern, self.full
+
+    @property
+    def shape(self):
+        return self.pattern.shape
+
+    def state(self):
+        """
+
+        :return: the state required to recreate the pyramid (without recomputing the downsampled pattern).
+        :rtype: ``dict``
+        """
+        return {'pattern': self.pattern, 'coarse_pattern': self.coarse_pattern, 'factor': self.factor}
+
+
+def _pyramid_matching_engine(base, pattern, base_resizes, base_image_cropping, end_search_threshold,
+                             n_candidates=3):
+    """
+
+    Search for ``pattern`` in ``base`` at various sizes of the base image using an image pyramid.
+
+    1. Coarse search: the (cropped) base image and the pattern are downsampled (see ``_pyramid_factor()``)
+       and the normalized cross-correlation is computed for every scale in ``base_resizes``.
+
+    2. Refinement: for the ``n_candidates`` scales with the strongest coarse matches, the normalized
+       cross-correlation is computed at full resolution, but only in a small window around the coarse match.
+
+    :param base: the base image (typically cropped)
+    :type base: ``2D ndarray``
+    :param pattern: the pattern image
+    :type pattern: ``2D ndarray`` or ``_PatternPyramid``
+    :param base_resizes: the range over which to rescale the base image.Define as a tuple of the
+                         form ``(start, end, step size)``.
+    :type base_resizes: ``tuple``
+    :param base_image_cropping: see ``robust_match_template()``.
+    :type base_image_cropping: ``tuple``
+    :param end_search_threshold: if a match of this quality is found during refinement, end the search.
+                                 Set ``None`` to disable.
+    :type end_search_threshold: ``float`` or  ``None``
+    :param n_candidates: the number of scales to refine. Defaults to 3.
+    :type n_candidates: ``int``
+    :return: a dictionary of the same form as the one returned by ``_matching_engine()``,
+             populated for the scales which were refined.
+    :rtype: ``dict``
+    """
+    # Crop the base image
+    base_h_crop = int(base.shape[1] * base_image_cropping[1])
+    cropped_base = _cropper(base, v_prop=base_image_cropping[0], h_prop=base_image_cropping[1])
+
+    pyramid = pattern if isinstance(pattern, _PatternPyramid) else _PatternPyramid(pattern)
+
+    # Apply tool to ensure the base will always be larger than the pattern
+    start, end, step = _min_base_rescale(cropped_base, pyramid.pattern, base_resizes, round_to=3)
+    scales = _arange_one_first(start=start, end=end, step=step)
+
+    factor = pyramid.factor
+    coarse_base = imresize(cropped_base, 1.0 / factor, interp='lanczos') if factor > 1 else cropped_base
+
+    match_dict, coarse_matches = dict(), list()
+    for scale in scales:
+        try:
+            response = _normalized_cross_correlation(imresize(coarse_base, scale, interp='lanczos'), pyramid.coarse)
+        except ValueError:  # the image has been scaled to nothing.
+            continue
+        if response is None:
+            continue
+        y, x = np.unravel_index(np.argmax(response), response.shape)
+        if factor == 1:  # the coarse search was performed at full resolution.
+            match_dict[scale] = _match_entry((x, y), response[y, x], scale, pyramid.shape, base_h_crop)
+        coarse_matches.append((response[y, x], scale, x * factor, y * factor))
+
+    if factor == 1:
+        return match_dict
+
+    ph, pw = pyramid.shape
+    margin = 2 * factor + 1
+    for _, scale, x, y in sorted(coarse_matches, key=lambda m: m[0], reverse=True)[:n_candidates]:
+        scaled_cropped_base = imresize(cropped_base, scale, interp='lanczos')
+        top, left = max(y - margin, 0), max(x - margin, 0)
+        window = scaled_cropped_base[top:y + ph + margin, left:x + pw + margin]
+        response = _normalized_cross_correlation(window, pyramid.full)
+        if response is None:
+            continue
+        wy, wx = np.unravel_index(np.argmax(response), response.shape)
+        match_quality = response[wy, wx]
+        match_dict[scale] = _match_entry((left + wx, top + wy), match_quality, scale, pyramid.shape, base_h_crop)
+
+        if isinstance(end_search_threshold, (int, float)):
+            if match_quality >= end_search_threshold:
+                break
+
+    return match_dict
+
+
 def _matching_engine(base, pattern, base_resizes, base_image_cropping, end_search_threshold):
     """
 
     Runs ``skimage.feature.match_template()`` against ``base`` for a given ``pattern``
-    at various sizes of the base image.
+    at various sizes of the base image (exhaustively, at full resolution).
 
     :param base: the base image (typically cropped)
     :type base: ``2D ndarray``
@@ -205,6 +490,124 @@ def _matching_engine(base, pattern, base_resizes, base_image_cropping, end_searc
     return match_dict
 
 
+# ----------------------------------------------------------------------------------------------------------
+# Template Registry
+# ----------------------------------------------------------------------------------------------------------
+
+
+class _TemplateRegistry(object):
+    """
+
+    Prepares pattern images (e.g., the MedPix logo) for ``_pyramid_matching_engine()``
+    once per process, rather than once per base image.
+
+    If a ``save_directory`` is provided to ``get()``, the prepared pyramid is also saved to disk,
+    s.t. it can be reused by other processes and sessions. Saved pyramids are rebuilt
+    if the pattern image they were built from changes.
+
+    """
+
+    # Increment if the form of the saved pyramids changes.
+    _version = 1
+
+    def __init__(self):
+        self._pyramids = dict()
+
+    def __len__(self):
+        return len(self._pyramids)
+
+    def clear(self):
+        """
+
+        Remove all prepared patterns from memory (saved pyramids are not deleted).
+
+        """
+        self._pyramids = dict()
+
+    @staticmethod
+    def _pyramid_save_path(path, save_directory):
+        """
+
+        :param path: the path to a pattern image.
+        :type path: ``str``
+        :param save_directory: the directory in which to save the prepared pyramid.
+        :type save_directory: ``str``
+        :return: the path to which the pyramid for ``path`` is saved, e.g., '.../medpix_logo_pyramid.p'.
+        :rtype: ``str``
+        """
+        return os.path.join(save_directory, "{0}_pyramid.p".format(os.path.splitext(os.path.basename(path))[0]))
+
+    def _load_pyramid(self, save_path, digest):
+        """
+
+        :param save_path: the path to a saved pyramid.
+        :type save_path: ``str``
+        :param digest: the SHA-1 digest of the pattern image the pyramid must have been built from.
+        :type digest: ``str``
+        :return: the saved pyramid, if it exists and is current. Otherwise ``None``.
+        :rtype: ``_PatternPyramid`` or ``None``
+        """
+        if not os.path.isfile(save_path):
+            return None
+        try:
+            with open(save_path, "rb") as f:
+                saved = pickle.load(f)
+        except (EOFError, pickle.UnpicklingError):
+            return None
+        if saved.get('version') != self._version or saved.get('digest') != digest:
+            return None
+        return _PatternPyramid(**saved['state'])
+
+    def _save_pyramid(self, pyramid, save_path, digest):
+        """
+
+        :param pyramid: a prepared pyramid.
+        :type pyramid: ``_PatternPyramid``
+        :param save_path: the path to save ``pyramid`` to.
+        :type save_path: ``str``
+        :param digest: the SHA-1 digest of the pattern image ``pyramid`` was built from.
+        :type digest: ``str``
+        """
+        atomic_pickle_dump({'version': self._version, 'digest': digest, 'state': pyramid.state()}, save_path)
+
+    def get(self, path, save_directory=None):
+        """
+
+        Get the prepared pyramid for a pattern image.
+
+        :param path: the path to the pattern image, e.g., the MedPix logo.
+        :type path: ``str``
+        :param save_directory: a directory in which to save the prepared pyramid. If ``None``, it will
+                               only be retained in memory. Defaults to ``None``.
+        :type save_directory: ``str`` or ``None``
+        :return: the prepared pyramid.
+        :rtype: ``_PatternPyramid``
+        """
+        stat = os.stat(path)
+        key = (os.path.abspath(path), stat.st_mtime, stat.st_size)
+        if key in self._pyramids:
+            return self._pyramids[key]
+
+        pyramid = None
+        if save_directory is not None:
+            with open(path, "rb") as f:
+                digest = hashlib.sha1(f.read()).hexdigest()
+            save_path = self._pyramid_save_path(path, save_directory)
+            pyramid = self._load_pyramid(save_path, digest=digest)
+
+        if pyramid is None:
+            pyramid = _PatternPyramid(imread(path, flatten=True))
+            if save_directory is not None:
+                self._save_pyramid(pyramid, save_path=save_path, digest=digest)
+
+        self._pyramids[key] = pyramid
+        return pyramid
+
+
+# The pattern images prepared by the current process.
+template_registry = _TemplateRegistry()
+
+
 def _corners_calc(top_left, bottom_right):
     """
 
@@ -230,7 +633,8 @@ def robust_match_template(pattern_image,
                           base_image,
                           base_resizes=(0.5, 2.5, 0.1),
                           end_search_threshold=0.875,
-                          base_image_cropping=(0.15, 0.5)):
+                          base_image_cropping=(0.15, 0.5),
+                          method='pyramid'):
     """
 
     Search for a pattern image in a base image using a algorithm which is robust
@@ -245,14 +649,14 @@ def robust_match_template(pattern_image,
 
     - This function may become unstable in situations where the pattern image is larger than the base image.
 
-    :param pattern_image: the pattern image.
+    :param pattern_image: the pattern image. Paths are prepared once per process (see ``template_registry``).
 
             .. warning::
 
                     If a `ndarray` is passed to `pattern_image`, it *must* be preprocessed to be a 2D array,
                     e.g., ``scipy.misc.imread(pattern_image, flatten=True)``
 
-    :type pattern_image: ``str`` or ``ndarray``
+    :type pattern_image: ``str``, ``ndarray`` or ``_PatternPyramid``
     :param base_image: the base image in which to look for the ``pattern_image``.
 
              .. warning::
@@ -280,6 +684,16 @@ def robust_match_template(pattern_image,
       However, if the image is cropped too much, the target pattern itself could be removed.
 
     :type base_image_cropping: ``tuple``
+    :param method: one of:
+
+                    - 'pyramid': search for the pattern in downsampled versions of the images and then refine the
+                       strongest matches at full resolution (see ``_pyramid_matching_engine()``).
+
+                    - 'exhaustive': search for the pattern at full resolution for every scale
+                       in ``base_resizes`` (see ``_matching_engine()``).
+
+                   Defaults to 'pyramid'.
+    :type method: ``str``
     :return: A dictionary of the form: ``{"bounding_box": ..., "match_quality": ..., "base_image_shape": ...}``.
 
             - bounding_box (``dict``): ``{'bottom_right': (x, y), 'top_right': (x, y), 'top_left': (x, y), 'bottom_left': (x, y)}``.
@@ -290,10 +704,23 @@ def robust_match_template(pattern_image,
 
     :rtype: ``dict``
     """
-    pattern = _robust_match_template_loading(pattern_image, "pattern_image")
+    if isinstance(pattern_image, str):
+        pattern = template_registry.get(pattern_image)
+    elif isinstance(pattern_image, _PatternPyramid):
+        pattern = pattern_image
+    else:
+        pattern = _robust_match_template_loading(pattern_image, "pattern_image")
     base = _robust_match_template_loading(base_image, "base_image")
 
-    match_dict = _matching_engine(base, pattern, base_resizes, base_image_cropping, end_search_threshold)
+    if method == 'pyramid':
+        engine = _pyramid_matching_engine
+    elif method == 'exhaustive':
+        engine = _matching_engine
+        pattern = pattern.pattern if isinstance(pattern, _PatternPyramid) else pattern
+    else:
+        raise ValueError("`method` must be one of: 'pyramid', 'exhaustive'.")
+
+    match_dict = engine(base, pattern, base_resizes, base_image_cropping, end_search_threshold)
 
     if len(list(match_dict.keys())):
         best_match = max(list(match_dict.values()), key=lambda x: x[2])
@@ -7,19 +7,26 @@
 
 """
 import os
+import json
 import shutil
 import pickle
-import requests
+from time import time
+from tempfile import mkstemp
 import numpy as np
 import pandas as pd
 from math import floor
 from copy import deepcopy
+from warnings import warn
 from datetime import datetime
 
 from biovida import __version_numeric__
 
 # General Image Support Tools
-from biovida.images._image_tools import NoResultsFound, sleep_with_noise
+from biovida.images._image_tools import (NoResultsFound,
+                                         RateLimiter,
+                                         PerHostLimiter,
+                                         ordered_thread_map,
+                                         bounded_thread_imap)
 
 # Database Management
 from biovida.images.image_cache_mgmt import (_records_db_merge,
@@ -28,7 +35,7 @@ from biovida.images.image_cache_mgmt import (_records_db_merge,
                                              _prune_rows_with_deleted_images)
 
 # Interface Support tools
-from biovida.images._interface_support.shared import save_records_db
+from biovida.images._interface_support.shared import save_records_db, DataFrameShardStore
 
 from biovida.images._interface_support.openi.openi_support_tools import (iter_join,
                                                                          url_combine,
@@ -39,10 +46,12 @@ from biovida.images._interface_support.openi.openi_support_tools import (iter_jo
 # Open-i API Parameters Information
 from biovida.images._interface_support.openi.openi_parameters import openi_search_information
 from biovida.images._interface_support.openi._openi_image_id_processing import image_id_short_gen
-from biovida.images._interface_support.openi.openi_text_processing import openi_raw_extract_and_clean
+from biovida.images._interface_support.openi.openi_text_processing import (openi_raw_extract_and_clean,
+                                                                           openi_raw_extract_and_clean_streaming)
 
 # Cache Management
 from biovida.support_tools._cache_management import package_cache_creator
+from biovida.support_tools.http_session import http_get
 
 # General Support Tools
 from biovida.support_tools.support_tools import (tqdm,
@@ -186,7 +195,7 @@ class _OpeniSearch(object):
         :rtype: ``tuple``
         """
         # Get a sample request
-        sample = requests.get(search_query + "&m=1&n=1").json()
+        sample = http_get(search_query + "&m=1&n=1").json()
 
         try:
             total = int(float(sample['total']))
@@ -380,21 +389,23 @@ class _OpeniRecords(object):
     :type cache_path: ``str``
     :param req_limit: Defaults to 30 (max allowed by Open-i; see: https://openi.nlm.nih.gov/services.php?it=xg).
     :type req_limit: ``int``
+    :param temp_directory_path: path to the 'openi/databases/__temp__' directory. If not ``None``, blocks of
+                                records will be checkpointed to this directory as they are harvested s.t.
+                                an interrupted pull can be resumed. Defaults to ``None``.
+    :type temp_directory_path: ``str`` or ``None``
     """
 
-    def __init__(self, root_url, date_format, verbose, cache_path, req_limit=30):
+    def __init__(self, root_url, date_format, verbose, cache_path, req_limit=30, temp_directory_path=None):
         self.root_url = root_url
         self.date_format = date_format
         self._verbose = verbose
         self._cache_path = cache_path
         self.req_limit = req_limit
+        self.temp_directory_path = temp_directory_path
 
         self.records_db = None
         self.download_limit = 100  # set to reasonable default.
 
-        # Sleep Time
-        self.records_sleep_time = None
-
     def openi_bounds(self, total):
         """
         
@@ -419,7 +430,7 @@ class _OpeniRecords(object):
             raise ValueError("`download_limit` cannot be less than 1.")
 
         if total < self.req_limit:
-            return [(1, total)]
+            return [(1, total)], total
         elif self.download_limit is not None and total > self.download_limit:
             download_no = self.download_limit
         else:
@@ -531,7 +542,7 @@ class _OpeniRecords(object):
         :rtype: ``list``
         """
         # Request data from the Open-i servers
-        req = requests.get(url + bound).json()['list']
+        req = http_get(url + bound).json()['list']
 
         root_url_columns = ('detailed_query_url', 'get_article_figures',
                             'similar_in_collection', 'similar_in_results')
@@ -559,47 +570,248 @@ class _OpeniRecords(object):
 
         return list_of_dicts
 
-    def _records_pull_engine(self, bounds_list, search_url, to_harvest, records_sleep_time, download_no):
+    @property
+    def _checkpoint_path(self):
+        """Path to the file which harvested blocks of records are checkpointed to."""
+        if self.temp_directory_path is None:
+            return None
+        return os.path.join(self.temp_directory_path, "records_pull_blocks.jsonl")
+
+    def _load_checkpoint(self, search_url, bounds_list, load_records=True):
+        """
+
+        Load the blocks of records checkpointed by an earlier (interrupted) pull of the same search.
+
+        The first line of the checkpoint file identifies the search. Each subsequent line
+        is a JSON object of the form ``{"bound": ..., "records": [...]}``.
+
+        :param search_url: search URL as generated by ``_OpeniSearch().search()``.
+        :type search_url: ``str``
+        :param bounds_list: see ``_records_pull_engine()``.
+        :type bounds_list: ``list``
+        :param load_records: if ``False``, the records themselves are not retained (``None`` is used
+                             in their place). Defaults to ``True``.
+        :type load_records: ``bool``
+        :return: a dictionary of the form ``{bound: list of records, ...}``.
+        :rtype: ``dict``
+        """
+        checkpoint_path = self._checkpoint_path
+        if checkpoint_path is None or not os.path.isfile(checkpoint_path):
+            return dict()
+
+        completed = dict()
+        with open(checkpoint_path, "r") as f:
+            try:
+                checkpoint_header = json.loads(f.readline())
+            except ValueError:
+                return dict()
+            if checkpoint_header != {'search_url': search_url, 'bounds': bounds_list}:
+                return dict()  # the checkpoint is for a different search.
+            for line in f:
+                try:
+                    block = json.loads(line)
+                    completed[block['bound']] = block['records'] if load_records else None
+                except (ValueError, KeyError):
+                    continue  # e.g., a partially written final line.
+
+        return completed
+
+    def _iter_checkpoint_blocks(self, bounds_list):
+        """
+
+        Read the blocks of records in the checkpoint file, one at a time.
+
+        :param bounds_list: see ``_records_pull_engine()``. All bounds in this list must be in the checkpoint file.
+        :type bounds_list: ``list``
+        :return: the list of records for each bound in ``bounds_list`` (in the same order).
+        :rtype: ``generator``
+        """
+        # Blocks are written to the checkpoint in the order they were obtained,
+        # so note where each one begins and then read them in the order requested.
+        offsets = dict()
+        with open(self._checkpoint_path, "rb") as f:
+            f.readline()  # header
+            while True:
+                offset = f.tell()
+                line = f.readline()
+                if not line:
+                    break
+                try:
+                    offsets[json.loads(line.decode('utf-8'))['bound']] = offset
+                except (ValueError, KeyError):
+                    continue  # e.g., a partially written final line.
+
+            for bound in bounds_list:
+                f.seek(offsets[bound])
+                yield json.loads(f.readline().decode('utf-8'))['records']
+
+    def _truncate_checkpoint(self):
+        """
+
+        Truncate the checkpoint file to the end of its last complete line, s.t. blocks appended
+        to it are not joined to a line which was only partially written by an interrupted pull.
+
+        """
+        end = 0
+        with open(self._checkpoint_path, "rb+") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                end += len(line)
+            f.truncate(end)
+
+    def _checkpoint_chunks(self, bounds_list, chunk_size):
+        """
+
+        Group the blocks of records in the checkpoint file into dataframes.
+
+        :param bounds_list: see ``_records_pull_engine()``.
+        :type bounds_list: ``list``
+        :param chunk_size: the min. number of records in each dataframe (save, possibly, the last).
+        :type chunk_size: ``int``
+        :return: dataframes of raw records.
+        :rtype: ``generator``
+        """
+        chunk = list()
+        for block in self._iter_checkpoint_blocks(bounds_list):
+            chunk += block
+            if len(chunk) >= chunk_size:
+                yield pd.DataFrame(chunk).fillna(np.NaN)
+                chunk = list()
+        if len(chunk):
+            yield pd.DataFrame(chunk).fillna(np.NaN)
+
+    def _records_pull_engine(self, bounds_list, search_url, to_harvest, max_workers, rate_limit, download_no,
+                             keep_blocks=True):
         """
         
         Download all records requested by the user.
 
+        Blocks (chunks) are requested concurrently, but are assembled in the order given by ``bounds_list``.
+
         :param bounds_list: a list of bounds (chunks), e.g., ``["&m=1&n=30", "&m=31&n=59"...]``. 
         :type bounds_list: ``list``
         :param search_url: search URL as generated by ``_OpeniSearch().search()``.
         :type search_url: ``str``
         :param to_harvest: yield of ``harvest_vector()``.
         :type to_harvest: ``list``
-        :param records_sleep_time: (every x downloads, period of time [seconds])
-        :type records_sleep_time: ``tuple`` or ``None``
+        :param max_workers: the max. number of blocks which can be requested at any one time.
+        :type max_workers: ``int``
+        :param rate_limit: the max. number of requests to send to Open-i per second. If ``None``, no limit is imposed.
+        :type rate_limit: ``int``, ``float`` or ``None``
         :param download_no: the number of records to download.
         :type download_no: ``int``
+        :param keep_blocks: if ``False``, harvested blocks are only written to the checkpoint file
+                            (see ``_iter_checkpoint_blocks()``) and ``None`` is returned. Defaults to ``True``.
+        :type keep_blocks: ``bool``
         :return: a list of dictionaries where the keys are future columns of the ``records_db`` dataframe.
-        :rtype: ``list``
+        :rtype: ``list`` or ``None``
         """
         if self._verbose:
             print("\nNumber of Records to Download: {0} (chunk size: {1} records).".format(
                 '{:,.0f}'.format(download_no), str(self.req_limit)))
 
-        do_sleep = isinstance(records_sleep_time, (list, tuple)) and len(records_sleep_time) == 2
+        completed = self._load_checkpoint(search_url, bounds_list=bounds_list, load_records=keep_blocks)
+        bounds_to_harvest = [b for b in bounds_list if b not in completed]
+        if len(completed) and self._verbose:
+            print("Resuming from checkpoint ({0} of {1} chunks already obtained).".format(
+                len(bounds_list) - len(bounds_to_harvest), len(bounds_list)))
+
+        def block_harvest(bound):
+            return self.openi_block_harvest(search_url, bound=bound, to_harvest=to_harvest)
+
+        checkpoint_file = None
+        if self._checkpoint_path is not None:
+            if not os.path.isdir(self.temp_directory_path):
+                os.makedirs(self.temp_directory_path)
+            if not len(completed):
+                with open(self._checkpoint_path, "w") as f:
+                    f.write(json.dumps({'search_url': search_url, 'bounds': bounds_list}) + "\n")
+            else:
+                self._truncate_checkpoint()
+            checkpoint_file = open(self._checkpoint_path, "a")
+
+        # Blocks are consumed (and written to the checkpoint file) as they complete. No more than
+        # ``2 * max_workers`` blocks are outstanding at any one time, s.t. memory use does not
+        # grow with the size of the pull when ``keep_blocks=False``.
+        harvest = bounded_thread_imap(func=block_harvest,
+                                      iterable=bounds_to_harvest,
+                                      max_workers=max_workers,
+                                      rate_limiter=RateLimiter(rate=rate_limit))
+        try:
+            for position, block in tqdm(harvest, total=len(bounds_to_harvest),
+                                        desc='Obtaining Records', disable=not self._verbose):
+                if keep_blocks:
+                    completed[bounds_to_harvest[position]] = block
+                if checkpoint_file is not None:
+                    checkpoint_file.write(json.dumps({'bound': bounds_to_harvest[position], 'records': block}) + "\n")
+                    checkpoint_file.flush()
+        finally:
+            harvest.close()
+            if checkpoint_file is not None:
+                checkpoint_file.close()
+
+        if not keep_blocks:
+            return None
 
         harvested_data = list()
-        for c, bound in enumerate(tqdm(bounds_list, desc='Obtaining Records', disable=not self._verbose), start=1):
-            if do_sleep and c % records_sleep_time[0] == 0:
-                sleep_with_noise(amount_of_time=records_sleep_time[1])
-            harvested_data += self.openi_block_harvest(search_url, bound=bound, to_harvest=to_harvest)
+        for bound in bounds_list:
+            harvested_data += completed[bound]
 
         return harvested_data
 
+    def _records_stream_process(self, bounds_list, chunk_size, clinical_cases_only, n_jobs=1, return_raw=False):
+        """
+
+        Process the harvested records, which reside in the checkpoint file, in chunks of ``chunk_size``.
+        Processed chunks are appended to a ``DataFrameShardStore`` in '__temp__/records_db_shards'.
+
+        Note: only the processing is bounded by ``chunk_size``. The processed records are concatenated
+        into a single dataframe when processing is complete (as ``records_db`` is held in memory).
+
+        :param bounds_list: see ``_records_pull_engine()``.
+        :type bounds_list: ``list``
+        :param chunk_size: see ``records_pull()``.
+        :type chunk_size: ``int``
+        :param clinical_cases_only: see ``records_pull()``.
+        :type clinical_cases_only: ``bool``
+        :param n_jobs: see ``records_pull()``.
+        :type n_jobs: ``int``
+        :param return_raw: if ``True``, return the raw records without processing them. Defaults to ``False``.
+        :type return_raw: ``bool``
+        :return: the processed records.
+        :rtype: ``Pandas DataFrame``
+        """
+        def chunks():
+            return self._checkpoint_chunks(bounds_list, chunk_size=chunk_size)
+
+        if return_raw:
+            return pd.concat(list(chunks()), ignore_index=True)
+
+        store = DataFrameShardStore(os.path.join(self.temp_directory_path, "records_db_shards"))
+        try:
+            openi_raw_extract_and_clean_streaming(chunks=chunks,
+                                                  clinical_cases_only=clinical_cases_only,
+                                                  verbose=self._verbose,
+                                                  cache_path=self._cache_path,
+                                                  store=store,
+                                                  n_jobs=n_jobs)
+            return store.to_data_frame()
+        finally:
+            store.destroy()
+
     def records_pull(self,
                      search_url,
                      to_harvest,
                      total,
                      query,
                      pull_time,
-                     records_sleep_time,
                      clinical_cases_only,
                      download_limit=None,
+                     max_workers=4,
+                     rate_limit=5,
+                     chunk_size=None,
+                     n_jobs=1,
                      **kwargs):
         """
 
@@ -617,12 +829,18 @@ class _OpeniRecords(object):
         :type query: ``dict``
         :param pull_time: yield of ``datetime.now()`` as as evolved inside ``OpeniInterface.pull()``.
         :type pull_time: ``datetime.datetime``
-        :param records_sleep_time: (every x downloads, period of time [seconds])
-        :type records_sleep_time: ``tuple`` or ``None``
         :param clinical_cases_only: see ``OpeniInterface().pull()``
         :type clinical_cases_only: ``bool``
         :param download_limit: see ``OpeniInterface().pull()``
         :type download_limit: ``None`` or ``int``
+        :param max_workers: see ``OpeniInterface().pull()``'s ``records_max_workers`` parameter. Defaults to `4`.
+        :type max_workers: ``int``
+        :param rate_limit: see ``OpeniInterface().pull()``'s ``records_rate_limit`` parameter. Defaults to `5`.
+        :type rate_limit: ``int``, ``float`` or ``None``
+        :param chunk_size: see ``OpeniInterface().pull()``'s ``records_chunk_size`` parameter. Defaults to ``None``.
+        :type chunk_size: ``int`` or ``None``
+        :param n_jobs: see ``OpeniInterface().pull()``'s ``records_n_jobs`` parameter. Defaults to `1`.
+        :type n_jobs: ``int``
         :return: a complete ``records_db``
         :rtype: ``Pandas DataFrame``
         """
@@ -633,6 +851,12 @@ class _OpeniRecords(object):
         else:
             raise TypeError("`download_limit` must be an `int` or `None`")
 
+        if chunk_size is not None:
+            if not isinstance(chunk_size, int) or chunk_size < 1:
+                raise ValueError("`chunk_size` must be an integer greater than or equal to 1.")
+            if self.temp_directory_path is None:
+                raise ValueError("`chunk_size` requires that `temp_directory_path` is not `None`.")
+
         # Get a list of lists with the bounds
         bounds, download_no = self.openi_bounds(total)
 
@@ -642,18 +866,33 @@ class _OpeniRecords(object):
         harvest = self._records_pull_engine(bounds_list=bounds_list,
                                             search_url=search_url,
                                             to_harvest=self.harvest_vector(to_harvest),
-                                            records_sleep_time=records_sleep_time,
-                                            download_no=download_no)
+                                            max_workers=max_workers,
+                                            rate_limit=rate_limit,
+                                            download_no=download_no,
+                                            keep_blocks=chunk_size is None)
+
+        if chunk_size is not None:
+            records_db = self._records_stream_process(bounds_list=bounds_list,
+                                                      chunk_size=chunk_size,
+                                                      clinical_cases_only=clinical_cases_only,
+                                                      n_jobs=n_jobs,
+                                                      return_raw=kwargs.get('return_raw', False))
+        else:
+            records_db = pd.DataFrame(harvest).fillna(np.NaN)
 
-        records_db = pd.DataFrame(harvest).fillna(np.NaN)
+        # All blocks have been harvested (and processed), so the checkpoint is no longer needed.
+        if self._checkpoint_path is not None and os.path.isfile(self._checkpoint_path):
+            os.remove(self._checkpoint_path)
 
         if kwargs.get('return_raw', False):
             return records_db
 
-        records_db = openi_raw_extract_and_clean(data_frame=records_db,
-                                                 clinical_cases_only=clinical_cases_only,
-                                                 verbose=self._verbose,
-                                                 cache_path=self._cache_path)
+        if chunk_size is None:
+            records_db = openi_raw_extract_and_clean(data_frame=records_db,
+                                                     clinical_cases_only=clinical_cases_only,
+                                                     verbose=self._verbose,
+                                                     cache_path=self._cache_path,
+                                                     n_jobs=n_jobs)
 
         records_db['query'] = [query] * records_db.shape[0]
         records_db['pull_time'] = [pull_time] * records_db.shape[0]
@@ -689,6 +928,9 @@ class _OpeniImages(object):
         self.records_db_images = None
         self.real_time_update_db = None
 
+        # Throughput of the most recent image harvest
+        self.throughput = None
+
         self.temp_directory_path = os.path.join(database_save_location, "__temp__")
 
     def _create_temp_directory_path(self):
@@ -742,92 +984,161 @@ class _OpeniImages(object):
         # Return the save path.
         return os.path.join(self.image_save_location, image_name)
 
-    def _individual_image_harvest(self, index, image_url, image_save_path, block):
+    def _stream_to_disk(self, image_url, image_save_path):
         """
 
-        Harvests a single image.
+        Stream an image to a temporary file and then (atomically) rename it to ``image_save_path``.
+        This ensures an image in the cache is never only partially written.
 
-        :param index: the row (index) that it currently being on through.
-        :param index: ``int``
         :param image_url: URL to the image.
         :type image_url: ``str``
         :param image_save_path: the location to save the image.
         :type image_save_path: ``str``
-        :param block: whether or not to block downloading the image if it does not already exist in the cache.
-        :type block: ``bool``
-        :return: `1` if an image was downloaded, `0` otherwise.
+        :return: the number of bytes written to disk.
         :rtype: ``int``
         """
-        image_downloaded = 0
+        n_bytes = 0
+        temp_fd, temp_path = mkstemp(suffix='.part', dir=self.image_save_location)
+        try:
+            with os.fdopen(temp_fd, 'wb') as temp_file:
+                page = http_get(image_url, stream=True)
+                try:
+                    page.raise_for_status()
+                    for chunk in page.iter_content(chunk_size=64 * 1024):
+                        temp_file.write(chunk)
+                        n_bytes += len(chunk)
+                finally:
+                    page.close()  # return the connection to the pool
+            os.replace(temp_path, image_save_path)
+        except:
+            if os.path.isfile(temp_path):
+                os.remove(temp_path)
+            raise
+        return n_bytes
 
-        def proceed_with_download(image_save_path):
-            return not os.path.isfile(image_save_path)
+    def _individual_image_harvest(self, image_url, image_save_path, block, rate_limiter, host_limiter):
+        """
 
+        Harvests a single image.
+
+        :param image_url: URL to the image.
+        :type image_url: ``str``
+        :param image_save_path: the location to save the image.
+        :type image_save_path: ``str``
+        :param block: whether or not to block downloading the image if it does not already exist in the cache.
+        :type block: ``bool``
+        :param rate_limiter: the rate limiter shared by all downloads.
+        :type rate_limiter: ``RateLimiter``
+        :param host_limiter: the per-host concurrency limiter shared by all downloads.
+        :type host_limiter: ``PerHostLimiter``
+        :return: a tuple of the form ``(cached image path, download success, number of bytes downloaded)``.
+        :rtype: ``tuple``
+        """
         try:
             # Only download if the file does not already exist in the cache.
-            if proceed_with_download(image_save_path):
+            if not os.path.isfile(image_save_path):
                 if block:
                     raise ImageProblemBasedOnText
+                with host_limiter.hold(image_url):
+                    # Tokens are only taken once a slot is held. Otherwise, tokens taken while waiting
+                    # for a slot would allow several requests to be sent at once when slots are freed.
+                    rate_limiter.wait()
+                    n_bytes = self._stream_to_disk(image_url, image_save_path=image_save_path)
+                return image_save_path, True, n_bytes
+            return image_save_path, True, 0
+        except:
+            return np.NaN, False, 0
 
-                # Get the image
-                page = requests.get(image_url)
-                # Save to disk
-                with open(image_save_path, 'wb') as image:
-                    image.write(page.content)
-                image_downloaded = 1
+    def _report_throughput(self, n_images, n_bytes, duration):
+        """
 
-            self.real_time_update_db.set_value(index, 'cached_images_path', image_save_path)
-            self.real_time_update_db.set_value(index, 'download_success', True)
-        except:
-            self.real_time_update_db.set_value(index, 'cached_images_path', np.NaN)
-            self.real_time_update_db.set_value(index, 'download_success', False)
+        Record (and, if ``verbose`` is ``True``, print) the throughput of the most recent image harvest.
 
-        return image_downloaded
+        :param n_images: the number of images which were downloaded.
+        :type n_images: ``int``
+        :param n_bytes: the number of bytes which were downloaded.
+        :type n_bytes: ``int``
+        :param duration: the time the harvest took (seconds).
+        :type duration: ``float``
+        """
+        duration = max(duration, 1e-6)
+        self.throughput = {'images_downloaded': n_images,
+                           'megabytes_downloaded': n_bytes / 1e6,
+                           'seconds': duration,
+                           'images_per_second': n_images / duration,
+                           'megabytes_per_second': n_bytes / 1e6 / duration}
+        if self._verbose and n_images:
+            print("\nDownloaded {0} images ({1:.2f} MB) in {2:.1f} seconds: "
+                  "{3:.2f} images/s, {4:.2f} MB/s.".format(n_images,
+                                                           self.throughput['megabytes_downloaded'],
+                                                           duration,
+                                                           self.throughput['images_per_second'],
+                                                           self.throughput['megabytes_per_second']))
 
-    def _pull_images_engine(self, harvesting_information, images_sleep_time, image_size, use_image_caption):
+    def _pull_images_engine(self, harvesting_information, image_size, use_image_caption,
+                            max_workers, per_host_limit, rate_limit):
         """
 
         Use ``_individual_image_harvest()`` to download all of the data (images) in ``harvesting_information``.
 
         :param harvesting_information: as evolved inside ``harvesting_information``
         :type harvesting_information: ``list``
-        :param images_sleep_time: see ``pull_images()``
-        :type images_sleep_time: ``tuple`` or ``None``
         :param image_size: see ``pull_images()``
         :type image_size: ``str``
         :param use_image_caption: if ``True`` block downloading of an image if its caption suggests the presence
                                   of problematic image properties (e.g., 'arrows') likely to corrupt
                                   a dataset intended for machine learning. Defaults to ``False``.
         :type use_image_caption: ``bool``
+        :param max_workers: see ``pull_images()``'s ``images_max_workers`` parameter.
+        :type max_workers: ``int``
+        :param per_host_limit: see ``pull_images()``'s ``images_per_host_limit`` parameter.
+        :type per_host_limit: ``int``
+        :param rate_limit: see ``pull_images()``'s ``images_rate_limit`` parameter.
+        :type rate_limit: ``int``, ``float`` or ``None``
         """
         def block_decision(ipt):
             """Decide whether or not to block the downloading."""
             return use_image_caption == True and isinstance(ipt, (list, tuple)) and len(ipt)
 
-        do_sleep = isinstance(images_sleep_time, (list, tuple)) and len(images_sleep_time) == 2
-            
-        download_count = 0
-        for index, image_url, image_problems_text in tqdm(harvesting_information, desc='Obtaining Images',
-                                                          disable=not self._verbose):
-            # Generate the save path for the image
-            image_save_path = self._title_image(url=image_url, image_size=image_size)
-
-            # Save the image
-            download_count += self._individual_image_harvest(index=index,
-                                                             image_url=image_url,
-                                                             image_save_path=image_save_path,
-                                                             block=block_decision(image_problems_text))
-
-            # Sleep when `download_count` 'builds up' to images_sleep_time[0].
-            if do_sleep and download_count == images_sleep_time[0]:
-                sleep_with_noise(amount_of_time=images_sleep_time[1])
-                download_count = 0  # reset
+        rate_limiter = RateLimiter(rate=rate_limit)
+        host_limiter = PerHostLimiter(limit=per_host_limit)
+
+        def harvest(info):
+            _, image_url, image_problems_text = info
+            return self._individual_image_harvest(image_url=image_url,
+                                                  image_save_path=self._title_image(image_url, image_size),
+                                                  block=block_decision(image_problems_text),
+                                                  rate_limiter=rate_limiter,
+                                                  host_limiter=host_limiter)
+
+        totals = {'images': 0, 'bytes': 0}
+
+        def record(position, result):
+            """Record each download as it completes (s.t. it is not lost if the pull is interrupted)."""
+            cached_images_path, download_success, image_bytes = result
+            index = harvesting_information[position][0]
+            self.real_time_update_db.set_value(index, 'cached_images_path', cached_images_path)
+            self.real_time_update_db.set_value(index, 'download_success', download_success)
+            totals['images'] += int(image_bytes > 0)
+            totals['bytes'] += image_bytes
+
+        start_time = time()
+        ordered_thread_map(func=harvest,
+                           iterable=harvesting_information,
+                           max_workers=max_workers,
+                           callback=record,
+                           desc='Obtaining Images',
+                           verbose=self._verbose)
+
+        self._report_throughput(totals['images'], n_bytes=totals['bytes'], duration=time() - start_time)
 
     def pull_images(self,
                     records_db,
                     image_size,
-                    images_sleep_time,
-                    use_image_caption):
+                    use_image_caption,
+                    images_max_workers=8,
+                    images_per_host_limit=4,
+                    images_rate_limit=10):
         """
 
         Pull images based in ``records_db``.
@@ -836,14 +1147,16 @@ class _OpeniImages(object):
         :type records_db: ``Pandas DataFrame``
         :param image_size: one of 'grid150', 'large', 'thumb' or 'thumb_large'.
         :type image_size: ``str``
-        :param images_sleep_time: tuple of the form: ``(every x downloads, period of time [seconds])``. Defaults to ``(10, 1.5)``.
-                                   Note: noise is randomly added to the sleep time by sampling from a normal distribution
-                                   (with mean = 0, sd = 0.75).
-        :type images_sleep_time: ``tuple`` or ``None``
         :param use_image_caption: if ``True`` block downloading of an image if its caption suggests the presence
                                   of problematic image properties (e.g., 'arrows') likely to corrupt
                                   a dataset intended for machine learning. Defaults to ``False``.
         :type use_image_caption: ``bool``
+        :param images_max_workers: see ``OpeniInterface().pull()``. Defaults to `8`.
+        :type images_max_workers: ``int``
+        :param images_per_host_limit: see ``OpeniInterface().pull()``. Defaults to `4`.
+        :type images_per_host_limit: ``int``
+        :param images_rate_limit: see ``OpeniInterface().pull()``. Defaults to `10`.
+        :type images_rate_limit: ``int``, ``float`` or ``None``
         :return: `records_db` with the addition of `cached_images_path` and `download_success` columns.
         :rtype: ``Pandas DataFrame``
         """
@@ -866,9 +1179,11 @@ class _OpeniImages(object):
                                             self.records_db_images['image_problems_from_text']]))
 
         self._pull_images_engine(harvesting_information=harvesting_information,
-                                 images_sleep_time=images_sleep_time,
                                  image_size=image_size,
-                                 use_image_caption=use_image_caption)
+                                 use_image_caption=use_image_caption,
+                                 max_workers=images_max_workers,
+                                 per_host_limit=images_per_host_limit,
+                                 rate_limit=images_rate_limit)
 
         return _record_update_dbs_joiner(records_db=self.records_db_images, update_db=self.real_time_update_db)
 
@@ -914,24 +1229,57 @@ class OpeniInterface(object):
     def _latent_temp_dir(self):
         """
 
-        Load a '__temp__' folder of image record databases which were not merged (and subsequently destroyed)
-        before python exited (the ``pull()`` method, specifically).
+        Resume a ``pull()`` which did not complete before python exited, using the settings and
+        databases in the '__temp__' folder.
+
+        - If 'image_pull_settings.p' exists, the records were obtained and the image harvest is resumed.
+
+        - If 'records_pull_settings.p' exists, records harvesting is resumed from the last block
+          checkpointed by ``_OpeniRecords()`` (the image harvest, if requested, then follows).
+
+        """
+        temp_dir = self._Images.temp_directory_path
+        image_pull_settings = os.path.join(temp_dir, "image_pull_settings.p")
+        records_pull_settings = os.path.join(temp_dir, "records_pull_settings.p")
+
+        if os.path.isfile(image_pull_settings):
+            with open(image_pull_settings, "rb") as f:
+                settings_dict = pickle.load(f)
+            settings_dict_for_pull = {k: v for k, v in list(settings_dict.items()) if k not in ['records_db']}
+            settings_dict_for_pull['new_records_pull'] = False  # adding this separately in `pull` breaks in python2
 
+            print("\nResuming Download...")
+            self.load_records_db(records_db=settings_dict['records_db'])
+            self.pull(**settings_dict_for_pull)
+        elif os.path.isfile(records_pull_settings):
+            with open(records_pull_settings, "rb") as f:
+                settings_dict = pickle.load(f)
+
+            print("\nResuming Records Download...")
+            for attr in ('current_query', 'current_search_url', 'current_search_total', '_current_search_to_harvest'):
+                setattr(self, attr, settings_dict['search'][attr])
+            self.pull(**settings_dict['pull'])
+
+        # `temp_directory_path` will be destroyed when `pull()` exits successfully
+
+    def _save_records_pull_settings(self, pull_settings):
         """
-        if os.path.isdir(self._Images.temp_directory_path):
-            temp_dir = self._Images.temp_directory_path
-            latent_pickles = [os.path.join(temp_dir, i) for i in os.listdir(temp_dir) if i.endswith(".p")]
-            if len(latent_pickles):
-                with open(latent_pickles[0], "rb") as f:
-                    settings_dict = pickle.load(f)
-                settings_dict_for_pull = {k: v for k, v in list(settings_dict.items()) if k not in ['records_db']}
-                settings_dict_for_pull['new_records_pull'] = False  # adding this separately in `pull` breaks in python2
 
-                print("\nResuming Download...")
-                self.load_records_db(records_db=settings_dict['records_db'])
-                self.pull(**settings_dict_for_pull)
+        Save the information needed to resume the records harvest to
+        'databases/__temp__/records_pull_settings.p'.
 
-            # `temp_directory_path` will be destroyed when `pull()` exits successfully
+        :param pull_settings: the arguments passed to ``pull()``.
+        :type pull_settings: ``dict``
+        :return: the path to the settings file.
+        :rtype: ``str``
+        """
+        self._Images._create_temp_directory_path()
+        settings_path = os.path.join(self._Images.temp_directory_path, "records_pull_settings.p")
+        search = {attr: getattr(self, attr) for attr in ('current_query', 'current_search_url',
+                                                         'current_search_total', '_current_search_to_harvest')}
+        with open(settings_path, "wb") as f:
+            pickle.dump({'search': search, 'pull': pull_settings}, f)
+        return settings_path
 
     def _openi_cache_records_db_handler(self):
         """
@@ -1001,7 +1349,9 @@ class OpeniInterface(object):
         self._Records = _OpeniRecords(root_url=self._root_url,
                                       date_format=self._date_format,
                                       verbose=verbose,
-                                      cache_path=cache_path)
+                                      cache_path=cache_path,
+                                      temp_directory_path=os.path.join(self._created_image_dirs['databases'],
+                                                                       "__temp__"))
 
         self._Images = _OpeniImages(image_save_location=self._created_image_dirs['raw'],
                                     database_save_location=self._created_image_dirs['databases'],
@@ -1155,12 +1505,19 @@ class OpeniInterface(object):
 
     def pull(self,
              image_size='large',
-             records_sleep_time=(10, 1.5),
-             images_sleep_time=(10, 1.5),
+             records_max_workers=4,
+             records_rate_limit=5,
+             images_max_workers=8,
+             images_per_host_limit=4,
+             images_rate_limit=10,
              download_limit=100,
              clinical_cases_only=False,
              use_image_caption=False,
-             new_records_pull=True):
+             records_chunk_size=None,
+             records_n_jobs=1,
+             new_records_pull=True,
+             records_sleep_time=None,
+             images_sleep_time=None):
         """
 
         Pull (i.e., download) the current search.
@@ -1198,14 +1555,21 @@ class OpeniInterface(object):
                                 most accurate with large images.
 
         :type image_size: ``str`` or ``None``
-        :param records_sleep_time: tuple of the form: ``(every x downloads, period of time [seconds])``. Defaults to ``(10, 1.5)``.
-                                   Note: noise is randomly added to the sleep time by sampling from a normal distribution
-                                   (with mean = 0, sd = 0.75).
-        :type records_sleep_time: ``tuple`` or ``None``
-        :param images_sleep_time: tuple of the form: ``(every x downloads, period of time [seconds])``. Defaults to ``(10, 1.5)``.
-                                  Note: noise is randomly added to the sleep time by sampling from a normal distribution
-                                  (with mean = 0, sd = 0.75).
-        :type images_sleep_time: ``tuple`` or ``None``
+        :param records_max_workers: the max. number of requests for records which can be in flight at any one time.
+                                    Defaults to `4`.
+        :type records_max_workers: ``int``
+        :param records_rate_limit: the max. number of requests for records to send to Open-i per second.
+                                   This limit is shared by all ``records_max_workers``. If ``None``, no limit will
+                                   be imposed (not recommended). Defaults to `5`.
+        :type records_rate_limit: ``int``, ``float`` or ``None``
+        :param images_max_workers: the max. number of images which can be downloaded at any one time. Defaults to `8`.
+        :type images_max_workers: ``int``
+        :param images_per_host_limit: the max. number of images which can be downloaded from any one host
+                                      at any one time. Defaults to `4`.
+        :type images_per_host_limit: ``int``
+        :param images_rate_limit: the max. number of requests for images to send per second. If ``None``, no limit
+                                  will be imposed (not recommended). Defaults to `10`.
+        :type images_rate_limit: ``int``, ``float`` or ``None``
         :param download_limit: max. number of results to download. If ``None``, no limit will be imposed
                               (not recommended). Defaults to 100.
         :type download_limit: ``None`` or ``int``
@@ -1223,6 +1587,17 @@ class OpeniInterface(object):
                                   of problematic image properties (e.g., 'arrows') likely to corrupt a dataset.
                                   Defaults to ``False``.
         :type use_image_caption: ``bool``
+        :param records_chunk_size: if an integer, records will be processed (i.e., cleaned and have features
+                                   extracted from them) in chunks of this many records, which are appended
+                                   to an on-disk store as they are completed. This bounds the memory used while
+                                   harvesting and processing large pulls. However, the final ``records_db``
+                                   is still materialised in memory (the processed records are concatenated
+                                   when processing is complete). If ``None``, all records are processed at once.
+                                   Defaults to ``None``.
+        :type records_chunk_size: ``int`` or ``None``
+        :param records_n_jobs: the number of processes to use when extracting features from the records.
+                               If `-1`, one process will be used per CPU. Defaults to `1`.
+        :type records_n_jobs: ``int``
         :param new_records_pull: if ``True``, download the data for the current search. If ``False``, use ``INSTANCE.records_db``.
 
             .. note::
@@ -1231,11 +1606,21 @@ class OpeniInterface(object):
                truncate or otherwise modify ``INSTANCE.records_db`` and then download images.
 
         :type new_records_pull: ``bool``
+        :param records_sleep_time: deprecated and ignored. Use ``records_max_workers`` and ``records_rate_limit``.
+        :type records_sleep_time: ``tuple`` or ``None``
+        :param images_sleep_time: deprecated and ignored. Use ``images_max_workers``, ``images_per_host_limit``
+                                  and ``images_rate_limit``.
+        :type images_sleep_time: ``tuple`` or ``None``
         :return: a DataFrame with the record information.
                  If ``image_size`` is not None, images will also be harvested and cached.
         :rtype: ``Pandas DataFrame``
         :raises ``ValueError``: if ``search()`` has not been called.
         """
+        if records_sleep_time is not None or images_sleep_time is not None:
+            warn("`records_sleep_time` and `images_sleep_time` are deprecated and will be ignored. Requests are now "
+                 "limited by the `records_max_workers`, `records_rate_limit`, `images_max_workers`, "
+                 "`images_per_host_limit` and `images_rate_limit` parameters.", DeprecationWarning)
+
         if not new_records_pull and not isinstance(self.records_db, pd.DataFrame):
             raise TypeError("`records_db` is not a dataframe.")
 
@@ -1243,22 +1628,36 @@ class OpeniInterface(object):
             if not isinstance(self.current_search_url, str):
                 raise ValueError("`search()` must be called before `pull()`.")
             self._pull_time = datetime.now()
-            self.records_db = self._Records.records_pull(search_url=self.current_search_url,
-                                                         to_harvest=self._current_search_to_harvest,
-                                                         total=self.current_search_total,
-                                                         query=self.current_query,
-                                                         pull_time=self._pull_time,
-                                                         records_sleep_time=records_sleep_time,
-                                                         clinical_cases_only=clinical_cases_only,
-                                                         download_limit=download_limit)
+            records_pull_settings = self._save_records_pull_settings(pull_settings={
+                k: v for k, v in list(locals().items())
+                if k not in ('self', 'new_records_pull', 'records_sleep_time', 'images_sleep_time')})
+            try:
+                self.records_db = self._Records.records_pull(search_url=self.current_search_url,
+                                                             to_harvest=self._current_search_to_harvest,
+                                                             total=self.current_search_total,
+                                                             query=self.current_query,
+                                                             pull_time=self._pull_time,
+                                                             clinical_cases_only=clinical_cases_only,
+                                                             download_limit=download_limit,
+                                                             max_workers=records_max_workers,
+                                                             rate_limit=records_rate_limit,
+                                                             chunk_size=records_chunk_size,
+                                                             n_jobs=records_n_jobs)
+            except NoResultsFound:
+                # Resuming would only yield the same result.
+                os.remove(records_pull_settings)
+                raise
+            os.remove(records_pull_settings)
         elif not isinstance(self.records_db, pd.DataFrame):
             raise TypeError("`records_db` is not a DataFrame.")
 
         if isinstance(image_size, str):
             self.records_db = self._Images.pull_images(records_db=self.records_db,
                                                        image_size=image_size,
-                                                       images_sleep_time=images_sleep_time,
-                                                       use_image_caption=use_image_caption)
+                                                       use_image_caption=use_image_caption,
+                                                       images_max_workers=images_max_workers,
+                                                       images_per_host_limit=images_per_host_limit,
+                                                       images_rate_limit=images_rate_limit)
 
             # Add the new records_db datafame with the existing `cache_records_db`.
             self._openi_cache_records_db_handler()
@@ -3,3 +3,4 @@ from biovida.support_tools.printing import dict_pprint
 from biovida.support_tools.printing import pandas_pprint
 from biovida.support_tools.utilities import train_val_test
 from biovida.support_tools.utilities import reverse_train_val_test
+from biovida.support_tools.http_session import session_manager
@@ -0,0 +1,162 @@
+# coding: utf-8
+
+"""
+
+    Multi-Pattern String Matching
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+"""
+import os
+import pickle
+import hashlib
+from collections import deque
+
+from biovida.support_tools.support_tools import atomic_pickle_dump
+
+
+class AhoCorasick(object):
+    """
+
+    An Aho-Corasick automaton which finds all occurrences of many terms in a
+    text with a single pass over the text.
+
+    :param terms: the terms to search for. Matching is exact (i.e., case-sensitive and
+                  without regard to word boundaries). Items which are not strings are ignored.
+    :type terms: ``iterable``
+
+    :Example:
+
+    >>> matcher = AhoCorasick(['heart disease', 'congenital heart disease', 'disease'])
+    >>> matcher.find_all("congenital heart disease")
+    ...
+    [(0, 24, 'congenital heart disease'), (11, 24, 'heart disease'), (17, 24, 'disease')]
+    >>> matcher.find_all("congenital heart disease", overlapping=False)
+    ...
+    [(0, 24, 'congenital heart disease')]
+    """
+
+    def __init__(self, terms):
+        self.terms = tuple(sorted(set(t for t in terms if isinstance(t, str) and len(t))))
+        self._term_set = frozenset(self.terms)
+
+        # Trie
+        goto, output = [dict()], [list()]
+        for index, term in enumerate(self.terms):
+            state = 0
+            for char in term:
+                next_state = goto[state].get(char)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto[state][char] = next_state
+                    goto.append(dict())
+                    output.append(list())
+                state = next_state
+            output[state].append(index)
+
+        # Failure links (breadth first s.t. the links for shallower states are always available).
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in goto[state].items():
+                queue.append(next_state)
+                f = fail[state]
+                while f and char not in goto[f]:
+                    f = fail[f]
+                fail[next_state] = goto[f].get(char, 0)
+                output[next_state] += output[fail[next_state]]
+
+        self._goto = goto
+        self._fail = fail
+        self._output = [tuple(o) for o in output]
+
+    def __len__(self):
+        return len(self.terms)
+
+    def __contains__(self, term):
+        return term in self._term_set
+
+    @staticmethod
+    def _remove_contained(matches):
+        """
+
+        Remove matches whose span lies within the span of another match.
+
+        :param matches: a list of tuples of the form ``(start, end, term)``.
+        :type matches: ``list``
+        :return: ``matches`` with any match which is contained within another removed.
+        :rtype: ``list``
+        """
+        rslt = list()
+        max_end = -1
+        for match in sorted(matches, key=lambda m: (m[0], -m[1])):
+            if match[1] > max_end:
+                rslt.append(match)
+                max_end = match[1]
+        return rslt
+
+    def find_all(self, text, overlapping=True):
+        """
+
+        Find all occurrences of ``terms`` in ``text``.
+
+        :param text: the text to search.
+        :type text: ``str``
+        :param overlapping: if ``False``, matches which lie within a longer match are dropped,
+                            e.g., 'heart disease' inside 'congenital heart disease'. Defaults to ``True``.
+        :type overlapping: ``bool``
+        :return: a list of tuples of the form ``(start, end, term)``, s.t. ``text[start:end] == term``,
+                 sorted by ``start`` (and, for matches with the same ``start``, longest first).
+        :rtype: ``list``
+        """
+        goto, fail, output, terms = self._goto, self._fail, self._output, self.terms
+
+        matches = list()
+        state = 0
+        for position, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for index in output[state]:
+                term = terms[index]
+                matches.append((position - len(term) + 1, position + 1, term))
+
+        if not overlapping:
+            return self._remove_contained(matches)
+        return sorted(matches, key=lambda m: (m[0], -m[1]))
+
+
+def cached_aho_corasick(terms, save_directory, name):
+    """
+
+    Load an ``AhoCorasick`` automaton for ``terms`` from ``save_directory``, building
+    (and saving) it if it does not already exist.
+
+    Automatons are saved as '``name``_HASH.p', where ``HASH`` is computed from ``terms``. Thus, a
+    change to ``terms`` results in a new automaton being built. Automatons for older versions of
+    ``terms`` are deleted.
+
+    :param terms: see ``AhoCorasick()``.
+    :type terms: ``iterable``
+    :param save_directory: the directory in which to save the automaton.
+    :type save_directory: ``str``
+    :param name: a name for the automaton, e.g., 'disease_matcher'.
+    :type name: ``str``
+    :return: an automaton which matches ``terms``.
+    :rtype: ``AhoCorasick``
+    """
+    unique_terms = sorted(set(t for t in terms if isinstance(t, str) and len(t)))
+    terms_hash = hashlib.sha1("\n".join(unique_terms).encode('utf-8')).hexdigest()[:16]
+    save_path = os.path.join(save_directory, "{0}_{1}.p".format(name, terms_hash))
+
+    if os.path.isfile(save_path):
+        try:
+            with open(save_path, "rb") as f:
+                return pickle.load(f)
+        except (EOFError, pickle.UnpicklingError):
+            pass  # rebuild below.
+
+    automaton = AhoCorasick(unique_terms)
+    atomic_pickle_dump(automaton, save_path=save_path,
+                       stale_pattern=os.path.join(save_directory, "{0}_*.p".format(name)))
+    return automaton
@@ -8,11 +8,11 @@
 """
 # Note: this module contains the tools required to construct the caches needed by BioVida.
 import os
-import requests
 from PIL import Image
 
 # General Support Tools
 from biovida.support_tools.support_tools import combine_dicts, list_to_bulletpoints
+from biovida.support_tools.http_session import http_get
 
 
 def _medpix_logo_download(save_path,
@@ -34,7 +34,7 @@ def _medpix_logo_download(save_path,
 
     if not os.path.isfile(full_save_path):
         # Get representative images
-        image = Image.open(requests.get(image_web_address, stream=True).raw)
+        image = Image.open(http_get(image_web_address, stream=True).raw)
         # Crop and Save
         image_cropped = image.crop(406, 6, 502, 27)
         image_cropped.save(full_save_path)
@@ -0,0 +1,186 @@
+# coding: utf-8
+
+"""
+
+    Memoized Fuzzy String Matching
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+"""
+import os
+import re
+import pickle
+import hashlib
+from collections import Counter, defaultdict
+
+from biovida.support_tools.support_tools import atomic_pickle_dump
+
+
+_non_alphanumeric_regex = re.compile(r'[\W_]+', re.UNICODE)
+
+
+def _ngrams(string, n):
+    """
+
+    :param string: any string.
+    :type string: ``str``
+    :param n: the length of each n-gram.
+    :type n: ``int``
+    :return: the (unique) character n-grams of ``string``, after it has been lower cased, had runs of
+             non-alphanumeric characters replaced with a single space and been padded with spaces.
+    :rtype: ``set``
+    """
+    processed = _non_alphanumeric_regex.sub(" ", string.lower()).strip()
+    if not len(processed):
+        return set()
+    padded = " {0} ".format(processed)
+    return set(padded[i:i + n] for i in range(max(len(padded) - n + 1, 1)))
+
+
+class NGramIndex(object):
+    """
+
+    A character n-gram inverted index, used to find the strings in ``choices`` which are
+    plausible fuzzy matches for a query, i.e., those which share the most n-grams with it
+    and those whose n-grams are the most completely contained in it (as short strings
+    can be strong partial matches for a long query).
+
+    :param choices: the strings to index.
+    :type choices: ``iterable``
+    :param n: the length of the n-grams. Defaults to 3.
+    :type n: ``int``
+    """
+
+    def __init__(self, choices, n=3):
+        self.n = n
+        self.choices = tuple(choices)
+        postings, n_grams = defaultdict(list), list()
+        for index, choice in enumerate(self.choices):
+            grams = _ngrams(choice, n)
+            for gram in grams:
+                postings[gram].append(index)
+            n_grams.append(len(grams))
+        self._postings = {k: tuple(v) for k, v in postings.items()}
+        self._n_grams = tuple(n_grams)
+
+    def __len__(self):
+        return len(self.choices)
+
+    def candidates(self, query, limit):
+        """
+
+        :param query: the string to find candidates for.
+        :type query: ``str``
+        :param limit: the maximum number of candidates to return.
+        :type limit: ``int``
+        :return: up to ``limit`` items in ``choices``. Half are those which share the most n-grams with ``query``
+                 and the rest are those with the largest fraction of their n-grams in ``query``.
+                 Items which do not share any n-grams with ``query`` are not returned.
+        :rtype: ``list``
+        """
+        counts = Counter()
+        for gram in _ngrams(query, self.n):
+            counts.update(self._postings.get(gram, ()))
+        if len(counts) <= limit:
+            return [self.choices[index] for index in counts]
+
+        by_count = [index for index, _ in counts.most_common(limit // 2)]
+        by_containment = sorted(counts, key=lambda index: counts[index] / self._n_grams[index], reverse=True)
+        indexes = list(by_count)
+        seen = set(by_count)
+        for index in by_containment:
+            if len(indexes) >= limit:
+                break
+            elif index not in seen:
+                indexes.append(index)
+                seen.add(index)
+        return [self.choices[index] for index in indexes]
+
+
+class FuzzyMatcher(object):
+    """
+
+    Find the best fuzzy match for a query among a fixed collection of strings.
+
+    Rather than scoring every string in ``choices``, queries are only scored against the candidates yielded
+    by an ``NGramIndex``. The results are memoized and, if ``save_directory`` is provided, persisted to
+    disk (see ``save()``) s.t. they can be reused across sessions.
+
+    :param choices: the strings to match against.
+    :type choices: ``iterable``
+    :param process: the ``fuzzywuzzy.process`` module (see ``biovida.images._image_tools.try_fuzzywuzzy_import()``).
+    :type process: ``module``
+    :param save_directory: a directory in which to save the memo. If ``None``, the memo
+                           is not persisted. Defaults to ``None``.
+    :type save_directory: ``str`` or ``None``
+    :param name: a name for the memo, e.g., 'disease_ontology_names'. Required if ``save_directory`` is not ``None``.
+    :type name: ``str`` or ``None``
+    :param candidate_limit: the number of candidates from the index to score for each query. Defaults to 100.
+    :type candidate_limit: ``int``
+    """
+
+    def __init__(self, choices, process, save_directory=None, name=None, candidate_limit=100):
+        if save_directory is not None and name is None:
+            raise ValueError("`name` must be provided if `save_directory` is not `None`.")
+
+        self._process = process
+        self.candidate_limit = candidate_limit
+        self.index = NGramIndex(sorted(set(c for c in choices if isinstance(c, str))))
+
+        if save_directory is not None:
+            choices_hash = hashlib.sha1("\n".join(self.index.choices).encode('utf-8')).hexdigest()[:16]
+            self._save_path = os.path.join(save_directory, "{0}_{1}.p".format(name, choices_hash))
+            self._stale_pattern = os.path.join(save_directory, "{0}_*.p".format(name))
+        else:
+            self._save_path = None
+
+        self.memo = self._load_memo()
+        self._memo_changed = False
+
+    def _load_memo(self):
+        """
+
+        :return: the memo saved for ``choices``, if one exists. Otherwise an empty dictionary.
+        :rtype: ``dict``
+        """
+        if self._save_path is not None and os.path.isfile(self._save_path):
+            try:
+                with open(self._save_path, "rb") as f:
+                    return pickle.load(f)
+            except (EOFError, pickle.UnpicklingError):
+                pass  # start afresh.
+        return dict()
+
+    def extract_one(self, query):
+        """
+
+        Find the best match for ``query``.
+
+        :param query: the string to match.
+        :type query: ``str``
+        :return: a tuple of the form ``(best match, score)``. If no item in ``choices`` shares
+                 any n-grams with ``query``, ``(None, 0)``.
+        :rtype: ``tuple``
+        """
+        if query in self.memo:
+            return self.memo[query]
+
+        candidates = self.index.candidates(query, limit=self.candidate_limit)
+        rslt = self._process.extractOne(query, candidates) if len(candidates) else None
+        rslt = (None, 0) if rslt is None else tuple(rslt[:2])
+
+        self.memo[query] = rslt
+        self._memo_changed = True
+        return rslt
+
+    def save(self):
+        """
+
+        Save the memo to ``save_directory`` (if it has changed since it was loaded).
+        Memos for other versions of ``choices`` are deleted.
+
+        """
+        if self._save_path is None or not self._memo_changed:
+            return None
+
+        atomic_pickle_dump(self.memo, save_path=self._save_path, stale_pattern=self._stale_pattern)
+        self._memo_changed = False
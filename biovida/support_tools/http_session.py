@@ -0,0 +1,325 @@
+# coding: utf-8
+
+"""
+
+    Pooled HTTP Session Shared by all BioVida Interfaces
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+"""
+import requests
+from threading import Lock
+from requests.adapters import HTTPAdapter
+from requests.packages.urllib3.util.retry import Retry
+from requests.packages.urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+
+_STATS_KEYS = ('requests', 'connections_created', 'connections_reused', 'retries')
+
+
+class _CountingHTTPAdapter(HTTPAdapter):
+    """
+
+    An ``HTTPAdapter`` which reports the creation and reuse of connections to ``manager``.
+
+    :param manager: the ``HTTPSessionManager`` instance to report to.
+    :type manager: ``HTTPSessionManager``
+    """
+
+    def __init__(self, manager, **kwargs):
+        self._manager = manager
+        super(_CountingHTTPAdapter, self).__init__(**kwargs)
+
+    def _counting_pool_class(self, base):
+        manager = self._manager
+
+        class CountingPool(base):
+            def _get_conn(self, *args, **kwargs):
+                manager._count('connections_reused')
+                return super(CountingPool, self)._get_conn(*args, **kwargs)
+
+            def _new_conn(self, *args, **kwargs):
+                # A new connection is not a reused one.
+                manager._count('connections_created')
+                manager._count('connections_reused', -1)
+                return super(CountingPool, self)._new_conn(*args, **kwargs)
+
+        return CountingPool
+
+    def init_poolmanager(self, *args, **kwargs):
+        super(_CountingHTTPAdapter, self).init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {'http': self._counting_pool_class(HTTPConnectionPool),
+                                                   'https': self._counting_pool_class(HTTPSConnectionPool)}
+
+
+def _counting_retry(manager, **kwargs):
+    """
+
+    :param manager: the ``HTTPSessionManager`` instance to report retries to.
+    :type manager: ``HTTPSessionManager``
+    :param kwargs: keyword arguments accepted by ``Retry()``.
+    :return: a ``Retry`` policy which reports each retry it permits to ``manager`` (including the retries
+             of requests which ultimately fail).
+    :rtype: ``Retry``
+    """
+    class CountingRetry(Retry):
+        def increment(self, *args, **kwargs):
+            # Raises ``MaxRetryError`` (and so is not counted) if no retries remain.
+            new_retry = super(CountingRetry, self).increment(*args, **kwargs)
+            manager._count('retries')
+            return new_retry
+
+    return CountingRetry(**kwargs)
+
+
+class HTTPSessionManager(object):
+    """
+
+    Keep-alive connection pooling, retries (with exponential backoff) and timeouts
+    for all HTTP requests made by BioVida.
+
+    :param timeout: a ``(connect, read)`` tuple of timeouts (seconds) applied to requests
+                    which do not specify their own. Defaults to ``(10, 120)``.
+    :type timeout: ``tuple``, ``int``, ``float`` or ``None``
+    :param max_retries: the max. number of times to retry a request which fails to connect or which
+                        yields a status code in ``retry_on``. Defaults to `3`.
+    :type max_retries: ``int``
+    :param backoff_factor: retries sleep for ``backoff_factor * (2 ** (retry number - 1))`` seconds.
+                           Note: 'Retry-After' headers (e.g., sent with 429 responses) are respected. Defaults to `0.5`.
+    :type backoff_factor: ``float``
+    :param retry_on: HTTP status codes which will trigger a retry. Defaults to ``(429, 500, 502, 503, 504)``.
+    :type retry_on: ``tuple``
+    :param pool_connections: the number of hosts to keep connection pools for. Defaults to `10`.
+    :type pool_connections: ``int``
+    :param pool_maxsize: the max. number of connections to keep alive for any one host. Defaults to `10`.
+    :type pool_maxsize: ``int``
+    """
+
+    def __init__(self,
+                 timeout=(10, 120),
+                 max_retries=3,
+                 backoff_factor=0.5,
+                 retry_on=(429, 500, 502, 503, 504),
+                 pool_connections=10,
+                 pool_maxsize=10):
+        self._lock = Lock()
+        self._counts = dict.fromkeys(_STATS_KEYS, 0)
+        self._host_pool_sizes = dict()
+        self._session = None
+        self.configure(timeout=timeout,
+                       max_retries=max_retries,
+                       backoff_factor=backoff_factor,
+                       retry_on=retry_on,
+                       pool_connections=pool_connections,
+                       pool_maxsize=pool_maxsize)
+
+    def _count(self, key, amount=1):
+        with self._lock:
+            self._counts[key] += amount
+
+    def _adapter(self, pool_maxsize):
+        """
+
+        :param pool_maxsize: the max. number of connections to keep alive per host.
+        :type pool_maxsize: ``int``
+        :return: an adapter configured with the current retry policy.
+        :rtype: ``_CountingHTTPAdapter``
+        """
+        retry = _counting_retry(manager=self,
+                                total=self.max_retries,
+                                backoff_factor=self.backoff_factor,
+                                status_forcelist=self.retry_on,
+                                raise_on_status=False)  # return the final response; callers decide how to handle it.
+        return _CountingHTTPAdapter(manager=self,
+                                    pool_connections=self.pool_connections,
+                                    pool_maxsize=pool_maxsize,
+                                    max_retries=retry)
+
+    def _build_session(self):
+        """
+
+        (Re)build the underlying ``requests.Session``, mounting the per-host adapters.
+
+        """
+        if self._session is not None:
+            self._session.close()
+        session = requests.Session()
+        session.headers.update({'User-Agent': 'biovida (python-requests/{0})'.format(requests.__version__)})
+        for prefix in ('http://', 'https://'):
+            session.mount(prefix, self._adapter(self.pool_maxsize))
+        for prefix, pool_maxsize in self._host_pool_sizes.items():
+            session.mount(prefix, self._adapter(pool_maxsize))
+        self._session = session
+
+    def configure(self, **kwargs):
+        """
+
+        Update any of the parameters accepted by ``HTTPSessionManager()`` and rebuild the session.
+
+        :param kwargs: parameters accepted by ``HTTPSessionManager()``.
+        """
+        allowed = ('timeout', 'max_retries', 'backoff_factor', 'retry_on', 'pool_connections', 'pool_maxsize')
+        for k, v in kwargs.items():
+            if k not in allowed:
+                raise AttributeError("'{0}' is not a valid parameter.".format(k))
+            setattr(self, k, tuple(v) if k == 'retry_on' else v)
+        self._build_session()
+
+    def set_host_pool_size(self, url_prefix, pool_maxsize):
+        """
+
+        Set the number of connections to keep alive for a given host.
+
+        :param url_prefix: the URL prefix of the host, e.g., 'https://openi.nlm.nih.gov'.
+        :type url_prefix: ``str``
+        :param pool_maxsize: the max. number of connections to keep alive for ``url_prefix``.
+        :type pool_maxsize: ``int``
+        """
+        if not isinstance(pool_maxsize, int) or pool_maxsize < 1:
+            raise ValueError("`pool_maxsize` must be an integer greater than or equal to 1.")
+        self._host_pool_sizes[url_prefix] = pool_maxsize
+        self._session.mount(url_prefix, self._adapter(pool_maxsize))
+
+    def request(self, method, url, **kwargs):
+        """
+
+        Send a request through the pooled session.
+
+        :param method: an HTTP method, e.g., 'GET'.
+        :type method: ``str``
+        :param url: a URL.
+        :type url: ``str``
+        :param kwargs: keyword arguments accepted by ``requests.Session.request()``.
+        :return: the response.
+        :rtype: ``requests.Response``
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        self._count('requests')
+        return self._session.request(method, url, **kwargs)
+
+    def get(self, url, **kwargs):
+        """
+
+        Send a GET request through the pooled session.
+
+        :param url: a URL.
+        :type url: ``str``
+        :param kwargs: keyword arguments accepted by ``requests.Session.get()``.
+        :return: the response.
+        :rtype: ``requests.Response``
+        """
+        return self.request('GET', url, **kwargs)
+
+    def close(self):
+        """Close all pooled connections."""
+        self._session.close()
+
+    @property
+    def stats(self):
+        """Counters for the requests sent, connections created and reused, and retries performed."""
+        with self._lock:
+            return dict(self._counts)
+
+    def reset_stats(self):
+        """Set all counters in ``stats`` to zero."""
+        with self._lock:
+            self._counts = dict.fromkeys(_STATS_KEYS, 0)
+
+
+# The session shared by all BioVida interfaces.
+session_manager = HTTPSessionManager()
+
+
+def http_get(url, **kwargs):
+    """
+
+    Send a GET request through the session shared by all BioVida interfaces.
+
+    :param url: a URL.
+    :type url: ``str``
+    :param kwargs: keyword arguments accepted by ``requests.Session.get()``.
+    :return: the response.
+    :rtype: ``requests.Response``
+    """
+    return session_manager.get(url, **kwargs)
+
+
+def http_download(url, file_path, chunk_size=64 * 1024, max_resumes=3, progress=None, **kwargs):
+    """
+
+    Stream the body of a GET request to ``file_path`` in chunks (s.t. it is never held in memory in its entirety).
+
+    If the connection is lost before all of the bytes given by the 'Content-Length' header have been received,
+    the download is resumed from the last byte received with an HTTP 'Range' request. If the server does
+    not honour the 'Range' header, the download is restarted.
+
+    The body is requested without compression ('Accept-Encoding: identity'), as the 'Content-Length' and 'Range'
+    headers refer to the bytes sent by the server, rather than the bytes written to ``file_path``, if the body is
+    compressed. If the server compresses the body regardless, it is decompressed as it is written. However,
+    its length cannot be checked and it will be restarted (rather than resumed) if the connection is lost.
+
+    :param url: a URL.
+    :type url: ``str``
+    :param file_path: the path to write the body to.
+    :type file_path: ``str``
+    :param chunk_size: the number of bytes to read at once. Defaults to 64 KiB.
+    :type chunk_size: ``int``
+    :param max_resumes: the max. number of times to resume (or restart) the download. Defaults to `3`.
+    :type max_resumes: ``int``
+    :param progress: a function which will be called as ``progress(bytes_received, total_bytes)`` as each chunk
+                     is written, where ``total_bytes`` is ``None`` if the server did not send a 'Content-Length'
+                     header (or compressed the body). Defaults to ``None``.
+    :type progress: ``callable`` or ``None``
+    :param kwargs: keyword arguments accepted by ``requests.Session.get()``.
+    :return: the number of bytes written to ``file_path``.
+    :rtype: ``int``
+    :raises IOError: if the number of bytes received does not match the 'Content-Length' header
+                     (after ``max_resumes`` attempts to resume the download).
+    """
+    headers = dict(kwargs.pop('headers', None) or {})
+    headers['Accept-Encoding'] = 'identity'
+    received, total_bytes, resumes, resumable = 0, None, 0, True
+    with open(file_path, 'wb') as f:
+        while True:
+            if received and resumable:
+                headers['Range'] = 'bytes={0}-'.format(received)
+            else:
+                headers.pop('Range', None)
+            try:
+                response = session_manager.get(url, stream=True, headers=headers, **kwargs)
+                try:
+                    response.raise_for_status()
+                    content_range = response.headers.get('Content-Range', '')
+                    if received and (response.status_code != 206 or
+                                     not content_range.startswith('bytes {0}-'.format(received))):
+                        # The server sent the entire body.
+                        f.seek(0)
+                        f.truncate()
+                        received = 0
+                    content_length = response.headers.get('Content-Length')
+                    if response.headers.get('Content-Encoding', 'identity').lower() not in ('identity', ''):
+                        # 'Content-Length' (and 'Range') count the compressed bytes.
+                        resumable, total_bytes = False, None
+                    else:
+                        total_bytes = received + int(content_length) if content_length is not None else None
+                    for chunk in response.iter_content(chunk_size=chunk_size):
+                        f.write(chunk)
+                        received += len(chunk)
+                        if progress is not None:
+                            progress(received, total_bytes)
+                finally:
+                    response.close()  # return the connection to the pool
+            except (requests.exceptions.ConnectionError, requests.exceptions.ChunkedEncodingError):
+                if resumes >= max_resumes:
+                    raise
+                resumes += 1
+                if not resumable:
+                    f.seek(0)
+                    f.truncate()
+                    received = 0
+                continue
+
+            if total_bytes is None or received == total_bytes:
+                return received
+            elif received > total_bytes or resumes >= max_resumes:
+                raise IOError("Expected {0} bytes from '{1}', but received {2}.".format(total_bytes, url, received))
+            resumes += 1
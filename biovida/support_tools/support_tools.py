@@ -9,8 +9,11 @@
 import os
 import re
 import sys
+import pickle
 import numpy as np
 import pandas as pd
+from glob import glob
+from tempfile import mkstemp
 from itertools import chain
 
 
@@ -214,6 +217,43 @@ def directory_existence_handler(path_, allow_creation=True, verbose=False):
     return path_
 
 
+def atomic_pickle_dump(obj, save_path, stale_pattern=None):
+    """
+
+    Pickle ``obj`` to ``save_path``.
+
+    ``obj`` is first written to a uniquely named temporary file (in the same directory), which then
+    replaces ``save_path``. Thus, if writing is interrupted, ``save_path`` is either left as it was or
+    complete (never partially written), and concurrent saves to ``save_path`` cannot interleave.
+
+    :param obj: a picklable object.
+    :type obj: ``any``
+    :param save_path: the path to save ``obj`` to.
+    :type save_path: ``str``
+    :param stale_pattern: a glob pattern matching files which ``save_path`` supersedes, e.g., saves for older
+                          versions of the same data. These are deleted (``save_path`` excepted) once ``obj``
+                          has been saved. If ``None``, no files are deleted. Defaults to ``None``.
+    :type stale_pattern: ``str`` or ``None``
+    """
+    temp_fd, temp_path = mkstemp(suffix='.part', dir=os.path.dirname(os.path.abspath(save_path)))
+    try:
+        with os.fdopen(temp_fd, "wb") as f:
+            pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, save_path)
+    except:
+        if os.path.isfile(temp_path):
+            os.remove(temp_path)
+        raise
+
+    if stale_pattern is not None:
+        for stale_path in glob(stale_pattern):
+            if os.path.abspath(stale_path) != os.path.abspath(save_path):
+                try:
+                    os.remove(stale_path)
+                except FileNotFoundError:
+                    pass  # e.g., deleted by another process.
+
+
 def pstr(s):
     """
 
@@ -10,9 +10,24 @@
 
 import os
 import sys
+import json
+import pickle
+import shutil
+import socket
+import zipfile
 import unittest
+import tempfile
+import warnings
+import subprocess
+import threading
+import numpy as np
 import pandas as pd
+from PIL import Image
+from time import sleep, time
+from collections import defaultdict
 from os.path import join as os_join
+from six.moves.urllib.parse import urlsplit, parse_qs
+from six.moves.BaseHTTPServer import HTTPServer, BaseHTTPRequestHandler
 
 
 # Allow access to modules
@@ -21,8 +36,23 @@ sys.path.insert(0, os.path.abspath("../"))
 
 
 from biovida import images
-from biovida.support_tools.support_tools import items_null
-from biovida.images._interface_support.openi.openi_text_processing import openi_raw_extract_and_clean
+from biovida.support_tools.support_tools import items_null, dicom
+from biovida.images.openi_interface import OpeniInterface, _OpeniRecords, _OpeniImages
+from biovida.images import cancer_image_interface, image_processing
+from biovida.images.cancer_image_interface import (CancerImageInterface, _CancerImageArchiveRecords,
+                                                  _CancerImageArchiveImages, _read_dicom)
+from biovida.images._image_tools import (ImageLoader, load_and_scale_images, scaled_image_batches, prefetched,
+                                         bounded_thread_imap, RateLimiter, PerHostLimiter)
+from biovida.images._results_store import ResultsStore, forget_images
+from biovida.images.image_processing import OpeniImageProcessing, _grayscale_image_analysis
+from biovida.images.models import template_matching, border_detection
+from biovida.images._interface_support.shared import DataFrameShardStore
+from biovida.images._interface_support.cancer_image.cancer_image_cache_index import (SeriesCacheIndex,
+                                                                                     png_series_abbrev,
+                                                                                     dicom_series_abbrev)
+from biovida.images._interface_support.openi import _openi_text_feature_extraction as otfe
+from biovida.images._interface_support.openi.openi_text_processing import (openi_raw_extract_and_clean,
+                                                                           openi_raw_extract_and_clean_streaming)
 
 
 data_path = os_join(str(os.getcwd()).split("/tests")[0], "tests/images/data")
@@ -74,4 +104,1225 @@ class OpeniInterfaceTests(unittest.TestCase):
         self.assertEqual(tuple_test, True)
 
 
+    def test_cleaning_raw_streaming(self):
+        """Test that processing raw Open-i data in chunks yields the same result as processing it all at once."""
+        # Repeat some rows s.t. 'uid's are split over chunks.
+        raw_df = pd.concat([raw_openi_data_df, raw_openi_data_df.iloc[::3]], ignore_index=True)
+        cleaned_df = openi_raw_extract_and_clean(raw_df.copy(), clinical_cases_only=False,
+                                                 verbose=False, cache_path=data_path)
+
+        def chunks():
+            return (raw_df.iloc[i:i + 7].reset_index(drop=True) for i in range(0, raw_df.shape[0], 7))
+
+        temp_dir = tempfile.mkdtemp()
+        try:
+            store = DataFrameShardStore(os_join(temp_dir, "shards"))
+            n_records = openi_raw_extract_and_clean_streaming(chunks, clinical_cases_only=False, verbose=False,
+                                                              cache_path=data_path, store=store)
+            streamed_df = store.to_data_frame()
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+        self.assertEqual(n_records, raw_df.shape[0])
+        self.assertEqual(list(streamed_df.columns), list(cleaned_df.columns))
+        for c in ('uid', 'image_id_short', 'image_caption', 'diagnosis', 'age', 'image_problems_from_text'):
+            self.assertEqual(streamed_df[c].astype(str).tolist(), cleaned_df[c].astype(str).tolist())
+
+    def test_cleaning_raw_n_jobs(self):
+        """Test that extracting features with a pool of processes yields the same result, in the same order."""
+        serial_df = openi_raw_extract_and_clean(raw_openi_data_df.copy(), clinical_cases_only=False,
+                                                verbose=False, cache_path=data_path)
+        parallel_df = openi_raw_extract_and_clean(raw_openi_data_df.copy(), clinical_cases_only=False,
+                                                  verbose=False, cache_path=data_path, n_jobs=2)
+        self.assertEqual(list(parallel_df.columns), list(serial_df.columns))
+        for c in serial_df.columns:
+            self.assertEqual(parallel_df[c].astype(str).tolist(), serial_df[c].astype(str).tolist())
+
+    def test_pull_deprecated_sleep_time(self):
+        """Test that the (removed) sleep time parameters are accepted, with a warning."""
+        opi = OpeniInterface.__new__(OpeniInterface)
+        opi.records_db = pd.DataFrame({'uid': ['1']})
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            records_db = opi.pull(image_size=None, new_records_pull=False, records_sleep_time=(10, 1.5))
+        self.assertTrue(records_db.equals(opi.records_db))
+        self.assertEqual([w.category for w in caught], [DeprecationWarning])
+
+
+class _StubOpeniHandler(BaseHTTPRequestHandler):
+    """Serve Open-i style blocks of records, where each record's 'uid' is its position in the search."""
+    requested_blocks = list()
+    fail_from = None  # respond to requests for blocks starting at or after this record with 404s.
+
+    def do_GET(self):
+        status = 200
+        if urlsplit(self.path).path.endswith('.png'):
+            body, content_type = b'\x89PNG' + os.path.basename(self.path).encode('utf-8'), 'image/png'
+        else:
+            params = parse_qs(urlsplit(self.path).query)
+            m, n = int(params['m'][0]), int(params['n'][0])
+            _StubOpeniHandler.requested_blocks.append(m)
+            body = json.dumps({'list': [{'uid': str(i)} for i in range(m, n + 1)]}).encode('utf-8')
+            content_type = 'application/json'
+            if self.fail_from is not None and m >= self.fail_from:
+                status, body = 404, b''
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class OpeniTextNormalizationTests(unittest.TestCase):
+    """
+
+    Unit Tests for Normalizing (HTML) Text from Open-i before Features are Extracted.
+
+    """
+
+    def test_strip_html(self):
+        """Test that tags (and comments) are replaced with a space and that entities are unescaped."""
+        self.assertEqual(otfe._strip_html("<p><b>History: </b>45 year old male.</p>"), "  History:  45 year old male. ")
+        self.assertEqual(otfe._strip_html("<!-- note --><i>T2</i>-weighted &amp; FLAIR"), "  T2 -weighted & FLAIR")
+        # '<' which does not open a tag is retained.
+        self.assertEqual(otfe._strip_html("p < 0.05 &lt; 0.1"), "p < 0.05 < 0.1")
+        self.assertEqual(otfe._strip_html("no html"), "no html")
+
+    def test_normalized_text(self):
+        text = "<p><b>History: </b>A 6 month old Girl</p><br/><b>Findings:</b>"
+        normalized = otfe._normalize(text)
+        self.assertEqual(normalized.raw, text)
+        self.assertEqual(normalized.clean, "History: A 6 month old Girl Findings:")
+        self.assertEqual(normalized.lower, "history: a 6 month old girl findings:")
+        self.assertIsNone(otfe._normalize(np.NaN))
+        self.assertIsNone(otfe._normalize(None))
+
+    def test_age_and_sex_from_html(self):
+        """Test that the age and sex extractors operate on the normalized views of HTML sources."""
+        def guesses(abstract, image_caption=None):
+            sources = {'background': None, 'abstract': otfe._normalize(abstract),
+                       'image_caption': otfe._normalize(image_caption), 'image_mention': None}
+            return otfe._patient_age_guess(**sources), otfe._patient_sex_guess(**sources)
+
+        self.assertEqual(guesses("<p><b>History: </b>45 year old<br/>male with chest pain.</p>"), (45.0, 'male'))
+        self.assertEqual(guesses("<p>A 6 month old <b>Girl</b></p>"), (0.5, 'female'))
+        self.assertEqual(guesses("<p><b>History: </b>Fifty-two year old woman.</p>"), (52.0, 'female'))
+        # Tags are not mistaken for text (e.g., '<b>' for ' b').
+        self.assertEqual(guesses("<p><b>Findings:</b> T2-weighted MRI.</p>"), (None, None))
+        # Sources are searched in order.
+        self.assertEqual(guesses(None, image_caption="<i>30 y</i> <b>M</b> patient"), (30.0, 'male'))
+
+
+class OpeniTermBankTests(unittest.TestCase):
+    """
+
+    Unit Tests for the Term Banks used to Guess the Imaging Modality and Plane from Open-i Text.
+
+    """
+
+    captions = ["Axial CT of the chest with contrast showing a mass.",
+                "Sagittal T2-weighted MRI of the lumbar spine.",
+                "Coronal and axial FLAIR images of the brain.",
+                "Transverse ultrasound of the liver; doppler flow is normal.",
+                "PA and lateral chest x-ray.",
+                "Non-contrast CT and MRI of the head.",
+                "Contrast enhanced T1 weighted image with fat suppression.",
+                "Photograph of the lesion.",
+                "",
+                "Sagittal reformatted CT angiography; coronal reconstruction."]
+
+    @staticmethod
+    def _linear_im_scan(source):
+        """The (per table) scan which ``_term_bank_scan()`` replaced."""
+        matches = defaultdict(set)
+        for k, v in otfe.terms_dict.items():
+            if any(i in source for i in v[0]):
+                matches[k].add(None)
+                if k in otfe.modality_subtypes:
+                    for v2 in otfe.modality_subtypes[k]:
+                        if any(j in source for j in v2):
+                            matches[k].add(otfe.cln(v2[0]))
+        for k, v in otfe.modality_specific_subtypes.items():
+            for i in v:
+                if any(j in source for j in i):
+                    matches[k].add(otfe.cln(i[0]))
+        if len(list(matches.keys())) != 1:
+            return None
+        else:
+            return {k: list([_f for _f in v if _f]) for k, v in list(matches.items())}
+
+    @staticmethod
+    def _linear_plane_guess(source):
+        plane_terms = [['axial', 'transverse'], ['coronal'], ['sagittal']]
+        planes = [p[0] for p in plane_terms if any(i in source for i in p)]
+        return planes[0] if len(planes) == 1 else None
+
+    def _sources(self):
+        """Representative captions, as well as each of the terms in the modality bank on its own."""
+        return [c.lower() for c in self.captions] + ["image: {0}.".format(t) for t, _ in otfe._IM_TERM_BANK]
+
+    def test_term_bank(self):
+        bank = otfe._term_bank([('a', ['x', 'y']), ('b', ['y', 'z'])])
+        self.assertEqual({term: sorted(hits) for term, hits in bank}, {'x': ['a'], 'y': ['a', 'b'], 'z': ['b']})
+        self.assertEqual(otfe._term_bank_scan(bank, "wyz"), {'a', 'b'})
+        self.assertEqual(otfe._term_bank_scan(bank, "x"), {'a'})
+        self.assertEqual(otfe._term_bank_scan(bank, ""), set())
+
+    def test_im_scan_matches_linear_scan(self):
+        for source in self._sources():
+            expected, actual = self._linear_im_scan(source), otfe._im_scan(source)
+            if isinstance(expected, dict):
+                expected = {k: sorted(v) for k, v in expected.items()}
+                actual = {k: sorted(v) for k, v in actual.items()}
+            self.assertEqual(actual, expected, msg=source)
+
+    def test_image_plane_guess_matches_linear_scan(self):
+        for source in self._sources():
+            caption = otfe._normalize(source)
+            expected = self._linear_plane_guess(caption.lower) if caption is not None else None
+            self.assertEqual(otfe._image_plane_guess(caption), expected, msg=source)
+        self.assertIsNone(otfe._image_plane_guess(None))
+
+
+class OpeniRecordsEngineTests(unittest.TestCase):
+    """
+
+    Unit Tests for the Concurrent Open-i Records Engine (against a local stub server).
+
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = HTTPServer(('127.0.0.1', 0), _StubOpeniHandler)
+        cls.server_thread = threading.Thread(target=cls.server.serve_forever)
+        cls.server_thread.daemon = True
+        cls.server_thread.start()
+        cls.root_url = "http://127.0.0.1:{0}".format(cls.server.server_address[1])
+        cls.search_url = "{0}/retrieve.php?query=".format(cls.root_url)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def test_records_pull_engine_order(self):
+        """Test that blocks harvested concurrently are assembled in the order of the bounds."""
+        oir = _OpeniRecords(root_url='https://openi.nlm.nih.gov', date_format='%d/%m/%Y',
+                            verbose=False, cache_path=data_path)
+        oir.download_limit = 250
+        bounds, download_no = oir.openi_bounds(total=1000)
+        harvest = oir._records_pull_engine(bounds_list=oir.openi_bounds_formatter(bounds),
+                                           search_url=self.search_url,
+                                           to_harvest=['uid'],
+                                           max_workers=8,
+                                           rate_limit=None,
+                                           download_no=download_no)
+        self.assertEqual([int(d['uid']) for d in harvest], list(range(1, 251)))
+
+    def test_records_pull_engine_resume(self):
+        """Test that an interrupted harvest resumes from the blocks checkpointed to disk."""
+        temp_dir = tempfile.mkdtemp()
+        try:
+            oir = _OpeniRecords(root_url='https://openi.nlm.nih.gov', date_format='%d/%m/%Y',
+                                verbose=False, cache_path=data_path, temp_directory_path=temp_dir)
+            oir.download_limit = 300
+            bounds, download_no = oir.openi_bounds(total=1000)
+            engine_kwargs = dict(bounds_list=oir.openi_bounds_formatter(bounds), search_url=self.search_url,
+                                 to_harvest=['uid'], max_workers=1, rate_limit=None, download_no=download_no)
+
+            _StubOpeniHandler.fail_from = 151
+            with self.assertRaises(ValueError):
+                oir._records_pull_engine(**engine_kwargs)
+
+            _StubOpeniHandler.fail_from = None
+            _StubOpeniHandler.requested_blocks = list()
+            harvest = oir._records_pull_engine(**engine_kwargs)
+            self.assertEqual(_StubOpeniHandler.requested_blocks, list(range(151, 301, 30)))
+            self.assertEqual([int(d['uid']) for d in harvest], list(range(1, 301)))
+        finally:
+            _StubOpeniHandler.fail_from = None
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def test_records_pull_engine_resume_partial_line(self):
+        """Test that blocks checkpointed after resuming from a partially written line can be read back."""
+        temp_dir = tempfile.mkdtemp()
+        try:
+            oir = _OpeniRecords(root_url='https://openi.nlm.nih.gov', date_format='%d/%m/%Y',
+                                verbose=False, cache_path=data_path, temp_directory_path=temp_dir)
+            oir.download_limit = 90
+            bounds, download_no = oir.openi_bounds(total=1000)
+            bounds_list = oir.openi_bounds_formatter(bounds)
+            with open(oir._checkpoint_path, "w") as f:
+                f.write(json.dumps({'search_url': self.search_url, 'bounds': bounds_list}) + "\n")
+                f.write(json.dumps({'bound': bounds_list[0], 'records': [{'uid': str(i)} for i in range(1, 31)]}))
+                f.write("\n" + json.dumps({'bound': bounds_list[1], 'records': []})[:10])  # cut off
+
+            harvest = oir._records_pull_engine(bounds_list=bounds_list, search_url=self.search_url,
+                                               to_harvest=['uid'], max_workers=1, rate_limit=None,
+                                               download_no=download_no)
+            self.assertEqual([int(d['uid']) for d in harvest], list(range(1, 91)))
+            self.assertEqual(sorted(oir._load_checkpoint(self.search_url, bounds_list)), sorted(bounds_list))
+            blocks = list(oir._iter_checkpoint_blocks(bounds_list))
+            self.assertEqual([int(d['uid']) for b in blocks for d in b], list(range(1, 91)))
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def test_records_pull_engine_streaming(self):
+        """Test that blocks which are not kept in memory are read back from the checkpoint in order."""
+        temp_dir = tempfile.mkdtemp()
+        try:
+            oir = _OpeniRecords(root_url='https://openi.nlm.nih.gov', date_format='%d/%m/%Y',
+                                verbose=False, cache_path=data_path, temp_directory_path=temp_dir)
+            oir.download_limit = 250
+            bounds, download_no = oir.openi_bounds(total=1000)
+            bounds_list = oir.openi_bounds_formatter(bounds)
+            harvest = oir._records_pull_engine(bounds_list=bounds_list,
+                                               search_url=self.search_url,
+                                               to_harvest=['uid'],
+                                               max_workers=8,
+                                               rate_limit=None,
+                                               download_no=download_no,
+                                               keep_blocks=False)
+            self.assertEqual(harvest, None)
+
+            chunks = list(oir._checkpoint_chunks(bounds_list, chunk_size=100))
+            self.assertEqual([c.shape[0] for c in chunks], [120, 120, 10])
+            self.assertEqual([int(u) for c in chunks for u in c['uid']], list(range(1, 251)))
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def test_pull_images_engine(self):
+        """Test that images downloaded concurrently are written to disk and recorded against the correct rows."""
+        temp_dir = tempfile.mkdtemp()
+        try:
+            oii = _OpeniImages(image_save_location=temp_dir, database_save_location=temp_dir, verbose=False)
+            urls = ["{0}/imgs/512/{1}.png".format(self.root_url, i) for i in range(25)]
+            oii._instantiate_real_time_update_db(db_index=pd.Index(range(len(urls))))
+            oii._pull_images_engine(harvesting_information=[(e, u, None) for e, u in enumerate(urls)],
+                                    image_size='large', use_image_caption=False,
+                                    max_workers=8, per_host_limit=4, rate_limit=None)
+            for index, url in enumerate(urls):
+                path = oii.real_time_update_db.get_value(index, 'cached_images_path')
+                self.assertEqual(oii.real_time_update_db.get_value(index, 'download_success'), True)
+                with open(path, 'rb') as f:
+                    self.assertEqual(f.read(), b'\x89PNG' + os.path.basename(url).encode('utf-8'))
+            self.assertEqual(oii.throughput['images_downloaded'], len(urls))
+            self.assertEqual(any(f.endswith('.part') for f in os.listdir(temp_dir)), False)
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def test_individual_image_harvest_rate(self):
+        """Test that requests held back by the per-host limit are not then sent faster than the rate limit."""
+        temp_dir = tempfile.mkdtemp()
+        try:
+            oii = _OpeniImages(image_save_location=temp_dir, database_save_location=temp_dir, verbose=False)
+            started, lock = list(), threading.Lock()
+
+            def stream_to_disk(image_url, image_save_path):
+                with lock:
+                    started.append(time())
+                    first = len(started) == 1
+                if first:
+                    sleep(0.4)  # the other requests (would) queue for the host meanwhile.
+                return 0
+
+            oii._stream_to_disk = stream_to_disk
+            rate_limiter, host_limiter = RateLimiter(rate=20), PerHostLimiter(limit=1)
+            threads = [threading.Thread(target=oii._individual_image_harvest,
+                                        args=("{0}/imgs/{1}.png".format(self.root_url, i),
+                                              os_join(temp_dir, "{0}.png".format(i)), False,
+                                              rate_limiter, host_limiter)) for i in range(5)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            self.assertEqual(len(started), 5)
+            self.assertGreater(min(b - a for a, b in zip(started, started[1:])), 0.04)
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def test_pull_images_engine_interrupted(self):
+        """Test that images downloaded before a pull is interrupted are recorded."""
+        temp_dir = tempfile.mkdtemp()
+        try:
+            oii = _OpeniImages(image_save_location=temp_dir, database_save_location=temp_dir, verbose=False)
+            harvesting_information = [(e, "{0}/imgs/512/{1}.png".format(self.root_url, e), None) for e in range(3)]
+            harvesting_information.append((3, None, None))  # an invalid url.
+            oii._instantiate_real_time_update_db(db_index=pd.Index(range(len(harvesting_information))))
+            with self.assertRaises(Exception):
+                oii._pull_images_engine(harvesting_information=harvesting_information,
+                                        image_size='large', use_image_caption=False,
+                                        max_workers=1, per_host_limit=1, rate_limit=None)
+            self.assertEqual(oii.real_time_update_db['download_success'].tolist()[:3], [True] * 3)
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+class _StubTCIAHandler(BaseHTTPRequestHandler):
+    """Serve TCIA style records for a collection with ``n_patients`` patients, each with one study of two series."""
+    requests = list()
+    n_patients = 6
+
+    def do_GET(self):
+        params = {k: v[0] for k, v in parse_qs(urlsplit(self.path).query).items()}
+        _StubTCIAHandler.requests.append(params.get('PatientID'))
+        if urlsplit(self.path).path.endswith('getPatientStudy'):
+            rows = ["P{0},1.{0},2001-01-01,F,040Y".format(i) for i in range(self.n_patients)]
+            body = "\n".join(["PatientID,StudyInstanceUID,StudyDate,PatientSex,PatientAge"] + rows)
+        else:
+            i = params['PatientID'][1:]
+            rows = ["2.{0}.{1},1.{0},CT,p,2001-01-01,d,CHEST,{2},no,STUDY,P{0},GE,m,1,4,1".format(i, k, k + 1)
+                    for k in range(2)]
+            body = "\n".join(["SeriesInstanceUID,StudyInstanceUID,Modality,ProtocolName,SeriesDate,"
+                               "SeriesDescription,BodyPartExamined,SeriesNumber,AnnotationsFlag,Collection,"
+                               "PatientID,Manufacturer,ManufacturerModelName,SoftwareVersions,ImageCount,"
+                               "Visibility"] + rows)
+        body = (body + "\n").encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class CancerImageRecordsTests(unittest.TestCase):
+    """
+
+    Unit Tests for Harvesting Cancer Imaging Archive Records (against a local stub server).
+
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = HTTPServer(('127.0.0.1', 0), _StubTCIAHandler)
+        cls.server_thread = threading.Thread(target=cls.server.serve_forever)
+        cls.server_thread.daemon = True
+        cls.server_thread.start()
+        cls.root_url = "http://127.0.0.1:{0}".format(cls.server.server_address[1])
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def _records_pull(self, cache_directory, max_workers):
+        records = _CancerImageArchiveRecords(api_key='key', dicom_modality_abbrevs={'CT': 'Computed Tomography'},
+                                             tcia_overview_df=pd.DataFrame({'collection': ['STUDY'],
+                                                                            'cancer_type': ['Lung']}),
+                                             root_url=self.root_url, cache_directory=cache_directory)
+        _StubTCIAHandler.requests = list()
+        return records.records_pull(study='STUDY', search_dict={}, pull_time=None, patient_limit=None,
+                                    verbose=False, max_workers=max_workers)
+
+    def test_records_pull(self):
+        """Test that patients requested at once yield the same records and that only new patients are requested."""
+        temp_dir = tempfile.mkdtemp()
+        try:
+            _StubTCIAHandler.n_patients = 6
+            serial = self._records_pull(cache_directory=None, max_workers=1)
+            concurrent = self._records_pull(cache_directory=temp_dir, max_workers=4)
+            self.assertTrue(serial.equals(concurrent))
+            self.assertEqual(concurrent['patient_id'].tolist(), ["P{0}".format(i // 2) for i in range(12)])
+
+            _StubTCIAHandler.n_patients = 7
+            cached = self._records_pull(cache_directory=temp_dir, max_workers=4)
+            self.assertEqual(_StubTCIAHandler.requests, [None, 'P6'])
+            self.assertTrue(cached.iloc[:12].equals(concurrent))
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+class _StubZipHandler(BaseHTTPRequestHandler):
+    """Serve ``body`` (a zip archive) in response to every request."""
+    body = b''
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _write_synthetic_dicom(path, instance_number):
+    """Write a (tiny) single frame, 8-bit grayscale DICOM file to ``path``."""
+    file_meta = getattr(dicom.dataset, 'FileMetaDataset', dicom.dataset.Dataset)()
+    file_meta.MediaStorageSOPClassUID = '1.2.840.10008.5.1.4.1.1.7'
+    file_meta.MediaStorageSOPInstanceUID = '1.2.3.{0}'.format(instance_number)
+    file_meta.TransferSyntaxUID = '1.2.840.10008.1.2'  # implicit VR, little endian.
+    f = dicom.dataset.FileDataset(path, {}, file_meta=file_meta, preamble=b'\0' * 128)
+    if int(str(getattr(dicom, '__version__', '0')).split('.')[0]) < 3:
+        f.is_little_endian, f.is_implicit_VR = True, True
+    f.SOPClassUID, f.SOPInstanceUID = file_meta.MediaStorageSOPClassUID, file_meta.MediaStorageSOPInstanceUID
+    f.PatientID, f.Modality, f.InstanceNumber = 'P0', 'CT', instance_number
+    f.Rows, f.Columns, f.SamplesPerPixel, f.PhotometricInterpretation = 4, 4, 1, 'MONOCHROME2'
+    f.BitsAllocated, f.BitsStored, f.HighBit, f.PixelRepresentation = 8, 8, 7, 0
+    f.PixelData = bytes(bytearray(range(0, 256, 16)))
+    f.save_as(path)
+
+
+class CancerImageImagesTests(unittest.TestCase):
+    """
+
+    Unit Tests for Harvesting Cancer Imaging Archive Images.
+
+    """
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.images = _CancerImageArchiveImages(api_key='key', dicom_modality_abbrevs={'CT': 'Computed Tomography'},
+                                                root_url='http://127.0.0.1:1', verbose=False, cache_path=self.temp_dir)
+        self.dicoms_dir = self.images._created_image_dirs['dicoms']
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _set_records(self, n_series):
+        self.images.records_db_images = pd.DataFrame({'patient_id': ['P{0}'.format(i) for i in range(n_series)],
+                                                      'series_instance_uid': ['1.2.{0}'.format(i)
+                                                                              for i in range(n_series)],
+                                                      'modality': 'CT', 'modality_full': 'Computed Tomography',
+                                                      'image_count': 1})
+        self.images._instantiate_real_time_update_db(self.images.records_db_images.index)
+
+    def test_download_zip(self):
+        """Test that the members of the archive are extracted (one at a time) to the top level of the folder."""
+        members = {'series/': None, 'series/1.dcm': b'first', '../2.dcm': b'second' * 1000}
+        archive = os_join(self.temp_dir, 'archive.zip')
+        with zipfile.ZipFile(archive, 'w', compression=zipfile.ZIP_DEFLATED) as z:
+            for name, content in members.items():
+                if content is None:
+                    z.writestr(zipfile.ZipInfo(name), b'')
+                else:
+                    z.writestr(name, content)
+        with open(archive, 'rb') as f:
+            _StubZipHandler.body = f.read()
+
+        server = HTTPServer(('127.0.0.1', 0), _StubZipHandler)
+        server_thread = threading.Thread(target=server.serve_forever)
+        server_thread.daemon = True
+        server_thread.start()
+        try:
+            self.images.ROOT_URL = "http://127.0.0.1:{0}".format(server.server_address[1])
+            temporary_folder = self.images._create_temp_dicom_dir()
+            dicom_files = self.images._download_zip('1.2.3', temporary_folder=temporary_folder)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        self.assertEqual(dicom_files, [os_join(temporary_folder, '1.dcm'), os_join(temporary_folder, '2.dcm')])
+        self.assertEqual(sorted(os.listdir(temporary_folder)), ['1.dcm', '2.dcm'])  # the archive is removed.
+        for path, content in zip(dicom_files, (b'first', b'second' * 1000)):
+            with open(path, 'rb') as f:
+                self.assertEqual(f.read(), content)
+
+    def _dicom_files(self, n=2):
+        folder = self.images._create_temp_dicom_dir()
+        paths = [os_join(folder, "{0}.dcm".format(i)) for i in range(n)]
+        for i, path in enumerate(paths):
+            _write_synthetic_dicom(path, instance_number=n - i)
+        return paths
+
+    def _counting_reads(self):
+        """Record the arguments passed to ``dicom.read_file()`` (until the test ends)."""
+        calls, read_file = list(), cancer_image_interface.dicom.read_file
+
+        def counting_read_file(*args, **kwargs):
+            calls.append((args, kwargs))
+            return read_file(*args, **kwargs)
+
+        cancer_image_interface.dicom.read_file = counting_read_file
+        self.addCleanup(setattr, cancer_image_interface.dicom, 'read_file', read_file)
+        return calls
+
+    def _extract_dicom_data(self, series_uids, cached_dicom_images_paths):
+        interface = CancerImageInterface.__new__(CancerImageInterface)
+        interface._Images = self.images
+        interface.records_db = pd.DataFrame({'series_instance_uid': series_uids,
+                                             'cached_dicom_images_path': cached_dicom_images_paths})
+        return interface.extract_dicom_data()
+
+    def test_read_dicom(self):
+        """Test that pixel data is only read if the DICOM is to be converted."""
+        path = self._dicom_files(n=1)[0]
+        calls = self._counting_reads()
+        instance_number, metadata, paths, success = _read_dicom(path, 1, '1.2.3', None, self.temp_dir, convert=False)
+        self.assertEqual((instance_number, paths, success), ('1', [], None))
+        self.assertEqual((metadata['PatientID'], metadata['Modality']), ('P0', 'CT'))
+        self.assertEqual(calls[-1][1], {'stop_before_pixels': True})
+
+        instance_number, converted_metadata, paths, success = _read_dicom(path, 1, '1.2.3', 'image',
+                                                                          self.temp_dir, convert=True)
+        self.assertEqual(calls[-1][1], {'stop_before_pixels': False})
+        self.assertTrue(success)
+        self.assertTrue(all(os.path.isfile(p) for p in paths))
+        self.assertEqual(len(calls), 2)  # each file is read once.
+
+    def test_dicom_data_without_saved_dicoms(self):
+        """Test that the metadata saved while pulling is used by ``extract_dicom_data()`` if DICOMs are not saved."""
+        dicom_files = self._dicom_files()
+        self.images._process_series(None, index=0, dicom_files=dicom_files, series_uid='1.2.3', series_abbrev='P0_3',
+                                    save_png=False, save_dicom=False)
+        shutil.rmtree(os.path.dirname(dicom_files[0]))
+
+        calls = self._counting_reads()
+        data = self._extract_dicom_data(['1.2.3'], [None]).iloc[0]
+        self.assertEqual(calls, [])
+        self.assertEqual(sorted(data), ['0.dcm', '1.dcm'])
+        self.assertEqual([data[k]['InstanceNumber'] for k in ('0.dcm', '1.dcm')], [2, 1])
+
+    def test_dicom_data_fallback(self):
+        """Test that, for series without saved metadata (i.e., older pulls), the cached DICOMs are read."""
+        dicom_files = self._dicom_files()
+        calls = self._counting_reads()
+        data = self._extract_dicom_data(['1.2.3'], [tuple(dicom_files)]).iloc[0]
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(sorted(data), sorted(dicom_files))
+        self.assertEqual(data[dicom_files[0]]['PatientID'], 'P0')
+
+    def test_interrupted_pull_removes_downloads(self):
+        """Test that series downloaded, but not processed, when processing raises are removed."""
+        self._set_records(n_series=6)
+        downloaded, processed = list(), list()
+
+        def download_series(series_uid, progress=None):
+            temporary_folder = self.images._create_temp_dicom_dir()
+            with open(os_join(temporary_folder, "1.dcm"), "wb") as f:
+                f.write(b"DICM")
+            downloaded.append(series_uid)
+            return temporary_folder, [os_join(temporary_folder, "1.dcm")]
+
+        def process_series(pool, index, dicom_files, series_uid, series_abbrev, save_png, save_dicom):
+            processed.append(series_uid)
+            sleep(0.05)  # let the downloads get ahead.
+            if len(processed) == 2:
+                raise KeyboardInterrupt
+
+        self.images._download_series = download_series
+        self.images._process_series = process_series
+        with self.assertRaises(KeyboardInterrupt):
+            self.images._pull_images_engine(save_dicom=False, allowed_modalities=None, save_png=True,
+                                            max_workers=2)
+        self.assertGreater(len(downloaded), len(processed))
+        self.assertLess(len(downloaded), 6)
+        self.assertEqual([d for d in os.listdir(self.dicoms_dir) if d.startswith('__temp_dicom__')], [])
+
+    def test_remove_latent_temp_dicom_dirs(self):
+        """Test that only temporary DICOM directories whose owner has stopped (or which are old) are removed."""
+        finished = subprocess.Popen([sys.executable, "-c", "pass"])
+        finished.wait()
+        host = socket.gethostname()
+
+        def temp_dir(name, age=0):
+            path = os_join(self.dicoms_dir, name)
+            os.makedirs(path)
+            if age:
+                os.utime(path, (time() - age, time() - age))
+            return path
+
+        own = self.images._create_temp_dicom_dir()
+        stopped = temp_dir("__temp_dicom__{0}@{1}__a".format(finished.pid, host))
+        other_host = temp_dir("__temp_dicom__1@not-{0}__b".format(host))
+        other_host_old = temp_dir("__temp_dicom__1@not-{0}__c".format(host), age=2 * 24 * 60 * 60)
+        unknown = temp_dir("__temp_dicom__d")
+        unknown_old = temp_dir("__temp_dicom__e", age=2 * 24 * 60 * 60)
+
+        self.images._remove_latent_temp_dicom_dirs()
+        self.assertEqual(sorted(p for p in (own, stopped, other_host, other_host_old, unknown, unknown_old)
+                                if os.path.isdir(p)), sorted([own, other_host, unknown]))
+
+
+class ImageLoaderTests(unittest.TestCase):
+    """
+
+    Unit Tests for Loading Images Once for Several Analyses.
+
+    """
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.paths = list()
+        for i in range(3):
+            path = os_join(self.temp_dir, "{0}.png".format(i))
+            Image.fromarray(np.arange(40 * 30 * 3, dtype='uint8').reshape(40, 30, 3) + i).save(path)
+            self.paths.append(path)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_views(self):
+        """Test that views are derived from a single decode and match those obtained by reading the image."""
+        decoded_image = ImageLoader()[self.paths[0]]
+        expected = np.array(Image.open(self.paths[0]).convert('F'))
+        self.assertEqual(np.array_equal(decoded_image.grayscale(), expected), True)
+        self.assertIs(decoded_image.grayscale(), decoded_image.grayscale())
+        cropped = decoded_image.cropped(lower_crop=30, upper_crop=np.NaN, vborder=[5, 25])
+        self.assertEqual(cropped.size, (20, 30))
+        self.assertIs(cropped, decoded_image.cropped(lower_crop=30.0, upper_crop=None, vborder=(5, 25)))
+
+    def test_lru_eviction(self):
+        """Test that the least recently used images are evicted once ``max_bytes`` is exceeded."""
+        loader = ImageLoader(max_bytes=40 * 30 * 3 * 2)
+        for path in self.paths:
+            loader[path].image
+        self.assertEqual(len(loader), 2)
+        self.assertEqual(self.paths[0] in loader, False)
+        loader[self.paths[1]].grayscale()
+        loader[self.paths[0]].image
+        self.assertEqual([p in loader for p in self.paths], [True, False, False])
+
+    def test_scaled_image_batches(self):
+        """Test that images loaded in batches match those loaded all at once."""
+        batches = list(scaled_image_batches(self.paths, image_size=(20, 10), batch_size=2))
+        self.assertEqual([b.shape for b in batches], [(2, 3, 20, 10), (1, 3, 20, 10)])
+        self.assertEqual(batches[0].dtype, np.float32)
+        expected = load_and_scale_images(self.paths, image_size=(20, 10), status=False)
+        self.assertEqual(np.allclose(np.concatenate(batches), expected), True)
+
+    def test_prefetched(self):
+        """Test that prefetching preserves order and raises exceptions in the consumer."""
+        self.assertEqual(list(prefetched(iter(range(50)), max_prefetch=3)), list(range(50)))
+
+        def failing():
+            yield 1
+            raise KeyError('failed')
+
+        with self.assertRaises(KeyError):
+            list(prefetched(failing()))
+
+    def test_bounded_thread_imap(self):
+        """Test that no more than ``max_workers + max_queued`` calls are outstanding while the consumer works."""
+        started, lock = list(), threading.Lock()
+
+        def func(i):
+            with lock:
+                started.append(i)
+            return i * 2
+
+        consumed = list()
+        for position, result in bounded_thread_imap(func, range(20), max_workers=2, max_queued=1):
+            self.assertEqual(result, position * 2)
+            sleep(0.01)
+            with lock:
+                self.assertLessEqual(len(started) - len(consumed), 3)
+            consumed.append(position)
+        self.assertEqual(sorted(consumed), list(range(20)))
+
+    def test_bounded_thread_imap_discard(self):
+        """Test that results which complete, but are not consumed, are discarded when the generator is closed."""
+        started, lock = list(), threading.Lock()
+
+        def func(i):
+            with lock:
+                started.append(i)
+            sleep(0.02)
+            return i
+
+        discarded = list()
+        results = bounded_thread_imap(func, range(20), max_workers=2, max_queued=2, discard=discarded.append)
+        consumed = [next(results)[1]]
+        sleep(0.1)
+        results.close()
+        self.assertLess(len(started), 20)
+        self.assertEqual(sorted(consumed + discarded), sorted(started))
+
+
+class TemplateMatchingTests(unittest.TestCase):
+    """
+
+    Unit Tests for Multi-Scale Template Matching.
+
+    """
+
+    def setUp(self):
+        random_state = np.random.RandomState(1)
+        self.pattern = (random_state.rand(24, 40) > 0.5) * 255.0
+        self.base = random_state.rand(300, 300) * 100
+        self.base[6:30, 200:240] = self.pattern
+
+    def test_normalized_cross_correlation(self):
+        """Test that the FFT-based normalized cross-correlation agrees with ``skimage.feature.match_template()``."""
+        from skimage.feature import match_template
+        prepared_pattern = template_matching._PreparedPattern(self.pattern)
+        response = template_matching._normalized_cross_correlation(self.base[:80, 150:], prepared_pattern)
+        self.assertEqual(np.allclose(response, match_template(self.base[:80, 150:], self.pattern)), True)
+        self.assertIsNone(template_matching._normalized_cross_correlation(self.pattern[:10], prepared_pattern))
+
+    def test_pyramid_engine(self):
+        """Test that the pyramid and exhaustive engines locate the pattern identically."""
+        rslts = [template_matching.robust_match_template(self.pattern, self.base, method=m)
+                 for m in ('pyramid', 'exhaustive')]
+        self.assertEqual(rslts[0]['bounding_box'], rslts[1]['bounding_box'])
+        self.assertEqual(rslts[0]['bounding_box']['top_left'], (200, 6))
+        self.assertAlmostEqual(rslts[0]['match_quality'], rslts[1]['match_quality'])
+
+    def test_template_registry(self):
+        """Test that patterns are prepared once per process and that the prepared pyramids are saved."""
+        temp_dir = tempfile.mkdtemp()
+        try:
+            logo_path = os_join(temp_dir, "logo.png")
+            Image.fromarray(self.pattern.astype('uint8')).save(logo_path)
+            registry = template_matching._TemplateRegistry()
+            pyramid = registry.get(logo_path, save_directory=temp_dir)
+            self.assertIs(registry.get(logo_path, save_directory=temp_dir), pyramid)
+            self.assertEqual(os.path.isfile(os_join(temp_dir, "logo_pyramid.p")), True)
+
+            # Saved pyramids are reused by other processes (here, a fresh registry)...
+            loaded = template_matching._TemplateRegistry().get(logo_path, save_directory=temp_dir)
+            self.assertEqual(np.array_equal(loaded.coarse_pattern, pyramid.coarse_pattern), True)
+
+            # ...unless the pattern image has changed.
+            Image.fromarray(255 - self.pattern.astype('uint8')).save(logo_path)
+            rebuilt = template_matching._TemplateRegistry().get(logo_path, save_directory=temp_dir)
+            self.assertEqual(np.array_equal(rebuilt.pattern, 255 - self.pattern), True)
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+class BorderDetectionTests(unittest.TestCase):
+    """
+
+    Unit Tests for the Signal Processing Underlying Border Detection.
+
+    """
+
+    def test_rounder(self):
+        """Test that ``_rounder()`` agrees with ``round()``, including where ``numpy.round()`` does not."""
+        values = [0.285, 2.675, 1.5, 0.123456789, np.float64(1) / 3]
+        self.assertEqual(list(border_detection._rounder(values, 2)), [round(v, 2) for v in values])
+        self.assertEqual(list(border_detection._rounder(values, 0)), [0, 2, 1, 0, 0])
+
+    def test_anomaly_removal(self):
+        """Test that isolated values are replaced by those of their homogeneous neighbours."""
+        row = [0.24677, 0.24677, 0.24677, 0.9, 0.24677, 0.24677, 0.24677]
+        self.assertEqual(list(border_detection._anomaly_removal(row, 3)), [0.24677] * 7)
+        row = [5, 0, 0, 0, 1, 2, 2, 2, 7, 2]
+        self.assertEqual(list(border_detection._anomaly_removal(row, 2)), [0, 0, 0, 0, 1, 2, 2, 2, 2, 7])
+
+
+class ResultsStoreTests(unittest.TestCase):
+    """
+
+    Unit Tests for Persistent Stores of Results Computed for Images.
+
+    """
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.paths = [os_join(self.temp_dir, "{0}.png".format(i)) for i in range(2)]
+        for path in self.paths:
+            Image.fromarray(np.zeros((10, 10), dtype='uint8')).save(path)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_content_addressing(self):
+        """Test that results are keyed on the contents of images and are persisted."""
+        store = ResultsStore(self.temp_dir, name='predictions', fingerprint='model_a')
+        store[store.key(self.paths[0], (1, 2))] = 'result'
+        store.save()
+
+        store = ResultsStore(self.temp_dir, name='predictions', fingerprint='model_a')
+        self.assertEqual(store.get(store.key(self.paths[1], (1, 2))), 'result')  # identical contents.
+        self.assertIsNone(store.get(store.key(self.paths[1], (1, 3))))
+        # Rewrite the image s.t. its size is unchanged and its mtime is set explicitly (rather than relying
+        # on the resolution of the filesystem's clock to detect that the file has changed).
+        stat = os.stat(self.paths[1])
+        Image.fromarray(np.ones((10, 10), dtype='uint8')).save(self.paths[1])
+        os.utime(self.paths[1], ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        self.assertIsNone(store.get(store.key(self.paths[1], (1, 2))))
+        self.assertEqual(store.info, {'hits': 1, 'misses': 2, 'size': 1})
+
+    def test_fingerprint(self):
+        """Test that stores for other fingerprints are not used and are deleted when a store is saved."""
+        store = ResultsStore(self.temp_dir, name='predictions', fingerprint='model_a')
+        store[store.key(self.paths[0])] = 'result'
+        store.save()
+        store = ResultsStore(self.temp_dir, name='predictions', fingerprint='model_b')
+        self.assertEqual(len(store), 0)
+        store[store.key(self.paths[0])] = 'result'
+        store.save()
+        self.assertEqual(sorted(f for f in os.listdir(self.temp_dir) if f.endswith('.p')), ['predictions_model_b.p'])
+
+    def test_forget_images(self):
+        """Test that results are removed for deleted images, unless another image has the same contents."""
+        Image.fromarray(np.ones((10, 10), dtype='uint8')).save(self.paths[1])
+        store = ResultsStore(self.temp_dir, name='border_analysis', fingerprint='v1')
+        for path in self.paths:
+            store[store.key(path, ('threshold', 0.25))] = path
+        store.save()
+
+        forget_images(self.temp_dir, [self.paths[1]])
+        store = ResultsStore(self.temp_dir, name='border_analysis', fingerprint='v1')
+        self.assertEqual(list(store.results.values()), [self.paths[0]])
+
+        store[store.key(self.paths[1], ('threshold', 0.25))] = self.paths[1]
+        Image.fromarray(np.zeros((10, 10), dtype='uint8')).save(self.paths[1])  # same contents as paths[0].
+        store.key(self.paths[1])
+        store.forget([self.paths[0]])
+        self.assertEqual(len(store), 2)
+
+
+def _bare_image_processing(temp_dir, image_dataframe):
+    """An ``OpeniImageProcessing`` instance with its results saved to ``temp_dir`` (and no model)."""
+    ip = OpeniImageProcessing.__new__(OpeniImageProcessing)
+    ip.image_dataframe = image_dataframe
+    ip.n_jobs = 1
+    ip.cache_analyses, ip.cache_predictions = True, True
+    ip._image_loader = ImageLoader()
+    ip._results_path = temp_dir
+    ip._predictions, ip._analyses, ip._defer_store_saves = None, dict(), False
+    ip._analysis_pools = None
+    return ip
+
+
+class ImageProcessingStoreTests(unittest.TestCase):
+    """
+
+    Unit Tests for the use of Stores of Results by ``OpeniImageProcessing``.
+
+    """
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.paths = [os_join(self.temp_dir, "{0}.png".format(i)) for i in range(3)]
+        for i, path in enumerate(self.paths):
+            Image.fromarray(np.full((10, 10), i, dtype='uint8')).save(path)
+        self.ip = _bare_image_processing(self.temp_dir, pd.DataFrame({'cached_images_path': self.paths}))
+        self.calls = list()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def analysis(self, decoded_image):
+        self.calls.append(decoded_image)
+        return _grayscale_image_analysis(decoded_image)
+
+    def analysis_map(self, new_analysis=False):
+        return self.ip._image_analysis_map(self.analysis, items=[(p,) for p in self.paths], n_jobs=1, desc='',
+                                           status=False, store_name='grayscale_analysis', new_analysis=new_analysis)
+
+    def saved_stores(self):
+        return [f for f in os.listdir(self.temp_dir) if f.endswith('.p')]
+
+    def test_deferred_saves(self):
+        """Test that stores are saved once, when the ``_deferred_store_saves()`` block exits."""
+        with self.ip._deferred_store_saves():
+            self.assertEqual(self.analysis_map(), [True] * 3)
+            self.analysis_map()
+            self.assertEqual(self.saved_stores(), [])
+        self.assertEqual(len(self.saved_stores()), 1)
+        self.assertEqual(len(self.calls), 3)
+
+    def test_new_analysis(self):
+        """Test that ``new_analysis=True`` ignores (but updates) the store."""
+        self.analysis_map()
+        self.analysis_map()
+        self.assertEqual(len(self.calls), 3)
+        self.analysis_map(new_analysis=True)
+        self.assertEqual(len(self.calls), 6)
+        self.assertEqual(self.ip.analysis_cache_info['grayscale_analysis']['size'], 3)
+
+
+class _StubCNN(object):
+    """Stands in for ``ImageClassificationCNN``, recording the number of images passed through it."""
+
+    image_shape = (8, 8)
+
+    def __init__(self):
+        self.throughput = None
+        self.n_images = 0
+
+    def predict_batches(self, batches, n_images, desc=None, status=True):
+        predictions = list()
+        for batch in batches:
+            predictions += [[('valid_image', 0.9), ('arrows', 0.1)]] * len(batch)
+        self.n_images += len(predictions)
+        self.throughput = 100.0
+        return predictions
+
+
+class _RecordingImageLoader(ImageLoader):
+    """An ``ImageLoader`` which records the paths of the images it is asked for."""
+
+    def __init__(self, *args, **kwargs):
+        super(_RecordingImageLoader, self).__init__(*args, **kwargs)
+        self.requested = list()
+
+    def __getitem__(self, path):
+        self.requested.append(path)
+        return super(_RecordingImageLoader, self).__getitem__(path)
+
+
+class VisualImageProblemsTests(unittest.TestCase):
+    """
+
+    Unit Tests for ``OpeniImageProcessing().visual_image_problems()`` (with a stub of the model).
+
+    """
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        modalities = ['ct', 'ultrasound', 'x_ray', 'photograph']
+        self.paths = [os_join(self.temp_dir, "{0}.png".format(i)) for i in range(len(modalities))]
+        for i, path in enumerate(self.paths):
+            Image.fromarray(np.full((10, 10, 3), (i, 50, 100), dtype='uint8')).save(path)
+        image_dataframe = pd.DataFrame({'cached_images_path': self.paths, 'image_modality_major': modalities,
+                                        'lower_crop': np.NaN, 'upper_crop': np.NaN, 'vborder': np.NaN})
+        self.ip = _bare_image_processing(self.temp_dir, image_dataframe)
+        self.ip._image_loader = _RecordingImageLoader()
+        self.ip._ircnn = _StubCNN()
+        self.ip._model_path = self.paths[0]
+        self.ip._prediction_counts = defaultdict(int)
+        self.ip.trained_open_i_modality_types = ['ct', 'mri', 'x_ray']
+        self.ip.known_image_problems = ('arrows', 'asterisks', 'grids')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_unknown_modalities_skipped(self):
+        """Test that images of unknown modalities are never loaded or scored and are counted."""
+        self.ip.visual_image_problems(status=False)
+        self.assertEqual(self.ip._ircnn.n_images, 2)
+        self.assertEqual(sorted(set(self.ip._image_loader.requested)), [self.paths[0], self.paths[2]])
+        vip = self.ip.image_dataframe['visual_image_problems'].tolist()
+        self.assertTrue(isinstance(vip[0], list) and isinstance(vip[2], list))
+        self.assertTrue(items_null(vip[1]) and items_null(vip[3]))
+        # 'image_modality_major' is no longer set to NaN for unknown modalities.
+        self.assertEqual(self.ip.image_dataframe['image_modality_major'].tolist(),
+                         ['ct', 'ultrasound', 'x_ray', 'photograph'])
+
+        self.ip.image_dataframe.drop('visual_image_problems', axis=1, inplace=True)
+        self.ip.visual_image_problems(status=False)  # predictions for known modalities are now cached.
+        self.assertEqual(self.ip._ircnn.n_images, 2)
+        self.assertEqual(self.ip.prediction_report, {'images': 8, 'unknown_modality': 4, 'cached': 2,
+                                                     'predicted': 2, 'seconds_saved': 6 / 100.0})
+
+    def test_auto_decision_unknown_modality(self):
+        """Test that the grayscale test of ``auto_decision()`` applies to images of unknown modalities."""
+        self.ip.visual_image_problems(status=False)
+        self.ip.image_dataframe['grayscale'] = False
+        self.ip.image_dataframe['image_problems_from_text'] = np.NaN
+        self.ip.auto_decision()
+        # 'ultrasound' is a grayscale modality which the model has not been trained on.
+        self.assertEqual(self.ip.image_dataframe['invalid_image_reasons'].tolist()[:3],
+                         [('grayscale',), ('grayscale',), ('grayscale',)])
+        self.assertTrue(items_null(self.ip.image_dataframe['invalid_image_reasons'].iloc[3]))
+
+
+class _StubOpeniInterface(object):
+    """Stands in for the ``OpeniInterface`` instance an ``OpeniImageProcessing`` instance is created from."""
+
+    def __init__(self, aux_directory):
+        self._created_image_dirs = {'aux': aux_directory}
+
+
+class AutoAnalysisTests(unittest.TestCase):
+    """
+
+    Unit Tests for ``OpeniImageProcessing().auto_analysis()`` and the Analyses it Runs (with a stub of the model).
+
+    """
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        rng = np.random.RandomState(0)
+        self.logo_path = os_join(self.temp_dir, "logo.png")
+        yy, xx = np.mgrid[0:16, 0:16]
+        logo = 255 * ((np.abs(yy - 7.5) > 5) | (np.abs(xx - 7.5) > 5) | (np.abs(yy - xx) < 2)).astype('uint8')
+        Image.fromarray(logo).save(self.logo_path)
+
+        journals = ['MedPix', 'Radiology', 'MedPix', 'MedPix', 'Radiology', 'MedPix', 'Radiology']
+        self.paths = [os_join(self.temp_dir, "{0}.png".format(i)) for i in range(len(journals))]
+        for i, path in enumerate(self.paths):
+            image = np.clip(rng.normal(90, 20, size=(96, 96)), 0, 255).astype('uint8')
+            if journals[i] == 'MedPix':
+                image[4:20, 74:90] = logo
+            if i % 3 == 0:
+                image[:10], image[-10:] = 0, 0  # borders
+            if i % 2:
+                image = np.dstack([image, image // 2, image])  # not grayscale
+            Image.fromarray(image).save(path)
+
+        self.image_dataframe = pd.DataFrame({'cached_images_path': self.paths, 'journal_title': journals,
+                                             'image_modality_major': ['ct', 'mri', 'x_ray', 'photograph',
+                                                                      'ct', 'mri', 'x_ray']})
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _image_processing(self, n_jobs=1):
+        ip = _bare_image_processing(self.temp_dir, self.image_dataframe.copy())
+        ip.n_jobs = n_jobs
+        ip.cache_analyses, ip.cache_predictions = False, False
+        ip.instance = _StubOpeniInterface(self.temp_dir)
+        ip._medpix_path = self.logo_path
+        ip._ircnn = _StubCNN()
+        ip._model_path = self.paths[0]
+        ip._prediction_counts = defaultdict(int)
+        ip.trained_open_i_modality_types = ['ct', 'mri', 'x_ray']
+        ip.known_image_problems = ('arrows', 'asterisks', 'grids')
+        return ip
+
+    def test_analyses_n_jobs(self):
+        """Test that the analyses yield the same results when run in several processes as in one."""
+        results = list()
+        for n_jobs in (1, 2):
+            ip = self._image_processing(n_jobs=n_jobs)
+            ip.grayscale_analysis(status=False)
+            ip.logo_analysis(status=False)
+            ip.border_analysis(status=False)
+            results.append(ip.image_dataframe)
+        self.assertTrue(any(isinstance(b, dict) for b in results[0]['medpix_logo_bounding_box']))
+        pd.testing.assert_frame_equal(results[1], results[0])
+
+        # The logo is sent to the processes as a (pickled) ``_PatternPyramid``.
+        logo = template_matching.template_registry.get(self.logo_path)
+        base_image = np.asarray(Image.open(self.paths[0]), dtype='float64')
+        self.assertEqual(template_matching.robust_match_template(pickle.loads(pickle.dumps(logo)), base_image),
+                         template_matching.robust_match_template(logo, base_image))
+
+    def test_batched_matches_unbatched(self):
+        """Test that analyzing the images in batches yields the same ``image_dataframe`` as analyzing them at once."""
+        expected = self._image_processing()
+        expected.auto_analysis(status=False)
+        self.assertTrue(any(isinstance(b, dict) for b in expected.image_dataframe['medpix_logo_bounding_box']))
+
+        for batch_size in (1, 3, len(self.paths)):
+            ip = self._image_processing()
+            ip.auto_analysis(status=False, batch_size=batch_size)
+            pd.testing.assert_frame_equal(ip.image_dataframe, expected.image_dataframe)
+
+    def test_batched_pools(self):
+        """Test that a batched analysis starts the processes for each analysis once (rather than once per batch)."""
+        expected = self._image_processing()
+        expected.auto_analysis(status=False)
+
+        new_pools = list()
+        new_image_analysis_pool = image_processing._new_image_analysis_pool
+
+        def recording_new_image_analysis_pool(processes, analysis):
+            pool = new_image_analysis_pool(processes, analysis=analysis)
+            new_pools.append(pool)
+            return pool
+
+        image_processing._new_image_analysis_pool = recording_new_image_analysis_pool
+        self.addCleanup(setattr, image_processing, '_new_image_analysis_pool', new_image_analysis_pool)
+
+        ip = self._image_processing(n_jobs=2)
+        ip.auto_analysis(status=False, batch_size=3)
+        self.assertEqual(len(new_pools), 3)  # grayscale, logo and border analyses.
+        self.assertIsNone(ip._analysis_pools)
+        pd.testing.assert_frame_equal(ip.image_dataframe, expected.image_dataframe)
+
+    def test_batched_interrupted(self):
+        """Test that the columns being computed are removed if the analysis is interrupted part way through."""
+        ip = self._image_processing()
+        predict_batches = ip._ircnn.predict_batches
+
+        def failing_predict_batches(batches, n_images, desc=None, status=True):
+            if ip._ircnn.n_images:
+                raise RuntimeError("interrupted")
+            return predict_batches(batches, n_images, desc=desc, status=status)
+
+        ip._ircnn.predict_batches = failing_predict_batches
+        with self.assertRaises(RuntimeError):
+            ip.auto_analysis(status=False, batch_size=3)
+        self.assertEqual(list(ip.image_dataframe.columns), list(self.image_dataframe.columns))
+        pd.testing.assert_frame_equal(ip.image_dataframe, self.image_dataframe)
+
+
+class SeriesCacheIndexTests(unittest.TestCase):
+    """
+
+    Unit Tests for the Index of the Cancer Image Archive Images Cache.
+
+    """
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.raw, self.dicoms = os_join(self.temp_dir, 'raw'), os_join(self.temp_dir, 'dicoms')
+        for d in (self.raw, self.dicoms):
+            os.makedirs(d)
+        for name in ('1_1__P1_0000000001__default.png', '2_2__P1_0000000001__default.png',
+                     '1_1__P1_0000000011__default.png'):
+            open(os_join(self.raw, name), 'w').close()
+        os.makedirs(os_join(self.dicoms, '__temp_dicom__abc'))
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _index(self):
+        return SeriesCacheIndex(save_path=os_join(self.temp_dir, 'index.p'),
+                                directories={'raw': (self.raw, png_series_abbrev),
+                                             'dicoms': (self.dicoms, dicom_series_abbrev)})
+
+    def test_series_abbrev(self):
+        """Test that the 'series_abbrev' is extracted from the names of files in the cache."""
+        self.assertEqual(png_series_abbrev('NA_3__P1_0000000001__default.png'), 'P1_0000000001')
+        self.assertEqual(dicom_series_abbrev('4_1-01__P1_0000000001.dcm'), 'P1_0000000001')
+        self.assertIsNone(png_series_abbrev('image.png'))
+        self.assertIsNone(dicom_series_abbrev('__temp_dicom__abc'))
+
+    def test_lookup_add_remove(self):
+        """Test that files are found for exactly the series requested and that the index can be updated."""
+        index = self._index()
+        self.assertEqual(index.lookup('raw', 'P1_0000000001'),
+                         (os_join(self.raw, '1_1__P1_0000000001__default.png'),
+                          os_join(self.raw, '2_2__P1_0000000001__default.png')))
+        self.assertEqual(index.lookup('dicoms', 'P1_0000000001'), ())
+
+        dicom_path = os_join(self.dicoms, '1_000001__P1_0000000001.dcm')
+        open(dicom_path, 'w').close()
+        index.add('dicoms', [dicom_path])
+        os.remove(os_join(self.raw, '2_2__P1_0000000001__default.png'))
+        index.remove([os_join(self.raw, '2_2__P1_0000000001__default.png')])
+        index.save()
+
+        index = self._index()
+        self.assertEqual(index.lookup('dicoms', 'P1_0000000001'), (dicom_path,))
+        self.assertEqual(len(index.lookup('raw', 'P1_0000000001')), 1)
+
+    def test_external_changes(self):
+        """Test that the index is rebuilt if a directory is changed without it being informed."""
+        index = self._index()
+        index.lookup('raw', 'P1_0000000011')
+        index.save()
+
+        os.remove(os_join(self.raw, '1_1__P1_0000000011__default.png'))
+        os.utime(self.raw, ns=(0, 0))
+        self.assertEqual(self._index().lookup('raw', 'P1_0000000011'), ())
+
+    def test_add_does_not_list(self):
+        """Test that the index's own changes to a directory do not cause it to be listed again."""
+        listed = list()
+        listdir = os.listdir
+
+        def recording_listdir(path):
+            listed.append(path)
+            return listdir(path)
+
+        os.listdir = recording_listdir
+        self.addCleanup(setattr, os, 'listdir', listdir)
+
+        index = self._index()
+        for i in range(20):
+            path = os_join(self.raw, '{0}_1__P2_0000000001__default.png'.format(i))
+            open(path, 'w').close()
+            index.add('raw', [path])
+        self.assertEqual(listed, [self.raw])
+        self.assertEqual(len(index.lookup('raw', 'P2_0000000001')), 20)
+
+        index.save()
+        self.assertEqual(len(self._index().lookup('raw', 'P2_0000000001')), 20)
+        self.assertEqual(listed, [self.raw])
+
+
 unittest.main()
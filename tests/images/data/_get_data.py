@@ -28,7 +28,6 @@ db = oir.records_pull(search_url=opi.current_search_url,
                       total=100,
                       query=opi.current_query,
                       pull_time=opi._pull_time,
-                      records_sleep_time=(10, 1.5),
                       clinical_cases_only=False,
                       return_raw=True)
 
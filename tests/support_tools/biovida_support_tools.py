@@ -6,13 +6,24 @@
 """
 import os
 import sys
+import gzip
+import pickle
+import shutil
+import tempfile
 import unittest
+import threading
+import requests
+from six.moves.BaseHTTPServer import HTTPServer, BaseHTTPRequestHandler
 
 # Allow access to modules
 sys.path.insert(0, os.path.abspath("."))
 sys.path.insert(0, os.path.abspath("../"))
 
 from biovida import support_tools
+from biovida.support_tools.support_tools import atomic_pickle_dump
+from biovida.support_tools.http_session import HTTPSessionManager, http_download
+from biovida.support_tools._fuzzy_matching import NGramIndex, FuzzyMatcher
+from biovida.support_tools._aho_corasick import AhoCorasick, cached_aho_corasick
 
 
 class SupportToolsTests(unittest.TestCase):
@@ -25,5 +36,310 @@ class SupportToolsTests(unittest.TestCase):
     def test(self):
         self.assertEqual(1, 1)
 
+    def test_atomic_pickle_dump(self):
+        temp_dir = tempfile.mkdtemp()
+        try:
+            for name in ('store_old.p', 'store_older.p', 'other.p'):
+                atomic_pickle_dump(name, os.path.join(temp_dir, name))
+            save_path = os.path.join(temp_dir, 'store_new.p')
+            atomic_pickle_dump({'a': 1}, save_path, stale_pattern=os.path.join(temp_dir, 'store_*.p'))
+            self.assertEqual(sorted(os.listdir(temp_dir)), ['other.p', 'store_new.p'])
+            with open(save_path, "rb") as f:
+                self.assertEqual(pickle.load(f), {'a': 1})
+
+            # Saves from several threads at once each write their own temporary file.
+            threads = [threading.Thread(target=atomic_pickle_dump, args=(list(range(i * 1000)), save_path),
+                                        kwargs={'stale_pattern': os.path.join(temp_dir, 'store_*.p')})
+                       for i in range(8)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            self.assertEqual(sorted(os.listdir(temp_dir)), ['other.p', 'store_new.p'])
+            with open(save_path, "rb") as f:
+                saved = pickle.load(f)
+            self.assertEqual(saved, list(range(len(saved))))
+        finally:
+            shutil.rmtree(temp_dir)
+
+
+class AhoCorasickTests(unittest.TestCase):
+    """
+
+    Unit Tests for Multi-Pattern String Matching.
+
+    """
+
+    terms = ['heart disease', 'congenital heart disease', 'disease', 'abc', 'bcd', 'ms', 'cd']
+
+    def test_find_all_overlapping(self):
+        matcher = AhoCorasick(self.terms)
+        self.assertEqual(matcher.find_all("congenital heart disease"),
+                         [(0, 24, 'congenital heart disease'), (11, 24, 'heart disease'), (17, 24, 'disease')])
+        self.assertEqual(matcher.find_all("abcd"), [(0, 3, 'abc'), (1, 4, 'bcd'), (2, 4, 'cd')])
+        self.assertEqual(matcher.find_all("disease, disease"), [(0, 7, 'disease'), (9, 16, 'disease')])
+        self.assertEqual(matcher.find_all(""), [])
+
+    def test_find_all_non_overlapping(self):
+        """Test that only matches which lie within a longer match are dropped."""
+        matcher = AhoCorasick(self.terms)
+        self.assertEqual(matcher.find_all("congenital heart disease", overlapping=False),
+                         [(0, 24, 'congenital heart disease')])
+        # Neither 'abc' nor 'bcd' lies within the other, but 'cd' lies within 'bcd'.
+        self.assertEqual(matcher.find_all("abcd", overlapping=False), [(0, 3, 'abc'), (1, 4, 'bcd')])
+        # A term mentioned on its own is kept, even if it also lies within a longer match elsewhere.
+        self.assertEqual(matcher.find_all("heart disease and disease", overlapping=False),
+                         [(0, 13, 'heart disease'), (18, 25, 'disease')])
+
+    def test_word_boundaries(self):
+        """Test that, like a scan with ``in``, matching ignores word boundaries (and case)."""
+        matcher = AhoCorasick(self.terms)
+        for text in ("items", "heart diseases", "Heart Disease", "xabcdx ms"):
+            self.assertEqual(sorted(set(m[-1] for m in matcher.find_all(text))),
+                             sorted(t for t in self.terms if t in text))
+        self.assertIn('ms', matcher)
+        self.assertNotIn('m', matcher)
+
+    def test_cache_rebuild(self):
+        """Test that a saved automaton is reused, and replaced when the terms change."""
+        temp_dir = tempfile.mkdtemp()
+        try:
+            matcher = cached_aho_corasick(self.terms, save_directory=temp_dir, name='matcher')
+            saved = os.listdir(temp_dir)
+            self.assertEqual(len(saved), 1)
+            self.assertEqual(cached_aho_corasick(reversed(self.terms), save_directory=temp_dir,
+                                                 name='matcher').terms, matcher.terms)
+            self.assertEqual(os.listdir(temp_dir), saved)
+
+            matcher = cached_aho_corasick(self.terms + ['stroke'], save_directory=temp_dir, name='matcher')
+            self.assertEqual(matcher.find_all("stroke"), [(0, 6, 'stroke')])
+            self.assertEqual(len(os.listdir(temp_dir)), 1)
+            self.assertNotEqual(os.listdir(temp_dir), saved)
+
+            # A corrupt save is rebuilt.
+            with open(os.path.join(temp_dir, os.listdir(temp_dir)[0]), "wb") as f:
+                f.write(b'')
+            matcher = cached_aho_corasick(self.terms + ['stroke'], save_directory=temp_dir, name='matcher')
+            self.assertEqual(matcher.find_all("stroke"), [(0, 6, 'stroke')])
+        finally:
+            shutil.rmtree(temp_dir)
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """Keep-alive server which responds to '/flaky' with 503 until every third request."""
+    protocol_version = 'HTTP/1.1'
+    n_requests = 0
+
+    def do_GET(self):
+        _StubHandler.n_requests += 1
+        status = 503 if self.path == '/flaky' and _StubHandler.n_requests % 3 else 200
+        self.send_response(status)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+class HTTPSessionManagerTests(unittest.TestCase):
+    """
+
+    Unit Tests for the Pooled HTTP Session.
+
+    """
+
+    def test_reuse_and_retries(self):
+        """Test that connections are reused and that 5xx responses are retried."""
+        server = HTTPServer(('127.0.0.1', 0), _StubHandler)
+        server_thread = threading.Thread(target=server.serve_forever)
+        server_thread.daemon = True
+        server_thread.start()
+        url = "http://127.0.0.1:{0}".format(server.server_address[1])
+        manager = HTTPSessionManager(backoff_factor=0)
+        try:
+            for _ in range(3):
+                manager.get(url + '/ok')
+            self.assertEqual(manager.stats['connections_created'], 1)
+            self.assertEqual(manager.stats['connections_reused'], 2)
+
+            _StubHandler.n_requests = 0
+            self.assertEqual(manager.get(url + '/flaky').status_code, 200)
+            self.assertEqual(manager.stats['retries'], 2)
+        finally:
+            manager.close()
+            server.shutdown()
+            server.server_close()
+
+    def test_retries_on_connection_error(self):
+        """Test that only the retries actually performed are counted when a request cannot connect."""
+        server = HTTPServer(('127.0.0.1', 0), _StubHandler)
+        url = "http://127.0.0.1:{0}".format(server.server_address[1])
+        server.server_close()  # nothing is listening on this port.
+        manager = HTTPSessionManager(max_retries=2, backoff_factor=0)
+        try:
+            with self.assertRaises(requests.exceptions.ConnectionError):
+                manager.get(url + '/ok')
+            self.assertEqual(manager.stats['retries'], 2)
+        finally:
+            manager.close()
+
+
+class _DownloadHandler(BaseHTTPRequestHandler):
+    """
+
+    Serve ``body`` (closing the connection after each response). Responses to the first ``n_truncated``
+    requests are cut short after ``truncate_at`` bytes. If ``mode`` is 'resume', 'Range' headers are honoured.
+    If ``mode`` is 'gzip', the body is compressed (regardless of the 'Accept-Encoding' header).
+
+    """
+    body = bytes(bytearray(range(256))) * 40
+    mode = 'resume'
+    n_truncated = 1
+    truncate_at = 1000
+    requests = list()
+
+    def do_GET(self):
+        _DownloadHandler.requests.append((self.headers.get('Range'), self.headers.get('Accept-Encoding')))
+        body, start = self.body, 0
+        if self.mode == 'gzip':
+            body = gzip.compress(body)
+        range_header = self.headers.get('Range')
+        if self.mode == 'resume' and range_header is not None:
+            start = int(range_header.split('=')[1].split('-')[0])
+            self.send_response(206)
+            self.send_header('Content-Range', 'bytes {0}-{1}/{2}'.format(start, len(body) - 1, len(body)))
+        else:
+            self.send_response(200)
+        if self.mode == 'gzip':
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(body) - start))
+        self.end_headers()
+        to_send = body[start:]
+        if len(_DownloadHandler.requests) <= self.n_truncated:
+            to_send = to_send[:self.truncate_at]
+        self.wfile.write(to_send)
+
+    def log_message(self, *args):
+        pass
+
+
+class HTTPDownloadTests(unittest.TestCase):
+    """
+
+    Unit Tests for Streaming Downloads (``http_download()``).
+
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = HTTPServer(('127.0.0.1', 0), _DownloadHandler)
+        cls.server_thread = threading.Thread(target=cls.server.serve_forever)
+        cls.server_thread.daemon = True
+        cls.server_thread.start()
+        cls.url = "http://127.0.0.1:{0}/file".format(cls.server.server_address[1])
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.temp_dir, 'download')
+        _DownloadHandler.requests = list()
+        _DownloadHandler.n_truncated = 1
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _download(self, mode, **kwargs):
+        _DownloadHandler.mode = mode
+        # Note: a chunk which is cut short is lost, so chunks must be smaller than `truncate_at`.
+        received = http_download(self.url, file_path=self.file_path, chunk_size=100, **kwargs)
+        with open(self.file_path, 'rb') as f:
+            self.assertEqual(f.read(), _DownloadHandler.body)
+        return received
+
+    def test_resume(self):
+        """Test that a download which is cut short is resumed from the last byte received."""
+        self.assertEqual(self._download('resume'), len(_DownloadHandler.body))
+        self.assertEqual([r[0] for r in _DownloadHandler.requests], [None, 'bytes=1000-'])
+
+    def test_range_ignored(self):
+        """Test that the download is restarted if the server does not honour the 'Range' header."""
+        self.assertEqual(self._download('ignore_range'), len(_DownloadHandler.body))
+        self.assertEqual([r[0] for r in _DownloadHandler.requests], [None, 'bytes=1000-'])
+
+    def test_short_body(self):
+        """Test that a body which is always cut short raises (after ``max_resumes`` attempts to resume)."""
+        _DownloadHandler.mode, _DownloadHandler.n_truncated = 'resume', 100
+        with self.assertRaises((IOError, requests.exceptions.ChunkedEncodingError)):
+            http_download(self.url, file_path=self.file_path, chunk_size=100, max_resumes=2)
+        self.assertEqual(len(_DownloadHandler.requests), 3)
+
+    def test_encoded_body(self):
+        """Test that an uncompressed body is requested, and that a compressed body is decompressed and restarted."""
+        _DownloadHandler.truncate_at = 100
+        try:
+            self.assertEqual(self._download('gzip'), len(_DownloadHandler.body))
+        finally:
+            _DownloadHandler.truncate_at = 1000
+        self.assertEqual(_DownloadHandler.requests, [(None, 'identity'), (None, 'identity')])
+
+
+class _CountingProcess(object):
+    """Stand-in for ``fuzzywuzzy.process`` which scores choices by the length of their common prefix."""
+    n_calls = 0
+
+    @classmethod
+    def extractOne(cls, query, choices):
+        cls.n_calls += 1
+        def score(c):
+            return next((i for i, (a, b) in enumerate(zip(query, c)) if a != b), min(len(query), len(c)))
+        best = max(choices, key=score)
+        return best, score(best)
+
+
+class FuzzyMatchingTests(unittest.TestCase):
+    """
+
+    Unit Tests for Memoized Fuzzy Matching.
+
+    """
+
+    def test_ngram_index_candidates(self):
+        """Test that choices sharing n-grams with a query are returned and that unrelated choices are not."""
+        index = NGramIndex(['lung cancer', 'lung carcinoma', 'heart disease', 'cyst'])
+        self.assertEqual(set(index.candidates('Lung Cancers', limit=10)), {'lung cancer', 'lung carcinoma'})
+        self.assertEqual(index.candidates('lung cancer', limit=1), ['lung cancer'])
+        self.assertEqual(index.candidates('xyz', limit=10), [])
+
+    def test_fuzzy_matcher_memo(self):
+        """Test that matches are memoized, persisted and discarded if the choices change."""
+        save_directory = tempfile.mkdtemp()
+        try:
+            _CountingProcess.n_calls = 0
+            matcher = FuzzyMatcher(['lung cancer', 'heart disease'], process=_CountingProcess,
+                                   save_directory=save_directory, name='test')
+            self.assertEqual(matcher.extract_one('lung cancers'), ('lung cancer', 11))
+            self.assertEqual(matcher.extract_one('lung cancers'), ('lung cancer', 11))
+            self.assertEqual(matcher.extract_one('xyz'), (None, 0))
+            self.assertEqual(_CountingProcess.n_calls, 1)
+            matcher.save()
+
+            reloaded = FuzzyMatcher(['heart disease', 'lung cancer'], process=_CountingProcess,
+                                    save_directory=save_directory, name='test')
+            self.assertEqual(reloaded.extract_one('lung cancers'), ('lung cancer', 11))
+            self.assertEqual(_CountingProcess.n_calls, 1)
+
+            changed = FuzzyMatcher(['lung cancer'], process=_CountingProcess,
+                                   save_directory=save_directory, name='test')
+            self.assertEqual(len(changed.memo), 0)
+            changed.extract_one('lung cancers')
+            changed.save()
+            self.assertEqual(len(os.listdir(save_directory)), 1)
+        finally:
+            shutil.rmtree(save_directory)
+
 
 unittest.main()